@@ -1,23 +1,26 @@
-from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, send_file, session, redirect, url_for, Response, stream_with_context, has_request_context
 import pandas as pd
 import os
 import json
 from datetime import datetime, timedelta
 import hashlib
 import uuid
+import copy
 import altair as alt
 from functools import wraps
 import pickle
 import io
+import threading
+import weakref
+import time
 import base64
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-import matplotlib.pyplot as plt
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
+# Charts are drawn on per-call Figure objects; pyplot's global figure state is not thread-safe
+from matplotlib.figure import Figure
 # Import database manager with error handling
 try:
     from database import db_manager
@@ -32,6 +35,16 @@ except ImportError:
     backup_system = None
     backup_all_user_data = lambda *args, **kwargs: []
 
+# Versioned backups of sessions, games and rosters (content-addressed: unchanged saves add nothing)
+from backup_store import BackupStore, DEFAULT_DIR as BACKUP_STORE_DIR, backup_key
+backup_store = backup_system.store if backup_system else BackupStore(BACKUP_STORE_DIR)
+
+# Session files, archived games and season caches live here (tests point it at a temporary directory)
+SESSION_DIR = os.environ.get('SESSION_DIR', 'server_sessions')
+# A session is backed up once this many versions or seconds have passed since its last backup
+BACKUP_EVERY_VERSIONS = int(os.environ.get('BACKUP_EVERY_VERSIONS', 10))
+BACKUP_EVERY_SECONDS = int(os.environ.get('BACKUP_EVERY_SECONDS', 300))
+
 # Import Supabase manager
 try:
     from supabase_config import supabase_manager
@@ -43,21 +56,36 @@ except Exception as e:
     print(f"Warning: Supabase initialization failed ({e}), using fallback")
     supabase_manager = None
 
+from session_cas import SessionConflict, write_file_cas, write_file_if_newer, SAVE_ATTEMPTS, ABSENT
+from session_schema import migrate_session, migrate_game, new_box_stats, team_stats_row, TEAM_PHASES, SCHEMA_KEY
+
 # Configure Altair to use inline data for web serving
 alt.data_transformers.disable_max_rows()
 alt.data_transformers.enable('default')
 
 class ServerSideSession:
-    """Hybrid server-side session storage with database primary and file fallback"""
+    """Hybrid server-side session storage: optional shared hot store, then database, then file fallback"""
     
-    def __init__(self, base_dir='server_sessions', use_database=True):
+    def __init__(self, base_dir='server_sessions', use_database=True, hot_store=None):
         self.base_dir = base_dir
         self.use_database = use_database
-        self.backup_dir = os.path.join(base_dir, 'backups')
+        # Shared across workers (hot_state.py); the database and files are then durable copies
+        self.hot_store = hot_store
+        # Per-session locks for the threads of one worker (gthread); dropped when no thread holds one
+        self._locks = weakref.WeakValueDictionary()
+        self._locks_guard = threading.Lock()
+        # session_id -> (version, time) of the last backup this process took
+        self._last_backup = {}
         if not os.path.exists(base_dir):
             os.makedirs(base_dir)
-        if not os.path.exists(self.backup_dir):
-            os.makedirs(self.backup_dir)
+    
+    def session_lock(self, session_id):
+        """Reentrant lock serializing this process's saves of one session"""
+        with self._locks_guard:
+            lock = self._locks.get(session_id)
+            if lock is None:
+                lock = self._locks[session_id] = threading.RLock()
+            return lock
     
     def get_session_file_path(self, session_id):
         """Get the file path for a session ID"""
@@ -67,9 +95,51 @@ class ServerSideSession:
             os.makedirs(subdir)
         return os.path.join(subdir, f"{session_id}.pkl")
     
-    def save_session_data(self, session_id, data):
-        """Save session data with Supabase primary and comprehensive backup"""
+    def save_session_data(self, session_id, data, overwrite=False, touched=None):
+        """Save session data with Supabase primary and comprehensive backup.
+        
+        The write is a compare-and-swap against the version the blob was loaded
+        at (session_cas.py): SessionConflict is raised if another request saved
+        in between; a blob loaded before anything was stored (no version) is only
+        saved if the session is still absent. overwrite=True replaces whatever is
+        stored (reset, loading a game, restores). The hot store decides while it
+        holds the session, else the database or file.
+        touched names the rows the request changed (see _stamp_version).
+        """
+        with self.session_lock(session_id):
+            backup_due = self._save_locked(session_id, data, overwrite, touched)
+        # Backups are taken outside the lock, so they never hold up the next save of the session
+        if backup_due:
+            self._backup(session_id, data)
+    
+    def _save_locked(self, session_id, data, overwrite=False, touched=None):
+        """Body of save_session_data, run under the session lock; returns whether a backup is due"""
         try:
+            if overwrite or not isinstance(data, dict):
+                expected_version = None
+            else:
+                expected_version = data.get('version', ABSENT)
+            # The signed-in user who first saves a session owns it (live viewers are checked against this);
+            # a save that replaces the blob (restore, game load, reset) keeps the stored owner
+            if isinstance(data, dict):
+                owner = data.get('username')
+                if expected_version != ABSENT and (overwrite or not owner):
+                    owner = self.session_owner(session_id) or owner
+                if not owner and has_request_context():
+                    owner = session.get('username')
+                if owner:
+                    data['username'] = owner
+            self._stamp_version(data, touched)
+            version = data.get('version') if isinstance(data, dict) else None
+        
+            # Hot: the shared copy every worker loads; it decides conflicts while it holds the session
+            held_hot = None
+            if self.hot_store:
+                held_hot = self.hot_store.cas(session_id, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL),
+                                              version, expected_version)
+                if held_hot is False:
+                    raise SessionConflict(session_id, expected_version)
+        
             # Primary: Save to Supabase
             if supabase_manager and supabase_manager.is_connected():
                 try:
@@ -79,87 +149,279 @@ class ServerSideSession:
                     print(f"✅ Supabase available for session {session_id}")
                 except Exception as supabase_e:
                     print(f"Supabase save failed: {supabase_e}")
-            
-            # Secondary: Save to database (existing)
-            if self.use_database:
-                try:
-                    username = data.get('username', 'unknown')
-                    db_manager.save_user_session(username, session_id, data)
+        
+            # Secondary: Save to database (existing); it decides conflicts when the hot store did not
+            saved_to_database = None
+            if self.use_database and db_manager:
+                username = data.get('username', 'unknown')
+                if held_hot:
+                    saved_to_database = db_manager.save_session_if_newer(session_id, username, data, version)
+                else:
+                    saved_to_database = db_manager.save_session_cas(session_id, username, data, version,
+                                                                    expected_version)
+                if saved_to_database is False:
+                    raise SessionConflict(session_id, expected_version)
+                if saved_to_database:
                     print(f"✅ Session {session_id} saved to database")
-                except Exception as db_e:
-                    print(f"Database save failed: {db_e}")
-            
-            # Tertiary: Save to file system (backup)
+        
+            # Tertiary: Save to file system (backup), compare-and-swap when no other tier decided
             session_dir = os.path.join(self.base_dir, session_id[:2])
             os.makedirs(session_dir, exist_ok=True)
-            
+        
             session_file = os.path.join(session_dir, f"{session_id}.pkl")
-            with open(session_file, 'wb') as f:
-                pickle.dump(data, f)
-            
-            # Quaternary: Backup system (if available)
-            if backup_system:
-                try:
-                    backup_system.backup_session_data(session_id, data)
-                    print(f"✅ Session {session_id} backed up via backup system")
-                except Exception as backup_e:
-                    print(f"Backup system failed: {backup_e}")
-            
+            if held_hot or saved_to_database:
+                write_file_if_newer(session_file, data, version)
+            else:
+                write_file_cas(session_id, session_file, data, expected_version)
+            self._record_owner(session_file, data)
+        
+            # The hot store did not have the session (first save, or it expired): it does now
+            if self.hot_store and held_hot is None:
+                self._warm(session_id, data, version)
+        
             print(f"✅ Session {session_id} saved successfully")
-            
+            return self._backup_due(session_id, version, overwrite)
+        
+        except SessionConflict as e:
+            print(f"⚠️  {e}")
+            raise
         except Exception as e:
             print(f"❌ Failed to save session {session_id}: {str(e)}")
             raise e
+
+    def update_session_data(self, session_id, apply, attempts=SAVE_ATTEMPTS):
+        """Load, apply and save, re-running apply on freshly loaded data after a conflict.
+        
+        For changes that can be re-applied to whatever another request saved
+        first (adding, editing or deleting plays, undo/redo). apply(data) returns
+        (changed, result); nothing is saved when changed is false. changed may
+        be a dict naming the rows the change touched ({'plays': indexes,
+        'players': keys}), so the save only fingerprints those. Returns (data, result).
+        """
+        # Threads of this process take turns; other processes are kept out by the CAS
+        with self.session_lock(session_id):
+            for attempt in range(1, attempts + 1):
+                data = self.load_session_data(session_id)
+                changed, result = apply(data)
+                if not changed:
+                    return data, result
+                try:
+                    backup_due = self._save_locked(session_id, data,
+                                                   touched=changed if isinstance(changed, dict) else None)
+                    break
+                except SessionConflict:
+                    if attempt == attempts:
+                        raise
+                    print(f"Retrying session {session_id} update ({attempt}/{attempts})")
+        if backup_due:
+            self._backup(session_id, data)
+        return data, result
     
-    def _save_to_file(self, session_id, data):
-        """Save session data to file with backup"""
-        file_path = self.get_session_file_path(session_id)
-        try:
-            # Create backup if file exists
-            if os.path.exists(file_path):
-                backup_path = os.path.join(self.backup_dir, f"{session_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pkl")
-                import shutil
-                shutil.copy2(file_path, backup_path)
-                
-                # Keep only last 5 backups per session
-                self._cleanup_old_backups(session_id)
-            
-            session_wrapper = {
-                'session_data': data,
-                'last_accessed': datetime.now().isoformat(),
-                'created_at': datetime.now().isoformat()
-            }
-            
-            with open(file_path, 'wb') as f:
-                pickle.dump(session_wrapper, f)
-            return True
-        except Exception as e:
-            print(f"Error saving session {session_id}: {e}")
+    def _backup_due(self, session_id, version, overwrite=False):
+        """Whether this save should be backed up: overwrites always, else every
+        BACKUP_EVERY_VERSIONS versions or BACKUP_EVERY_SECONDS seconds."""
+        last = self._last_backup.get(session_id)
+        now = time.time()
+        if not (overwrite or last is None or not isinstance(version, int) or not isinstance(last[0], int)
+                or version - last[0] >= BACKUP_EVERY_VERSIONS or now - last[1] >= BACKUP_EVERY_SECONDS):
             return False
+        self._last_backup[session_id] = (version, now)
+        return True
+    
+    def _backup(self, session_id, data):
+        """Versioned backup of a saved session (only the chunks that changed are written)"""
+        try:
+            backup_version, _ = backup_store.save('sessions', session_id, data,
+                                                  meta={'username': data.get('username', 'unknown'),
+                                                        'session_version': data.get('version')})
+            print(f"✅ Session {session_id} backed up (backup version {backup_version})")
+        except Exception as backup_e:
+            print(f"Backup store failed: {backup_e}")
+    
+    @staticmethod
+    def _fingerprint(obj):
+        """Short content hash used to detect which rows changed between saves"""
+        return hashlib.blake2b(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), digest_size=8).hexdigest()
+    
+    def _stamp_version(self, data, touched=None):
+        """Bump the session version and record the version at which each play/player last changed.
+        
+        Blobs that were replaced wholesale (reset, loaded game) carry no version;
+        they restart from the current time in milliseconds so versions never go
+        backwards and a client's old version can not match the new blob.
+        
+        touched ({'plays': indexes, 'players': keys}) limits fingerprinting to
+        those rows plus appended plays and new players; the other rows keep
+        their recorded fingerprints. Without it (or with touched['all']) every
+        row is fingerprinted.
+        """
+        if not isinstance(data, dict) or not isinstance(data.get('box_stats'), dict):
+            return
+        box_stats = data['box_stats']
+        
+        previous = data.get('row_versions')
+        if 'version' in data and isinstance(previous, dict):
+            version = int(data['version']) + 1
+        else:
+            version = int(datetime.now().timestamp() * 1000)
+            previous = {'base': version, 'plays': [], 'players': {}, 'removed_players': {}}
+        
+        old_plays = previous.get('plays', [])
+        plays = box_stats.get('plays', [])
+        changed = len(plays) != len(old_plays)
+        # A hint is only trusted for in-place changes and appends on a versioned blob
+        if touched is not None and (touched.get('all') or len(plays) < len(old_plays) or 'version' not in data):
+            touched = None
+        touched_plays = set(touched.get('plays', ())) if touched is not None else None
+        touched_players = {str(key) for key in touched.get('players', ())} if touched is not None else None
+        play_versions = []
+        edited_plays = []
+        for i, play in enumerate(plays):
+            if touched_plays is not None and i < len(old_plays) and i not in touched_plays:
+                play_versions.append(old_plays[i])
+                continue
+            fp = self._fingerprint(play)
+            if i < len(old_plays) and old_plays[i][0] == fp:
+                play_versions.append(old_plays[i])
+            else:
+                play_versions.append([fp, version])
+                changed = True
+                if i < len(old_plays):
+                    edited_plays.append(i)
+        # The posting lists only notice a change in play count; re-file plays edited in place
+        # (re-filing a play its handler already updated leaves the lists as they are)
+        if edited_plays and len(plays) == len(old_plays) and PLAY_POSTINGS_KEY in box_stats:
+            for i in edited_plays:
+                update_play_postings(box_stats, PLAY_INDEX_DIMENSIONS, i)
+        
+        old_players = previous.get('players', {})
+        player_versions = {}
+        for key, player in (box_stats.get('players') or {}).items():
+            key = str(key)
+            old = old_players.get(key)
+            if touched_players is not None and old and key not in touched_players:
+                player_versions[key] = old
+                continue
+            fp = self._fingerprint(player)
+            if old and old[0] == fp:
+                player_versions[key] = old
+            else:
+                player_versions[key] = [fp, version]
+                changed = True
+        removed_players = {k: v for k, v in previous.get('removed_players', {}).items() if k not in player_versions}
+        for key in old_players:
+            if key not in player_versions:
+                removed_players[key] = version
+                changed = True
+        
+        aggregates = {
+            'team_stats': box_stats.get('team_stats', {}),
+            'play_call_stats': box_stats.get('play_call_stats', {}),
+            'game_info': box_stats.get('game_info', {}),
+            'next_situation': box_stats.get('next_situation', {})
+        }
+        fp = self._fingerprint(aggregates)
+        old = previous.get('aggregates')
+        if not (old and old[0] == fp):
+            old = [fp, version]
+            changed = True
+        
+        # Saving an unchanged blob keeps its version (and so its ETag)
+        if not changed and 'version' in data:
+            return
+        
+        data['version'] = version
+        data['row_versions'] = {
+            'base': previous.get('base', version),
+            'plays': play_versions,
+            'players': player_versions,
+            'removed_players': removed_players,
+            'aggregates': old
+        }
     
     def load_session_data(self, session_id):
-        """Load session data with database primary and file fallback"""
+        """Load session data from the hot store, else the database, else the file fallback"""
         if not session_id:
             return {}
+        
+        # Hot store first: the latest save from any worker, without a database round trip
+        if self.hot_store:
+            try:
+                entry = self.hot_store.get(session_id)
+                if entry:
+                    return self._upgrade(session_id, pickle.loads(entry[1]))
+            except Exception as e:
+                print(f"❌ Hot store load exception: {e}, trying database")
             
         # Try database first - this is critical for persistence
+        stored = None
         if self.use_database:
             try:
                 data = db_manager.load_session_data(session_id)
                 if data:
                     print(f"✓ Session loaded from database")
-                    return data
+                    stored = data
                 else:
                     print(f"No session found in database, trying file fallback")
             except Exception as e:
                 print(f"❌ Database load exception: {e}, trying file fallback")
         
         # Fallback to file storage
-        print(f"⚠️  Loading from file storage - may not have latest data")
-        return self._load_from_file(session_id)
+        if stored is None:
+            print(f"⚠️  Loading from file storage - may not have latest data")
+            stored = self._load_stored_file(session_id)
+        
+        if self.hot_store and isinstance(stored, dict) and stored:
+            self._warm(session_id, stored, stored.get('version'))
+        return self._upgrade(session_id, stored)
+    
+    def _warm(self, session_id, stored, version):
+        """Put a durable copy in the hot store, unless a worker already put the same or a newer one there"""
+        try:
+            self.hot_store.put_if_newer(session_id, pickle.dumps(stored, protocol=pickle.HIGHEST_PROTOCOL), version)
+        except Exception as e:
+            print(f"Hot store warm failed for {session_id}: {e}")
+    
+    def _upgrade(self, session_id, data):
+        """Bring a blob written under an older schema up to date, and store it so this runs once"""
+        if migrate_session(data):
+            print(f"✓ Session {session_id} migrated to schema v{data['box_stats'][SCHEMA_KEY]}")
+            try:
+                self.save_session_data(session_id, data)
+            except Exception as e:
+                print(f"Saving migrated session {session_id} failed: {e}")
+        return data
+    
+    def session_owner(self, session_id):
+        """Username that owns a stored session, read without loading the blob (None if unknown)"""
+        if not session_id:
+            return None
+        if self.use_database and db_manager:
+            owner = db_manager.load_session_owner(session_id)
+            if owner:
+                return owner
+        try:
+            with open(f"{self.get_session_file_path(session_id)}.owner", encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _record_owner(session_file, data):
+        """Write the owner next to the session file the first time it is known; never rewritten"""
+        owner = data.get('username') if isinstance(data, dict) else None
+        if not owner or os.path.exists(f"{session_file}.owner"):
+            return
+        try:
+            with open(f"{session_file}.owner", 'x', encoding='utf-8') as f:
+                f.write(owner)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            print(f"Recording owner of {session_file} failed: {e}")
     
-    def _load_from_file(self, session_id):
-        """Load session data from file"""
+    def _load_stored_file(self, session_id):
+        """Session blob from file as stored"""
         file_path = self.get_session_file_path(session_id)
         try:
             if os.path.exists(file_path):
@@ -175,18 +437,6 @@ class ServerSideSession:
             print(f"Error loading session {session_id}: {e}")
             return {}
     
-    def _cleanup_old_backups(self, session_id):
-        """Keep only the 5 most recent backups for a session"""
-        try:
-            backup_files = [f for f in os.listdir(self.backup_dir) if f.startswith(session_id)]
-            backup_files.sort(reverse=True)  # Most recent first
-            
-            # Remove old backups beyond the 5 most recent
-            for old_backup in backup_files[5:]:
-                os.remove(os.path.join(self.backup_dir, old_backup))
-        except Exception as e:
-            print(f"Error cleaning up backups for {session_id}: {e}")
-    
     def create_session(self):
         """Create a new session ID"""
         import uuid
@@ -198,6 +448,14 @@ class ServerSideSession:
             return False
         
         success = True
+        self._last_backup.pop(session_id, None)
+        
+        if self.hot_store:
+            try:
+                self.hot_store.delete(session_id)
+            except Exception as e:
+                print(f"Error deleting session from hot store {session_id}: {e}")
+                success = False
         
         # Try to delete from database first
         if self.use_database:
@@ -207,11 +465,16 @@ class ServerSideSession:
                 print(f"Error deleting session from database {session_id}: {e}")
                 success = False
         
-        # Also delete from file storage
+        # Archived games belong to the session as well
+        if session_archive:
+            session_archive.delete_segments(session_id)
+        
+        # Also delete from file storage, with the lock file its compare-and-swap writes left and the owner
         file_path = self.get_session_file_path(session_id)
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            for path in (file_path, f"{file_path}.lock", f"{file_path}.owner"):
+                if os.path.exists(path):
+                    os.remove(path)
         except Exception as e:
             print(f"Error deleting session file {session_id}: {e}")
             success = False
@@ -232,6 +495,15 @@ app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['PERMANENT_SESSION_LIFETIME'] = 86400  # 24 hours
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max request size
 
+# orjson-backed JSON responses and gzip/brotli compression for large payloads
+try:
+    from fast_json import FastJSONProvider, init_compression
+    app.json = FastJSONProvider(app)
+    init_compression(app)
+    print("✅ Fast JSON provider and response compression enabled")
+except Exception as e:
+    print(f"❌ Fast JSON/compression setup failed, using Flask defaults: {e}")
+
 # Initialize database and server-side session storage with error handling
 try:
     from database import DatabaseManager
@@ -241,13 +513,82 @@ except Exception as e:
     print(f"❌ DatabaseManager initialization failed: {e}")
     db_manager = None
 
+# Shared hot tier for live sessions across workers (HOT_STATE_BACKEND: redis or sqlite)
+try:
+    from hot_state import create_hot_store
+    hot_store = create_hot_store(base_dir=SESSION_DIR)
+    if hot_store:
+        print(f"✅ Hot session store enabled ({type(hot_store).__name__})")
+except Exception as e:
+    print(f"Warning: Hot session store not available ({e})")
+    hot_store = None
+
 try:
-    server_session = ServerSideSession()
+    server_session = ServerSideSession(base_dir=SESSION_DIR, hot_store=hot_store)
     print("✅ ServerSideSession initialized successfully")
 except Exception as e:
     print(f"❌ ServerSideSession initialization failed: {e}")
     server_session = None
 
+# Per-session play indexes (player lookups, per-player play lists, posting lists for play queries)
+# and the pre-aggregated situational cube
+from play_index import (resolve_player, index_new_play, rebuild_player_index, get_player_index, player_plays, involved_entry,
+                        unindex_last_play, rebuild_play_postings,
+                        index_play_postings, remove_play_postings, update_play_postings, query_play_indices,
+                        union_postings, PLAYER_INDEX_KEY, PLAY_POSTINGS_KEY)
+from situation_cube import (get_cube, cube_add_play, cube_remove_play, cube_replace_play, slice_cube, rebuild_cube,
+                            SITUATION_CUBE_KEY)
+from drives import get_drives, drives_add_play, resegment_from, rebuild_drives, DRIVES_KEY
+# Down/distance/field position model (strings only at the API boundary)
+from situation import next_situation_for_play, encode_field_position, recheck_situations, MIDFIELD
+# One-pass validation and canonical roles/play types for add_play
+from play_schema import validate_play, PlayValidationError
+# Idempotent play submission and offline batch sync
+from play_sync import get_receipt, store_receipt, make_receipt, order_batch, apply_batch, BATCH_LIMIT as SYNC_BATCH_LIMIT
+# Undo/redo journal for play entry
+import journal as play_journal
+
+# Season rollups over saved games, with per-game summaries cached until a game is re-saved
+try:
+    from season_rollup import SeasonSummaryCache, season_rollup, dedupe_summaries
+    season_cache = SeasonSummaryCache(os.path.join(SESSION_DIR, 'season_cache'))
+except Exception as e:
+    print(f"Warning: Season rollups not available ({e})")
+    season_cache = None
+
+# Alternate efficient/explosive/negative thresholds, scored side by side with the current rules
+try:
+    from play_rules import RuleConfig, play_columns, concat_columns, compare_rules
+except Exception as e:
+    print(f"Warning: What-if rule evaluation not available ({e})")
+    RuleConfig = None
+
+# Cold storage for completed games (keeps long-running sessions small)
+try:
+    from session_archive import SessionArchive, ensure_game_id, is_same_game
+    session_archive = SessionArchive(os.path.join(SESSION_DIR, 'archive'))
+    print("✅ SessionArchive initialized successfully")
+except Exception as e:
+    print(f"Warning: Session archive not available ({e}), keeping all plays in the hot session")
+    session_archive = None
+
+# Live update fan-out for dashboards watching a game session (SSE)
+try:
+    from live_updates import create_broker
+    live_broker = create_broker(spool_dir=os.path.join(SESSION_DIR, 'events'))
+    print(f"✅ Live updates enabled ({type(live_broker).__name__})")
+except Exception as e:
+    print(f"Warning: Live updates not available ({e})")
+    live_broker = None
+
+# Sync gunicorn workers are killed after 30s, so streams end before that and the browser reconnects
+LIVE_STREAM_SECONDS = int(os.environ.get('LIVE_STREAM_SECONDS', 25))
+LIVE_HEARTBEAT_SECONDS = 10
+# An open stream holds a gthread thread for its whole life; by default at most half of a
+# worker's threads stream, so play entry and exports always have threads left (gunicorn.conf.py)
+LIVE_STREAM_LIMIT = int(os.environ.get('LIVE_STREAM_LIMIT', max(1, int(os.environ.get('GUNICORN_THREADS', 8)) // 2)))
+live_stream_slots = threading.BoundedSemaphore(LIVE_STREAM_LIMIT)
+
 # Authentication helper functions
 def hash_password(password):
     """Hash password with salt"""
@@ -364,6 +705,7 @@ def data_recovery_dashboard():
         return jsonify({
             'backup_status': backup_status,
             'recovery_options': [
+                'Backup store recovery (any backed-up version)',
                 'Database recovery',
                 'File system recovery', 
                 'Emergency backup recovery'
@@ -373,35 +715,6 @@ def data_recovery_dashboard():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/admin/recover_session/<session_id>')
-def recover_session_data(session_id):
-    """Recover session data from backups"""
-    try:
-        if backup_system:
-            recovered_data = backup_system.recover_session_data(session_id)
-            
-            if recovered_data:
-                # Restore to active session
-                server_session.save_session_data(session_id, recovered_data)
-                return jsonify({
-                    'success': True,
-                    'message': f'Session {session_id} recovered successfully',
-                    'data_size': len(str(recovered_data))
-                })
-            else:
-                return jsonify({
-                    'success': False,
-                    'message': f'No backup found for session {session_id}'
-                }), 404
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Backup system not available'
-            }), 503
-            
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-
 @app.route('/admin/recalculate_stats/<session_id>')
 def recalculate_session_stats(session_id):
     """Force recalculation of all stats for a session with updated defensive logic"""
@@ -437,10 +750,6 @@ def recalculate_session_stats(session_id):
         session_data['box_stats'] = box_stats
         server_session.save_session_data(session_id, session_data)
         
-        # Also save to database
-        username = session_data.get('username', 'unknown')
-        db_manager.save_user_session(username, session_id, session_data)
-        
         return jsonify({
             'success': True,
             'message': f'Stats recalculated for session {session_id}',
@@ -500,6 +809,51 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
+@app.route('/admin/session_backups/<session_id>')
+@admin_required
+def list_session_backups(session_id):
+    """Backed-up versions of a session, oldest first"""
+    try:
+        return jsonify({
+            'session_id': session_id,
+            'versions': backup_store.versions('sessions', session_id)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/admin/recover_session/<session_id>', methods=['POST'])
+@admin_required
+def recover_session_data(session_id):
+    """Recover session data from backups (?version=N picks a backed-up version, else the latest)"""
+    try:
+        version = request.values.get('version', type=int)
+        if backup_system:
+            recovered_data = backup_system.recover_session_data(session_id, version)
+        else:
+            recovered_data = backup_store.restore('sessions', session_id, version)
+        
+        if recovered_data:
+            # The backed-up version stamps are stale: without them the restore is stamped
+            # newer than anything saved since, so workers and clients pick it up
+            recovered_data.pop('version', None)
+            recovered_data.pop('row_versions', None)
+            # Restore to active session
+            server_session.save_session_data(session_id, recovered_data, overwrite=True)
+            return jsonify({
+                'success': True,
+                'message': f'Session {session_id} recovered successfully',
+                'version': version,
+                'data_size': len(str(recovered_data))
+            })
+        else:
+            return jsonify({
+                'success': False,
+                'message': f'No backup found for session {session_id}' + (f' at version {version}' if version else '')
+            }), 404
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # Configure Altair to use JSON renderer
 alt.data_transformers.enable('json')
 
@@ -1664,29 +2018,13 @@ def hudl_analyze():
         # Handle NaN values for JSON serialization
         data_preview = combined_df.head(10).fillna('').to_dict('records')
         
-        # Clean calculated_stats to handle NaN values
-        cleaned_calculated_stats = {}
-        for stat_name, stat_data in calculated_stats.items():
-            cleaned_data = []
-            for record in stat_data:
-                cleaned_record = {}
-                for key, value in record.items():
-                    if pd.isna(value):
-                        cleaned_record[key] = None
-                    elif isinstance(value, float) and (value == float('inf') or value == float('-inf')):
-                        cleaned_record[key] = None
-                    else:
-                        cleaned_record[key] = value
-                cleaned_data.append(cleaned_record)
-            cleaned_calculated_stats[stat_name] = cleaned_data
-        
         # Generate play filtering options
         filter_options = generate_filter_options(combined_df)
         
         return jsonify({
             'success': True,
             'summary_stats': summary_stats,
-            'calculated_stats': cleaned_calculated_stats,
+            'calculated_stats': calculated_stats,  # NaN/inf serialize as null
             'charts': charts,
             'data_preview': data_preview,
             'filter_options': filter_options
@@ -2054,11 +2392,14 @@ def generate_offensive_analysis(df):
 # IN-GAME BOX STATS ANALYTICS ROUTES
 # =====================================
 
-def _resolve_player(players: dict, player_number_or_key: str):
+def _resolve_player(players: dict, player_number_or_key: str, box_stats: dict = None):
     """Resolve a player entry from `players` by key or jersey number or name alias.
+    Pass the session's box_stats to resolve through its player index instead of scanning.
     Returns (key, player_dict) or (None, None)."""
     if not isinstance(players, dict):
         return None, None
+    if box_stats is not None and box_stats.get('players') is players:
+        return resolve_player(box_stats, player_number_or_key)
     # 1) Direct key match
     lookup = str(player_number_or_key)
     if lookup in players:
@@ -2102,908 +2443,343 @@ def box_stats_redirect():
     # Redirect to the canonical analytics route
     return redirect(url_for('box_stats_analytics'))
 
-@app.route('/box_stats/add_play', methods=['POST'])
-@login_required
-def add_box_stats_play():
-    """Add a single play's box stats"""
-    try:
-        data = request.get_json()
-        
-        # Debug logging for incoming request data
-        print(f"DEBUG REQUEST: Full request data: {data}")
-        print(f"DEBUG REQUEST: Players field: {data.get('players')}")
-        print(f"DEBUG REQUEST: Phase field: {data.get('phase')}")
-        print(f"DEBUG REQUEST: Play type: {data.get('play_type')}")
-        
-        # Get or create server-side session ID
-        if 'server_session_id' not in session:
-            session['server_session_id'] = str(uuid.uuid4())
-            session.permanent = True
-        
-        session_id = session['server_session_id']
-        
-        # Load box stats from server-side storage
-        box_stats_data = server_session.load_session_data(session_id)
-        
-        # Initialize box stats if not exists
-        if 'box_stats' not in box_stats_data:
-            box_stats_data['box_stats'] = {
-                'plays': [],
-                'players': {},
-                'game_info': {},
-                'team_stats': {
-                    'total_plays': 0,
-                    'efficient_plays': 0,
-                    'explosive_plays': 0,
-                    'total_yards': 0,
-                    'efficiency_rate': 0.0,
-                    'explosive_rate': 0.0,
-                    'avg_yards_per_play': 0.0,
-                    'success_rate': 0.0
-                }
-            }
-        
-        # Get reference to box_stats for easier access
-        box_stats = box_stats_data['box_stats']
-        
-        # Ensure phase-specific team_stats exists in existing sessions (backward compatibility)
-        if 'team_stats' not in box_stats:
-            box_stats['team_stats'] = {}
-        
-        # Initialize phase-specific team stats
-        phases = ['offense', 'defense', 'special_teams']
-        for phase in phases:
-            if phase not in box_stats['team_stats']:
-                box_stats['team_stats'][phase] = {
-                    'total_plays': 0,
-                    'efficient_plays': 0,
-                    'explosive_plays': 0,
-                    'negative_plays': 0,
-                    'total_yards': 0,
-                    'passing_yards': 0,
-                    'rushing_yards': 0,
-                    'passing_plays': 0,
-                    'rushing_plays': 0,
-                    'passing_efficient_plays': 0,
-                    'rushing_efficient_plays': 0,
-                    'passing_explosive_plays': 0,
-                    'rushing_explosive_plays': 0,
-                    'passing_negative_plays': 0,
-                    'rushing_negative_plays': 0,
-                    'touchdowns': 0,
-                    'turnovers': 0,
-                    'interceptions': 0,
-                    'efficiency_rate': 0.0,
-                    'explosive_rate': 0.0,
-                    'negative_rate': 0.0,
-                    'nee_score': 0.0,
-                    'avg_yards_per_play': 0.0,
-                    'success_rate': 0.0,
-                    # Progression tracking
-                    'nee_progression': [],
-                    'efficiency_progression': [],
-                    'avg_yards_progression': []
-                }
-        
-        # Maintain overall team stats for backward compatibility
-        if 'overall' not in box_stats['team_stats']:
-            box_stats['team_stats']['overall'] = {
-                'total_plays': 0,
-                'efficient_plays': 0,
-                'explosive_plays': 0,
-                'negative_plays': 0,
-                'total_yards': 0,
-                'passing_yards': 0,
-                'rushing_yards': 0,
-                'passing_plays': 0,
-                'rushing_plays': 0,
-                'passing_efficient_plays': 0,
-                'rushing_efficient_plays': 0,
-                'passing_explosive_plays': 0,
-                'rushing_explosive_plays': 0,
-                'passing_negative_plays': 0,
-                'rushing_negative_plays': 0,
-                'touchdowns': 0,
-                'turnovers': 0,
-                'interceptions': 0,
-                'efficiency_rate': 0.0,
-                'explosive_rate': 0.0,
-                'negative_rate': 0.0,
-                'nee_score': 0.0,
-                'avg_yards_per_play': 0.0,
-                'success_rate': 0.0,
-                # Progression tracking
-                'nee_progression': [],
-                'efficiency_progression': [],
-                'avg_yards_progression': []
-            }
-        
-        # Ensure all advanced analytics fields exist in all phase-specific team_stats (backward compatibility)
-        required_team_fields = {
-            'total_yards': 0,
-            'passing_yards': 0,
-            'rushing_yards': 0,
-            'passing_plays': 0,
-            'rushing_plays': 0,
-            'passing_efficient_plays': 0,
-            'rushing_efficient_plays': 0,
-            'passing_explosive_plays': 0,
-            'rushing_explosive_plays': 0,
-            'passing_negative_plays': 0,
-            'rushing_negative_plays': 0,
-            'negative_plays': 0,
-            'efficiency_rate': 0.0,
-            'explosive_rate': 0.0,
-            'negative_rate': 0.0,
-            'nee_score': 0.0,
-            'avg_yards_per_play': 0.0,
-            'success_rate': 0.0,
-            'nee_progression': [],
-            'efficiency_progression': [],
-            'avg_yards_progression': []
-        }
-        
-        # Apply backward compatibility to all phases (including overall)
-        all_phases = ['offense', 'defense', 'special_teams', 'overall']
-        for phase in all_phases:
-            if phase in box_stats['team_stats']:
-                for field, default_value in required_team_fields.items():
-                    if field not in box_stats['team_stats'][phase]:
-                        box_stats['team_stats'][phase][field] = default_value
-        
-        # Ensure play_call_stats exists in existing sessions (backward compatibility)
-        if 'play_call_stats' not in box_stats:
-            box_stats['play_call_stats'] = {}
-        
-        # Normalize players array: prefer 'players_involved', fallback to legacy 'players'
-        players_involved = data.get('players_involved')
-        # If single-object, wrap into list
-        if isinstance(players_involved, dict):
-            players_involved = [players_involved]
-        # If empty or invalid, fallback to legacy 'players'
-        if not players_involved or (isinstance(players_involved, list) and len(players_involved) == 0):
-            legacy_players = data.get('players')
-            if isinstance(legacy_players, dict):
-                legacy_players = [legacy_players]
-            if legacy_players and isinstance(legacy_players, list):
-                players_involved = legacy_players
-            else:
-                players_involved = []
-
-        # Extract play data
-        play_data = {
-            'play_number': data.get('play_number'),
-            'down': data.get('down'),
-            'distance': data.get('distance'),
-            'field_position': data.get('field_position'),
-            'play_type': data.get('play_type'),
-            'play_call': data.get('play_call'),  # Optional play call field
-            'result': data.get('result'),
-            'yards_gained': data.get('yards_gained', 0),
-            'players_involved': players_involved,
-            'timestamp': data.get('timestamp'),
-            'phase': data.get('phase', 'offense').lower()  # Store the phase in play data
-        }
-
-        # Normalize and persist canonical play_type for downstream analytics
+def record_play(session_id, box_stats_data, play_data, touched=None):
+    """Apply one validated play to a loaded session: stats, indexes and journal (the caller saves).
+    
+    touched, if given, collects the rows the play changed for save_session_data.
+    """
+    box_stats = box_stats_data['box_stats']
+    
+    # Move a finished game out of the hot session before recording the new one
+    if session_archive:
         try:
-            pt_raw = str(play_data.get('play_type', '')).lower()
-        except Exception:
-            pt_raw = ''
-        if pt_raw == 'pass_defense':
-            pt_norm = 'pass'
-        elif pt_raw == 'run_defense' or pt_raw == 'run':
-            pt_norm = 'rush'
-        else:
-            pt_norm = pt_raw
-        play_data['play_type'] = pt_norm
-        
-        # DEBUG: Log the incoming data to diagnose player selection issue
-        print(f"DEBUG PLAY SUBMISSION: Received data: {data}")
-        print(f"DEBUG PLAY SUBMISSION: Players involved count: {len(play_data['players_involved'])}")
-        print(f"DEBUG PLAY SUBMISSION: Players involved data: {play_data['players_involved']}")
-        
-        # Add penalty-specific data if this is a penalty
-        if play_data.get('play_type') == 'penalty':
-            play_data.update({
-                'penalty_type': data.get('penalty_type'),
-                'penalty_yards': data.get('penalty_yards', 0),
-                'penalty_on': data.get('penalty_on', 'offense')
-            })
-        
-        # Add play to server-side storage with size monitoring
-        box_stats['plays'].append(play_data)
-        
-        # Save to server-side storage
-        server_session.save_session_data(session_id, box_stats_data)
-        
-        # Monitor session size and warn if getting large
-        play_count = len(box_stats['plays'])
-        print(f"DEBUG: Added play #{play_count}. Total plays in session: {play_count}")
-        if play_count % 10 == 0:  # Check every 10 plays for debugging
-            print(f"INFO: Session now contains {play_count} plays")
-            if play_count > 200:
-                print(f"WARNING: Large session detected with {play_count} plays - consider implementing data archiving")
-        
-        # Calculate next play situation based on play type
-        if play_data.get('play_type') == 'penalty':
-            next_situation = calculate_penalty_situation(play_data, box_stats['plays'])
-        else:
-            next_situation = calculate_next_situation(play_data, box_stats['plays'])
-        box_stats['next_situation'] = next_situation
-        
-        # Handle penalty tracking separately
-        if play_data.get('play_type') == 'penalty':
-            penalty_side = data.get('penalty_side', 'offense')
-            penalty_yards = int(data.get('penalty_yards', 0))
-            current_phase = data.get('phase', 'offense').lower()
-            
-            # Track penalty yards when penalty is on our team (negative impact)
-            if penalty_side == 'offense':
-                # Our team committed the penalty - track as negative yards
-                phase_team_stats = box_stats['team_stats'][current_phase]
-                overall_team_stats = box_stats['team_stats']['overall']
-                
-                # Add penalty yards tracking
-                if 'penalty_yards' not in phase_team_stats:
-                    phase_team_stats['penalty_yards'] = 0
-                if 'penalty_yards' not in overall_team_stats:
-                    overall_team_stats['penalty_yards'] = 0
-                    
-                phase_team_stats['penalty_yards'] += penalty_yards
-                overall_team_stats['penalty_yards'] += penalty_yards
-                
-                print(f"DEBUG PENALTY TRACKING: Added {penalty_yards} penalty yards to {current_phase} phase")
-        
-        # Update team-level analytics (skip penalties - they don't count as offensive plays)
-        elif play_data.get('play_type') != 'penalty':
-            yards_gained = int(play_data.get('yards_gained', 0))
-            
-            # Determine the phase for this play
-            current_phase = data.get('phase', 'offense').lower()
-            if current_phase not in ['offense', 'defense', 'special_teams']:
-                current_phase = 'offense'  # Default to offense if phase not specified
-            
-            # Debug logging for phase detection
-            print(f"DEBUG PHASE: Received phase='{data.get('phase')}', processed as '{current_phase}'")
-            
-            # Get phase-specific team stats
+            if session_archive.archive_completed_games(session_id, box_stats):
+                # Journal entries refer to the plays that were just archived
+                play_journal.clear(box_stats_data)
+                if touched is not None:
+                    touched['all'] = True
+            play_data['game_id'] = ensure_game_id(box_stats)
+        except Exception as archive_e:
+            print(f"Archive rollover failed: {archive_e}")
+    
+    # Rows this play may change, for the undo journal
+    journal_before = play_journal.snapshot(box_stats, play_journal.play_rows(play_data))
+    
+    # Add play to server-side storage
+    box_stats['plays'].append(play_data)
+    
+    play_count = len(box_stats['plays'])
+    print(f"DEBUG: Added play #{play_count}. Total plays in current game: {play_count}")
+    
+    # Calculate next play situation (penalties move the ball by penalty yards)
+    box_stats['next_situation'] = next_situation_for_play(play_data)
+    
+    # Defaults for penalties, which skip the team and player analytics below
+    current_phase = play_data['phase']
+    play_type = play_data['play_type']
+    yards_gained = play_data['yards_gained']
+    is_team_efficient = team_explosive_this_play = team_negative_this_play = False
+    phase_team_stats = box_stats['team_stats'][current_phase]
+    overall_team_stats = box_stats['team_stats']['overall']
+    
+    # Handle penalty tracking separately
+    if play_data.get('play_type') == 'penalty':
+        penalty_side = play_data['penalty_on']
+        penalty_yards = play_data['penalty_yards']
+        current_phase = play_data['phase']
+        
+        # Track penalty yards when penalty is on our team (negative impact)
+        if penalty_side == 'offense':
+            # Our team committed the penalty - track as negative yards
             phase_team_stats = box_stats['team_stats'][current_phase]
             overall_team_stats = box_stats['team_stats']['overall']
             
-            # Update basic team stats for both phase-specific and overall
-            phase_team_stats['total_plays'] += 1
-            phase_team_stats['total_yards'] += yards_gained
-            overall_team_stats['total_plays'] += 1
-            overall_team_stats['total_yards'] += yards_gained
+            # Add penalty yards tracking
+            if 'penalty_yards' not in phase_team_stats:
+                phase_team_stats['penalty_yards'] = 0
+            if 'penalty_yards' not in overall_team_stats:
+                overall_team_stats['penalty_yards'] = 0
+                
+            phase_team_stats['penalty_yards'] += penalty_yards
+            overall_team_stats['penalty_yards'] += penalty_yards
             
-            # Calculate team efficiency and explosiveness for this play
-            # For team calculation, pass None as player_data to check all players for turnovers
-            is_team_efficient = calculate_play_efficiency(play_data, yards_gained, None, current_phase)
+            print(f"DEBUG PENALTY TRACKING: Added {penalty_yards} penalty yards to {current_phase} phase")
+    
+    # Update team-level analytics (skip penalties - they don't count as offensive plays)
+    elif play_data.get('play_type') != 'penalty':
+        yards_gained = play_data['yards_gained']
+        current_phase = play_data['phase']
+        
+        # Get phase-specific team stats
+        phase_team_stats = box_stats['team_stats'][current_phase]
+        overall_team_stats = box_stats['team_stats']['overall']
+        
+        # Update basic team stats for both phase-specific and overall
+        phase_team_stats['total_plays'] += 1
+        phase_team_stats['total_yards'] += yards_gained
+        overall_team_stats['total_plays'] += 1
+        overall_team_stats['total_yards'] += yards_gained
+        
+        # Calculate team efficiency and explosiveness for this play
+        # For team calculation, pass None as player_data to check all players for turnovers
+        is_team_efficient = calculate_play_efficiency(play_data, yards_gained, None, current_phase)
+        
+        # Track passing vs rushing yards and advanced analytics (play_type is canonical)
+        play_type = play_data['play_type']
+        
+        if play_type == 'pass':
+            phase_team_stats['passing_yards'] = phase_team_stats.get('passing_yards', 0) + yards_gained
+            phase_team_stats['passing_plays'] = phase_team_stats.get('passing_plays', 0) + 1
+            overall_team_stats['passing_yards'] = overall_team_stats.get('passing_yards', 0) + yards_gained
+            overall_team_stats['passing_plays'] = overall_team_stats.get('passing_plays', 0) + 1
+            
+            # Track passing efficiency
+            if is_team_efficient:
+                phase_team_stats['passing_efficient_plays'] = phase_team_stats.get('passing_efficient_plays', 0) + 1
+                overall_team_stats['passing_efficient_plays'] = overall_team_stats.get('passing_efficient_plays', 0) + 1
+                
+        elif play_type == 'rush':
+            phase_team_stats['rushing_yards'] = phase_team_stats.get('rushing_yards', 0) + yards_gained
+            phase_team_stats['rushing_plays'] = phase_team_stats.get('rushing_plays', 0) + 1
+            overall_team_stats['rushing_yards'] = overall_team_stats.get('rushing_yards', 0) + yards_gained
+            overall_team_stats['rushing_plays'] = overall_team_stats.get('rushing_plays', 0) + 1
             
-            # Track passing vs rushing yards and advanced analytics
-            play_type = play_data.get('play_type', '').lower()
+            # Track rushing efficiency
+            if is_team_efficient:
+                phase_team_stats['rushing_efficient_plays'] = phase_team_stats.get('rushing_efficient_plays', 0) + 1
+                overall_team_stats['rushing_efficient_plays'] = overall_team_stats.get('rushing_efficient_plays', 0) + 1
             
-            # Map defensive play types to base types
-            if play_type == 'pass_defense':
-                play_type = 'pass'
-            elif play_type == 'run_defense':
-                play_type = 'rush'
-            elif play_type == 'run':
-                # Normalize synonym
-                play_type = 'rush'
+        if is_team_efficient:
+            phase_team_stats['efficient_plays'] += 1
+            overall_team_stats['efficient_plays'] += 1
             
-            print(f"DEBUG PLAY_TYPE: Original='{data.get('play_type')}', Mapped='{play_type}'")
+        # For team explosive rate, check if any player had an explosive play
+        # BUT if ANY player on the play has a turnover, the team play is not explosive
+        team_explosive_this_play = False
+        team_negative_this_play = False
+        
+        # First check if ANY player on the play has a turnover
+        play_has_turnover = False
+        for player in play_data['players_involved']:
+            if player.get('fumble', False) or player.get('interception', False):
+                play_has_turnover = True
+                break
+        
+        for player in play_data['players_involved']:
+            role = str(player.get('role', ''))
             
-            if play_type == 'pass':
-                phase_team_stats['passing_yards'] = phase_team_stats.get('passing_yards', 0) + yards_gained
-                phase_team_stats['passing_plays'] = phase_team_stats.get('passing_plays', 0) + 1
-                overall_team_stats['passing_yards'] = overall_team_stats.get('passing_yards', 0) + yards_gained
-                overall_team_stats['passing_plays'] = overall_team_stats.get('passing_plays', 0) + 1
-                
-                # Track passing efficiency
-                if is_team_efficient:
-                    phase_team_stats['passing_efficient_plays'] = phase_team_stats.get('passing_efficient_plays', 0) + 1
-                    overall_team_stats['passing_efficient_plays'] = overall_team_stats.get('passing_efficient_plays', 0) + 1
-                    
-            elif play_type == 'rush':
-                phase_team_stats['rushing_yards'] = phase_team_stats.get('rushing_yards', 0) + yards_gained
-                phase_team_stats['rushing_plays'] = phase_team_stats.get('rushing_plays', 0) + 1
-                overall_team_stats['rushing_yards'] = overall_team_stats.get('rushing_yards', 0) + yards_gained
-                overall_team_stats['rushing_plays'] = overall_team_stats.get('rushing_plays', 0) + 1
-                
-                # Track rushing efficiency
-                if is_team_efficient:
-                    phase_team_stats['rushing_efficient_plays'] = phase_team_stats.get('rushing_efficient_plays', 0) + 1
-                    overall_team_stats['rushing_efficient_plays'] = overall_team_stats.get('rushing_efficient_plays', 0) + 1
-                
-            if is_team_efficient:
-                phase_team_stats['efficient_plays'] += 1
-                overall_team_stats['efficient_plays'] += 1
-                
-            # For team explosive rate, check if any player had an explosive play
-            # BUT if ANY player on the play has a turnover, the team play is not explosive
-            team_explosive_this_play = False
-            team_negative_this_play = False
+            # For defensive plays, infer role from play type if role is empty
+            if current_phase == 'defense' and not role:
+                if play_type == 'pass':
+                    role = 'receiver'  # Offensive player who caught the pass
+                elif play_type == 'rush':
+                    role = 'rusher'    # Offensive player who ran the ball
             
-            # First check if ANY player on the play has a turnover
-            play_has_turnover = False
-            for player in play_data['players_involved']:
-                if player.get('fumble', False) or player.get('interception', False):
-                    play_has_turnover = True
-                    break
+            print(f"DEBUG ROLE: Player #{player.get('number', 'N/A')} - Original role: '{player.get('role', '')}', Final role: '{role}'")
             
-            for player in play_data['players_involved']:
-                role = str(player.get('role', ''))
-                
-                # For defensive plays, infer role from play type if role is empty
-                if current_phase == 'defense' and not role:
-                    if play_type == 'pass':
-                        role = 'receiver'  # Offensive player who caught the pass
-                    elif play_type == 'rush':
-                        role = 'rusher'    # Offensive player who ran the ball
+            # For team explosive calculation, don't count as explosive if ANY player on play has turnover
+            if not play_has_turnover and calculate_play_explosiveness(role, yards_gained, player, current_phase):
+                team_explosive_this_play = True
                 
-                print(f"DEBUG ROLE: Player #{player.get('number', 'N/A')} - Original role: '{player.get('role', '')}', Final role: '{role}'")
-                
-                # For team explosive calculation, don't count as explosive if ANY player on play has turnover
-                if not play_has_turnover and calculate_play_explosiveness(role, yards_gained, player, current_phase):
-                    team_explosive_this_play = True
-                    
-                if calculate_play_negativeness(play_data, yards_gained, player, current_phase):
-                    team_negative_this_play = True
-                
-                # Update team-level special stats
-                if player.get('touchdown', False):
-                    phase_team_stats['touchdowns'] += 1
-                    overall_team_stats['touchdowns'] += 1
-                if player.get('interception', False):
-                    phase_team_stats['interceptions'] = phase_team_stats.get('interceptions', 0) + 1
-                    phase_team_stats['turnovers'] = phase_team_stats.get('turnovers', 0) + 1  # Interceptions count as turnovers
-                    overall_team_stats['interceptions'] = overall_team_stats.get('interceptions', 0) + 1
-                    overall_team_stats['turnovers'] = overall_team_stats.get('turnovers', 0) + 1
-                if player.get('fumble', False):
-                    phase_team_stats['turnovers'] = phase_team_stats.get('turnovers', 0) + 1  # Fumbles count as turnovers
-                    overall_team_stats['turnovers'] = overall_team_stats.get('turnovers', 0) + 1
-            
-            # Debug logging for this play's calculations
-            print(f"DEBUG PLAY: Phase={current_phase}, Down {play_data.get('down')}, Distance {play_data.get('distance')}, Yards {yards_gained}")
-            print(f"DEBUG PLAY: Efficient: {is_team_efficient}, Explosive: {team_explosive_this_play}, Negative: {team_negative_this_play}")
-            player_roles = [f"{p.get('role', 'unknown')}-#{p.get('number', 'N/A')}" for p in play_data['players_involved']]
-            print(f"DEBUG PLAY: Players involved: {player_roles}")
+            if calculate_play_negativeness(play_data, yards_gained, player, current_phase):
+                team_negative_this_play = True
             
-            # Debug individual player calculations
-            for player in play_data['players_involved']:
-                role = str(player.get('role', '')).lower()
-                norm_role = 'rusher' if role in ['ball_carrier', 'rusher'] else role
-                is_explosive = calculate_play_explosiveness(norm_role, yards_gained, player, current_phase)
-                is_negative = calculate_play_negativeness(play_data, yards_gained, player, current_phase)
-                print(f"DEBUG PLAYER: #{player.get('number', 'N/A')} ({role}) - Explosive: {is_explosive}, Negative: {is_negative}")
-            
-            # Fallbacks when no players are attached or no per-player flags triggered
-            if not team_explosive_this_play:
-                # Infer primary role from play_type for explosive calc (handle synonyms)
-                inferred_role = 'rusher' if ('rush' in play_type or 'run' in play_type) else ('receiver' if 'pass' in play_type else '')
-                if inferred_role and not play_has_turnover:
-                    if calculate_play_explosiveness(inferred_role, yards_gained, None, current_phase):
-                        team_explosive_this_play = True
-            if not team_negative_this_play:
-                if calculate_play_negativeness(play_data, yards_gained, {}, current_phase):
-                    team_negative_this_play = True
+            # Update team-level special stats
+            if player.get('touchdown', False):
+                phase_team_stats['touchdowns'] += 1
+                overall_team_stats['touchdowns'] += 1
+            if player.get('interception', False):
+                phase_team_stats['interceptions'] = phase_team_stats.get('interceptions', 0) + 1
+                phase_team_stats['turnovers'] = phase_team_stats.get('turnovers', 0) + 1  # Interceptions count as turnovers
+                overall_team_stats['interceptions'] = overall_team_stats.get('interceptions', 0) + 1
+                overall_team_stats['turnovers'] = overall_team_stats.get('turnovers', 0) + 1
+            if player.get('fumble', False):
+                phase_team_stats['turnovers'] = phase_team_stats.get('turnovers', 0) + 1  # Fumbles count as turnovers
+                overall_team_stats['turnovers'] = overall_team_stats.get('turnovers', 0) + 1
+        
+        # Debug logging for this play's calculations
+        print(f"DEBUG PLAY: Phase={current_phase}, Down {play_data.get('down')}, Distance {play_data.get('distance')}, Yards {yards_gained}")
+        print(f"DEBUG PLAY: Efficient: {is_team_efficient}, Explosive: {team_explosive_this_play}, Negative: {team_negative_this_play}")
+        player_roles = [f"{p.get('role', 'unknown')}-#{p.get('number', 'N/A')}" for p in play_data['players_involved']]
+        print(f"DEBUG PLAY: Players involved: {player_roles}")
+        
+        # Debug individual player calculations
+        for player in play_data['players_involved']:
+            role = str(player.get('role', '')).lower()
+            norm_role = 'rusher' if role in ['ball_carrier', 'rusher'] else role
+            is_explosive = calculate_play_explosiveness(norm_role, yards_gained, player, current_phase)
+            is_negative = calculate_play_negativeness(play_data, yards_gained, player, current_phase)
+            print(f"DEBUG PLAYER: #{player.get('number', 'N/A')} ({role}) - Explosive: {is_explosive}, Negative: {is_negative}")
+        
+        # Fallbacks when no players are attached or no per-player flags triggered
+        if not team_explosive_this_play:
+            # Infer primary role from play_type for explosive calc (handle synonyms)
+            inferred_role = 'rusher' if ('rush' in play_type or 'run' in play_type) else ('receiver' if 'pass' in play_type else '')
+            if inferred_role and not play_has_turnover:
+                if calculate_play_explosiveness(inferred_role, yards_gained, None, current_phase):
+                    team_explosive_this_play = True
+        if not team_negative_this_play:
+            if calculate_play_negativeness(play_data, yards_gained, {}, current_phase):
+                team_negative_this_play = True
 
-            if team_explosive_this_play:
-                phase_team_stats['explosive_plays'] += 1
-                overall_team_stats['explosive_plays'] += 1
-                
-                # Track explosive plays by type
-                if play_type == 'pass':
-                    phase_team_stats['passing_explosive_plays'] = phase_team_stats.get('passing_explosive_plays', 0) + 1
-                    overall_team_stats['passing_explosive_plays'] = overall_team_stats.get('passing_explosive_plays', 0) + 1
-                elif play_type == 'rush':
-                    phase_team_stats['rushing_explosive_plays'] = phase_team_stats.get('rushing_explosive_plays', 0) + 1
-                    overall_team_stats['rushing_explosive_plays'] = overall_team_stats.get('rushing_explosive_plays', 0) + 1
-                
-            if team_negative_this_play:
-                phase_team_stats['negative_plays'] += 1
-                overall_team_stats['negative_plays'] += 1
-                
-                # Track negative plays by type
-                if play_type == 'pass':
-                    phase_team_stats['passing_negative_plays'] = phase_team_stats.get('passing_negative_plays', 0) + 1
-                    overall_team_stats['passing_negative_plays'] = overall_team_stats.get('passing_negative_plays', 0) + 1
-                elif play_type == 'rush':
-                    phase_team_stats['rushing_negative_plays'] = phase_team_stats.get('rushing_negative_plays', 0) + 1
-                    overall_team_stats['rushing_negative_plays'] = overall_team_stats.get('rushing_negative_plays', 0) + 1
-        else:
-            # For penalties, get the current phase for consistency
-            current_phase = data.get('phase', 'offense').lower()
-            if current_phase not in ['offense', 'defense', 'special_teams']:
-                current_phase = 'offense'
-            phase_team_stats = box_stats['team_stats'][current_phase]
-            overall_team_stats = box_stats['team_stats']['overall']
-        
-        # Update team rates for both phase-specific and overall stats
-        def update_team_rates(stats, phase='offense'):
-            """Helper function to update rates for team stats"""
-            stats['efficiency_rate'] = round((stats['efficient_plays'] / stats['total_plays']) * 100, 1) if stats['total_plays'] > 0 else 0.0
-            stats['explosive_rate'] = round((stats['explosive_plays'] / stats['total_plays']) * 100, 1) if stats['total_plays'] > 0 else 0.0
-            stats['negative_rate'] = round((stats['negative_plays'] / stats['total_plays']) * 100, 1) if stats['total_plays'] > 0 else 0.0
-            stats['avg_yards_per_play'] = round(stats['total_yards'] / stats['total_plays'], 1) if stats['total_plays'] > 0 else 0.0
-            # Calculate NEE (Net Explosive Efficiency) with phase-specific logic
-            stats['nee_score'] = calculate_nee_score(stats['efficiency_rate'], stats['explosive_rate'], stats['negative_rate'], phase)
-            
-            # Calculate pass vs rush advanced analytics
-            # Passing analytics
-            passing_plays = stats.get('passing_plays', 0)
-            if passing_plays > 0:
-                stats['passing_efficiency_rate'] = round((stats.get('passing_efficient_plays', 0) / passing_plays) * 100, 1)
-                stats['passing_explosive_rate'] = round((stats.get('passing_explosive_plays', 0) / passing_plays) * 100, 1)
-                stats['passing_negative_rate'] = round((stats.get('passing_negative_plays', 0) / passing_plays) * 100, 1)
-                stats['passing_avg_yards'] = round(stats.get('passing_yards', 0) / passing_plays, 1)
-                stats['passing_nee_score'] = calculate_nee_score(stats['passing_efficiency_rate'], stats['passing_explosive_rate'], stats['passing_negative_rate'], phase)
-            else:
-                stats['passing_efficiency_rate'] = 0.0
-                stats['passing_explosive_rate'] = 0.0
-                stats['passing_negative_rate'] = 0.0
-                stats['passing_avg_yards'] = 0.0
-                stats['passing_nee_score'] = 0.0
+        if team_explosive_this_play:
+            phase_team_stats['explosive_plays'] += 1
+            overall_team_stats['explosive_plays'] += 1
             
-            # Rushing analytics
-            rushing_plays = stats.get('rushing_plays', 0)
-            if rushing_plays > 0:
-                stats['rushing_efficiency_rate'] = round((stats.get('rushing_efficient_plays', 0) / rushing_plays) * 100, 1)
-                stats['rushing_explosive_rate'] = round((stats.get('rushing_explosive_plays', 0) / rushing_plays) * 100, 1)
-                stats['rushing_negative_rate'] = round((stats.get('rushing_negative_plays', 0) / rushing_plays) * 100, 1)
-                stats['rushing_avg_yards'] = round(stats.get('rushing_yards', 0) / rushing_plays, 1)
-                stats['rushing_nee_score'] = calculate_nee_score(stats['rushing_efficiency_rate'], stats['rushing_explosive_rate'], stats['rushing_negative_rate'], phase)
-            else:
-                stats['rushing_efficiency_rate'] = 0.0
-                stats['rushing_explosive_rate'] = 0.0
-                stats['rushing_negative_rate'] = 0.0
-                stats['rushing_avg_yards'] = 0.0
-                stats['rushing_nee_score'] = 0.0
-        
-        update_team_rates(phase_team_stats, current_phase)
-        update_team_rates(overall_team_stats, 'overall')
-        
-        # Debug logging for team advanced analytics
-        print(f"DEBUG TEAM ANALYTICS ({current_phase}): Total plays: {phase_team_stats['total_plays']}, Efficient plays: {phase_team_stats['efficient_plays']}, Explosive plays: {phase_team_stats['explosive_plays']}, Negative plays: {phase_team_stats['negative_plays']}")
-        print(f"DEBUG TEAM ANALYTICS ({current_phase}): Efficiency rate: {phase_team_stats['efficiency_rate']}%, Explosive rate: {phase_team_stats['explosive_rate']}%, Negative rate: {phase_team_stats['negative_rate']}%, NEE: {phase_team_stats['nee_score']}")
-        print(f"DEBUG TEAM ANALYTICS (OVERALL): Total plays: {overall_team_stats['total_plays']}, Efficient plays: {overall_team_stats['efficient_plays']}, Explosive plays: {overall_team_stats['explosive_plays']}, Negative plays: {overall_team_stats['negative_plays']}")
-        
-        # Record team progression data (play number and various metrics) for both phase-specific and overall
-        current_play_number = len(box_stats['plays']) + 1
-        
-        def update_progression(stats):
-            # NEE progression
-            if 'nee_progression' not in stats:
-                stats['nee_progression'] = []
-            stats['nee_progression'].append({
-                'play': current_play_number,
-                'nee': stats['nee_score']
-            })
+            # Track explosive plays by type
+            if play_type == 'pass':
+                phase_team_stats['passing_explosive_plays'] = phase_team_stats.get('passing_explosive_plays', 0) + 1
+                overall_team_stats['passing_explosive_plays'] = overall_team_stats.get('passing_explosive_plays', 0) + 1
+            elif play_type == 'rush':
+                phase_team_stats['rushing_explosive_plays'] = phase_team_stats.get('rushing_explosive_plays', 0) + 1
+                overall_team_stats['rushing_explosive_plays'] = overall_team_stats.get('rushing_explosive_plays', 0) + 1
             
-            # Efficiency progression
-            if 'efficiency_progression' not in stats:
-                stats['efficiency_progression'] = []
-            stats['efficiency_progression'].append({
-                'play': current_play_number,
-                'efficiency': stats['efficiency_rate']
-            })
+        if team_negative_this_play:
+            phase_team_stats['negative_plays'] += 1
+            overall_team_stats['negative_plays'] += 1
             
-            # Explosive progression
-            if 'explosive_progression' not in stats:
-                stats['explosive_progression'] = []
-            stats['explosive_progression'].append({
-                'play': current_play_number,
-                'explosive_rate': stats['explosive_rate']
-            })
-            
-            # Average yards progression
-            if 'avg_yards_progression' not in stats:
-                stats['avg_yards_progression'] = []
-            stats['avg_yards_progression'].append({
-                'play': current_play_number,
-                'avg_yards': stats['avg_yards_per_play']
-            })
-        
-        update_progression(phase_team_stats)
-        update_progression(overall_team_stats)
-        
-        # Debug: Check progression data was added
-        print(f"DEBUG PROGRESSION: Phase {current_phase} NEE progression length: {len(phase_team_stats.get('nee_progression', []))}")
-        print(f"DEBUG PROGRESSION: Overall NEE progression length: {len(overall_team_stats.get('nee_progression', []))}")
-        print(f"DEBUG PROGRESSION: Overall explosive progression length: {len(overall_team_stats.get('explosive_progression', []))}")
-        if overall_team_stats.get('nee_progression'):
-            print(f"DEBUG PROGRESSION: Latest overall NEE entry: {overall_team_stats['nee_progression'][-1]}")
-        if overall_team_stats.get('explosive_progression'):
-            print(f"DEBUG PROGRESSION: Latest overall explosive entry: {overall_team_stats['explosive_progression'][-1]}")
-        
-        # Update play call analytics if play call is provided
-        play_call = play_data.get('play_call')
-        if play_call and play_call.strip():
-            print(f"DEBUG: Processing play call '{play_call}' for {current_phase} analytics")
-            update_play_call_analytics(box_stats, play_call, play_data, yards_gained, is_team_efficient, team_explosive_this_play, team_negative_this_play, current_phase)
+            # Track negative plays by type
+            if play_type == 'pass':
+                phase_team_stats['passing_negative_plays'] = phase_team_stats.get('passing_negative_plays', 0) + 1
+                overall_team_stats['passing_negative_plays'] = overall_team_stats.get('passing_negative_plays', 0) + 1
+            elif play_type == 'rush':
+                phase_team_stats['rushing_negative_plays'] = phase_team_stats.get('rushing_negative_plays', 0) + 1
+                overall_team_stats['rushing_negative_plays'] = overall_team_stats.get('rushing_negative_plays', 0) + 1
+    
+    # Update team rates for both phase-specific and overall stats
+    def update_team_rates(stats, phase='offense'):
+        """Helper function to update rates for team stats"""
+        stats['efficiency_rate'] = round((stats['efficient_plays'] / stats['total_plays']) * 100, 1) if stats['total_plays'] > 0 else 0.0
+        stats['explosive_rate'] = round((stats['explosive_plays'] / stats['total_plays']) * 100, 1) if stats['total_plays'] > 0 else 0.0
+        stats['negative_rate'] = round((stats['negative_plays'] / stats['total_plays']) * 100, 1) if stats['total_plays'] > 0 else 0.0
+        stats['avg_yards_per_play'] = round(stats['total_yards'] / stats['total_plays'], 1) if stats['total_plays'] > 0 else 0.0
+        # Calculate NEE (Net Explosive Efficiency) with phase-specific logic
+        stats['nee_score'] = calculate_nee_score(stats['efficiency_rate'], stats['explosive_rate'], stats['negative_rate'], phase)
+        
+        # Calculate pass vs rush advanced analytics
+        # Passing analytics
+        passing_plays = stats.get('passing_plays', 0)
+        if passing_plays > 0:
+            stats['passing_efficiency_rate'] = round((stats.get('passing_efficient_plays', 0) / passing_plays) * 100, 1)
+            stats['passing_explosive_rate'] = round((stats.get('passing_explosive_plays', 0) / passing_plays) * 100, 1)
+            stats['passing_negative_rate'] = round((stats.get('passing_negative_plays', 0) / passing_plays) * 100, 1)
+            stats['passing_avg_yards'] = round(stats.get('passing_yards', 0) / passing_plays, 1)
+            stats['passing_nee_score'] = calculate_nee_score(stats['passing_efficiency_rate'], stats['passing_explosive_rate'], stats['passing_negative_rate'], phase)
         else:
-            print(f"DEBUG: No play call provided or empty play call: '{play_call}'")
-        
-        # Success rate: percentage of plays that are either efficient OR explosive
-        # We need to track this properly by checking each play individually
-        # For now, use a simplified calculation: (efficient + explosive) / total, capped at 100%
-        success_percentage = min(100.0, phase_team_stats['efficiency_rate'] + phase_team_stats['explosive_rate'])
-        phase_team_stats['success_rate'] = round(success_percentage, 1)
+            stats['passing_efficiency_rate'] = 0.0
+            stats['passing_explosive_rate'] = 0.0
+            stats['passing_negative_rate'] = 0.0
+            stats['passing_avg_yards'] = 0.0
+            stats['passing_nee_score'] = 0.0
+        
+        # Rushing analytics
+        rushing_plays = stats.get('rushing_plays', 0)
+        if rushing_plays > 0:
+            stats['rushing_efficiency_rate'] = round((stats.get('rushing_efficient_plays', 0) / rushing_plays) * 100, 1)
+            stats['rushing_explosive_rate'] = round((stats.get('rushing_explosive_plays', 0) / rushing_plays) * 100, 1)
+            stats['rushing_negative_rate'] = round((stats.get('rushing_negative_plays', 0) / rushing_plays) * 100, 1)
+            stats['rushing_avg_yards'] = round(stats.get('rushing_yards', 0) / rushing_plays, 1)
+            stats['rushing_nee_score'] = calculate_nee_score(stats['rushing_efficiency_rate'], stats['rushing_explosive_rate'], stats['rushing_negative_rate'], phase)
+        else:
+            stats['rushing_efficiency_rate'] = 0.0
+            stats['rushing_explosive_rate'] = 0.0
+            stats['rushing_negative_rate'] = 0.0
+            stats['rushing_avg_yards'] = 0.0
+            stats['rushing_nee_score'] = 0.0
+    
+    update_team_rates(phase_team_stats, current_phase)
+    update_team_rates(overall_team_stats, 'overall')
+    
+    # Debug logging for team advanced analytics
+    print(f"DEBUG TEAM ANALYTICS ({current_phase}): Total plays: {phase_team_stats['total_plays']}, Efficient plays: {phase_team_stats['efficient_plays']}, Explosive plays: {phase_team_stats['explosive_plays']}, Negative plays: {phase_team_stats['negative_plays']}")
+    print(f"DEBUG TEAM ANALYTICS ({current_phase}): Efficiency rate: {phase_team_stats['efficiency_rate']}%, Explosive rate: {phase_team_stats['explosive_rate']}%, Negative rate: {phase_team_stats['negative_rate']}%, NEE: {phase_team_stats['nee_score']}")
+    print(f"DEBUG TEAM ANALYTICS (OVERALL): Total plays: {overall_team_stats['total_plays']}, Efficient plays: {overall_team_stats['efficient_plays']}, Explosive plays: {overall_team_stats['explosive_plays']}, Negative plays: {overall_team_stats['negative_plays']}")
+    
+    # Record team progression data (play number and various metrics) for both phase-specific and overall
+    current_play_number = len(box_stats['plays']) + 1
+    
+    record_progression(phase_team_stats, current_play_number, phase_team_stats.get('total_yards', 0), current_phase)
+    record_progression(overall_team_stats, current_play_number, overall_team_stats.get('total_yards', 0), 'overall')
+    
+    # Debug: Check progression data was added
+    print(f"DEBUG PROGRESSION: Phase {current_phase} progression points: {len(phase_team_stats['progression_counters']['play'])}")
+    print(f"DEBUG PROGRESSION: Overall progression points: {len(overall_team_stats['progression_counters']['play'])}")
+    
+    # Update play call analytics if play call is provided
+    play_call = play_data.get('play_call')
+    if play_call and play_call.strip() and play_type != 'penalty':
+        print(f"DEBUG: Processing play call '{play_call}' for {current_phase} analytics")
+        update_play_call_analytics(box_stats, play_call, play_data, yards_gained, is_team_efficient, team_explosive_this_play, team_negative_this_play, current_phase)
+    else:
+        print(f"DEBUG: No play call provided or empty play call: '{play_call}'")
+    
+    # Success rate: percentage of plays that are either efficient OR explosive
+    # We need to track this properly by checking each play individually
+    # For now, use a simplified calculation: (efficient + explosive) / total, capped at 100%
+    success_percentage = min(100.0, phase_team_stats['efficiency_rate'] + phase_team_stats['explosive_rate'])
+    phase_team_stats['success_rate'] = round(success_percentage, 1)
+    
+    # Also update overall team stats success rate
+    overall_success_percentage = min(100.0, overall_team_stats['efficiency_rate'] + overall_team_stats['explosive_rate'])
+    overall_team_stats['success_rate'] = round(overall_success_percentage, 1)
+    
+    # Update player stats (skip penalties - they don't affect individual player stats)
+    if play_data['play_type'] != 'penalty':
+        # Smart passing automation: detect if this is a passing play
+        play_type = play_data['play_type']
+        is_passing_play = play_type == 'pass'
+        yards_gained = play_data['yards_gained']
+        
+        # For passing plays, determine if it's a completion or incompletion
+        is_completion = False
+        if is_passing_play:
+            # Check if any player has completion marked, or if there are positive yards with a receiver
+            for player in play_data['players_involved']:
+                if player.get('completion', False):
+                    is_completion = True
+                    break
+                # If there's a receiver with positive yards, it's likely a completion
+                if player.get('role') == 'receiver' and yards_gained > 0:
+                    is_completion = True
+                    break
+            
+            # If zero yards and no completion checkbox, it's an incompletion
+            if yards_gained == 0 and not is_completion:
+                is_completion = False
         
-        # Also update overall team stats success rate
-        overall_success_percentage = min(100.0, overall_team_stats['efficiency_rate'] + overall_team_stats['explosive_rate'])
-        overall_team_stats['success_rate'] = round(overall_success_percentage, 1)
+        # Find QB for passing plays (look for passer role or QB position)
+        qb_player = None
+        if is_passing_play:
+            for player in play_data['players_involved']:
+                if player.get('role') == 'passer':
+                    qb_player = player
+                    break
+                elif player.get('position', '').upper() == 'QB':
+                    qb_player = player
+                    break
         
-        # Mark session as modified and persist updated stats to server-side storage
-        session.modified = True
-        box_stats_data['box_stats'] = box_stats
-        server_session.save_session_data(session_id, box_stats_data)
+        print(f"DEBUG: Players involved in play: {play_data['players_involved']}")
+        print(f"DEBUG: Number of players involved: {len(play_data['players_involved'])}")
         
-        # Update player stats (skip penalties - they don't affect individual player stats)
-        if data.get('play_type') != 'penalty':
-            # Smart passing automation: detect if this is a passing play
-            play_type = data.get('play_type', '').lower()
-            is_passing_play = play_type == 'pass'
-            yards_gained = int(play_data.get('yards_gained', 0))
-            
-            # For passing plays, determine if it's a completion or incompletion
-            is_completion = False
-            if is_passing_play:
-                # Check if any player has completion marked, or if there are positive yards with a receiver
-                for player in play_data['players_involved']:
-                    if player.get('completion', False):
-                        is_completion = True
-                        break
-                    # If there's a receiver with positive yards, it's likely a completion
-                    if player.get('role') == 'receiver' and yards_gained > 0:
-                        is_completion = True
-                        break
-                
-                # If zero yards and no completion checkbox, it's an incompletion
-                if yards_gained == 0 and not is_completion:
-                    is_completion = False
-            
-            # Find QB for passing plays (look for passer role or QB position)
-            qb_player = None
-            if is_passing_play:
-                for player in play_data['players_involved']:
-                    if player.get('role') == 'passer':
-                        qb_player = player
-                        break
-                    elif player.get('position', '').upper() == 'QB':
-                        qb_player = player
-                        break
-            
-            print(f"DEBUG: Players involved in play: {play_data['players_involved']}")
-            print(f"DEBUG: Number of players involved: {len(play_data['players_involved'])}")
-            
-            for player in play_data['players_involved']:
-                player_num = player.get('number')
-                print(f"DEBUG: Processing player - raw data: {player}")
-                # Fallback: if number missing, use name as key to avoid dropping stats
-                player_key = None
-                if player_num is not None and player_num != "":
-                    player_key = str(player_num)
-                else:
-                    pname = str(player.get('name', '')).strip()
-                    if pname:
-                        player_key = f"name:{pname}"
-                if player_key:
-                    print(f"DEBUG: Player key: {player_key}, Player number: {player_num}")
-                    if player_key not in box_stats['players']:
-                        box_stats['players'][player_key] = {
-                            'number': int(player_num) if str(player_num).isdigit() else None,
-                            'name': str(player.get('name', f'Player #{player_num if player_num else "?"}')),
-                            'position': str(player.get('position', '')),
-                            # Offensive stats
-                            'rushing_attempts': 0,
-                            'rushing_yards': 0,
-                            'receptions': 0,
-                            'receiving_yards': 0,
-                            'passing_attempts': 0,
-                            'passing_completions': 0,
-                            'passing_yards': 0,
-                            'touchdowns': 0,
-                            'fumbles': 0,
-                            'interceptions': 0,
-                            # Defensive stats
-                            'tackles_solo': 0,
-                            'defensive_td': 0,
-                            'return_yards': 0,
-                            'tackles_total': 0,
-                            'sacks': 0,
-                            'qb_hits': 0,
-                            'interceptions_def': 0,
-                            'pass_breakups': 0,
-                            'fumble_recoveries': 0,
-                            'forced_fumbles': 0,
-                            'defensive_tds': 0,
-                            'tackles_for_loss': 0,
-                            # Special teams stats
-                            'field_goals_made': 0,
-                            'field_goals_attempted': 0,
-                            'extra_points_made': 0,
-                            'extra_points_attempted': 0,
-                            'punts': 0,
-                            'punt_yards': 0,
-                            'kickoff_returns': 0,
-                            'kickoff_return_yards': 0,
-                            'punt_returns': 0,
-                            'punt_return_yards': 0,
-                            'blocked_kicks': 0,
-                            'coverage_tackles': 0,
-                            # Advanced analytics
-                            'total_plays': 0,
-                            'efficient_plays': 0,
-                            'explosive_plays': 0,
-                            'negative_plays': 0,
-                            'efficiency_rate': 0.0,
-                            'explosive_rate': 0.0,
-                            'negative_rate': 0.0,
-                            'nee_score': 0.0,
-                            # Progression tracking
-                            'nee_progression': [],
-                            'efficiency_progression': [],
-                            'avg_yards_progression': []
-                        }
-                    
-                    # Update stats based on player's role in the play
-                    player_stats = box_stats['players'][player_key]
-                    
-                    # Ensure all advanced analytics fields exist in existing player stats (backward compatibility)
-                    required_player_fields = {
-                        'negative_plays': 0,
-                        'efficiency_rate': 0.0,
-                        'explosive_rate': 0.0,
-                        'negative_rate': 0.0,
-                        'nee_score': 0.0,
-                        'nee_progression': [],
-                        'efficiency_progression': [],
-                        'avg_yards_progression': []
-                    }
-                    
-                    for field, default_value in required_player_fields.items():
-                        if field not in player_stats:
-                            player_stats[field] = default_value
-                    
-                    # Normalize role from UI to canonical values
-                    raw_role = str(player.get('role', '')).strip().lower()
-                    role_map = {
-                        # offense
-                        'ball_carrier': 'rusher', 'runner': 'rusher', 'rush': 'rusher',
-                        'wr': 'receiver', 'rec': 'receiver', 'catch': 'receiver',
-                        'qb': 'passer', 'quarterback': 'passer', 'thrower': 'passer',
-                        # defense
-                        'tackle': 'tackler', 'tk': 'tackler', 'tacklesolo': 'tackler',
-                        'assist_tackle': 'assist', 'assist': 'assist',
-                        'sack': 'sacker', 'sacker': 'sacker',
-                        'int': 'interceptor', 'interception': 'interceptor', 'interceptor': 'interceptor',
-                        'pbu': 'pass_breakup'
-                    }
-                    role = role_map.get(raw_role, raw_role)
-                    # If defensive phase and role missing, infer from play_type
-                    if (not role) and current_phase == 'defense':
-                        base_pt = play_data.get('play_type', '')
-                        if base_pt == 'pass':
-                            role = 'receiver'
-                        elif base_pt == 'rush':
-                            role = 'rusher'
-                    # Passing play inference for offense/special teams
-                    if (not role) and is_passing_play:
-                        pos = str(player.get('position', '')).strip().upper()
-                        if pos == 'QB':
-                            role = 'passer'
-                        elif yards_gained > 0:
-                            role = 'receiver'
-
-                    # Update basic stats based on normalized role
-                    if role == 'rusher':
-                        player_stats['rushing_attempts'] += 1
-                        player_stats['rushing_yards'] += yards_gained
-                    elif role == 'receiver':
-                        player_stats['receptions'] += 1
-                        player_stats['receiving_yards'] += yards_gained
-                    elif role == 'passer':
-                        player_stats['passing_attempts'] += 1
-                        if player.get('completion', False) or is_completion:
-                            player_stats['passing_completions'] += 1
-                            player_stats['passing_yards'] += yards_gained
-                    
-                    # Defensive stats
-                    elif role == 'tackler':
-                        player_stats['tackles_solo'] += 1
-                        player_stats['tackles_total'] += 1
-                        if yards_gained < 0:
-                            player_stats['tackles_for_loss'] += 1
-                    elif role == 'assist':
-                        player_stats['tackles_assisted'] += 1
-                        player_stats['tackles_total'] += 1
-                    elif role == 'sacker':
-                        player_stats['sacks'] += 1
-                        player_stats['tackles_solo'] += 1
-                        player_stats['tackles_total'] += 1
-                        player_stats['tackles_for_loss'] += 1
-                    elif role == 'interceptor':
-                        player_stats['interceptions_def'] += 1
-                        player_stats['return_yards'] += max(0, player.get('return_yards', yards_gained if yards_gained > 0 else 0))
-                        if player.get('touchdown', False):
-                            player_stats['defensive_tds'] += 1
-                    elif role == 'fumble_forcer':
-                        player_stats['forced_fumbles'] += 1
-                    elif role == 'fumble_recoverer':
-                        player_stats['fumble_recoveries'] += 1
-                        if player.get('touchdown', False):
-                            player_stats['defensive_tds'] += 1
-                    elif role == 'pass_breakup':
-                        player_stats['pass_breakups'] += 1
-                    
-                    # Special teams stats
-                    elif role == 'kicker':
-                        play_type = play_data.get('play_type', '')
-                        result = play_data.get('result', '')
-                        if play_type == 'field_goal':
-                            player_stats['field_goals_attempted'] += 1
-                            if result == 'good':
-                                player_stats['field_goals_made'] += 1
-                        elif play_type == 'extra_point':
-                            player_stats['extra_points_attempted'] += 1
-                            if result == 'good':
-                                player_stats['extra_points_made'] += 1
-                    elif role == 'punter':
-                        player_stats['punts'] += 1
-                        player_stats['punt_yards'] += abs(yards_gained)
-                    elif role == 'returner':
-                        play_type = play_data.get('play_type', '')
-                        if play_type == 'kickoff_return':
-                            player_stats['kickoff_returns'] += 1
-                            player_stats['kickoff_return_yards'] += yards_gained
-                        elif play_type == 'punt_return':
-                            player_stats['punt_returns'] += 1
-                            player_stats['punt_return_yards'] += yards_gained
-                    elif role == 'coverage' or role == 'coverage_tackler':
-                        player_stats['coverage_tackles'] += 1
-                        player_stats['tackles_total'] += 1
-                    
-                    # Smart RB reception automation: If this is a passing play and player is RB, auto-credit reception
-                    if is_passing_play and is_completion:
-                        player_position = player.get('position', '').upper()
-                        if player_position == 'RB' and role != 'receiver':  # RB involved but not marked as receiver
-                            player_stats['receptions'] += 1
-                            player_stats['receiving_yards'] += yards_gained
-                            print(f"DEBUG: Auto-credited RB #{player.get('number')} with reception on pass play")
-                    
-                    # Update special stats - Offensive
-                    if player.get('touchdown', False):
-                        player_stats['touchdowns'] += 1
-                    if player.get('fumble', False):
-                        player_stats['fumbles'] += 1
-                    if player.get('interception', False):
-                        player_stats['interceptions'] += 1
-                    
-                    # Update special stats - Defensive (from checkboxes)
-                    if player.get('tackle', False):
-                        player_stats['tackles_solo'] += 1
-                        player_stats['tackles_total'] += 1
-                    if player.get('sack', False):
-                        player_stats['sacks'] += 1
-                        player_stats['tackles_solo'] += 1
-                        player_stats['tackles_total'] += 1
-                        player_stats['tackles_for_loss'] += 1
-                    if player.get('interception_def', False):
-                        player_stats['interceptions_def'] += 1
-                        player_stats['return_yards'] += player.get('return_yards', 0)
-                    if player.get('fumble_recovery', False):
-                        player_stats['fumble_recoveries'] += 1
-                        player_stats['return_yards'] += player.get('return_yards', 0)
-                    if player.get('pass_breakup', False):
-                        player_stats['pass_breakups'] += 1
-                    if player.get('forced_fumble', False):
-                        player_stats['forced_fumbles'] += 1
-                    if player.get('tackle_for_loss', False):
-                        player_stats['tackles_for_loss'] += 1
-                        player_stats['tackles_solo'] += 1
-                        player_stats['tackles_total'] += 1
-                    if player.get('defensive_td', False):
-                        player_stats['defensive_tds'] += 1
-                        player_stats['touchdowns'] += 1  # Also count in general TDs
-                    
-                    # Update special stats - Special Teams (from checkboxes)
-                    if player.get('field_goal_made', False):
-                        player_stats['field_goals_attempted'] += 1
-                        player_stats['field_goals_made'] += 1
-                    if player.get('extra_point_made', False):
-                        player_stats['extra_points_attempted'] += 1
-                        player_stats['extra_points_made'] += 1
-                    if player.get('punt_return', False):
-                        player_stats['punt_returns'] += 1
-                        player_stats['punt_return_yards'] += yards_gained
-                    if player.get('kickoff_return', False):
-                        player_stats['kickoff_returns'] += 1
-                        player_stats['kickoff_return_yards'] += yards_gained
-                    if player.get('coverage_tackle', False):
-                        player_stats['coverage_tackles'] += 1
-                        player_stats['tackles_total'] += 1
-                    if player.get('blocked_kick', False):
-                        player_stats['blocked_kicks'] += 1
-                    if player.get('special_teams_td', False):
-                        player_stats['touchdowns'] += 1  # Count in general TDs
-                    
-                    # Update advanced analytics for all players
-                    player_stats['total_plays'] += 1
-                    
-                    # Calculate if play was efficient
-                    # For individual player calculation, pass the player data to check only their turnover
-                    is_efficient = calculate_play_efficiency(play_data, yards_gained, player, current_phase)
-                    if is_efficient:
-                        player_stats['efficient_plays'] += 1
-                    
-                    # Calculate if play was explosive
-                    is_explosive = calculate_play_explosiveness(role, yards_gained, player, current_phase)
-                    if is_explosive:
-                        player_stats['explosive_plays'] += 1
-                    
-                    # Calculate if play was negative
-                    is_negative = calculate_play_negativeness(play_data, yards_gained, player, current_phase)
-                    if is_negative:
-                        player_stats['negative_plays'] += 1
-                    
-                    # Update rates
-                    player_stats['efficiency_rate'] = round((player_stats['efficient_plays'] / player_stats['total_plays']) * 100, 1) if player_stats['total_plays'] > 0 else 0.0
-                    player_stats['explosive_rate'] = round((player_stats['explosive_plays'] / player_stats['total_plays']) * 100, 1) if player_stats['total_plays'] > 0 else 0.0
-                    player_stats['negative_rate'] = round((player_stats['negative_plays'] / player_stats['total_plays']) * 100, 1) if player_stats['total_plays'] > 0 else 0.0
-                    
-                    # Calculate NEE (Net Explosive Efficiency) with phase-specific logic
-                    player_stats['nee_score'] = calculate_nee_score(player_stats['efficiency_rate'], player_stats['explosive_rate'], player_stats['negative_rate'], current_phase)
-                    
-                    # Record progression data (play number and various metrics)
-                    current_play_number = len(box_stats['plays']) + 1
-                    
-                    # NEE progression
-                    if 'nee_progression' not in player_stats:
-                        player_stats['nee_progression'] = []
-                    player_stats['nee_progression'].append({
-                        'play': current_play_number,
-                        'nee': player_stats['nee_score']
-                    })
-                    
-                    # Efficiency progression
-                    if 'efficiency_progression' not in player_stats:
-                        player_stats['efficiency_progression'] = []
-                    player_stats['efficiency_progression'].append({
-                        'play': current_play_number,
-                        'efficiency': player_stats['efficiency_rate']
-                    })
-                    
-                    # Average yards progression (calculate avg yards per play for this player)
-                    player_avg_yards = 0.0
-                    if player_stats['total_plays'] > 0:
-                        total_yards = (player_stats.get('rushing_yards', 0) + 
-                                     player_stats.get('receiving_yards', 0) + 
-                                     player_stats.get('passing_yards', 0))
-                        player_avg_yards = round(total_yards / player_stats['total_plays'], 1)
-                    
-                    # Explosive progression
-                    if 'explosive_progression' not in player_stats:
-                        player_stats['explosive_progression'] = []
-                    player_stats['explosive_progression'].append({
-                        'play': current_play_number,
-                        'explosive_rate': player_stats['explosive_rate']
-                    })
-                    
-                    print(f"DEBUG: Updated advanced analytics for player #{player_key} - Total plays: {player_stats['total_plays']}, Efficiency: {player_stats['efficiency_rate']}%, Explosive: {player_stats['explosive_rate']}%, NEE: {player_stats['nee_score']}")
-            
-            # Smart QB automation: If this is a passing play and we found a QB, update their passing stats
-            if is_passing_play and qb_player and qb_player.get('number'):
-                qb_key = str(qb_player.get('number'))
-                
-                # Ensure QB exists in stats
-                if qb_key not in box_stats['players']:
-                    box_stats['players'][qb_key] = {
-                        'number': int(qb_player.get('number')),
-                        'name': str(qb_player.get('name', f'Player #{qb_player.get("number")}')),
-                        'position': str(qb_player.get('position', 'QB')),
+        for player in play_data['players_involved']:
+            player_num = player.get('number')
+            print(f"DEBUG: Processing player - raw data: {player}")
+            # Fallback: if number missing, use name as key to avoid dropping stats
+            player_key = None
+            if player_num is not None and player_num != "":
+                player_key = str(player_num)
+            else:
+                pname = str(player.get('name', '')).strip()
+                if pname:
+                    player_key = f"name:{pname}"
+            if player_key:
+                print(f"DEBUG: Player key: {player_key}, Player number: {player_num}")
+                if player_key not in box_stats['players']:
+                    box_stats['players'][player_key] = {
+                        'number': int(player_num) if str(player_num).isdigit() else None,
+                        'name': str(player.get('name', f'Player #{player_num if player_num else "?"}')),
+                        'position': str(player.get('position', '')),
+                        # Offensive stats
                         'rushing_attempts': 0,
                         'rushing_yards': 0,
                         'receptions': 0,
@@ -3014,6 +2790,33 @@ def add_box_stats_play():
                         'touchdowns': 0,
                         'fumbles': 0,
                         'interceptions': 0,
+                        # Defensive stats
+                        'tackles_solo': 0,
+                        'defensive_td': 0,
+                        'return_yards': 0,
+                        'tackles_total': 0,
+                        'sacks': 0,
+                        'qb_hits': 0,
+                        'interceptions_def': 0,
+                        'pass_breakups': 0,
+                        'fumble_recoveries': 0,
+                        'forced_fumbles': 0,
+                        'defensive_tds': 0,
+                        'tackles_for_loss': 0,
+                        # Special teams stats
+                        'field_goals_made': 0,
+                        'field_goals_attempted': 0,
+                        'extra_points_made': 0,
+                        'extra_points_attempted': 0,
+                        'punts': 0,
+                        'punt_yards': 0,
+                        'kickoff_returns': 0,
+                        'kickoff_return_yards': 0,
+                        'punt_returns': 0,
+                        'punt_return_yards': 0,
+                        'blocked_kicks': 0,
+                        'coverage_tackles': 0,
+                        # Advanced analytics
                         'total_plays': 0,
                         'efficient_plays': 0,
                         'explosive_plays': 0,
@@ -3024,47 +2827,342 @@ def add_box_stats_play():
                         'nee_score': 0.0
                     }
                 
-                qb_stats = box_stats['players'][qb_key]
+                # Update stats based on player's role in the play
+                player_stats = box_stats['players'][player_key]
                 
-                # Only update QB stats if they weren't already updated as a 'passer'
-                qb_already_processed = False
-                for p in play_data['players_involved']:
-                    if str(p.get('number')) == qb_key and p.get('role') == 'passer':
-                        qb_already_processed = True
-                        break
+                # Roles are canonical (play_schema.ROLE_SYNONYMS)
+                role = player['role']
+                # If defensive phase and role missing, infer from play_type
+                if (not role) and current_phase == 'defense':
+                    base_pt = play_data.get('play_type', '')
+                    if base_pt == 'pass':
+                        role = 'receiver'
+                    elif base_pt == 'rush':
+                        role = 'rusher'
+                # Passing play inference for offense/special teams
+                if (not role) and is_passing_play:
+                    pos = str(player.get('position', '')).strip().upper()
+                    if pos == 'QB':
+                        role = 'passer'
+                    elif yards_gained > 0:
+                        role = 'receiver'
+
+                # Update basic stats based on normalized role
+                if role == 'rusher':
+                    player_stats['rushing_attempts'] += 1
+                    player_stats['rushing_yards'] += yards_gained
+                elif role == 'receiver':
+                    player_stats['receptions'] += 1
+                    player_stats['receiving_yards'] += yards_gained
+                elif role == 'passer':
+                    player_stats['passing_attempts'] += 1
+                    if player.get('completion', False) or is_completion:
+                        player_stats['passing_completions'] += 1
+                        player_stats['passing_yards'] += yards_gained
                 
-                if not qb_already_processed:
-                    qb_stats['passing_attempts'] += 1
-                    if is_completion:
-                        qb_stats['passing_completions'] += 1
-                        qb_stats['passing_yards'] += yards_gained
-                    
-                    print(f"DEBUG: Auto-updated QB #{qb_key} passing stats - Attempt: +1, Completion: {'+1' if is_completion else '0'}, Yards: {'+' + str(yards_gained) if is_completion else '0'}")
-                    
-                    # Note: Advanced analytics for QB will be handled in the main player loop if QB is in players_involved
-        
-        # Final safeguard disabled temporarily to preserve per-player stats after add
-        # recalculate_all_stats(box_stats)
+                # Defensive stats
+                elif role == 'tackler':
+                    player_stats['tackles_solo'] += 1
+                    player_stats['tackles_total'] += 1
+                    if yards_gained < 0:
+                        player_stats['tackles_for_loss'] += 1
+                elif role == 'assist':
+                    player_stats['tackles_assisted'] += 1
+                    player_stats['tackles_total'] += 1
+                elif role == 'sacker':
+                    player_stats['sacks'] += 1
+                    player_stats['tackles_solo'] += 1
+                    player_stats['tackles_total'] += 1
+                    player_stats['tackles_for_loss'] += 1
+                elif role == 'interceptor':
+                    player_stats['interceptions_def'] += 1
+                    player_stats['return_yards'] += max(0, player.get('return_yards', yards_gained if yards_gained > 0 else 0))
+                    if player.get('touchdown', False):
+                        player_stats['defensive_tds'] += 1
+                elif role == 'fumble_forcer':
+                    player_stats['forced_fumbles'] += 1
+                elif role == 'fumble_recoverer':
+                    player_stats['fumble_recoveries'] += 1
+                    if player.get('touchdown', False):
+                        player_stats['defensive_tds'] += 1
+                elif role == 'pass_breakup':
+                    player_stats['pass_breakups'] += 1
+                
+                # Special teams stats
+                elif role == 'kicker':
+                    play_type = play_data.get('play_type', '')
+                    result = play_data.get('result', '')
+                    if play_type == 'field_goal':
+                        player_stats['field_goals_attempted'] += 1
+                        if result == 'good':
+                            player_stats['field_goals_made'] += 1
+                    elif play_type == 'extra_point':
+                        player_stats['extra_points_attempted'] += 1
+                        if result == 'good':
+                            player_stats['extra_points_made'] += 1
+                elif role == 'punter':
+                    player_stats['punts'] += 1
+                    player_stats['punt_yards'] += abs(yards_gained)
+                elif role == 'returner':
+                    play_type = play_data.get('play_type', '')
+                    if play_type == 'kickoff_return':
+                        player_stats['kickoff_returns'] += 1
+                        player_stats['kickoff_return_yards'] += yards_gained
+                    elif play_type == 'punt_return':
+                        player_stats['punt_returns'] += 1
+                        player_stats['punt_return_yards'] += yards_gained
+                elif role == 'coverage' or role == 'coverage_tackler':
+                    player_stats['coverage_tackles'] += 1
+                    player_stats['tackles_total'] += 1
+                
+                # Smart RB reception automation: If this is a passing play and player is RB, auto-credit reception
+                if is_passing_play and is_completion:
+                    player_position = player.get('position', '').upper()
+                    if player_position == 'RB' and role != 'receiver':  # RB involved but not marked as receiver
+                        player_stats['receptions'] += 1
+                        player_stats['receiving_yards'] += yards_gained
+                        print(f"DEBUG: Auto-credited RB #{player.get('number')} with reception on pass play")
+                
+                # Update special stats - Offensive
+                if player.get('touchdown', False):
+                    player_stats['touchdowns'] += 1
+                if player.get('fumble', False):
+                    player_stats['fumbles'] += 1
+                if player.get('interception', False):
+                    player_stats['interceptions'] += 1
+                
+                # Update special stats - Defensive (from checkboxes)
+                if player.get('tackle', False):
+                    player_stats['tackles_solo'] += 1
+                    player_stats['tackles_total'] += 1
+                if player.get('sack', False):
+                    player_stats['sacks'] += 1
+                    player_stats['tackles_solo'] += 1
+                    player_stats['tackles_total'] += 1
+                    player_stats['tackles_for_loss'] += 1
+                if player.get('interception_def', False):
+                    player_stats['interceptions_def'] += 1
+                    player_stats['return_yards'] += player.get('return_yards', 0)
+                if player.get('fumble_recovery', False):
+                    player_stats['fumble_recoveries'] += 1
+                    player_stats['return_yards'] += player.get('return_yards', 0)
+                if player.get('pass_breakup', False):
+                    player_stats['pass_breakups'] += 1
+                if player.get('forced_fumble', False):
+                    player_stats['forced_fumbles'] += 1
+                if player.get('tackle_for_loss', False):
+                    player_stats['tackles_for_loss'] += 1
+                    player_stats['tackles_solo'] += 1
+                    player_stats['tackles_total'] += 1
+                if player.get('defensive_td', False):
+                    player_stats['defensive_tds'] += 1
+                    player_stats['touchdowns'] += 1  # Also count in general TDs
+                
+                # Update special stats - Special Teams (from checkboxes)
+                if player.get('field_goal_made', False):
+                    player_stats['field_goals_attempted'] += 1
+                    player_stats['field_goals_made'] += 1
+                if player.get('extra_point_made', False):
+                    player_stats['extra_points_attempted'] += 1
+                    player_stats['extra_points_made'] += 1
+                if player.get('punt_return', False):
+                    player_stats['punt_returns'] += 1
+                    player_stats['punt_return_yards'] += yards_gained
+                if player.get('kickoff_return', False):
+                    player_stats['kickoff_returns'] += 1
+                    player_stats['kickoff_return_yards'] += yards_gained
+                if player.get('coverage_tackle', False):
+                    player_stats['coverage_tackles'] += 1
+                    player_stats['tackles_total'] += 1
+                if player.get('blocked_kick', False):
+                    player_stats['blocked_kicks'] += 1
+                if player.get('special_teams_td', False):
+                    player_stats['touchdowns'] += 1  # Count in general TDs
+                
+                # Update advanced analytics for all players
+                player_stats['total_plays'] += 1
+                
+                # Calculate if play was efficient
+                # For individual player calculation, pass the player data to check only their turnover
+                is_efficient = calculate_play_efficiency(play_data, yards_gained, player, current_phase)
+                if is_efficient:
+                    player_stats['efficient_plays'] += 1
+                
+                # Calculate if play was explosive
+                is_explosive = calculate_play_explosiveness(role, yards_gained, player, current_phase)
+                if is_explosive:
+                    player_stats['explosive_plays'] += 1
+                
+                # Calculate if play was negative
+                is_negative = calculate_play_negativeness(play_data, yards_gained, player, current_phase)
+                if is_negative:
+                    player_stats['negative_plays'] += 1
+                
+                # Update rates
+                player_stats['efficiency_rate'] = round((player_stats['efficient_plays'] / player_stats['total_plays']) * 100, 1) if player_stats['total_plays'] > 0 else 0.0
+                player_stats['explosive_rate'] = round((player_stats['explosive_plays'] / player_stats['total_plays']) * 100, 1) if player_stats['total_plays'] > 0 else 0.0
+                player_stats['negative_rate'] = round((player_stats['negative_plays'] / player_stats['total_plays']) * 100, 1) if player_stats['total_plays'] > 0 else 0.0
+                
+                # Calculate NEE (Net Explosive Efficiency) with phase-specific logic
+                player_stats['nee_score'] = calculate_nee_score(player_stats['efficiency_rate'], player_stats['explosive_rate'], player_stats['negative_rate'], current_phase)
+                
+                # Record progression data (cumulative counters; rate series are derived on read)
+                current_play_number = len(box_stats['plays']) + 1
+                player_total_yards = (player_stats.get('rushing_yards', 0) +
+                                      player_stats.get('receiving_yards', 0) +
+                                      player_stats.get('passing_yards', 0))
+                record_progression(player_stats, current_play_number, player_total_yards, current_phase)
+                
+                print(f"DEBUG: Updated advanced analytics for player #{player_key} - Total plays: {player_stats['total_plays']}, Efficiency: {player_stats['efficiency_rate']}%, Explosive: {player_stats['explosive_rate']}%, NEE: {player_stats['nee_score']}")
+        
+        # Smart QB automation: If this is a passing play and we found a QB, update their passing stats
+        if is_passing_play and qb_player and qb_player.get('number'):
+            qb_key = str(qb_player.get('number'))
+            
+            # Ensure QB exists in stats
+            if qb_key not in box_stats['players']:
+                box_stats['players'][qb_key] = {
+                    'number': int(qb_player.get('number')),
+                    'name': str(qb_player.get('name', f'Player #{qb_player.get("number")}')),
+                    'position': str(qb_player.get('position', 'QB')),
+                    'rushing_attempts': 0,
+                    'rushing_yards': 0,
+                    'receptions': 0,
+                    'receiving_yards': 0,
+                    'passing_attempts': 0,
+                    'passing_completions': 0,
+                    'passing_yards': 0,
+                    'touchdowns': 0,
+                    'fumbles': 0,
+                    'interceptions': 0,
+                    'total_plays': 0,
+                    'efficient_plays': 0,
+                    'explosive_plays': 0,
+                    'negative_plays': 0,
+                    'efficiency_rate': 0.0,
+                    'explosive_rate': 0.0,
+                    'negative_rate': 0.0,
+                    'nee_score': 0.0
+                }
+            
+            qb_stats = box_stats['players'][qb_key]
+            
+            # Only update QB stats if they weren't already updated as a 'passer'
+            qb_already_processed = False
+            for p in play_data['players_involved']:
+                if str(p.get('number')) == qb_key and p.get('role') == 'passer':
+                    qb_already_processed = True
+                    break
+            
+            if not qb_already_processed:
+                qb_stats['passing_attempts'] += 1
+                if is_completion:
+                    qb_stats['passing_completions'] += 1
+                    qb_stats['passing_yards'] += yards_gained
+                
+                print(f"DEBUG: Auto-updated QB #{qb_key} passing stats - Attempt: +1, Completion: {'+1' if is_completion else '0'}, Yards: {'+' + str(yards_gained) if is_completion else '0'}")
+                
+                # Note: Advanced analytics for QB will be handled in the main player loop if QB is in players_involved
+    
+    # Final safeguard disabled temporarily to preserve per-player stats after add
+    # recalculate_all_stats(box_stats)
+
+    # Keep the player index and play posting lists current
+    index_new_play(box_stats)
+    index_play_postings(box_stats, PLAY_INDEX_DIMENSIONS)
+    cube_add_play(box_stats, SITUATION_CUBE_DIMENSIONS, play_outcome)
+    drives_add_play(box_stats, play_outcome)
+    journal_delta = play_journal.diff(journal_before, box_stats)
+    play_journal.record(box_stats_data, play_journal.add_play_entry(
+        len(box_stats['plays']) - 1, box_stats['plays'][-1], journal_delta))
+    if touched is not None:
+        touched.setdefault('plays', set()).add(len(box_stats['plays']) - 1)
+        touched.setdefault('players', set()).update(journal_delta['rows'].get('players', {}))
+    
+    return {
+        'play_index': len(box_stats['plays']) - 1,
+        'play_number': play_data.get('play_number'),
+        'play_count': len(box_stats['plays']),
+        'next_situation': box_stats.get('next_situation', {}),
+        # Debug fields surfaced to the client for verification
+        'debug_play_type_mapped': play_type,
+        'debug_team_explosive': bool(team_explosive_this_play),
+        'debug_team_negative': bool(team_negative_this_play)
+    }
 
-        # Save updated data to server-side storage before returning
-        server_session.save_session_data(session_id, box_stats_data)
+
+@app.route('/box_stats/add_play', methods=['POST'])
+@login_required
+def add_box_stats_play():
+    """Add a single play's box stats (a resubmitted client_id gets the stored result back)"""
+    try:
+        data = request.get_json(silent=True)
+        try:
+            play_data = validate_play(data)
+        except PlayValidationError as e:
+            return jsonify({'error': f'Invalid play: {e}', 'errors': e.errors}), 400
         
-        # Debug: Verify progression data was saved
-        test_load = server_session.load_session_data(session_id)
-        test_overall = test_load.get('box_stats', {}).get('team_stats', {}).get('overall', {})
-        print(f"DEBUG POST-SAVE: Overall NEE progression length: {len(test_overall.get('nee_progression', []))}")
-        print(f"DEBUG POST-SAVE: Overall explosive progression length: {len(test_overall.get('explosive_progression', []))}")
+        # Debug logging for incoming request data
+        print(f"DEBUG REQUEST: Full request data: {data}")
+        print(f"DEBUG REQUEST: Players field: {data.get('players')}")
+        print(f"DEBUG REQUEST: Phase field: {data.get('phase')}")
+        print(f"DEBUG REQUEST: Play type: {data.get('play_type')}")
+        
+        # Get or create server-side session ID
+        if 'server_session_id' not in session:
+            session['server_session_id'] = str(uuid.uuid4())
+            session.permanent = True
+        
+        session_id = session['server_session_id']
+        
+        # DEBUG: Log the incoming data to diagnose player selection issue
+        print(f"DEBUG PLAY SUBMISSION: Received data: {data}")
+        print(f"DEBUG PLAY SUBMISSION: Players involved count: {len(play_data['players_involved'])}")
+        print(f"DEBUG PLAY SUBMISSION: Players involved data: {play_data['players_involved']}")
+        
+        client_id = play_data.get('client_id')
+        
+        def apply(box_stats_data):
+            """Record the play on the loaded session; re-run on fresh data if another save wins"""
+            loaded_version = box_stats_data.get('version', 0)
+            
+            # Initialize box stats if not exists (loaded sessions are already in the current schema)
+            if 'box_stats' not in box_stats_data:
+                box_stats_data['box_stats'] = new_box_stats()
+            
+            # Already applied (the response to an earlier try was lost): answer from the receipt
+            receipt = get_receipt(box_stats_data, client_id)
+            if receipt:
+                return False, (loaded_version, receipt, None)
+            
+            # record_play appends to play_data; each attempt starts from the validated copy
+            touched = {'plays': set(), 'players': set()}
+            result = record_play(session_id, box_stats_data, copy.deepcopy(play_data), touched)
+            store_receipt(box_stats_data, client_id, make_receipt(result))
+            return touched, (loaded_version, None, result)
+        
+        # Appends from concurrent requests are merged by retrying on the newer session
+        box_stats_data, (loaded_version, receipt, result) = server_session.update_session_data(session_id, apply)
+        box_stats = box_stats_data['box_stats']
+        
+        if receipt:
+            return jsonify({
+                'success': True,
+                'duplicate': True,
+                'message': 'Play already recorded',
+                **receipt,
+                'play_count': len(box_stats['plays']),
+                'team_stats': box_stats['team_stats']
+            })
+        
+        session.modified = True
+        publish_box_stats_change(session_id, box_stats_data, 'play_added', result['play_index'], loaded_version)
         
         return jsonify({
             'success': True,
-            'play_count': len(box_stats['plays']),
             'message': 'Play added successfully',
-            'next_situation': box_stats.get('next_situation', {}),
+            **result,
             'team_stats': box_stats['team_stats'],
-            # Debug fields surfaced to the client for verification
-            'debug_play_type_mapped': play_type,
-            'debug_team_explosive': bool(team_explosive_this_play),
-            'debug_team_negative': bool(team_negative_this_play),
             'player_count': len(box_stats.get('players', {})),
             'player_keys_sample': list(box_stats.get('players', {}).keys())[:5]
         })
@@ -3072,6 +3170,77 @@ def add_box_stats_play():
     except Exception as e:
         return jsonify({'error': f'Error adding play: {str(e)}'}), 500
 
+@app.route('/box_stats/sync', methods=['POST'])
+@login_required
+def sync_box_stats_plays():
+    """Apply a batch of plays queued offline, in queue order, in one load/save round.
+    
+    Body: {'plays': [{...play, 'client_id', 'client_seq', 'queued_at'}, ...]}. Every play
+    needs a client_id. Each gets a result: added, duplicate (already applied; the
+    stored receipt is returned) or rejected (with field errors; the rest still apply).
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get('plays')
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'plays must be a non-empty list'}), 400
+        if len(items) > SYNC_BATCH_LIMIT:
+            return jsonify({'error': f'At most {SYNC_BATCH_LIMIT} plays per sync'}), 400
+        
+        if 'server_session_id' not in session:
+            session['server_session_id'] = str(uuid.uuid4())
+            session.permanent = True
+        session_id = session['server_session_id']
+        
+        # Validate once up front: (client_id, play, None) or (client_id, None, errors)
+        plays = []
+        for item in order_batch(items):
+            try:
+                play_data = validate_play(item)
+            except PlayValidationError as e:
+                client_id = item.get('client_id') if isinstance(item, dict) else None
+                plays.append((client_id, None, e.errors))
+                continue
+            if not play_data.get('client_id'):
+                plays.append((None, None, [{'field': 'client_id', 'message': 'is required to sync'}]))
+                continue
+            plays.append((play_data['client_id'], play_data, None))
+        
+        def apply(box_stats_data):
+            """Apply the batch to the loaded session; re-run on fresh data if another save wins"""
+            loaded_version = box_stats_data.get('version', 0)
+            if 'box_stats' not in box_stats_data:
+                box_stats_data['box_stats'] = new_box_stats()
+            
+            touched = {'plays': set(), 'players': set()}
+            
+            def record(session_data, play_data):
+                return record_play(session_id, session_data, play_data, touched)
+            
+            # A play that fails is rejected on its own; the rest of the queue still applies
+            results, last_index = apply_batch(box_stats_data, plays, record)
+            return (touched if last_index is not None else False), (loaded_version, results, last_index)
+        
+        box_stats_data, (loaded_version, results, last_index) = server_session.update_session_data(session_id, apply)
+        
+        if last_index is not None:
+            session.modified = True
+            publish_box_stats_change(session_id, box_stats_data, 'plays_synced', last_index, loaded_version)
+        
+        box_stats = box_stats_data['box_stats']
+        return jsonify({
+            'success': True,
+            'results': results,
+            'added': sum(1 for r in results if r['status'] == 'added'),
+            'version': box_stats_data.get('version', 0),
+            'play_count': len(box_stats['plays']),
+            'next_situation': box_stats.get('next_situation', {}),
+            'team_stats': box_stats['team_stats']
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Error syncing plays: {str(e)}'}), 500
+
 def calculate_play_efficiency(play_data, yards_gained, player_data=None, phase='offense'):
     """
     Calculate if a play was efficient based on down and distance
@@ -3217,6 +3386,130 @@ def calculate_play_negativeness(play_data, yards_gained, player, phase='offense'
     except (ValueError, TypeError):
         return False
 
+# Progression is stored as cumulative counters, one entry per recorded point,
+# instead of four {play, value} dicts per point. Rate series are derived on read.
+PROGRESSION_COUNTERS = ('play', 'plays', 'efficient', 'explosive', 'negative', 'yards', 'defense')
+
+# metric -> (legacy series key, value key in each point)
+PROGRESSION_METRICS = {
+    'nee': ('nee_progression', 'nee'),
+    'efficiency': ('efficiency_progression', 'efficiency'),
+    'explosive': ('explosive_progression', 'explosive_rate'),
+    'avg_yards': ('avg_yards_progression', 'avg_yards')
+}
+
+def record_progression(stats, play_number, total_yards, phase='offense'):
+    """Append the current cumulative counters of a team/player stats dict as a progression point"""
+    counters = stats.get('progression_counters')
+    if not isinstance(counters, dict) or any(name not in counters for name in PROGRESSION_COUNTERS):
+        counters = {name: [] for name in PROGRESSION_COUNTERS}
+        stats['progression_counters'] = counters
+    counters['play'].append(play_number)
+    counters['plays'].append(stats.get('total_plays', 0))
+    counters['efficient'].append(stats.get('efficient_plays', 0))
+    counters['explosive'].append(stats.get('explosive_plays', 0))
+    counters['negative'].append(stats.get('negative_plays', 0))
+    counters['yards'].append(total_yards)
+    counters['defense'].append(1 if phase == 'defense' else 0)
+
+def derive_progression(stats, metric, max_points=None, window=None):
+    """Build a [{'play': n, <value key>: v}, ...] series for a metric from the stored counters.
+    
+    window applies a trailing rolling mean; max_points downsamples with LTTB.
+    """
+    series_key, value_key = PROGRESSION_METRICS[metric]
+    
+    # Sessions recorded before counters existed keep their stored points
+    series = list(stats.get(series_key, []))
+    counters = stats.get('progression_counters') or {}
+    
+    for i, play_number in enumerate(counters.get('play', [])):
+        plays = counters['plays'][i]
+        if metric == 'avg_yards':
+            value = round(counters['yards'][i] / plays, 1) if plays > 0 else 0.0
+        else:
+            efficiency_rate = round((counters['efficient'][i] / plays) * 100, 1) if plays > 0 else 0.0
+            explosive_rate = round((counters['explosive'][i] / plays) * 100, 1) if plays > 0 else 0.0
+            if metric == 'efficiency':
+                value = efficiency_rate
+            elif metric == 'explosive':
+                value = explosive_rate
+            else:
+                negative_rate = round((counters['negative'][i] / plays) * 100, 1) if plays > 0 else 0.0
+                phase = 'defense' if counters['defense'][i] else 'offense'
+                value = calculate_nee_score(efficiency_rate, explosive_rate, negative_rate, phase)
+        series.append({'play': play_number, value_key: value})
+    
+    if window and window > 1:
+        series = smooth_series(series, value_key, window)
+    if max_points and len(series) > max_points:
+        series = downsample_lttb(series, value_key, max_points)
+    return series
+
+def smooth_series(series, value_key, window):
+    """Trailing rolling mean over the last `window` points of a progression series"""
+    smoothed = []
+    running_total = 0.0
+    for i, point in enumerate(series):
+        running_total += point.get(value_key, 0) or 0
+        if i >= window:
+            running_total -= series[i - window].get(value_key, 0) or 0
+        count = min(i + 1, window)
+        smoothed.append({'play': point.get('play'), value_key: round(running_total / count, 1)})
+    return smoothed
+
+def downsample_lttb(series, value_key, max_points):
+    """Largest-Triangle-Three-Buckets downsampling of a progression series.
+    
+    Keeps the first and last points and, for each bucket in between, the point
+    forming the largest triangle with the previously kept point and the average
+    of the next bucket, which preserves peaks and dips of the chart.
+    """
+    n = len(series)
+    max_points = max(max_points, 3)
+    if max_points >= n:
+        return series
+    
+    xs = [float(point.get('play') or i) for i, point in enumerate(series)]
+    ys = [float(point.get(value_key) or 0) for point in series]
+    bucket_size = (n - 2) / (max_points - 2)
+    
+    sampled = [series[0]]
+    a = 0
+    for bucket in range(max_points - 2):
+        # Average of the next bucket is the third vertex of the triangle
+        next_start = int((bucket + 1) * bucket_size) + 1
+        next_end = min(int((bucket + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+        
+        start = int(bucket * bucket_size) + 1
+        end = int((bucket + 1) * bucket_size) + 1
+        best_index, best_area = start, -1.0
+        for i in range(start, end):
+            area = abs((xs[a] - avg_x) * (ys[i] - ys[a]) - (xs[a] - xs[i]) * (avg_y - ys[a]))
+            if area > best_area:
+                best_index, best_area = i, area
+        sampled.append(series[best_index])
+        a = best_index
+    
+    sampled.append(series[-1])
+    return sampled
+
+def progression_query_options():
+    """Read optional max_points/window chart parameters from the query string"""
+    options = {}
+    for name in ('max_points', 'window'):
+        try:
+            value = int(request.args.get(name, 0))
+        except (TypeError, ValueError):
+            value = 0
+        if value > 0:
+            options[name] = value
+    return options
+
 def get_saved_games_dir():
     """Get the directory for saved games"""
     saved_games_dir = os.path.join(os.path.dirname(__file__), 'saved_games')
@@ -3254,14 +3547,55 @@ def create_safe_roster_filename(roster_name):
         safe_filename = f"roster_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
     return f"{safe_filename}.json"
 
+def _back_up_for_save(kind, key, value, meta, filepath):
+    """Back up value in the backup store; returns (backup_version, current).
+    
+    current is True when value equals the latest backed-up version and the
+    file already holds that version (and reached Supabase, when connected),
+    so the save has nothing left to do.
+    """
+    try:
+        backup_version, changed = backup_store.save(kind, key, value, meta=meta)
+    except Exception as e:
+        print(f"❌ Backup store failed for {kind} '{key}': {e}")
+        return None, False
+    if changed or not os.path.exists(filepath):
+        return backup_version, False
+    try:
+        with open(filepath, 'r') as f:
+            saved = json.load(f)
+    except Exception:
+        return backup_version, False
+    reached_database = saved.get('database_saved') or not (supabase_manager and supabase_manager.is_connected())
+    return backup_version, saved.get('backup_version') == backup_version and bool(reached_database)
+
 def save_roster_data(username, roster_name, roster_data):
-    """Save roster data to database with file backup"""
+    """Save roster data to database with file backup (a no-op when nothing changed)"""
     try:
         # Security check: prevent saving to anonymous or invalid usernames
         if not username or username == 'anonymous' or len(username.strip()) == 0:
             print(f"WARNING: Blocked roster save for invalid username: '{username}'")
             return False, "Access denied"
         
+        user_dir = get_user_rosters_dir(username)
+        
+        # Additional security: verify the directory belongs to this user
+        expected_hash = hashlib.md5(username.encode()).hexdigest()
+        if expected_hash not in user_dir:
+            print(f"WARNING: Directory hash mismatch during save for user {username}")
+            return False, "Access denied"
+        
+        # Create safe filename using consistent helper function
+        filename = create_safe_roster_filename(roster_name)
+        filepath = os.path.join(user_dir, filename)
+        
+        # Versioned backup; an unchanged roster that is already saved everywhere is not written again
+        backup_version, current = _back_up_for_save('rosters', backup_key(username, roster_name), roster_data,
+                                                    {'username': username, 'roster_name': roster_name}, filepath)
+        if current:
+            print(f"✓ Roster '{roster_name}' unchanged for {username}, nothing to save")
+            return True, filename
+        
         # Primary: Save to Supabase
         database_success = False
         try:
@@ -3285,18 +3619,6 @@ def save_roster_data(username, roster_name, roster_data):
             print(f"❌ Supabase save failed for roster '{roster_name}': {e}")
         
         # Secondary: Save to file (always as backup)
-        user_dir = get_user_rosters_dir(username)
-        
-        # Additional security: verify the directory belongs to this user
-        expected_hash = hashlib.md5(username.encode()).hexdigest()
-        if expected_hash not in user_dir:
-            print(f"WARNING: Directory hash mismatch during save for user {username}")
-            return False, "Access denied"
-        
-        # Create safe filename using consistent helper function
-        filename = create_safe_roster_filename(roster_name)
-        filepath = os.path.join(user_dir, filename)
-        
         # Add metadata to roster data
         roster_data_with_meta = {
             'roster_name': roster_name,
@@ -3304,23 +3626,10 @@ def save_roster_data(username, roster_name, roster_data):
             'created_at': datetime.now().isoformat(),
             'username': username,  # Track which user created this
             'database_saved': database_success,
-            **roster_data
+            **roster_data,
+            'backup_version': backup_version
         }
         
-        # Create backup if file exists
-        if os.path.exists(filepath):
-            backup_dir = os.path.join(user_dir, 'backups')
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir)
-            
-            backup_filename = f"{filename.replace('.json', '')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            backup_path = os.path.join(backup_dir, backup_filename)
-            import shutil
-            shutil.copy2(filepath, backup_path)
-            
-            # Keep only last 5 backups per roster (increased from 3)
-            _cleanup_roster_backups(backup_dir, roster_name, keep_count=5)
-        
         with open(filepath, 'w') as f:
             json.dump(roster_data_with_meta, f, indent=2)
         
@@ -3333,19 +3642,6 @@ def save_roster_data(username, roster_name, roster_data):
         print(f"❌ Error saving roster data: {e}")
         return False, str(e)
 
-def _cleanup_roster_backups(backup_dir, roster_name, keep_count=5):
-    """Keep only the most recent backups for a roster"""
-    try:
-        safe_name = create_safe_roster_filename(roster_name).replace('.json', '')
-        backup_files = [f for f in os.listdir(backup_dir) if f.startswith(safe_name)]
-        backup_files.sort(reverse=True)  # Most recent first
-        
-        # Remove old backups beyond the keep_count most recent
-        for old_backup in backup_files[keep_count:]:
-            os.remove(os.path.join(backup_dir, old_backup))
-    except Exception as e:
-        print(f"Error cleaning up roster backups: {e}")
-
 def load_roster_data(username, roster_filename):
     """Load roster data from file for a specific user"""
     try:
@@ -3441,8 +3737,24 @@ def delete_roster_data(username, roster_filename):
         return False, str(e)
 
 def save_game_data(username, game_name, game_data):
-    """Save game data to database with file backup"""
+    """Save game data to database with file backup (a no-op when nothing changed)"""
     try:
+        user_dir = get_user_games_dir(username)
+        safe_game_name = "".join(c for c in game_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        safe_game_name = safe_game_name.replace(' ', '_')
+        if not safe_game_name:
+            safe_game_name = f"game_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        filename = f"{safe_game_name}.json"
+        filepath = os.path.join(user_dir, filename)
+        
+        # Versioned backup; an unchanged game that is already saved everywhere is not written again
+        backup_version, current = _back_up_for_save('games', backup_key(username, game_name), game_data,
+                                                    {'username': username, 'game_name': game_name}, filepath)
+        if current:
+            print(f"✓ Game '{game_name}' unchanged for {username}, nothing to save")
+            return True, filepath
+        
         # Primary: Save to Supabase
         database_success = False
         try:
@@ -3469,15 +3781,6 @@ def save_game_data(username, game_name, game_data):
             print(f"❌ Supabase save failed for game '{game_name}': {e}")
         
         # Secondary: Save to file (always as backup)
-        user_dir = get_user_games_dir(username)
-        safe_game_name = "".join(c for c in game_name if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        safe_game_name = safe_game_name.replace(' ', '_')
-        if not safe_game_name:
-            safe_game_name = f"game_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-        
-        filename = f"{safe_game_name}.json"
-        filepath = os.path.join(user_dir, filename)
-        
         # Add metadata
         save_data = {
             'game_name': game_name,
@@ -3485,23 +3788,14 @@ def save_game_data(username, game_name, game_data):
             'saved_at': datetime.now().isoformat(),
             'version': '2.0',
             'database_saved': database_success,
+            'backup_version': backup_version,
             'game_data': game_data
         }
         
-        # Create backup if file exists
-        if os.path.exists(filepath):
-            backup_dir = os.path.join(user_dir, 'backups')
-            os.makedirs(backup_dir, exist_ok=True)
-            backup_filename = f"{filename.replace('.json', '')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            backup_path = os.path.join(backup_dir, backup_filename)
-            import shutil
-            shutil.copy2(filepath, backup_path)
-            
-            # Keep only last 5 backups per game (increased from 3)
-            _cleanup_game_backups(backup_dir, safe_game_name, keep_count=5)
-        
         with open(filepath, 'w') as f:
             json.dump(save_data, f, indent=2)
+        if season_cache:
+            season_cache.invalidate(username, f"local:{filename}")
         
         print(f"✓ Game '{game_name}' saved to file backup for {username}")
         
@@ -3512,18 +3806,6 @@ def save_game_data(username, game_name, game_data):
         print(f"❌ Error saving game data: {str(e)}")
         return False, str(e)
 
-def _cleanup_game_backups(backup_dir, game_name, keep_count=5):
-    """Keep only the most recent backups for a game"""
-    try:
-        backup_files = [f for f in os.listdir(backup_dir) if f.startswith(game_name)]
-        backup_files.sort(reverse=True)  # Most recent first
-        
-        # Remove old backups beyond the keep_count most recent
-        for old_backup in backup_files[keep_count:]:
-            os.remove(os.path.join(backup_dir, old_backup))
-    except Exception as e:
-        print(f"Error cleaning up game backups: {e}")
-
 def load_game_data(username, game_filename):
     """Load game data from file"""
     try:
@@ -3536,6 +3818,14 @@ def load_game_data(username, game_filename):
         with open(filepath, 'r') as f:
             game_data = json.load(f)
         
+        # Upgrade a file written under an older schema once, in place
+        if migrate_game(game_data):
+            tmp_path = f"{filepath}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(game_data, f, indent=2)
+            os.replace(tmp_path, filepath)
+            print(f"✓ Game file {game_filename} migrated to schema v{game_data.get('game_data', game_data)[SCHEMA_KEY]}")
+        
         return game_data, None
     except Exception as e:
         print(f"Error loading game data: {str(e)}")
@@ -3580,18 +3870,7 @@ def get_user_saved_games(username):
 def update_play_call_analytics(box_stats, play_call, play_data, yards_gained, is_efficient, is_explosive, is_negative, phase):
     """Update analytics tracking for a specific play call by phase (offense/defense)"""
     try:
-        # Initialize play call stats if not exists
-        if 'play_call_stats' not in box_stats:
-            box_stats['play_call_stats'] = {
-                'offense': {},
-                'defense': {},
-                'special_teams': {}
-            }
-        
-        # Ensure phase-specific structure exists
-        if phase not in box_stats['play_call_stats']:
-            box_stats['play_call_stats'][phase] = {}
-        
+        # play_call_stats is keyed by phase (session_schema)
         play_call_stats = box_stats['play_call_stats'][phase]
         
         # Initialize this play call's stats if first time seeing it
@@ -3686,283 +3965,127 @@ def update_play_call_analytics(box_stats, play_call, play_data, yards_gained, is
     except Exception as e:
         print(f"Error updating play call analytics: {str(e)}")
 
-def parse_field_position(fp):
-    """Parse field position accepting signed ints or legacy 'OWN/OPP xx' strings.
-    Returns tuple: (side: 'OWN'|'OPP', yard: int 1..50)
-    """
-    try:
-        # Signed integer or numeric string
-        if isinstance(fp, (int, float)) or (isinstance(fp, str) and fp.strip().lstrip('+-').isdigit()):
-            val = int(fp)
-            side = 'OWN' if val < 0 else 'OPP'
-            yard = max(1, min(50, abs(val) if val != 0 else 25))
-            return side, yard
-        # Legacy string format
-        s = str(fp).strip().upper()
-        parts = s.split()
-        if len(parts) >= 2:
-            side = 'OWN' if parts[0] == 'OWN' else 'OPP'
-            try:
-                yard = int(parts[1])
-            except Exception:
-                yard = 25
-            yard = max(1, min(50, yard))
-            return side, yard
-        return 'OWN', 25
-    except Exception:
-        return 'OWN', 25
-
-def field_string_from_signed(val):
-    """Convert a signed field position integer to legacy 'OWN/OPP xx' string."""
-    try:
-        v = int(val)
-        side = 'OWN' if v < 0 else 'OPP'
-        yard = max(1, min(50, abs(v) if v != 0 else 25))
-        return f"{side} {yard}"
-    except Exception:
-        return 'OPP 25'
-
-def calculate_penalty_situation(current_play, all_plays):
-    """Calculate next down, distance, and field position for penalty plays"""
-    try:
-        current_down = int(current_play.get('down', 1))
-        current_distance = int(current_play.get('distance', 10))
-        current_field_position = current_play.get('field_position', 'OWN 25')
-        penalty_yards = int(current_play.get('penalty_yards', 0))
-        penalty_side = current_play.get('penalty_side', 'offense')
-
-        # Parse current field position into side and yard line
-        side, yard_line = parse_field_position(current_field_position)
-
-        # Effective yards for offense perspective
-        effective_yards = -penalty_yards if penalty_side == 'offense' else penalty_yards
-
-        # Apply penalty movement
-        if side == 'OWN':
-            new_yard_line = int(yard_line) + effective_yards
-            if new_yard_line >= 50:
-                new_side = 'OPP'
-                new_yard_line = 100 - new_yard_line
-                new_yard_line = max(1, new_yard_line)
-            elif new_yard_line <= 0:
-                new_side = 'OWN'
-                new_yard_line = max(1, new_yard_line)
-            else:
-                new_side = 'OWN'
-        else:  # OPP side
-            new_yard_line = int(yard_line) - effective_yards
-            if new_yard_line <= 0:
-                # Touchdown due to penalty
-                return {
-                    'down': 1,
-                    'distance': 10,
-                    'field_position': 'OWN 25',
-                    'auto_calculated': True,
-                    'reason': 'Penalty resulted in touchdown - Reset for next drive'
-                }
-            elif new_yard_line > 50:
-                new_side = 'OWN'
-                new_yard_line = 100 - new_yard_line
-            else:
-                new_side = 'OPP'
-                new_yard_line = max(1, new_yard_line)
-
-        # Finalize field position
-        final_yard_line = max(1, abs(int(new_yard_line)))
-        new_field_position = f"{new_side} {final_yard_line}"
-
-        # Penalty down/distance logic
-        if penalty_side == 'defense':
-            new_down = 1
-            new_distance = 10
-            reason = f"Defensive penalty: Automatic first down at {new_field_position}"
-        else:
-            new_down = current_down
-            new_distance = current_distance + penalty_yards
-            reason = f"Offensive penalty: Repeat {current_down} down with {penalty_yards} yard penalty"
-
-        return {
-            'down': new_down,
-            'distance': new_distance,
-            'field_position': new_field_position,
-            'auto_calculated': True,
-            'reason': reason
-        }
+# Sections of box_stats that can be selected with ?fields= or dropped with ?exclude=
+BOX_STATS_SECTIONS = ('plays', 'players', 'game_info', 'team_stats', 'play_call_stats', 'next_situation', 'situation_flags',
+                      'archive')
 
-    except Exception as e:
-        return {
-            'down': 1,
-            'distance': 10,
-            'field_position': 'OWN 25',
-            'auto_calculated': False,
-            'reason': f'Error calculating penalty situation: {str(e)}'
-        }
+# Server-side indexes stored with the session; never sent to clients
+HIDDEN_BOX_STATS_KEYS = (PLAYER_INDEX_KEY, PLAY_POSTINGS_KEY, SITUATION_CUBE_KEY, DRIVES_KEY)
 
-def calculate_next_situation(current_play, all_plays):
-    """Calculate next down, distance, and field position based on current play"""
-    try:
-        current_down = int(current_play.get('down', 1))
-        current_distance = int(current_play.get('distance', 10))
-        current_field_position = current_play.get('field_position', 'OWN 25')
-        yards_gained = int(current_play.get('yards_gained', 0))
-        play_result = str(current_play.get('result', '')).lower()
-
-        side, yard_line = parse_field_position(current_field_position)
-
-        # Compute new field position
-        if side == 'OWN':
-            new_yard_line = int(yard_line) + int(yards_gained)
-            if new_yard_line >= 50:
-                new_side = 'OPP'
-                new_yard_line = 100 - new_yard_line
-                new_yard_line = max(1, new_yard_line)
-            else:
-                new_side = 'OWN'
-        else:  # OPP side
-            new_yard_line = int(yard_line) - int(yards_gained)
-            if new_yard_line <= 0:
-                # Touchdown
-                return {
-                    'down': 1,
-                    'distance': 10,
-                    'field_position': 'OWN 25',
-                    'auto_calculated': True,
-                    'reason': 'Touchdown - Reset for next drive'
-                }
-            elif new_yard_line > 50:
-                new_side = 'OWN'
-                new_yard_line = 100 - new_yard_line
-            else:
-                new_side = 'OPP'
-                new_yard_line = max(1, new_yard_line)
-
-        final_yard_line = max(1, abs(int(new_yard_line)))
-        new_field_position = f"{new_side} {final_yard_line}"
-
-        # Next down and distance
-        remaining_distance = int(current_distance) - int(yards_gained)
-        if remaining_distance <= 0:
-            next_down = 1
-            next_distance = 10
-            reason = 'First down achieved'
-        elif int(current_down) >= 4:
-            next_down = 1
-            next_distance = 10
-            if new_side == 'OWN':
-                new_field_position = f"OPP {100 - abs(int(new_yard_line))}"
-            else:
-                new_field_position = f"OWN {100 - abs(int(new_yard_line))}"
-            reason = 'Turnover on downs'
-        else:
-            next_down = int(current_down) + 1
-            next_distance = max(1, remaining_distance)
-            reason = f"Next down: {next_down} & {next_distance}"
-
-        # Special cases from result
-        if any(keyword in play_result for keyword in ['touchdown', 'td', 'score']):
-            return {
-                'down': 1,
-                'distance': 10,
-                'field_position': 'OWN 25',
-                'auto_calculated': True,
-                'reason': 'Touchdown scored - Reset for next drive'
-            }
-        elif any(keyword in play_result for keyword in ['interception', 'int', 'fumble', 'turnover']):
-            if new_side == 'OWN':
-                new_field_position = f"OPP {100 - abs(int(new_yard_line))}"
-            else:
-                new_field_position = f"OWN {100 - abs(int(new_yard_line))}"
-            return {
-                'down': 1,
-                'distance': 10,
-                'field_position': new_field_position,
-                'auto_calculated': True,
-                'reason': 'Turnover - Opponent takes possession'
-            }
-
-        return {
-            'down': next_down,
-            'distance': next_distance,
-            'field_position': new_field_position,
-            'auto_calculated': True,
-            'reason': reason
-        }
-
-    except Exception as e:
-        return {
-            'down': 1,
-            'distance': 10,
-            'field_position': 'OWN 25',
-            'auto_calculated': False,
-            'reason': f'Error calculating: {str(e)}'
-        }
-
-
-        side, yard_line = parse_field_position(current_field_position)
-
-        # Effective yards for offense perspective
-        effective_yards = -penalty_yards if penalty_side == 'offense' else penalty_yards
-
-        # Move ball according to side
-        if side == 'OWN':
-            new_yard_line = int(yard_line) + effective_yards
-            if new_yard_line >= 50:
-                new_side = 'OPP'
-                new_yard_line = 100 - new_yard_line
-                new_yard_line = max(1, new_yard_line)
-            elif new_yard_line <= 0:
-                new_side = 'OWN'
-                new_yard_line = max(1, new_yard_line)
-            else:
-                new_side = 'OWN'
-        else:  # OPP side
-            new_yard_line = int(yard_line) - effective_yards
-            if new_yard_line <= 0:
-                # Touchdown due to penalty
-                return {
-                    'down': 1,
-                    'distance': 10,
-                    'field_position': 'OWN 25',
-                    'auto_calculated': True,
-                    'reason': 'Penalty resulted in touchdown - Reset for next drive'
-                }
-            elif new_yard_line > 50:
-                new_side = 'OWN'
-                new_yard_line = 100 - new_yard_line
-            else:
-                new_side = 'OPP'
-                new_yard_line = max(1, new_yard_line)
-
-        final_yard_line = max(1, abs(int(new_yard_line)))
-        new_field_position = f"{new_side} {final_yard_line}"
-
-        # Penalty down/distance logic
-        if penalty_side == 'defense':
-            new_down = 1
-            new_distance = 10
-            reason = f"Defensive penalty: Automatic first down at {new_field_position}"
-        else:
-            new_down = current_down
-            new_distance = current_distance + penalty_yards
-            reason = f"Offensive penalty: Repeat {current_down} down with {penalty_yards} yard penalty"
-
-        return {
-            'down': new_down,
-            'distance': new_distance,
-            'field_position': new_field_position,
-            'auto_calculated': True,
-            'reason': reason
-        }
-
-    except Exception as e:
-        return {
-            'down': 1,
-            'distance': 10,
-            'field_position': 'OWN 25',
-            'auto_calculated': False,
-            'reason': f'Error calculating penalty situation: {str(e)}'
-        }
+def parse_stats_projection(args):
+    """Read fields/exclude/plays_offset/plays_limit from the query string"""
+    def name_set(value):
+        return {name.strip() for name in (value or '').split(',') if name.strip()}
+    
+    plays_limit = args.get('plays_limit', type=int)
+    return {
+        'fields': name_set(args.get('fields')),
+        'exclude': name_set(args.get('exclude')),
+        'plays_offset': max(0, args.get('plays_offset', 0, type=int) or 0),
+        'plays_limit': plays_limit if plays_limit is not None and plays_limit >= 0 else None
+    }
 
+def projection_wants(projection, section):
+    """Whether a section survives the projection"""
+    if projection['fields'] and section not in projection['fields']:
+        return False
+    return section not in projection['exclude']
+
+def _excluded_row_key(key, exclude):
+    """Row-level exclusion; 'progression' covers the counters and every legacy *_progression series"""
+    if key in exclude:
+        return True
+    return 'progression' in exclude and (key == 'progression_counters' or str(key).endswith('progression'))
+
+def _project_rows(rows, exclude):
+    """Drop excluded keys from each row of a {key: row} mapping"""
+    if not exclude or not isinstance(rows, dict):
+        return rows
+    return {
+        key: {k: v for k, v in row.items() if not _excluded_row_key(k, exclude)} if isinstance(row, dict) else row
+        for key, row in rows.items()
+    }
+
+def project_box_stats(box_stats, projection):
+    """Shallow projected copy of box_stats: selected sections, trimmed rows, one page of plays"""
+    if not projection['fields'] and not projection['exclude'] and not projection['plays_offset'] and projection['plays_limit'] is None:
+        return {k: v for k, v in box_stats.items() if k not in HIDDEN_BOX_STATS_KEYS}
+    
+    projected = {}
+    for section, value in box_stats.items():
+        if section in HIDDEN_BOX_STATS_KEYS:
+            continue
+        if section in BOX_STATS_SECTIONS and not projection_wants(projection, section):
+            continue
+        if section not in BOX_STATS_SECTIONS and projection['fields']:
+            continue
+        if section in ('players', 'team_stats'):
+            value = _project_rows(value, projection['exclude'])
+        projected[section] = value
+    
+    if 'plays' in projected:
+        plays = projected['plays']
+        start = projection['plays_offset']
+        end = None if projection['plays_limit'] is None else start + projection['plays_limit']
+        projected['plays'] = plays[start:end]
+        projected['plays_total'] = len(plays)
+        projected['plays_offset'] = start
+    return projected
+
+def project_stats_payload(payload, projection):
+    """Apply the projection to the top-level get_stats payload (full or delta)"""
+    for section in ('team_stats', 'next_situation', 'players', 'play_call_stats', 'game_info'):
+        if section not in payload:
+            continue
+        if not projection_wants(projection, section):
+            del payload[section]
+        elif section in ('team_stats', 'players'):
+            payload[section] = _project_rows(payload[section], projection['exclude'])
+    if payload.get('delta') and not projection_wants(projection, 'plays'):
+        payload.pop('plays', None)
+    return payload
+
+def build_box_stats_delta(box_stats, team_stats, row_versions, version, since_version):
+    """Build the get_stats delta payload: plays and players changed after since_version.
+    
+    Plays are sent with their index; the client truncates to play_count, so
+    deleted plays need no explicit tombstone. Removed players are listed by key.
+    """
+    plays = box_stats.get('plays', [])
+    play_versions = row_versions.get('plays', [])
+    changed_plays = [
+        {'index': i, 'play': play}
+        for i, play in enumerate(plays)
+        if i >= len(play_versions) or play_versions[i][1] > since_version
+    ]
+    
+    player_versions = row_versions.get('players', {})
+    changed_players = {
+        key: player for key, player in box_stats.get('players', {}).items()
+        if key not in player_versions or player_versions[key][1] > since_version
+    }
+    removed_players = [key for key, removed_at in row_versions.get('removed_players', {}).items() if removed_at > since_version]
+    
+    delta = {
+        'success': True,
+        'delta': True,
+        'version': version,
+        'since_version': since_version,
+        'play_count': len(plays),
+        'plays': changed_plays,
+        'players': changed_players,
+        'removed_players': removed_players
+    }
+    
+    # Aggregates are small and change with nearly every play; send them whole when touched
+    if row_versions.get('aggregates', [None, version])[1] > since_version or changed_plays:
+        delta.update({
+            'team_stats': team_stats,
+            'play_call_stats': box_stats.get('play_call_stats', {}),
+            'game_info': box_stats.get('game_info', {}),
+            'next_situation': box_stats.get('next_situation', {})
+        })
+    return delta
 
 @app.route('/box_stats/get_stats', methods=['GET'])
 @login_required
@@ -3971,102 +4094,33 @@ def get_box_stats():
     try:
         # Get server-side session ID
         session_id = session.get('server_session_id')
+        box_stats_data = {}
         if not session_id:
             # No session yet, return empty data
-            box_stats = {
-                'plays': [],
-                'players': {},
-                'game_info': {},
-                'team_stats': {
-                    'total_plays': 0,
-                    'efficient_plays': 0,
-                    'explosive_plays': 0,
-                    'negative_plays': 0,
-                    'total_yards': 0,
-                    'touchdowns': 0,
-                    'turnovers': 0,
-                    'interceptions': 0,
-                    'efficiency_rate': 0.0,
-                    'explosive_rate': 0.0,
-                    'negative_rate': 0.0,
-                    'nee_score': 0.0,
-                    'avg_yards_per_play': 0.0,
-                    'success_rate': 0.0
-                }
-            }
+            box_stats = new_box_stats()
         else:
-            # Load from server-side storage
+            # Load from server-side storage (already in the current schema)
             box_stats_data = server_session.load_session_data(session_id)
-            box_stats = box_stats_data.get('box_stats', {
-                'plays': [],
-                'players': {},
-                'game_info': {},
-                'team_stats': {
-                    'total_plays': 0,
-                    'efficient_plays': 0,
-                    'explosive_plays': 0,
-                    'negative_plays': 0,
-                    'total_yards': 0,
-                    'touchdowns': 0,
-                    'turnovers': 0,
-                    'interceptions': 0,
-                    'efficiency_rate': 0.0,
-                    'explosive_rate': 0.0,
-                    'negative_rate': 0.0,
-                    'nee_score': 0.0,
-                    'avg_yards_per_play': 0.0,
-                    'success_rate': 0.0
-                }
-            })
+            box_stats = box_stats_data.get('box_stats') or new_box_stats()
         
-        # Use the stored team stats from session (which include phase-separated analytics)
-        # Frontend expects phase-separated stats: offense, defense, special_teams
-        # Normalize player keys to strings to avoid jsonify sort TypeErrors
-        players = box_stats.get('players', {})
-        if isinstance(players, dict):
-            normalized = {}
-            for k, v in players.items():
-                sk = 'unknown' if k is None else str(k)
-                normalized[sk] = v
-            box_stats['players'] = normalized
-        team_stats = box_stats.get('team_stats', {})
+        # Conditional GET: the ETag follows the session version
+        version = box_stats_data.get('version', 0)
+        etag = f'W/"{session_id[:8]}-{version}"' if session_id and version else None
+        if etag and etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+            not_modified = app.response_class(status=304)
+            not_modified.headers['ETag'] = etag
+            not_modified.headers['Cache-Control'] = 'no-cache'
+            return not_modified
         
-        # Ensure phase-separated structure exists - but preserve existing calculated values
-        if 'offense' not in team_stats:
-            # Only create empty structure if no team_stats exist at all
-            team_stats = {
-                'offense': {
-                    'total_plays': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0,
-                    'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'interceptions': 0,
-                    'efficiency_rate': 0.0, 'explosive_rate': 0.0, 'negative_rate': 0.0,
-                    'nee_score': 0.0, 'avg_yards_per_play': 0.0, 'success_rate': 0.0
-                },
-                'defense': {
-                    'total_plays': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0,
-                    'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'interceptions': 0,
-                    'efficiency_rate': 0.0, 'explosive_rate': 0.0, 'negative_rate': 0.0,
-                    'nee_score': 0.0, 'avg_yards_per_play': 0.0, 'success_rate': 0.0
-                },
-                'special_teams': {
-                    'total_plays': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0,
-                    'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'interceptions': 0,
-                    'efficiency_rate': 0.0, 'explosive_rate': 0.0, 'negative_rate': 0.0,
-                    'nee_score': 0.0, 'avg_yards_per_play': 0.0, 'success_rate': 0.0
-                },
-                'overall': {
-                    'total_plays': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0,
-                    'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'interceptions': 0,
-                    'efficiency_rate': 0.0, 'explosive_rate': 0.0, 'negative_rate': 0.0,
-                    'nee_score': 0.0, 'avg_yards_per_play': 0.0, 'success_rate': 0.0
-                }
-            }
-        else:
-            # Preserve existing calculated team_stats - don't overwrite with zeros
-            print(f"DEBUG GET_STATS: Preserving existing team_stats with {len(team_stats)} phases")
+        # Stored team stats are phase-separated: offense, defense, special_teams, overall
+        team_stats = box_stats['team_stats']
+        
+        # Optional projection (?fields=, ?exclude=, ?plays_offset=, ?plays_limit=)
+        projection = parse_stats_projection(request.args)
         
         # Add basic play type counts for compatibility
         for phase in ['offense', 'defense', 'special_teams', 'overall']:
-            if phase in team_stats:
+            if projection_wants(projection, 'team_stats'):
                 team_stats[phase]['rushing_plays'] = len([p for p in box_stats['plays'] 
                                                         if p.get('play_type') == 'rush' and p.get('phase', 'offense') == phase])
                 team_stats[phase]['passing_plays'] = len([p for p in box_stats['plays'] 
@@ -4076,29 +4130,33 @@ def get_box_stats():
         print(f"DEBUG GET_STATS: Defense efficiency rate: {team_stats.get('defense', {}).get('efficiency_rate', 'NOT_FOUND')}")
         print(f"DEBUG GET_STATS: Defense NEE score: {team_stats.get('defense', {}).get('nee_score', 'NOT_FOUND')}")
 
-        # Sanitize play_call_stats for JSON (convert int keys to strings)
-        try:
-            pcs = box_stats.get('play_call_stats', {})
-            for _phase in list(pcs.keys()):
-                for _pc, _stats in list(pcs.get(_phase, {}).items()):
-                    _db = _stats.get('down_breakdown')
-                    if isinstance(_db, dict):
-                        _stats['down_breakdown'] = {str(k): v for k, v in _db.items()}
-        except Exception as _e:
-            print(f'SANITIZE play_call_stats failed: {_e}')
-
-        return jsonify({
-            'success': True,
-            'box_stats': box_stats,
-            'team_stats': team_stats,
-            'next_situation': box_stats.get('next_situation', {
-                'down': 1,
-                'distance': 10,
-                'field_position': 'OWN 25',
-                'auto_calculated': False,
-                'reason': 'Starting position'
-            })
-        })
+        # Delta mode: only rows changed after the client's version
+        since_version = request.args.get('since_version', type=int)
+        row_versions = box_stats_data.get('row_versions') or {}
+        if since_version is not None and version and row_versions and since_version >= row_versions.get('base', version):
+            payload = build_box_stats_delta(box_stats, team_stats, row_versions, version, since_version)
+            payload = project_stats_payload(payload, projection)
+        else:
+            payload = {
+                'success': True,
+                'version': version,
+                'box_stats': project_box_stats(box_stats, projection),
+                'team_stats': team_stats,
+                'next_situation': box_stats.get('next_situation', {
+                    'down': 1,
+                    'distance': 10,
+                    'field_position': 'OWN 25',
+                    'auto_calculated': False,
+                    'reason': 'Starting position'
+                })
+            }
+            payload = project_stats_payload(payload, projection)
+        response = jsonify(payload)
+        
+        if etag:
+            response.headers['ETag'] = etag
+            response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
         try:
@@ -4139,8 +4197,13 @@ def get_down_analytics():
             }
         }
         
+        # Historical view: include plays from archived games
+        plays = box_stats.get('plays', [])
+        if request.args.get('include_archived') in ('1', 'true') and session_archive:
+            plays = session_archive.load_plays(session_id, box_stats)
+        
         # Process each play
-        for play in box_stats.get('plays', []):
+        for play in plays:
             phase = play.get('phase', 'offense').lower()
             if phase not in ['offense', 'defense']:
                 continue  # Skip special teams for down analytics
@@ -4295,6 +4358,260 @@ def get_down_analytics():
         print(f"Error getting down analytics: {str(e)}")
         return jsonify({'error': f'Error getting down analytics: {str(e)}'}), 500
 
+def distance_bucket(distance):
+    """short (1-3), medium (4-7) or long (8+) yards to go, as in play call analytics"""
+    try:
+        distance = int(distance)
+    except (TypeError, ValueError):
+        return None
+    if distance <= 3:
+        return 'short'
+    if distance <= 7:
+        return 'medium'
+    return 'long'
+
+def field_zone(field_position):
+    """backed_up (own 1-20), own_territory, opp_territory or red_zone (opp 20-1)"""
+    if field_position is None or str(field_position).strip() == '':
+        return None
+    yard_line = encode_field_position(field_position)
+    if yard_line < MIDFIELD:
+        return 'backed_up' if yard_line <= 20 else 'own_territory'
+    return 'red_zone' if yard_line >= 80 else 'opp_territory'
+
+# Posting list dimensions for /box_stats/query_plays (players come from the player index)
+PLAY_INDEX_DIMENSIONS = {
+    'play_call': lambda play: play.get('play_call'),
+    'phase': lambda play: play.get('phase', 'offense'),
+    'down': lambda play: play.get('down'),
+    'distance': lambda play: distance_bucket(play.get('distance')),
+    'zone': lambda play: field_zone(play.get('field_position')),
+    'play_type': lambda play: play.get('play_type')
+}
+
+def play_outcome(play):
+    """Yards and efficient/explosive/negative flags for one play, judged the same way as down analytics"""
+    phase = str(play.get('phase', 'offense')).lower()
+    try:
+        yards_gained = int(play.get('yards_gained', 0))
+    except (TypeError, ValueError):
+        yards_gained = 0
+    play_type = str(play.get('play_type', '')).lower()
+    players_involved = play.get('players_involved', []) or []
+    
+    explosive = False
+    has_turnover = any(p.get('fumble', False) or p.get('interception', False) for p in players_involved)
+    if not has_turnover:
+        explosive = any(calculate_play_explosiveness(str(p.get('role', '')), yards_gained, p, phase) for p in players_involved)
+        if not explosive:
+            inferred_role = 'rusher' if ('rush' in play_type or 'run' in play_type) else ('receiver' if 'pass' in play_type else '')
+            explosive = bool(inferred_role) and calculate_play_explosiveness(inferred_role, yards_gained, None, phase)
+    
+    negative = (any(calculate_play_negativeness(play, yards_gained, p, phase) for p in players_involved)
+                or calculate_play_negativeness(play, yards_gained, {}, phase))
+    
+    return {
+        'phase': phase,
+        'yards': yards_gained,
+        'efficient': bool(calculate_play_efficiency(play, yards_gained, None, phase)),
+        'explosive': bool(explosive),
+        'negative': bool(negative)
+    }
+
+def situation_metrics(counters, phase='offense'):
+    """Rates and NEE for a plays/yards/efficient/explosive/negative counter set"""
+    total = counters.get('plays', 0)
+    metrics = {
+        'total_plays': total,
+        'total_yards': counters.get('yards', 0),
+        'efficient_plays': counters.get('efficient', 0),
+        'explosive_plays': counters.get('explosive', 0),
+        'negative_plays': counters.get('negative', 0)
+    }
+    if total > 0:
+        metrics['avg_yards_per_play'] = round(metrics['total_yards'] / total, 1)
+        metrics['efficiency_rate'] = round(metrics['efficient_plays'] / total * 100, 1)
+        metrics['explosive_rate'] = round(metrics['explosive_plays'] / total * 100, 1)
+        metrics['negative_rate'] = round(metrics['negative_plays'] / total * 100, 1)
+        metrics['nee_score'] = calculate_nee_score(metrics['efficiency_rate'], metrics['explosive_rate'], metrics['negative_rate'], phase)
+    else:
+        metrics.update({'avg_yards_per_play': 0.0, 'efficiency_rate': 0.0, 'explosive_rate': 0.0,
+                        'negative_rate': 0.0, 'nee_score': 0.0})
+    return metrics
+
+def summarize_plays(plays):
+    """Aggregate metrics for a set of plays"""
+    counters = {'plays': len(plays), 'yards': 0, 'efficient': 0, 'explosive': 0, 'negative': 0}
+    phases = set()
+    for play in plays:
+        outcome = play_outcome(play)
+        phases.add(outcome['phase'])
+        counters['yards'] += outcome['yards']
+        for field in ('efficient', 'explosive', 'negative'):
+            if outcome[field]:
+                counters[field] += 1
+    return situation_metrics(counters, phases.pop() if len(phases) == 1 else 'offense')
+
+@app.route('/box_stats/query_plays', methods=['GET'])
+@login_required
+def query_plays():
+    """Filter plays by play_call, phase, down, distance, zone, play_type and player.
+    
+    Each parameter takes one or more comma-separated values (any may match);
+    different parameters must all match. Answered from the session's posting
+    lists, with aggregate metrics for the matching plays.
+    """
+    try:
+        session_id = session.get('server_session_id')
+        if not session_id:
+            return jsonify({'success': False, 'error': 'No active session found'})
+        
+        box_stats_data = server_session.load_session_data(session_id)
+        box_stats = box_stats_data.get('box_stats', {'plays': []})
+        plays = box_stats.get('plays', [])
+        
+        filters = {}
+        for name in PLAY_INDEX_DIMENSIONS:
+            values = [v.strip() for v in request.args.get(name, '').split(',') if v.strip()]
+            if values:
+                filters[name] = values
+        
+        # Players resolve by key, jersey number or name
+        extra_lists = []
+        player_values = [v.strip() for v in request.args.get('player', '').split(',') if v.strip()]
+        if player_values:
+            player_index = get_player_index(box_stats)
+            player_lists = []
+            for value in player_values:
+                key, _ = resolve_player(box_stats, value)
+                if key is not None:
+                    player_lists.append(player_index['plays'].get(key, []))
+            extra_lists.append(union_postings(player_lists))
+            filters['player'] = player_values
+        
+        indices = query_play_indices(box_stats, PLAY_INDEX_DIMENSIONS, {k: v for k, v in filters.items() if k != 'player'}, extra_lists)
+        matched = [plays[i] for i in indices if i < len(plays)]
+        
+        offset = max(0, request.args.get('plays_offset', 0, type=int) or 0)
+        limit = request.args.get('plays_limit', type=int)
+        page = indices[offset:None if limit is None or limit < 0 else offset + limit]
+        
+        return jsonify({
+            'success': True,
+            'filters': filters,
+            'match_count': len(indices),
+            'plays_offset': offset,
+            'plays': [{'index': i, 'play': plays[i]} for i in page if i < len(plays)],
+            'summary': summarize_plays(matched)
+        })
+        
+    except Exception as e:
+        print(f"Error querying plays: {str(e)}")
+        return jsonify({'error': f'Error querying plays: {str(e)}'}), 500
+
+# Dimensions of the situational cube (phase x play call x down x distance x zone x play type)
+SITUATION_CUBE_DIMENSIONS = PLAY_INDEX_DIMENSIONS
+
+@app.route('/box_stats/situations', methods=['GET'])
+@login_required
+def get_situations():
+    """Slice the situational cube.
+    
+    Filter with any of phase, play_call, down, distance, zone and play_type
+    (comma-separated values); group_by=play_call,down,... breaks the slice
+    down by those dimensions.
+    """
+    try:
+        session_id = session.get('server_session_id')
+        if not session_id:
+            return jsonify({'success': False, 'error': 'No active session found'})
+        
+        box_stats_data = server_session.load_session_data(session_id)
+        box_stats = box_stats_data.get('box_stats', {'plays': []})
+        cube = get_cube(box_stats, SITUATION_CUBE_DIMENSIONS, play_outcome)
+        
+        filters = {}
+        for name in SITUATION_CUBE_DIMENSIONS:
+            values = [v.strip() for v in request.args.get(name, '').split(',') if v.strip()]
+            if values:
+                filters[name] = values
+        group_by = [g.strip() for g in request.args.get('group_by', '').split(',') if g.strip()]
+        unknown = [g for g in group_by if g not in SITUATION_CUBE_DIMENSIONS]
+        if unknown:
+            return jsonify({'error': f'Unknown group_by dimension(s): {", ".join(unknown)}',
+                            'dimensions': list(SITUATION_CUBE_DIMENSIONS)}), 400
+        
+        # NEE flips sign for defense; mixed-phase slices are scored as offense
+        phases = filters.get('phase', [])
+        phase = phases[0].lower() if len(phases) == 1 else 'offense'
+        
+        totals, groups = slice_cube(cube, filters, group_by)
+        breakdown = []
+        for group in groups.values():
+            values = dict(zip(group_by, group['values']))
+            group_phase = str(values.get('phase', phase)).lower()
+            breakdown.append({**values, **situation_metrics(group, group_phase)})
+        breakdown.sort(key=lambda row: row['total_plays'], reverse=True)
+        
+        return jsonify({
+            'success': True,
+            'filters': filters,
+            'group_by': group_by,
+            'totals': situation_metrics(totals, phase),
+            'breakdown': breakdown,
+            'cells': len(cube['cells'])
+        })
+        
+    except Exception as e:
+        print(f"Error slicing situations: {str(e)}")
+        return jsonify({'error': f'Error slicing situations: {str(e)}'}), 500
+
+def drive_report(box_stats):
+    """Drive table rows with efficiency/NEE, plus per-phase drive summaries"""
+    table = get_drives(box_stats, play_outcome)
+    rows = []
+    summary = {}
+    for drive in table['drives']:
+        counters = {field: drive[field] for field in ('plays', 'yards', 'efficient', 'explosive', 'negative')}
+        rows.append({**drive, **situation_metrics(counters, drive['phase'])})
+        phase_summary = summary.setdefault(drive['phase'], {
+            'drives': 0, 'results': {}, 'counters': {'plays': 0, 'yards': 0, 'efficient': 0, 'explosive': 0, 'negative': 0}})
+        phase_summary['drives'] += 1
+        result = drive['result'] or 'in_progress'
+        phase_summary['results'][result] = phase_summary['results'].get(result, 0) + 1
+        for field, value in counters.items():
+            phase_summary['counters'][field] += value
+    for phase, phase_summary in summary.items():
+        counters = phase_summary.pop('counters')
+        phase_summary.update(situation_metrics(counters, phase))
+        phase_summary['avg_plays_per_drive'] = round(counters['plays'] / phase_summary['drives'], 1)
+        phase_summary['avg_yards_per_drive'] = round(counters['yards'] / phase_summary['drives'], 1)
+    return rows, summary
+
+@app.route('/box_stats/drives', methods=['GET'])
+@login_required
+def get_drive_table():
+    """Drives of the current session (optionally ?phase=offense|defense) with per-drive efficiency and NEE"""
+    try:
+        session_id = session.get('server_session_id')
+        if not session_id:
+            return jsonify({'success': False, 'error': 'No active session found'})
+        
+        box_stats_data = server_session.load_session_data(session_id)
+        box_stats = box_stats_data.get('box_stats', {'plays': []})
+        rows, summary = drive_report(box_stats)
+        
+        phase = request.args.get('phase', '').strip().lower()
+        if phase:
+            rows = [row for row in rows if row['phase'] == phase]
+            summary = {phase: summary[phase]} if phase in summary else {}
+        
+        return jsonify({'success': True, 'drives': rows, 'summary': summary})
+        
+    except Exception as e:
+        print(f"Error getting drives: {str(e)}")
+        return jsonify({'error': f'Error getting drives: {str(e)}'}), 500
+
 @app.route('/box_stats/reset', methods=['POST'])
 @login_required
 def reset_box_stats():
@@ -4309,89 +4626,11 @@ def reset_box_stats():
             session['server_session_id'] = session_id
         
         # Reset server-side session data
-        reset_data = {
-            'box_stats': {
-                'plays': [],
-                'players': {},
-                'game_info': {},
-                'team_stats': {
-                    'total_plays': 0,
-                    'efficient_plays': 0,
-                    'explosive_plays': 0,
-                    'negative_plays': 0,
-                    'efficiency_rate': 0.0,
-                    'explosive_rate': 0.0,
-                    'avg_yards_per_play': 0.0,
-                    'success_rate': 0.0,
-                    'offense': {
-                        'total_plays': 0,
-                        'efficient_plays': 0,
-                        'explosive_plays': 0,
-                        'negative_plays': 0,
-                        'total_yards': 0,
-                        'passing_yards': 0,
-                        'rushing_yards': 0,
-                        'passing_plays': 0,
-                        'rushing_plays': 0,
-                        'passing_efficient_plays': 0,
-                        'rushing_efficient_plays': 0,
-                        'passing_explosive_plays': 0,
-                        'rushing_explosive_plays': 0,
-                        'passing_negative_plays': 0,
-                        'rushing_negative_plays': 0,
-                        'efficiency_rate': 0.0,
-                        'explosive_rate': 0.0,
-                        'avg_yards_per_play': 0.0,
-                        'nee_score': 0.0
-                    },
-                    'defense': {
-                        'total_plays': 0,
-                        'efficient_plays': 0,
-                        'explosive_plays': 0,
-                        'negative_plays': 0,
-                        'total_yards': 0,
-                        'passing_yards': 0,
-                        'rushing_yards': 0,
-                        'passing_plays': 0,
-                        'rushing_plays': 0,
-                        'passing_efficient_plays': 0,
-                        'rushing_efficient_plays': 0,
-                        'passing_explosive_plays': 0,
-                        'rushing_explosive_plays': 0,
-                        'passing_negative_plays': 0,
-                        'rushing_negative_plays': 0,
-                        'efficiency_rate': 0.0,
-                        'explosive_rate': 0.0,
-                        'avg_yards_per_play': 0.0,
-                        'nee_score': 0.0
-                    },
-                    'special_teams': {
-                        'total_plays': 0,
-                        'efficient_plays': 0,
-                        'explosive_plays': 0,
-                        'negative_plays': 0,
-                        'total_yards': 0,
-                        'passing_yards': 0,
-                        'rushing_yards': 0,
-                        'passing_plays': 0,
-                        'rushing_plays': 0,
-                        'passing_efficient_plays': 0,
-                        'rushing_efficient_plays': 0,
-                        'passing_explosive_plays': 0,
-                        'rushing_explosive_plays': 0,
-                        'passing_negative_plays': 0,
-                        'rushing_negative_plays': 0,
-                        'efficiency_rate': 0.0,
-                        'explosive_rate': 0.0,
-                        'avg_yards_per_play': 0.0,
-                        'nee_score': 0.0
-                    }
-                },
-                'play_call_stats': {}
-            }
-        }
+        reset_data = {'box_stats': new_box_stats()}
         
-        server_session.save_session_data(session_id, reset_data)
+        server_session.save_session_data(session_id, reset_data, overwrite=True)
+        if session_archive:
+            session_archive.delete_segments(session_id)
         
         # Also clear old session data for backward compatibility
         session['box_stats'] = {
@@ -4654,6 +4893,15 @@ def set_box_stats_game_info():
             }
         })
         
+        # Same game keeps its id; a different game archives the finished one first
+        previous_info = box_stats.get('game_info') or {}
+        if session_archive:
+            if is_same_game(previous_info, game_info):
+                if previous_info.get('game_id'):
+                    game_info['game_id'] = previous_info['game_id']
+            else:
+                session_archive.archive_game(session_id, box_stats, reason='new_game')
+        
         # Update game info
         box_stats['game_info'] = game_info
         
@@ -4663,54 +4911,138 @@ def set_box_stats_game_info():
         
         return jsonify({
             'success': True,
-            'message': 'Game information saved successfully',
-            'game_info': game_info
+            'message': 'Game information saved successfully',
+            'game_info': game_info
+        })
+        
+    except SessionConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'conflict': True}), 409
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Error saving game info: {str(e)}'}), 500
+
+@app.route('/box_stats/get_game_info', methods=['GET'])
+@login_required
+def get_box_stats_game_info():
+    """Get current game information"""
+    try:
+        game_info = session.get('box_stats', {}).get('game_info', {})
+        
+        return jsonify({
+            'success': True,
+            'game_info': game_info
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Error getting game info: {str(e)}'}), 500
+
+@app.route('/box_stats/clear_game_info', methods=['POST'])
+@login_required
+def clear_box_stats_game_info():
+    """Clear game information for the current session"""
+    try:
+        # Get server-side session ID
+        session_id = session.get('server_session_id')
+        if session_id:
+            # Load existing session data
+            box_stats_data = server_session.load_session_data(session_id)
+            box_stats = box_stats_data.get('box_stats', {})
+            
+            # Clear game info (the game itself is still in progress)
+            game_id = (box_stats.get('game_info') or {}).get('game_id')
+            box_stats['game_info'] = {'game_id': game_id} if game_id else {}
+            
+            # Save back to server-side session
+            box_stats_data['box_stats'] = box_stats
+            server_session.save_session_data(session_id, box_stats_data)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Game information cleared'
+        })
+        
+    except SessionConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'conflict': True}), 409
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Error clearing game info: {str(e)}'}), 500
+
+@app.route('/box_stats/archive_game', methods=['POST'])
+@login_required
+def archive_box_stats_game():
+    """Finish the current game: move it to cold storage and start a fresh one"""
+    try:
+        if not session_archive:
+            return jsonify({'success': False, 'error': 'Archiving is not available'}), 500
+        
+        session_id = session.get('server_session_id')
+        if not session_id:
+            return jsonify({'success': False, 'error': 'No active session found'})
+        
+        box_stats_data = server_session.load_session_data(session_id)
+        box_stats = box_stats_data.get('box_stats', {})
+        
+        summary = session_archive.archive_game(session_id, box_stats)
+        if not summary:
+            return jsonify({'success': False, 'error': 'No plays to archive'})
+        
+        # The next play starts a new game
+        box_stats['game_info'] = {}
+        box_stats_data['box_stats'] = box_stats
+        server_session.save_session_data(session_id, box_stats_data)
+        
+        return jsonify({
+            'success': True,
+            'message': f"Archived {summary['play_count']} plays",
+            'segment': summary
         })
         
+    except SessionConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'conflict': True}), 409
     except Exception as e:
-        return jsonify({'success': False, 'error': f'Error saving game info: {str(e)}'}), 500
+        print(f"Error archiving game: {str(e)}")
+        return jsonify({'success': False, 'error': f'Error archiving game: {str(e)}'}), 500
 
-@app.route('/box_stats/get_game_info', methods=['GET'])
+@app.route('/box_stats/archive', methods=['GET'])
 @login_required
-def get_box_stats_game_info():
-    """Get current game information"""
+def list_box_stats_archive():
+    """List archived games for the current session (hot summaries only)"""
     try:
-        game_info = session.get('box_stats', {}).get('game_info', {})
+        session_id = session.get('server_session_id')
+        if not session_id:
+            return jsonify({'success': False, 'error': 'No active session found'})
+        
+        box_stats_data = server_session.load_session_data(session_id)
+        box_stats = box_stats_data.get('box_stats', {})
+        segments = session_archive.list_segments(box_stats) if session_archive else []
         
         return jsonify({
             'success': True,
-            'game_info': game_info
+            'segments': segments,
+            'archived_plays': sum(seg.get('play_count', 0) for seg in segments),
+            'current_plays': len(box_stats.get('plays', []))
         })
         
     except Exception as e:
-        return jsonify({'success': False, 'error': f'Error getting game info: {str(e)}'}), 500
+        print(f"Error listing archive: {str(e)}")
+        return jsonify({'success': False, 'error': f'Error listing archive: {str(e)}'}), 500
 
-@app.route('/box_stats/clear_game_info', methods=['POST'])
+@app.route('/box_stats/archive/<segment_id>', methods=['GET'])
 @login_required
-def clear_box_stats_game_info():
-    """Clear game information for the current session"""
+def get_box_stats_archive_segment(segment_id):
+    """Load one archived game (plays, players and team stats) from cold storage"""
     try:
-        # Get server-side session ID
         session_id = session.get('server_session_id')
-        if session_id:
-            # Load existing session data
-            box_stats_data = server_session.load_session_data(session_id)
-            box_stats = box_stats_data.get('box_stats', {})
-            
-            # Clear game info
-            box_stats['game_info'] = {}
-            
-            # Save back to server-side session
-            box_stats_data['box_stats'] = box_stats
-            server_session.save_session_data(session_id, box_stats_data)
+        if not session_id or not session_archive:
+            return jsonify({'success': False, 'error': 'No archive available'})
         
-        return jsonify({
-            'success': True,
-            'message': 'Game information cleared'
-        })
+        segment = session_archive.read_segment(session_id, segment_id)
+        if not segment:
+            return jsonify({'success': False, 'error': 'Archived game not found'}), 404
+        
+        return jsonify({'success': True, 'segment': segment})
         
     except Exception as e:
-        return jsonify({'success': False, 'error': f'Error clearing game info: {str(e)}'}), 500
+        print(f"Error loading archived game: {str(e)}")
+        return jsonify({'success': False, 'error': f'Error loading archived game: {str(e)}'}), 500
 
 @app.route('/box_stats/export', methods=['GET'])
 @login_required
@@ -5043,6 +5375,9 @@ def update_player_stats():
                 }
             }
         
+        cookie_players = session['box_stats']['players']
+        players_before = {k: play_journal.strip_row(cookie_players[k]) for k in updated_players if k in cookie_players}
+        
         # Update player statistics
         for player_number, stats in updated_players.items():
             # Ensure player exists in session
@@ -5098,6 +5433,21 @@ def update_player_stats():
         
         session.modified = True
         
+        # Journal the manual edit so it can be undone
+        session_id = session.get('server_session_id')
+        if session_id:
+            try:
+                players_after = {k: play_journal.strip_row(cookie_players[k]) for k in updated_players}
+                entry = play_journal.player_stats_entry(players_before, players_after)
+                
+                def apply(box_stats_data):
+                    play_journal.record(box_stats_data, entry)
+                    return True, None
+                
+                server_session.update_session_data(session_id, apply)
+            except Exception as journal_e:
+                print(f"Could not journal player stat update: {journal_e}")
+        
         print(f"DEBUG: Updated player stats for {len(updated_players)} players")
         
         return jsonify({
@@ -5216,6 +5566,142 @@ def get_saved_games():
     except Exception as e:
         return jsonify({'error': f'Error getting saved games: {str(e)}'}), 500
 
+def season_game_sources(username):
+    """Every saved game for the season rollup, stamped so only re-saved games are summarized again"""
+    sources = []
+    user_dir = get_user_games_dir(username)
+    for filename in os.listdir(user_dir):
+        if not filename.endswith('.json'):
+            continue
+        stat = os.stat(os.path.join(user_dir, filename))
+        sources.append({
+            'game_key': f"local:{filename}",
+            'stamp': f"{stat.st_mtime_ns}:{stat.st_size}",
+            'source': 'local',
+            'game_name': None,
+            'load': lambda filename=filename: _load_saved_game_for_season(username, filename)
+        })
+
+    try:
+        if supabase_manager and supabase_manager.is_connected():
+            user_id = session.get('user_id')
+            if not user_id:
+                user = supabase_manager.get_user_by_username(username)
+                user_id = user['id'] if user else None
+            if user_id:
+                for row in supabase_manager.get_user_game_session_stamps(user_id):
+                    session_row_id = row.get('id')
+                    sources.append({
+                        'game_key': f"supabase:{session_row_id}",
+                        'stamp': str(row.get('updated_at') or row.get('created_at') or ''),
+                        'source': 'supabase',
+                        'game_name': row.get('session_name'),
+                        'opponent': row.get('opponent') or '',
+                        'date': row.get('game_date') or '',
+                        'saved_at': row.get('updated_at') or row.get('created_at') or '',
+                        'load': lambda session_row_id=session_row_id: (supabase_manager.get_session_by_id(session_row_id) or {}).get('box_stats')
+                    })
+    except Exception as e:
+        print(f"Error listing Supabase games for season rollup: {e}")
+    return sources
+
+def _load_saved_game_for_season(username, filename):
+    """Saved game file contents with the file's name/saved_at metadata folded in"""
+    game_file, error = load_game_data(username, filename)
+    if error or not isinstance(game_file, dict):
+        return None
+    game_data = dict(game_file.get('game_data', game_file))
+    game_info = dict(game_data.get('game_info') or {})
+    game_info.setdefault('name', game_file.get('game_name') or filename[:-len('.json')])
+    game_data['game_info'] = game_info
+    game_data['saved_at'] = game_file.get('saved_at', '')
+    return game_data
+
+@app.route('/box_stats/season', methods=['GET'])
+@login_required
+def get_season_rollup():
+    """Season, per-opponent, per-game, player and play call rollups across the user's saved games"""
+    try:
+        if not season_cache:
+            return jsonify({'error': 'Season rollups are not available'}), 500
+
+        username = session.get('username', 'anonymous')
+        sources = season_game_sources(username)
+        summaries, refreshed = season_cache.get_summaries(username, sources)
+
+        phase = request.args.get('phase', '').strip().lower() or None
+        opponent = request.args.get('opponent', '').strip().lower()
+        if opponent:
+            summaries = [s for s in summaries if str(s.get('opponent', '')).strip().lower() == opponent]
+
+        rollup = season_rollup(summaries, phase=phase)
+        rollup['summaries_refreshed'] = refreshed
+        return jsonify({'success': True, **rollup})
+    except Exception as e:
+        print(f"Error building season rollup: {e}")
+        return jsonify({'error': f'Error building season rollup: {str(e)}'}), 500
+
+def _rule_comparison(counters, phase):
+    """Current vs what-if metrics for one phase or play call, with the change in each rate"""
+    current = situation_metrics(counters['current'], phase)
+    what_if = situation_metrics(counters['what_if'], phase)
+    delta = {field: round(what_if[field] - current[field], 1)
+             for field in ('efficiency_rate', 'explosive_rate', 'negative_rate', 'nee_score')}
+    return {'current': current, 'what_if': what_if, 'delta': delta}
+
+@app.route('/box_stats/what_if', methods=['POST'])
+@login_required
+def what_if_rules():
+    """Re-score the current game or the whole season under alternate efficiency/explosive/negative rules"""
+    try:
+        if RuleConfig is None:
+            return jsonify({'error': 'What-if rule evaluation is not available'}), 500
+
+        data = request.get_json() or {}
+        try:
+            rules = RuleConfig.from_dict(data.get('rules'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        scope = data.get('scope', 'game')
+
+        if scope == 'season':
+            if not season_cache:
+                return jsonify({'error': 'Season rollups are not available'}), 500
+            username = session.get('username', 'anonymous')
+            summaries, _ = season_cache.get_summaries(username, season_game_sources(username))
+            summaries = dedupe_summaries(summaries)
+            columns = concat_columns([s.get('play_columns') or {} for s in summaries])
+            labels = [label for s in summaries for label in s.get('play_call_labels', [])]
+            games = len(summaries)
+        elif scope == 'game':
+            session_id = session.get('server_session_id')
+            if not session_id:
+                return jsonify({'error': 'No active session found'}), 400
+            plays = server_session.load_session_data(session_id).get('box_stats', {}).get('plays', [])
+            columns = play_columns(plays)
+            labels = [str(play.get('play_call') or '') for play in plays]
+            games = 1
+        else:
+            return jsonify({'error': "scope must be 'game' or 'season'"}), 400
+
+        comparison = compare_rules(columns, rules, groups=labels)
+        return jsonify({
+            'success': True,
+            'scope': scope,
+            'games': games,
+            'total_plays': len(columns['down']),
+            'rules': {'current': RuleConfig().to_dict(), 'what_if': rules.to_dict()},
+            'phases': {phase: _rule_comparison(counters, phase) for phase, counters in comparison['phases'].items()},
+            'changed_plays': comparison['changed'],
+            'play_calls': {
+                phase: {call: _rule_comparison(counters, phase) for call, counters in calls.items() if call}
+                for phase, calls in comparison['groups'].items()
+            }
+        })
+    except Exception as e:
+        print(f"Error evaluating what-if rules: {e}")
+        return jsonify({'error': f'Error evaluating what-if rules: {str(e)}'}), 500
+
 @app.route('/box_stats/load_game', methods=['POST'])
 @login_required
 def load_saved_game():
@@ -5289,68 +5775,11 @@ def load_saved_game():
         print(f"DEBUG LOAD: Final box_stats plays count: {len(box_stats_data['box_stats']['plays'])}")
         print(f"DEBUG LOAD: Final box_stats players count: {len(box_stats_data['box_stats']['players'])}")
         
-        # Apply backward compatibility for loaded game data
-        # Convert old team_stats format to new phase-specific format if needed
-        if 'team_stats' in box_stats_data['box_stats']:
-            team_stats = box_stats_data['box_stats']['team_stats']
-            
-            # Check if this is old format (has direct stats) vs new format (has phases)
-            if 'total_plays' in team_stats and 'offense' not in team_stats:
-                # Old format - convert to new phase-specific format
-                old_stats = dict(team_stats)  # Copy old stats
-                box_stats_data['box_stats']['team_stats'] = {
-                    'offense': old_stats,
-                    'defense': {
-                        'total_plays': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0,
-                        'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'interceptions': 0,
-                        'efficiency_rate': 0.0, 'explosive_rate': 0.0, 'negative_rate': 0.0,
-                        'nee_score': 0.0, 'avg_yards_per_play': 0.0, 'success_rate': 0.0,
-                        'nee_progression': [], 'efficiency_progression': [], 'explosive_progression': []
-                    },
-                    'special_teams': {
-                        'total_plays': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0,
-                        'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'interceptions': 0,
-                        'efficiency_rate': 0.0, 'explosive_rate': 0.0, 'negative_rate': 0.0,
-                        'nee_score': 0.0, 'avg_yards_per_play': 0.0, 'success_rate': 0.0,
-                        'nee_progression': [], 'efficiency_progression': [], 'explosive_progression': []
-                    },
-                    'overall': old_stats
-                }
-            
-            # Ensure all advanced analytics fields exist in all phases
-            required_team_fields = {
-                'negative_plays': 0, 'efficiency_rate': 0.0, 'explosive_rate': 0.0, 'negative_rate': 0.0,
-                'nee_score': 0.0, 'avg_yards_per_play': 0.0, 'success_rate': 0.0,
-                'nee_progression': [], 'efficiency_progression': [], 'avg_yards_progression': []
-            }
-            
-            all_phases = ['offense', 'defense', 'special_teams', 'overall']
-            for phase in all_phases:
-                if phase in box_stats_data['box_stats']['team_stats']:
-                    for field, default_value in required_team_fields.items():
-                        if field not in box_stats_data['box_stats']['team_stats'][phase]:
-                            box_stats_data['box_stats']['team_stats'][phase][field] = default_value
-        
-        # Ensure all advanced analytics fields exist in loaded player stats
-        if 'players' in box_stats_data['box_stats']:
-            required_player_fields = {
-                'negative_plays': 0,
-                'efficiency_rate': 0.0,
-                'explosive_rate': 0.0,
-                'negative_rate': 0.0,
-                'nee_score': 0.0,
-                'nee_progression': [],
-                'efficiency_progression': [],
-                'explosive_progression': []
-            }
-            
-            for player_key, player_data in box_stats_data['box_stats']['players'].items():
-                for field, default_value in required_player_fields.items():
-                    if field not in player_data:
-                        player_data[field] = default_value
+        # Games saved under an older schema are upgraded before they become the session
+        migrate_session(box_stats_data)
         
-        # Save the loaded game data to server-side session
-        server_session.save_session_data(session_id, box_stats_data)
+        # Save the loaded game data to server-side session, replacing what was there
+        server_session.save_session_data(session_id, box_stats_data, overwrite=True)
         
         return jsonify({
             'success': True,
@@ -5359,10 +5788,12 @@ def load_saved_game():
                 'game_info': actual_game_data.get('game_info', {}),
                 'total_plays': len(actual_game_data.get('plays', [])),
                 'total_players': len(actual_game_data.get('players', {})),
-                'team_stats': actual_game_data.get('team_stats', {})
+                'team_stats': box_stats_data['box_stats']['team_stats']
             }
         })
         
+    except SessionConflict as e:
+        return jsonify({'error': str(e), 'conflict': True}), 409
     except Exception as e:
         return jsonify({'error': f'Error loading game: {str(e)}'}), 500
 
@@ -5389,6 +5820,19 @@ def delete_saved_game():
         print(f"Error deleting saved game: {str(e)}")
         return jsonify({'success': False, 'error': str(e)})
 
+def shift_situation_flags(box_stats, play_index, delta):
+    """Renumber situation flags after a play was removed (delta=-1) or reinserted (delta=1) at play_index"""
+    flags = box_stats.get('situation_flags')
+    if not flags:
+        return
+    shifted = {}
+    for key, flag in flags.items():
+        index = int(key)
+        if delta < 0 and index == play_index:
+            continue
+        shifted[str(index + delta if index >= play_index else index)] = flag
+    box_stats['situation_flags'] = shifted
+
 @app.route('/box_stats/edit_play', methods=['POST'])
 @login_required
 def edit_play():
@@ -5406,17 +5850,6 @@ def edit_play():
         if not session_id:
             return jsonify({'success': False, 'error': 'No active session found'})
         
-        # Load current box stats from server-side storage
-        box_stats_data = server_session.load_session_data(session_id)
-        box_stats = box_stats_data.get('box_stats', {'plays': []})
-        
-        # Validate play index
-        if play_index < 0 or play_index >= len(box_stats.get('plays', [])):
-            return jsonify({'success': False, 'error': 'Invalid play index'})
-        
-        # Store original play for comparison
-        original_play = box_stats['plays'][play_index].copy()
-
         # Sanitize key fields
         if isinstance(play_data.get('play_call', None), str):
             play_data['play_call'] = play_data['play_call'].strip()
@@ -5431,30 +5864,69 @@ def edit_play():
                 else:
                     dst[k] = v
             return dst
-
-        print(f"DEBUG EDIT: Incoming play_call: {play_data.get('play_call')} (index {play_index})")
-        merged_play = deep_merge(original_play, play_data or {})
-
-        # If players_involved provided as a non-empty list, replace; if empty or omitted, keep existing
-        if 'players_involved' in play_data and isinstance(play_data['players_involved'], list):
-            if len(play_data['players_involved']) > 0:
-                merged_play['players_involved'] = play_data['players_involved']
-
-        box_stats['plays'][play_index] = merged_play
-        print(f"DEBUG EDIT: Saved play_call: {box_stats['plays'][play_index].get('play_call')} (index {play_index})")
         
-        # Recalculate all stats since play data changed
-        recalculate_all_stats(box_stats)
+        def apply(box_stats_data):
+            """Edit the play on the loaded session; re-run on fresh data if another save wins"""
+            loaded_version = box_stats_data.get('version', 0)
+            box_stats = box_stats_data.get('box_stats', {'plays': []})
+            
+            # Validate play index
+            if play_index < 0 or play_index >= len(box_stats.get('plays', [])):
+                return False, (loaded_version, jsonify({'success': False, 'error': 'Invalid play index'}), None)
+            
+            # Store original play for comparison
+            original_play = copy.deepcopy(box_stats['plays'][play_index])
+            journal_before_play = copy.deepcopy(box_stats['plays'][play_index])
+            
+            print(f"DEBUG EDIT: Incoming play_call: {play_data.get('play_call')} (index {play_index})")
+            merged_play = deep_merge(original_play, copy.deepcopy(play_data))
+            
+            # If players_involved provided as a non-empty list, replace; if empty or omitted, keep existing
+            if 'players_involved' in play_data and isinstance(play_data['players_involved'], list):
+                if len(play_data['players_involved']) > 0:
+                    merged_play['players_involved'] = copy.deepcopy(play_data['players_involved'])
+            
+            # The edited play goes back into the engine, so it is held to the same schema as add_play
+            try:
+                canonical_play = validate_play(merged_play)
+            except PlayValidationError as e:
+                return False, (loaded_version, (jsonify({'success': False, 'error': f'Invalid play: {e}',
+                                                         'errors': e.errors}), 400), None)
+            # Keys outside the schema (game_id, ...) stay on the stored play
+            merged_play = {**canonical_play, **{k: v for k, v in merged_play.items()
+                                                if k not in canonical_play and k != 'players'}}
+            
+            previous_play = box_stats['plays'][play_index]
+            box_stats['plays'][play_index] = merged_play
+            update_play_postings(box_stats, PLAY_INDEX_DIMENSIONS, play_index)
+            cube_replace_play(box_stats, SITUATION_CUBE_DIMENSIONS, play_outcome, previous_play, merged_play)
+            resegment_from(box_stats, play_outcome, play_index)
+            situation_chain = recheck_situations(box_stats, play_index)
+            play_journal.record(box_stats_data, play_journal.edit_play_entry(play_index, journal_before_play, merged_play))
+            print(f"DEBUG EDIT: Saved play_call: {box_stats['plays'][play_index].get('play_call')} (index {play_index})")
+            
+            # Recalculate all stats since play data changed
+            recalculate_all_stats(box_stats)
+            rebuild_player_index(box_stats)
+            box_stats_data['box_stats'] = box_stats
+            return True, (loaded_version, None, situation_chain)
         
-        # Save updated box stats to server-side storage
-        box_stats_data['box_stats'] = box_stats
-        server_session.save_session_data(session_id, box_stats_data)
+        # Edits from concurrent requests are serialized by the session lock and retried on the newer session
+        box_stats_data, (loaded_version, error, situation_chain) = server_session.update_session_data(session_id, apply)
+        if error:
+            return error
+        box_stats = box_stats_data['box_stats']
+        publish_box_stats_change(session_id, box_stats_data, 'play_edited', play_index, loaded_version)
         
         return jsonify({
             'success': True, 
-            'message': f'Play #{play_data.get("play_number", play_index + 1)} updated successfully'
+            'message': f'Play #{play_data.get("play_number", play_index + 1)} updated successfully',
+            'situation_mismatches': situation_chain['mismatches'],
+            'next_situation': box_stats.get('next_situation', {})
         })
         
+    except SessionConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'conflict': True}), 409
     except Exception as e:
         print(f"Error editing play: {str(e)}")
         return jsonify({'success': False, 'error': str(e)})
@@ -5475,32 +5947,263 @@ def delete_play():
         if not session_id:
             return jsonify({'success': False, 'error': 'No active session found'})
         
-        # Load current box stats from server-side storage
-        box_stats_data = server_session.load_session_data(session_id)
-        box_stats = box_stats_data.get('box_stats', {'plays': []})
+        def apply(box_stats_data):
+            """Delete the play from the loaded session; re-run on fresh data if another save wins"""
+            loaded_version = box_stats_data.get('version', 0)
+            box_stats = box_stats_data.get('box_stats', {'plays': []})
+            
+            # Validate play index
+            if play_index < 0 or play_index >= len(box_stats.get('plays', [])):
+                return False, (loaded_version, None, None)
+            
+            # Remove the play
+            deleted_play = box_stats['plays'].pop(play_index)
+            remove_play_postings(box_stats, PLAY_INDEX_DIMENSIONS, play_index)
+            cube_remove_play(box_stats, SITUATION_CUBE_DIMENSIONS, play_outcome, deleted_play)
+            resegment_from(box_stats, play_outcome, play_index, len(box_stats['plays']) + 1)
+            shift_situation_flags(box_stats, play_index, -1)
+            # The play before the gap now leads into the one after it
+            situation_chain = recheck_situations(box_stats, play_index - 1) if play_index > 0 else None
+            play_journal.record(box_stats_data, play_journal.delete_play_entry(play_index, deleted_play))
+            
+            # Recalculate all stats since play was removed
+            recalculate_all_stats(box_stats)
+            rebuild_player_index(box_stats)
+            box_stats_data['box_stats'] = box_stats
+            return True, (loaded_version, deleted_play, situation_chain)
         
-        # Validate play index
-        if play_index < 0 or play_index >= len(box_stats.get('plays', [])):
+        # Serialized with other writers by the session lock, retried on the newer session
+        box_stats_data, (loaded_version, deleted_play, situation_chain) = server_session.update_session_data(session_id, apply)
+        if deleted_play is None:
             return jsonify({'success': False, 'error': 'Invalid play index'})
+        box_stats = box_stats_data['box_stats']
+        publish_box_stats_change(session_id, box_stats_data, 'play_deleted', play_index, loaded_version)
         
-        # Remove the play
-        deleted_play = box_stats['plays'].pop(play_index)
+        return jsonify({
+            'success': True, 
+            'message': f'Play #{deleted_play.get("play_number", play_index + 1)} deleted successfully',
+            'situation_mismatches': situation_chain['mismatches'] if situation_chain else [],
+            'next_situation': box_stats.get('next_situation', {})
+        })
         
-        # Recalculate all stats since play was removed
+    except SessionConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'conflict': True}), 409
+    except Exception as e:
+        print(f"Error deleting play: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)})
+
+def apply_journal_entry(box_stats_data, entry, undo, player_box_stats=None):
+    """Apply or invert a journal entry and bring the derived stats and indexes back in line.
+    
+    Manual player edits live in the cookie session, like update_player_stats itself;
+    they are applied to player_box_stats, which the caller writes back once saved.
+    """
+    if entry['op'] == 'update_player_stats':
+        if player_box_stats is None:
+            raise play_journal.JournalConflict('player stats are no longer in this session')
+        play_journal.apply_play_change(player_box_stats, entry, undo)
+        return
+    
+    box_stats = box_stats_data.setdefault('box_stats', {'plays': []})
+    play_journal.apply_play_change(box_stats, entry, undo)
+    
+    if entry['op'] == 'add_play':
+        # Only the last play moves; its rows were restored from the journal
+        if undo:
+            unindex_last_play(box_stats, entry['index'])
+            remove_play_postings(box_stats, PLAY_INDEX_DIMENSIONS, entry['index'])
+            cube_remove_play(box_stats, SITUATION_CUBE_DIMENSIONS, play_outcome, entry['play'])
+            resegment_from(box_stats, play_outcome, entry['index'], entry['index'] + 1)
+        else:
+            index_new_play(box_stats)
+            index_play_postings(box_stats, PLAY_INDEX_DIMENSIONS)
+            cube_add_play(box_stats, SITUATION_CUBE_DIMENSIONS, play_outcome)
+            drives_add_play(box_stats, play_outcome)
+    else:
+        # Edits and deletes recompute, exactly as edit_play/delete_play do
+        index = entry['index']
+        if entry['op'] == 'edit_play':
+            recheck_situations(box_stats, index)
+        else:
+            # Undoing a delete puts the play back; redoing removes it again
+            shift_situation_flags(box_stats, index, 1 if undo else -1)
+            recheck_situations(box_stats, index if undo else index - 1)
         recalculate_all_stats(box_stats)
+        rebuild_player_index(box_stats)
+        rebuild_play_postings(box_stats, PLAY_INDEX_DIMENSIONS)
+        rebuild_cube(box_stats, SITUATION_CUBE_DIMENSIONS, play_outcome)
+        rebuild_drives(box_stats, play_outcome)
+
+def step_journal(undo):
+    """Shared body of /box_stats/undo and /box_stats/redo"""
+    action = 'undo' if undo else 'redo'
+    try:
+        session_id = session.get('server_session_id')
+        if not session_id:
+            return jsonify({'success': False, 'error': 'No active session found'})
         
-        # Save updated box stats to server-side storage
-        box_stats_data['box_stats'] = box_stats
-        server_session.save_session_data(session_id, box_stats_data)
+        player_box_stats = {}
+        
+        def apply(box_stats_data):
+            """Step the journal on the loaded session; re-run on fresh data if another save wins"""
+            loaded_version = box_stats_data.get('version', 0)
+            journal = play_journal.get_journal(box_stats_data)
+            source, target = (journal['undo'], journal['redo']) if undo else (journal['redo'], journal['undo'])
+            if not source:
+                return False, (loaded_version, None, jsonify({'success': False, 'error': f'Nothing to {action}'}))
+            
+            entry = source[-1]
+            # A retry starts again from the cookie's player stats, not a half-applied copy
+            player_box_stats.clear()
+            if entry['op'] == 'update_player_stats' and 'box_stats' in session:
+                player_box_stats.update(copy.deepcopy(session['box_stats']))
+            try:
+                apply_journal_entry(box_stats_data, entry, undo, player_box_stats or None)
+            except play_journal.JournalConflict as conflict:
+                # The session moved on without the journal; drop it rather than apply stale deltas
+                play_journal.clear(box_stats_data)
+                return True, (loaded_version, None, (jsonify({'success': False, 'error': f'Cannot {action}: {conflict}',
+                                                              'journal_cleared': True}), 409))
+            
+            source.pop()
+            target.append(entry)
+            return True, (loaded_version, entry, None)
+        
+        box_stats_data, (loaded_version, entry, error) = server_session.update_session_data(session_id, apply)
+        if error:
+            return error
+        if entry['op'] == 'update_player_stats':
+            session['box_stats'] = player_box_stats
+            session.modified = True
+        else:
+            publish_box_stats_change(session_id, box_stats_data, f"play_{action}", entry.get('index'), loaded_version)
+        journal = play_journal.get_journal(box_stats_data)
         
         return jsonify({
-            'success': True, 
-            'message': f'Play #{deleted_play.get("play_number", play_index + 1)} deleted successfully'
+            'success': True,
+            'action': action,
+            'op': entry['op'],
+            'play_index': entry.get('index'),
+            'version': box_stats_data.get('version'),
+            'can_undo': bool(journal['undo']),
+            'can_redo': bool(journal['redo'])
         })
         
+    except SessionConflict as e:
+        return jsonify({'success': False, 'error': str(e), 'conflict': True}), 409
     except Exception as e:
-        print(f"Error deleting play: {str(e)}")
-        return jsonify({'success': False, 'error': str(e)})
+        print(f"Error during {action}: {str(e)}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/box_stats/undo', methods=['POST'])
+@login_required
+def undo_last_change():
+    """Undo the most recent add/edit/delete/player stat update"""
+    return step_journal(undo=True)
+
+@app.route('/box_stats/redo', methods=['POST'])
+@login_required
+def redo_last_change():
+    """Redo the most recently undone change"""
+    return step_journal(undo=False)
+
+def publish_box_stats_change(session_id, box_stats_data, event_type, play_index=None, since_version=0):
+    """Push a compact change event to live viewers of a game session.
+    
+    Carries the affected play, team aggregates, the player rows changed after
+    since_version and the next situation; progression counters are left out.
+    """
+    if not live_broker:
+        return
+    try:
+        box_stats = box_stats_data.get('box_stats', {})
+        version = box_stats_data.get('version', 0)
+        row_versions = box_stats_data.get('row_versions') or {}
+        player_versions = row_versions.get('players', {})
+        plays = box_stats.get('plays', [])
+        
+        def compact(row):
+            return {k: v for k, v in row.items() if k != 'progression_counters'}
+        
+        event = {
+            'type': event_type,
+            'version': version,
+            'play_index': play_index,
+            'play': plays[play_index] if event_type != 'play_deleted' and play_index is not None and 0 <= play_index < len(plays) else None,
+            'play_count': len(plays),
+            'team_stats': {phase: compact(stats) for phase, stats in box_stats.get('team_stats', {}).items() if isinstance(stats, dict)},
+            'players': {
+                str(key): compact(row) for key, row in box_stats.get('players', {}).items()
+                if player_versions.get(str(key), [None, version])[1] > since_version
+            },
+            'removed_players': [key for key, removed_at in row_versions.get('removed_players', {}).items() if removed_at > since_version],
+            'next_situation': box_stats.get('next_situation', {})
+        }
+        live_broker.publish(session_id, event)
+    except Exception as e:
+        print(f"Live update publish failed for {session_id}: {e}")
+
+def can_watch_session(session_id):
+    """The caller's own session, or one saved under the caller's username"""
+    if session_id == session.get('server_session_id'):
+        return True
+    username = session.get('username')
+    if not username:
+        return False
+    # Only the owner is looked up, so a viewer never loads (or migrates) the whole session
+    return server_session.session_owner(session_id) == username
+
+@app.route('/box_stats/stream', methods=['GET'])
+@login_required
+def stream_box_stats():
+    """Server-Sent Events stream of play changes for a game session.
+    
+    Viewers on other devices pass ?session_id=<id> of the session being
+    recorded; only its owner may watch it. The event id is the session
+    version, so EventSource resumes via Last-Event-ID after the periodic
+    reconnect. A worker serves at most LIVE_STREAM_LIMIT streams at once;
+    past that the viewer gets a 503 with Retry-After.
+    """
+    session_id = request.args.get('session_id') or session.get('server_session_id')
+    if not session_id or not live_broker:
+        return jsonify({'error': 'Live updates are not available'}), 404
+    if not can_watch_session(session_id):
+        return jsonify({'error': 'Access denied'}), 403
+    
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID') or request.args.get('last_event_id'))
+    except (TypeError, ValueError):
+        last_event_id = None
+    
+    if not live_stream_slots.acquire(blocking=False):
+        return jsonify({'error': 'Too many live viewers on this server, try again shortly'}), 503, {'Retry-After': '5'}
+    try:
+        subscription = live_broker.subscribe(session_id, last_event_id)
+    except Exception:
+        live_stream_slots.release()
+        raise
+    
+    def generate():
+        try:
+            yield 'retry: 2000\n\n'
+            deadline = datetime.now() + timedelta(seconds=LIVE_STREAM_SECONDS)
+            while datetime.now() < deadline:
+                remaining = (deadline - datetime.now()).total_seconds()
+                event = subscription.get(timeout=max(0.1, min(LIVE_HEARTBEAT_SECONDS, remaining)))
+                if event is None:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"id: {event.get('version', '')}\nevent: {event.get('type', 'message')}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            subscription.close()
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Runs even when the client leaves before the first event is sent
+    response.call_on_close(live_stream_slots.release)
+    return response
 
 def load_box_stats_data(username):
     """Load box stats data from session storage"""
@@ -5512,21 +6215,7 @@ def load_box_stats_data(username):
         
         # Load session data from server-side storage
         box_stats_data = server_session.load_session_data(session_id)
-        return box_stats_data.get('box_stats', {
-            'plays': [],
-            'players': {},
-            'team_stats': {
-                'offense': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'passing_yards': 0, 'rushing_yards': 0, 'passing_plays': 0, 'rushing_plays': 0, 'passing_efficient_plays': 0, 'passing_explosive_plays': 0, 'passing_negative_plays': 0, 'rushing_efficient_plays': 0, 'rushing_explosive_plays': 0, 'rushing_negative_plays': 0, 'progression': []},
-                'defense': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'passing_yards': 0, 'rushing_yards': 0, 'passing_plays': 0, 'rushing_plays': 0, 'passing_efficient_plays': 0, 'passing_explosive_plays': 0, 'passing_negative_plays': 0, 'rushing_efficient_plays': 0, 'rushing_explosive_plays': 0, 'rushing_negative_plays': 0, 'progression': []},
-                'special_teams': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'progression': []},
-                'overall': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'passing_yards': 0, 'rushing_yards': 0, 'passing_plays': 0, 'rushing_plays': 0, 'passing_efficient_plays': 0, 'passing_explosive_plays': 0, 'passing_negative_plays': 0, 'rushing_efficient_plays': 0, 'rushing_explosive_plays': 0, 'rushing_negative_plays': 0, 'progression': []}
-            },
-            'play_call_stats': {
-                'offense': {},
-                'defense': {},
-                'special_teams': {}
-            }
-        })
+        return box_stats_data.get('box_stats') or new_box_stats()
         
     except Exception as e:
         print(f"Error loading box stats data: {str(e)}")
@@ -5549,9 +6238,6 @@ def save_box_stats_data(username, box_stats):
         # Save back to session storage
         server_session.save_session_data(session_id, box_stats_data)
         
-        # Also save to database for persistence
-        db_manager.save_user_session(username, session_id, box_stats_data)
-        
         # Comprehensive backup of all user data
         if backup_all_user_data:
             try:
@@ -5569,13 +6255,8 @@ def save_box_stats_data(username, box_stats):
 def recalculate_all_stats(box_stats):
     """Recalculate all statistics from scratch based on current plays"""
     try:
-        # Reset all stats to initial state
-        box_stats['team_stats'] = {
-            'offense': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'passing_yards': 0, 'rushing_yards': 0, 'passing_plays': 0, 'rushing_plays': 0, 'passing_efficient_plays': 0, 'passing_explosive_plays': 0, 'passing_negative_plays': 0, 'rushing_efficient_plays': 0, 'rushing_explosive_plays': 0, 'rushing_negative_plays': 0, 'progression': []},
-            'defense': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'passing_yards': 0, 'rushing_yards': 0, 'passing_plays': 0, 'rushing_plays': 0, 'passing_efficient_plays': 0, 'passing_explosive_plays': 0, 'passing_negative_plays': 0, 'rushing_efficient_plays': 0, 'rushing_explosive_plays': 0, 'rushing_negative_plays': 0, 'progression': []},
-            'special_teams': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'progression': []},
-            'overall': {'total_plays': 0, 'total_yards': 0, 'touchdowns': 0, 'turnovers': 0, 'first_downs': 0, 'efficient_plays': 0, 'explosive_plays': 0, 'negative_plays': 0, 'passing_yards': 0, 'rushing_yards': 0, 'passing_plays': 0, 'rushing_plays': 0, 'passing_efficient_plays': 0, 'passing_explosive_plays': 0, 'passing_negative_plays': 0, 'rushing_efficient_plays': 0, 'rushing_explosive_plays': 0, 'rushing_negative_plays': 0, 'progression': []}
-        }
+        # Reset all stats to initial state (every schema v1 counter, as add_play maintains them)
+        box_stats['team_stats'] = {phase: team_stats_row() for phase in TEAM_PHASES}
         
         # Reset player stats
         box_stats['players'] = {}
@@ -5925,6 +6606,10 @@ def recalculate_all_stats(box_stats):
         update_team_rates(box_stats['team_stats']['special_teams'], 'special_teams')
         update_team_rates(box_stats['team_stats']['overall'], 'overall')
         
+        # Success rate as add_play keeps it: (efficient + explosive) rate, capped at 100%
+        for stats in box_stats['team_stats'].values():
+            stats['success_rate'] = round(min(100.0, stats['efficiency_rate'] + stats['explosive_rate']), 1)
+        
         print(f"Recalculated stats for {len(box_stats.get('plays', []))} plays")
         
     except Exception as e:
@@ -5946,10 +6631,10 @@ def get_player_nee_progression(player_number):
         box_stats = box_stats_data.get('box_stats', {})
         players = box_stats.get('players', {})
         # Resolve by key, number, or name
-        key, player_data = _resolve_player(players, str(player_number))
+        key, player_data = _resolve_player(players, str(player_number), box_stats)
         if not player_data:
             return jsonify({'error': 'Player not found', 'requested': str(player_number), 'available_keys': list(players.keys())}), 404
-        nee_progression = player_data.get('nee_progression', [])
+        nee_progression = derive_progression(player_data, 'nee', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -5980,7 +6665,7 @@ def get_team_nee_progression():
         
         # Use overall team stats for progression (combines all phases)
         overall_stats = team_stats.get('overall', {})
-        nee_progression = overall_stats.get('nee_progression', [])
+        nee_progression = derive_progression(overall_stats, 'nee', **progression_query_options())
         
         print(f"DEBUG TEAM NEE ENDPOINT: Found {len(nee_progression)} NEE progression entries")
         print(f"DEBUG TEAM NEE ENDPOINT: Overall stats keys: {list(overall_stats.keys())}")
@@ -6011,10 +6696,10 @@ def get_player_efficiency_progression(player_number):
         box_stats = box_stats_data.get('box_stats', {})
         players = box_stats.get('players', {})
         # Resolve by key, number, or name
-        key, player_data = _resolve_player(players, str(player_number))
+        key, player_data = _resolve_player(players, str(player_number), box_stats)
         if not player_data:
             return jsonify({'error': 'Player not found', 'requested': str(player_number), 'available_keys': list(players.keys())}), 404
-        efficiency_progression = player_data.get('efficiency_progression', [])
+        efficiency_progression = derive_progression(player_data, 'efficiency', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6045,7 +6730,7 @@ def get_team_efficiency_progression():
         
         # Use overall team stats for progression (combines all phases)
         overall_stats = team_stats.get('overall', {})
-        efficiency_progression = overall_stats.get('efficiency_progression', [])
+        efficiency_progression = derive_progression(overall_stats, 'efficiency', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6074,7 +6759,7 @@ def get_team_explosive_progression():
         
         # Use overall team stats for progression (combines all phases)
         overall_stats = team_stats.get('overall', {})
-        explosive_progression = overall_stats.get('explosive_progression', [])
+        explosive_progression = derive_progression(overall_stats, 'explosive', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6103,7 +6788,7 @@ def get_phase_nee_progression(phase):
         
         # Get phase-specific stats
         phase_stats = team_stats.get(phase, {})
-        nee_progression = phase_stats.get('nee_progression', [])
+        nee_progression = derive_progression(phase_stats, 'nee', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6132,7 +6817,7 @@ def get_phase_efficiency_progression(phase):
         
         # Get phase-specific stats
         phase_stats = team_stats.get(phase, {})
-        efficiency_progression = phase_stats.get('efficiency_progression', [])
+        efficiency_progression = derive_progression(phase_stats, 'efficiency', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6161,7 +6846,7 @@ def get_phase_explosive_progression(phase):
         
         # Get phase-specific stats
         phase_stats = team_stats.get(phase, {})
-        explosive_progression = phase_stats.get('explosive_progression', [])
+        explosive_progression = derive_progression(phase_stats, 'explosive', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6188,10 +6873,10 @@ def get_player_explosive_progression(player_number):
         box_stats = box_stats_data.get('box_stats', {})
         players = box_stats.get('players', {})
         # Resolve by key, number, or name
-        key, player_data = _resolve_player(players, str(player_number))
+        key, player_data = _resolve_player(players, str(player_number), box_stats)
         if not player_data:
             return jsonify({'error': 'Player not found', 'requested': str(player_number), 'available_keys': list(players.keys())}), 404
-        explosive_progression = player_data.get('explosive_progression', [])
+        explosive_progression = derive_progression(player_data, 'explosive', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6222,7 +6907,7 @@ def get_team_avg_yards_progression():
         
         # Use overall team stats for progression (combines all phases)
         overall_stats = team_stats.get('overall', {})
-        avg_yards_progression = overall_stats.get('avg_yards_progression', [])
+        avg_yards_progression = derive_progression(overall_stats, 'avg_yards', **progression_query_options())
         
         return jsonify({
             'success': True,
@@ -6234,6 +6919,127 @@ def get_team_avg_yards_progression():
     except Exception as e:
         return jsonify({'error': f'Error getting team avg yards progression: {str(e)}'}), 500
 
+# Current-value field for each progression metric
+PROGRESSION_CURRENT_FIELDS = {
+    'nee': 'nee_score',
+    'efficiency': 'efficiency_rate',
+    'explosive': 'explosive_rate',
+    'avg_yards': 'avg_yards_per_play'
+}
+
+def parse_progression_specs(raw_specs):
+    """Normalize series specs given as dicts or 'scope:target:metric' strings"""
+    specs = []
+    if isinstance(raw_specs, str):
+        raw_specs = [part for part in raw_specs.split(',') if part.strip()]
+    for raw in raw_specs or []:
+        if isinstance(raw, str):
+            parts = [part.strip() for part in raw.split(':')]
+            if len(parts) == 2:
+                parts = [parts[0], 'overall', parts[1]]
+            if len(parts) != 3:
+                specs.append({'error': f'Invalid series spec: {raw}'})
+                continue
+            raw = {'scope': parts[0], 'target': parts[1], 'metric': parts[2]}
+        if not isinstance(raw, dict):
+            specs.append({'error': f'Invalid series spec: {raw}'})
+            continue
+        specs.append({
+            'scope': str(raw.get('scope', 'team')).lower(),
+            'target': str(raw.get('target') or raw.get('phase') or raw.get('player') or 'overall'),
+            'metric': str(raw.get('metric', 'nee')).lower(),
+            'max_points': raw.get('max_points'),
+            'window': raw.get('window')
+        })
+    return specs
+
+def build_progression_series(box_stats, spec, default_options):
+    """Resolve one series spec against an already loaded box_stats blob"""
+    metric = spec['metric']
+    if metric not in PROGRESSION_METRICS:
+        return {**spec, 'error': f'Unknown metric: {metric}'}
+    
+    result = {'scope': spec['scope'], 'target': spec['target'], 'metric': metric}
+    if spec['scope'] in ('team', 'phase'):
+        stats = box_stats.get('team_stats', {}).get(spec['target'])
+        if not isinstance(stats, dict):
+            return {**result, 'error': f"Unknown phase: {spec['target']}"}
+    elif spec['scope'] == 'player':
+        players = box_stats.get('players', {})
+        key, stats = _resolve_player(players, spec['target'], box_stats)
+        if not stats:
+            return {**result, 'error': 'Player not found'}
+        result.update({
+            'player_key': key,
+            'player_number': spec['target'],
+            'player_name': stats.get('name', f"Player #{spec['target']}"),
+            'player_position': stats.get('position', '')
+        })
+    else:
+        return {**result, 'error': f"Unknown scope: {spec['scope']}"}
+    
+    options = dict(default_options)
+    for name in ('max_points', 'window'):
+        try:
+            if spec.get(name) is not None and int(spec[name]) > 0:
+                options[name] = int(spec[name])
+        except (TypeError, ValueError):
+            pass
+    
+    points = derive_progression(stats, metric, **options)
+    current = stats.get(PROGRESSION_CURRENT_FIELDS[metric])
+    if current is None:
+        current = points[-1][PROGRESSION_METRICS[metric][1]] if points else 0.0
+    
+    result.update({
+        'value_key': PROGRESSION_METRICS[metric][1],
+        'points': points,
+        'current': current,
+        'total_plays': stats.get('total_plays', 0)
+    })
+    return result
+
+@app.route('/box_stats/progressions', methods=['GET', 'POST'])
+@login_required
+def get_progressions():
+    """Return several progression series from a single session load.
+    
+    Series are given as a list of {scope, target, metric} specs in a JSON body
+    or as ?series=team:overall:nee,phase:offense:efficiency,player:12:explosive.
+    scope is team/phase (target = phase name) or player (target = key, number or name).
+    """
+    try:
+        session_id = session.get('server_session_id')
+        if not session_id:
+            return jsonify({'error': 'No active session'}), 404
+        
+        body = (request.get_json(silent=True) or {}) if request.method == 'POST' else {}
+        specs = parse_progression_specs(body.get('series') if body.get('series') is not None else request.args.get('series', ''))
+        if not specs:
+            return jsonify({'error': 'No series requested'}), 400
+        
+        default_options = progression_query_options()
+        for name in ('max_points', 'window'):
+            try:
+                if body.get(name) is not None and int(body[name]) > 0:
+                    default_options[name] = int(body[name])
+            except (TypeError, ValueError):
+                pass
+        
+        # One load for every requested series
+        box_stats_data = server_session.load_session_data(session_id)
+        box_stats = box_stats_data.get('box_stats', {})
+        
+        series = [spec if 'error' in spec else build_progression_series(box_stats, spec, default_options) for spec in specs]
+        
+        return jsonify({
+            'success': True,
+            'series': series
+        })
+        
+    except Exception as e:
+        return jsonify({'error': f'Error getting progressions: {str(e)}'}), 500
+
 @app.route('/box_stats/debug_team_data', methods=['GET'])
 @login_required
 def debug_team_data():
@@ -6251,12 +7057,12 @@ def debug_team_data():
             'session_id': session_id,
             'team_stats_keys': list(team_stats.keys()),
             'overall_keys': list(team_stats.get('overall', {}).keys()),
-            'overall_nee_progression_length': len(team_stats.get('overall', {}).get('nee_progression', [])),
-            'overall_explosive_progression_length': len(team_stats.get('overall', {}).get('explosive_progression', [])),
-            'overall_efficiency_progression_length': len(team_stats.get('overall', {}).get('efficiency_progression', [])),
+            'overall_nee_progression_length': len(derive_progression(team_stats.get('overall', {}), 'nee')),
+            'overall_explosive_progression_length': len(derive_progression(team_stats.get('overall', {}), 'explosive')),
+            'overall_efficiency_progression_length': len(derive_progression(team_stats.get('overall', {}), 'efficiency')),
             'total_plays': len(box_stats.get('plays', [])),
-            'sample_nee_data': team_stats.get('overall', {}).get('nee_progression', [])[:3],
-            'sample_explosive_data': team_stats.get('overall', {}).get('explosive_progression', [])[:3]
+            'sample_nee_data': derive_progression(team_stats.get('overall', {}), 'nee')[:3],
+            'sample_explosive_data': derive_progression(team_stats.get('overall', {}), 'explosive')[:3]
         }
         
         return jsonify({
@@ -6289,44 +7095,17 @@ def get_play_call_analytics():
         box_stats = box_stats_data.get('box_stats', {})
         play_call_stats = box_stats.get('play_call_stats', {})
         
-        # Handle both old format (flat) and new format (by phase)
-        offense_analytics = []
-        defense_analytics = []
-        special_teams_analytics = []
-        
-        # If old format, treat all as offense for backward compatibility
-        if isinstance(play_call_stats, dict) and any(key not in ['offense', 'defense', 'special_teams'] for key in play_call_stats.keys()):
-            # Old format - convert to offense analytics
-            for play_call, stats in play_call_stats.items():
-                if isinstance(stats, dict) and 'total_plays' in stats:
-                    offense_analytics.append({
-                        'play_call': play_call,
-                        **stats
-                    })
-        else:
-            # New format - separate by phase
-            for phase in ['offense', 'defense', 'special_teams']:
-                phase_stats = play_call_stats.get(phase, {})
-                phase_analytics = []
-                
-                for play_call, stats in phase_stats.items():
-                    phase_analytics.append({
-                        'play_call': play_call,
-                        **stats
-                    })
-                
-                # Sort by total plays descending
-                phase_analytics.sort(key=lambda x: x.get('total_plays', 0), reverse=True)
-                
-                if phase == 'offense':
-                    offense_analytics = phase_analytics
-                elif phase == 'defense':
-                    defense_analytics = phase_analytics
-                elif phase == 'special_teams':
-                    special_teams_analytics = phase_analytics
-        
-        # Sort offense analytics if from old format
-        offense_analytics.sort(key=lambda x: x.get('total_plays', 0), reverse=True)
+        # Stored play_call_stats is keyed by phase (session_schema)
+        analytics = {}
+        for phase in ['offense', 'defense', 'special_teams']:
+            phase_analytics = [{'play_call': play_call, **stats}
+                               for play_call, stats in play_call_stats.get(phase, {}).items()]
+            # Sort by total plays descending
+            phase_analytics.sort(key=lambda x: x.get('total_plays', 0), reverse=True)
+            analytics[phase] = phase_analytics
+        offense_analytics = analytics['offense']
+        defense_analytics = analytics['defense']
+        special_teams_analytics = analytics['special_teams']
         
         total_play_calls = len(offense_analytics) + len(defense_analytics) + len(special_teams_analytics)
         
@@ -6363,24 +7142,23 @@ class PDFExporter:
     
     def create_chart_image(self, chart_data, chart_type='bar', title='Chart'):
         """Create matplotlib chart and return as image buffer"""
-        plt.figure(figsize=(10, 6))
-        plt.clf()
+        fig = Figure(figsize=(10, 6))
+        ax = fig.subplots()
         
         if chart_type == 'bar':
-            plt.bar(chart_data.keys(), chart_data.values())
+            ax.bar(list(chart_data.keys()), list(chart_data.values()))
         elif chart_type == 'line':
-            plt.plot(list(chart_data.keys()), list(chart_data.values()), marker='o')
+            ax.plot(list(chart_data.keys()), list(chart_data.values()), marker='o')
         elif chart_type == 'pie':
-            plt.pie(chart_data.values(), labels=chart_data.keys(), autopct='%1.1f%%')
+            ax.pie(list(chart_data.values()), labels=list(chart_data.keys()), autopct='%1.1f%%')
         
-        plt.title(title)
-        plt.tight_layout()
+        ax.set_title(title)
+        fig.tight_layout()
         
         # Save to buffer
         img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
+        fig.savefig(img_buffer, format='png', dpi=300, bbox_inches='tight')
         img_buffer.seek(0)
-        plt.close()
         
         return img_buffer
     
@@ -6874,6 +7652,65 @@ class PDFExporter:
         story.append(analytics_table)
         
     
+    def export_drives(self, username, box_stats, drive_rows, drive_summary):
+        """Export the drive table with per-drive efficiency and NEE to PDF"""
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter)
+        story = []
+        
+        game_info = box_stats.get('game_info', {})
+        story.append(Paragraph(f"Drive Summary - {game_info.get('name', 'Game Report')}", self.title_style))
+        story.append(Spacer(1, 12))
+        
+        if not drive_rows:
+            story.append(Paragraph("No drives recorded", self.styles['Normal']))
+        
+        for phase in ['offense', 'defense']:
+            phase_rows = [row for row in drive_rows if row['phase'] == phase]
+            if not phase_rows:
+                continue
+            summary = drive_summary.get(phase, {})
+            story.append(Paragraph(f"{phase.title()} Drives", self.heading_style))
+            results = ', '.join(f"{result.replace('_', ' ')}: {count}" for result, count in summary.get('results', {}).items())
+            story.append(Paragraph(
+                f"{summary.get('drives', 0)} drives, {summary.get('avg_plays_per_drive', 0):.1f} plays and "
+                f"{summary.get('avg_yards_per_drive', 0):.1f} yards per drive, NEE {summary.get('nee_score', 0):.1f} ({results})",
+                self.styles['Normal']))
+            story.append(Spacer(1, 6))
+            
+            data = [['#', 'Start', 'End', 'Plays', 'Yards', 'Efficiency %', 'Explosive %', 'NEE', 'Result']]
+            for row in phase_rows:
+                data.append([
+                    str(row['number']),
+                    str(row.get('start_field_position') or ''),
+                    str(row.get('end_field_position') or ''),
+                    str(row['total_plays']),
+                    str(row['total_yards']),
+                    f"{row['efficiency_rate']:.1f}%",
+                    f"{row['explosive_rate']:.1f}%",
+                    f"{row['nee_score']:.1f}",
+                    (row.get('result') or 'in progress').replace('_', ' ').title()
+                ])
+            
+            drive_table = Table(data)
+            drive_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('FONTSIZE', (0, 1), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black)
+            ]))
+            story.append(drive_table)
+            story.append(Spacer(1, 20))
+        
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
+    
     def export_down_analytics(self, username, down_analytics):
         """Export down-specific analytics to PDF"""
         buffer = io.BytesIO()
@@ -7079,11 +7916,6 @@ class PDFExporter:
     def generate_player_chart(self, player_id, chart_type, session_id=None):
         """Generate matplotlib chart for player progression"""
         try:
-            import matplotlib.pyplot as plt
-            import matplotlib
-            matplotlib.use('Agg')  # Use non-interactive backend
-            import io
-            
             # Get session data directly
             if not session_id:
                 session_id = session.get('server_session_id')
@@ -7096,12 +7928,8 @@ class PDFExporter:
             players = box_stats.get('players', {})
             plays = box_stats.get('plays', [])
             
-            # Find the player
-            player_data = None
-            for pid, pdata in players.items():
-                if str(pid) == str(player_id) or str(pdata.get('number')) == str(player_id):
-                    player_data = pdata
-                    break
+            # Find the player through the session's player index
+            player_key, player_data = _resolve_player(players, str(player_id), box_stats)
             
             if not player_data:
                 return None
@@ -7113,24 +7941,20 @@ class PDFExporter:
             current_negative = 0
             total_plays = 0
             
-            for play in plays:
-                # Check if this player was involved in the play
-                player_involved = False
-                for involved_player in play.get('players_involved', []):
-                    if (str(involved_player.get('number')) == str(player_id) or 
-                        str(involved_player.get('id')) == str(player_id)):
-                        player_involved = True
-                        
-                        # Update counters based on play outcome
-                        if involved_player.get('efficient', False):
-                            current_efficient += 1
-                        if involved_player.get('explosive', False):
-                            current_explosive += 1
-                        if involved_player.get('negative', False):
-                            current_negative += 1
-                        
-                        total_plays += 1
-                        break
+            # Only the plays this player was involved in
+            for _, play in player_plays(box_stats, player_key):
+                involved_player = involved_entry(box_stats, play, player_key)
+                player_involved = involved_player is not None
+                if player_involved:
+                    # Update counters based on play outcome
+                    if involved_player.get('efficient', False):
+                        current_efficient += 1
+                    if involved_player.get('explosive', False):
+                        current_explosive += 1
+                    if involved_player.get('negative', False):
+                        current_negative += 1
+                    
+                    total_plays += 1
                 
                 if player_involved:
                     # Calculate rates
@@ -7152,33 +7976,33 @@ class PDFExporter:
                 return None
             
             # Create the chart
-            plt.figure(figsize=(8, 4))
-            plt.plot(range(1, len(progression_data) + 1), progression_data, 
+            fig = Figure(figsize=(8, 4))
+            ax = fig.subplots()
+            ax.plot(range(1, len(progression_data) + 1), progression_data, 
                     marker='o', linewidth=2, markersize=4)
             
             # Customize chart based on type
             if chart_type == 'nee':
-                plt.title('NEE Score Progression', fontsize=14, fontweight='bold')
-                plt.ylabel('NEE Score', fontsize=12)
-                plt.axhline(y=0, color='gray', linestyle='--', alpha=0.5)
+                ax.set_title('NEE Score Progression', fontsize=14, fontweight='bold')
+                ax.set_ylabel('NEE Score', fontsize=12)
+                ax.axhline(y=0, color='gray', linestyle='--', alpha=0.5)
             elif chart_type == 'efficiency':
-                plt.title('Efficiency Rate Progression', fontsize=14, fontweight='bold')
-                plt.ylabel('Efficiency Rate (%)', fontsize=12)
-                plt.ylim(0, 100)
+                ax.set_title('Efficiency Rate Progression', fontsize=14, fontweight='bold')
+                ax.set_ylabel('Efficiency Rate (%)', fontsize=12)
+                ax.set_ylim(0, 100)
             elif chart_type == 'explosive':
-                plt.title('Explosive Rate Progression', fontsize=14, fontweight='bold')
-                plt.ylabel('Explosive Rate (%)', fontsize=12)
-                plt.ylim(0, 100)
+                ax.set_title('Explosive Rate Progression', fontsize=14, fontweight='bold')
+                ax.set_ylabel('Explosive Rate (%)', fontsize=12)
+                ax.set_ylim(0, 100)
             
-            plt.xlabel('Play Number', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            plt.tight_layout()
+            ax.set_xlabel('Play Number', fontsize=12)
+            ax.grid(True, alpha=0.3)
+            fig.tight_layout()
             
             # Save to buffer
             buffer = io.BytesIO()
-            plt.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
+            fig.savefig(buffer, format='png', dpi=150, bbox_inches='tight')
             buffer.seek(0)
-            plt.close()
             
             return buffer
             
@@ -7230,6 +8054,10 @@ def export_pdf(export_type):
         elif export_type == 'play_call_analytics':
             pdf_buffer = pdf_exporter.export_play_call_analytics(username, box_stats)
             filename = f"play_call_analytics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        elif export_type == 'drives':
+            drive_rows, drive_summary = drive_report(box_stats)
+            pdf_buffer = pdf_exporter.export_drives(username, box_stats, drive_rows, drive_summary)
+            filename = f"drives_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
         elif export_type == 'down_analytics':
             # Get down analytics data
             response = get_down_analytics()
@@ -7285,7 +8113,7 @@ def export_player_pdf(player_key):
         box_stats = box_stats_data.get('box_stats', {})
         players = box_stats.get('players', {})
         # Resolve by key, number, or name
-        key, player_data = _resolve_player(players, str(player_key))
+        key, player_data = _resolve_player(players, str(player_key), box_stats)
         if not player_data:
             print(f"DEBUG: Player {player_key} not found")
             return jsonify({'error': 'Player not found', 'requested': str(player_key), 'available_keys': list(players.keys())}), 404
@@ -7339,7 +8167,7 @@ def export_player_chart(player_key, chart_type):
         players = box_stats.get('players', {})
         
         # Resolve for filename
-        resolved_key, pdata = _resolve_player(players, str(player_key))
+        resolved_key, pdata = _resolve_player(players, str(player_key), box_stats)
         if pdata:
             player_name = pdata.get('name', f"player_{player_key}").replace(' ', '_')
         else:
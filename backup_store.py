@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Content-addressed backup store for sessions, games and rosters.
+
+A backed-up blob is split along its structure: dict entries (down to
+SPLIT_DEPTH levels) and runs of CHUNK_ITEMS list items (the plays) each
+become one chunk. Chunks are pickled, hashed (SHA-256) and written once
+under objects/; a chunk that is already there is not written again. Each
+version of a blob is a small JSON manifest naming its chunks:
+
+    objects/ab/ab12...            zlib-compressed pickled chunk, never rewritten
+    manifests/<kind>/<key>/000042.json
+                                  {'version', 'saved_at', 'root', 'tree', 'meta'}
+
+Saving content identical to the latest version writes nothing, and adding
+plays to a game only adds the chunks for the last run of plays plus the
+entries that changed. Older versions stay restorable by number until
+prune() drops their manifests; once GC_AFTER_PRUNED manifests have been
+dropped, save() runs collect_garbage() to remove objects no manifest names.
+
+Usage: python backup_store.py [--base DIR] list KIND KEY | gc
+"""
+import os
+import sys
+import json
+import zlib
+import pickle
+import hashlib
+import argparse
+import threading
+import time
+from datetime import datetime
+
+from session_cas import file_lock
+
+# Shared by the app's own saves and DataBackupSystem
+DEFAULT_DIR = os.environ.get('BACKUP_STORE_DIR', os.path.join('user_data', 'backup_store'))
+CHUNK_ITEMS = 32
+SPLIT_DEPTH = 3
+KEEP_VERSIONS = 50
+# Manifests a process prunes before save() collects garbage (a collection reads every manifest)
+GC_AFTER_PRUNED = 20
+# Objects written or reused this recently are never collected: a save stores them before its manifest
+GC_GRACE_SECONDS = 10 * 60
+PICKLE_PROTOCOL = 4  # fixed, so the same content always hashes the same
+
+
+def _safe(part):
+    return "".join(c if c.isalnum() or c in '-_.' else '_' for c in str(part)) or '_'
+
+
+def backup_key(username, name):
+    """Key for a user's game or roster: user hash plus the name as saved on disk"""
+    safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+    return f"{hashlib.md5(username.encode()).hexdigest()[:8]}-{safe_name}"
+
+
+class BackupStore:
+    """Write-once chunks plus one manifest per version of each (kind, key)"""
+
+    def __init__(self, base_dir, keep_versions=KEEP_VERSIONS):
+        self.base_dir = base_dir
+        self.keep_versions = keep_versions
+        self.objects_dir = os.path.join(base_dir, 'objects')
+        self.manifests_dir = os.path.join(base_dir, 'manifests')
+        self._lock = threading.Lock()
+        self._pruned = 0
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+    # Objects
+
+    def _object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest)
+
+    def _put(self, value):
+        """Store one chunk; returns its hash (a chunk that is already stored is only touched)"""
+        payload = pickle.dumps(value, protocol=PICKLE_PROTOCOL)
+        digest = hashlib.sha256(payload).hexdigest()
+        path = self._object_path(digest)
+        try:
+            # Already stored: refresh it so a collection running before this save's manifest lands keeps it
+            os.utime(path)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(payload))
+            os.replace(tmp_path, path)
+        return digest
+
+    def _get(self, digest):
+        with open(self._object_path(digest), 'rb') as f:
+            return pickle.loads(zlib.decompress(f.read()))
+
+    def _split(self, value, depth=0):
+        """Store value as chunks and return the tree that rebuilds it"""
+        if isinstance(value, dict) and depth < SPLIT_DEPTH and value and all(isinstance(k, str) for k in value):
+            return {'dict': {key: self._split(item, depth + 1) for key, item in value.items()}}
+        if isinstance(value, list) and len(value) > CHUNK_ITEMS:
+            return {'list': [self._put(value[i:i + CHUNK_ITEMS]) for i in range(0, len(value), CHUNK_ITEMS)]}
+        return {'chunk': self._put(value)}
+
+    def _join(self, tree):
+        if 'dict' in tree:
+            return {key: self._join(node) for key, node in tree['dict'].items()}
+        if 'list' in tree:
+            return [item for digest in tree['list'] for item in self._get(digest)]
+        return self._get(tree['chunk'])
+
+    # Manifests
+
+    def _manifest_dir(self, kind, key):
+        return os.path.join(self.manifests_dir, _safe(kind), _safe(key))
+
+    def _version_numbers(self, kind, key):
+        directory = self._manifest_dir(kind, key)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(int(name[:-5]) for name in os.listdir(directory) if name.endswith('.json') and name[:-5].isdigit())
+
+    def manifest(self, kind, key, version=None):
+        """Manifest of a version (the latest when version is None), or None"""
+        numbers = self._version_numbers(kind, key)
+        if version is None:
+            version = numbers[-1] if numbers else None
+        if version is None or version not in numbers:
+            return None
+        with open(os.path.join(self._manifest_dir(kind, key), f"{version:06d}.json"), 'r') as f:
+            return json.load(f)
+
+    def versions(self, kind, key):
+        """[{'version', 'saved_at', 'root', 'meta'}] oldest first"""
+        summaries = []
+        for number in self._version_numbers(kind, key):
+            manifest = self.manifest(kind, key, number)
+            summaries.append({k: manifest.get(k) for k in ('version', 'saved_at', 'root', 'meta')})
+        return summaries
+
+    def save(self, kind, key, value, meta=None):
+        """Back up value as a new version of (kind, key) unless it equals the latest.
+
+        Returns (version, changed); an unchanged save only hashes. Versions past
+        keep_versions are pruned, and their objects collected every
+        GC_AFTER_PRUNED pruned manifests.
+        """
+        tree = self._split(value)
+        root = hashlib.sha256(json.dumps(tree, sort_keys=True).encode()).hexdigest()
+        directory = self._manifest_dir(kind, key)
+        os.makedirs(directory, exist_ok=True)
+        # Version numbers are handed out under a lock shared with other workers
+        with self._lock, file_lock(directory):
+            latest = self.manifest(kind, key)
+            if latest and latest['root'] == root:
+                return latest['version'], False
+            version = (latest['version'] if latest else 0) + 1
+            manifest = {'version': version, 'saved_at': datetime.now().isoformat(), 'root': root,
+                        'tree': tree, 'meta': meta or {}}
+            path = os.path.join(directory, f"{version:06d}.json")
+            with open(f"{path}.tmp", 'w') as f:
+                json.dump(manifest, f)
+            os.replace(f"{path}.tmp", path)
+            self._pruned += self.prune(kind, key)
+            collect = self._pruned >= GC_AFTER_PRUNED
+            if collect:
+                self._pruned = 0
+        if collect:
+            removed = self.collect_garbage()
+            print(f"✓ Backup store: {removed} unreferenced objects removed")
+        return version, True
+
+    def restore(self, kind, key, version=None):
+        """The blob as saved at version (the latest when None), or None"""
+        manifest = self.manifest(kind, key, version)
+        return self._join(manifest['tree']) if manifest else None
+
+    def prune(self, kind, key, keep=None):
+        """Drop all but the newest keep manifests; returns how many were dropped.
+
+        Their objects go at the next collect_garbage().
+        """
+        keep = self.keep_versions if keep is None else keep
+        numbers = self._version_numbers(kind, key)
+        dropped = numbers[:max(0, len(numbers) - keep)]
+        for number in dropped:
+            os.remove(os.path.join(self._manifest_dir(kind, key), f"{number:06d}.json"))
+        return len(dropped)
+
+    def keys(self, kind):
+        directory = os.path.join(self.manifests_dir, _safe(kind))
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+
+    def collect_garbage(self, grace=None):
+        """Remove objects no manifest refers to; returns how many were removed.
+        
+        A save stores its objects before its manifest, so objects written or
+        reused in the last grace seconds (GC_GRACE_SECONDS) are kept. One
+        collection runs at a time across workers.
+        """
+        grace = GC_GRACE_SECONDS if grace is None else grace
+        referenced = set()
+
+        def walk(tree):
+            if 'dict' in tree:
+                for node in tree['dict'].values():
+                    walk(node)
+            elif 'list' in tree:
+                referenced.update(tree['list'])
+            else:
+                referenced.add(tree['chunk'])
+
+        cutoff = time.time() - grace
+        with self._lock, file_lock(self.objects_dir):
+            for root, _, files in os.walk(self.manifests_dir):
+                for name in files:
+                    if name.endswith('.json'):
+                        with open(os.path.join(root, name), 'r') as f:
+                            walk(json.load(f)['tree'])
+            removed = 0
+            for root, _, files in os.walk(self.objects_dir):
+                for name in files:
+                    path = os.path.join(root, name)
+                    if name not in referenced and os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+        return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--base', default=DEFAULT_DIR)
+    commands = parser.add_subparsers(dest='command', required=True)
+    listing = commands.add_parser('list', help='versions of one backed-up blob')
+    listing.add_argument('kind', choices=['sessions', 'games', 'rosters'])
+    listing.add_argument('key')
+    commands.add_parser('gc', help='remove objects no manifest refers to')
+    args = parser.parse_args()
+
+    store = BackupStore(args.base)
+    if args.command == 'list':
+        for summary in store.versions(args.kind, args.key):
+            print(f"  v{summary['version']}  {summary['saved_at']}  {summary['root'][:12]}  {summary['meta']}")
+    else:
+        print(f"✓ {store.collect_garbage()} unreferenced objects removed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
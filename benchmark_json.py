@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization and compression on representative payloads.
+
+Compares the standard library (with the NaN cleaning it needs) against the
+fast_json serializer, and reports gzip/brotli sizes for each payload.
+
+Usage: python benchmark_json.py [--plays 150] [--rows 2000] [--repeat 20]
+"""
+import sys
+import json
+import math
+import time
+import random
+import argparse
+
+from fast_json import dumps_bytes, compress_body, orjson, brotli
+
+try:
+    import pandas as pd
+    import numpy as np
+except ImportError:
+    pd = None
+    np = None
+
+
+def build_box_stats(play_count, player_count=45):
+    """A live box stats payload: play log, players with counters, team stats"""
+    rng = random.Random(1)
+    players = {}
+    for number in range(1, player_count + 1):
+        players[str(number)] = {
+            'number': number, 'name': f'Player {number}', 'position': rng.choice(['QB', 'RB', 'WR', 'TE', 'OL', 'DL', 'LB', 'DB']),
+            'total_plays': rng.randint(0, 60), 'efficient_plays': rng.randint(0, 30), 'explosive_plays': rng.randint(0, 8),
+            'negative_plays': rng.randint(0, 8), 'rushing_yards': rng.randint(-5, 150), 'receiving_yards': rng.randint(0, 120),
+            'passing_yards': 0, 'touchdowns': rng.randint(0, 2), 'efficiency_rate': rng.random() * 100,
+            'progression_counters': {str(p): [p, 1, rng.randint(0, 1), 0, 0, rng.randint(-3, 20), 0] for p in range(1, 40)}
+        }
+    plays = []
+    for n in range(1, play_count + 1):
+        plays.append({
+            'play_number': n, 'phase': rng.choice(['offense', 'defense', 'special_teams']), 'down': rng.randint(1, 4),
+            'distance': rng.randint(1, 15), 'yard_line': rng.randint(1, 99), 'play_type': rng.choice(['run', 'pass']),
+            'yards_gained': rng.randint(-5, 40), 'play_call': rng.choice(['Inside Zone', 'Power', 'Mesh', 'Four Verts', 'Stick']),
+            'players_involved': [{'number': rng.randint(1, player_count), 'role': 'carrier'}],
+            'is_efficient': rng.random() > 0.5, 'is_explosive': rng.random() > 0.9, 'timestamp': f'2026-10-19T19:{n % 60:02d}:00'
+        })
+    team_stats = {phase: {'total_plays': play_count, 'total_yards': rng.randint(0, 500), 'efficiency_rate': rng.random() * 100}
+                  for phase in ('offense', 'defense', 'special_teams', 'overall')}
+    return {'success': True, 'version': 1, 'box_stats': {'plays': plays, 'players': players, 'play_call_stats': {}},
+            'team_stats': team_stats}
+
+
+def build_records(row_count):
+    """Spreadsheet rows as analyze_plays/preview return them, with blanks as NaN"""
+    rng = random.Random(2)
+    columns = ['PLAY #', 'ODK', 'DN', 'DIST', 'YARD LN', 'GN/LS', 'PLAY TYPE', 'RESULT', 'OFF FORM', 'OFF PLAY', 'HASH', 'QTR']
+    rows = []
+    for n in range(row_count):
+        rows.append({
+            'PLAY #': n + 1, 'ODK': rng.choice('ODK'), 'DN': rng.choice([1, 2, 3, 4, float('nan')]),
+            'DIST': rng.choice([10, 7, 3, float('nan')]), 'YARD LN': rng.randint(-49, 50), 'GN/LS': rng.randint(-5, 30) * 1.0,
+            'PLAY TYPE': rng.choice(['Run', 'Pass', None]), 'RESULT': rng.choice(['Rush', 'Complete', 'Incomplete']),
+            'OFF FORM': rng.choice(['TRIPS RT', 'DOUBLES', 'EMPTY']), 'OFF PLAY': rng.choice(['IZ', 'POWER', 'MESH']),
+            'HASH': rng.choice(['L', 'M', 'R']), 'QTR': rng.randint(1, 4)
+        })
+    if pd is not None:
+        # Real DataFrame records carry NumPy scalars
+        return pd.DataFrame(rows, columns=columns).to_dict('records')
+    return rows
+
+
+def stdlib_dumps(obj):
+    """What the app did before: clean NaN/inf by hand, then json.dumps"""
+    def clean(value):
+        if isinstance(value, dict):
+            return {str(k): clean(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [clean(v) for v in value]
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        if np is not None and isinstance(value, np.generic):
+            return clean(value.item())
+        return value
+    return json.dumps(clean(obj)).encode('utf-8')
+
+
+def time_call(func, payload, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(payload)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--plays', type=int, default=150)
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if orjson else 'no (stdlib fallback)'}, brotli: {'yes' if brotli else 'no'}")
+    payloads = {
+        f'get_stats ({args.plays} plays)': build_box_stats(args.plays),
+        f'analyze_plays ({args.rows} rows)': {'success': True, 'play_data': build_records(args.rows)},
+    }
+
+    for name, payload in payloads.items():
+        stdlib_ms, stdlib_body = time_call(stdlib_dumps, payload, args.repeat)
+        fast_ms, body = time_call(dumps_bytes, payload, args.repeat)
+        gzip_body = compress_body(body, 'gzip')
+        print(f"\n{name}")
+        print(f"  json.dumps + NaN cleaning: {stdlib_ms:8.2f} ms  {len(stdlib_body):>9,} bytes")
+        print(f"  fast_json.dumps_bytes:     {fast_ms:8.2f} ms  {len(body):>9,} bytes  ({stdlib_ms / max(fast_ms, 1e-9):.1f}x)")
+        print(f"  gzip:                      {len(gzip_body):>20,} bytes  ({100 - len(gzip_body) * 100 / len(body):.0f}% smaller)")
+        if brotli is not None:
+            br_body = compress_body(body, 'br')
+            print(f"  brotli:                    {len(br_body):>20,} bytes  ({100 - len(br_body) * 100 / len(body):.0f}% smaller)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,146 +7,88 @@ Ensures all user data is saved to multiple locations with automatic recovery
 import os
 import json
 import pickle
-import shutil
-import hashlib
-from datetime import datetime
 from database import db_manager
+from backup_store import BackupStore, DEFAULT_DIR, backup_key
 
 class DataBackupSystem:
-    """Handles comprehensive backup and recovery of all user data"""
+    """Handles comprehensive backup and recovery of all user data.
     
-    def __init__(self, base_dir="/tmp/hoy_sports_backup"):
-        self.base_dir = base_dir
-        self.ensure_backup_dirs()
+    Backups go to a content-addressed store (backup_store.py): every changed
+    save adds one version, an unchanged save adds nothing. The JSON and pickle
+    files under base_dir are only read, for backups taken before the store.
+    """
     
-    def ensure_backup_dirs(self):
-        """Create backup directory structure"""
-        dirs = [
-            self.base_dir,
-            os.path.join(self.base_dir, "sessions"),
-            os.path.join(self.base_dir, "games"),
-            os.path.join(self.base_dir, "rosters"),
-            os.path.join(self.base_dir, "emergency")
-        ]
-        for dir_path in dirs:
-            os.makedirs(dir_path, exist_ok=True)
+    def __init__(self, base_dir="/tmp/hoy_sports_backup", store_dir=DEFAULT_DIR):
+        self.base_dir = base_dir
+        self.store = BackupStore(store_dir)
     
     def backup_session_data(self, session_id, username, data):
-        """Backup session data to multiple locations"""
-        success_count = 0
-        
-        # 1. Database backup
-        try:
-            if db_manager.save_session_data(session_id, username, data):
-                print(f"✓ Session {session_id} backed up to database")
-                success_count += 1
-        except Exception as e:
-            print(f"❌ Database session backup failed: {e}")
-        
-        # 2. File backup
+        """Backup session data as a new version in the backup store"""
         try:
-            session_file = os.path.join(self.base_dir, "sessions", f"{session_id}.json")
-            backup_data = {
-                'session_id': session_id,
-                'username': username,
-                'timestamp': datetime.now().isoformat(),
-                'data': data
-            }
-            with open(session_file, 'w') as f:
-                json.dump(backup_data, f, indent=2)
-            print(f"✓ Session {session_id} backed up to file")
-            success_count += 1
+            version, changed = self.store.save('sessions', session_id, data, meta={'username': username})
+            if changed:
+                print(f"✓ Session {session_id} backed up (version {version})")
+            return True
         except Exception as e:
-            print(f"❌ File session backup failed: {e}")
-        
-        # 3. Emergency pickle backup
-        try:
-            emergency_file = os.path.join(self.base_dir, "emergency", f"session_{session_id}.pkl")
-            with open(emergency_file, 'wb') as f:
-                pickle.dump({'session_id': session_id, 'username': username, 'data': data}, f)
-            success_count += 1
-        except Exception as e:
-            print(f"❌ Emergency session backup failed: {e}")
-        
-        return success_count > 0
+            print(f"❌ Session backup failed: {e}")
+            return False
     
     def backup_game_data(self, username, game_name, game_data):
-        """Backup game data to multiple locations"""
-        success_count = 0
+        """Backup game data to the backup store, and to the database when it changed"""
+        try:
+            version, changed = self.store.save('games', backup_key(username, game_name), game_data,
+                                               meta={'username': username, 'game_name': game_name})
+        except Exception as e:
+            print(f"❌ Game backup failed: {e}")
+            return False
+        if not changed:
+            return True
+        print(f"✓ Game '{game_name}' backed up for {username} (version {version})")
         
-        # 1. Database backup
         try:
             if db_manager.save_game(username, game_name, game_data):
                 print(f"✓ Game '{game_name}' backed up to database for {username}")
-                success_count += 1
         except Exception as e:
             print(f"❌ Database game backup failed: {e}")
-        
-        # 2. File backup
-        try:
-            user_hash = hashlib.md5(username.encode()).hexdigest()[:8]
-            game_dir = os.path.join(self.base_dir, "games", user_hash)
-            os.makedirs(game_dir, exist_ok=True)
-            
-            safe_name = "".join(c for c in game_name if c.isalnum() or c in (' ', '-', '_')).replace(' ', '_')
-            game_file = os.path.join(game_dir, f"{safe_name}.json")
-            
-            backup_data = {
-                'game_name': game_name,
-                'username': username,
-                'timestamp': datetime.now().isoformat(),
-                'game_data': game_data
-            }
-            
-            with open(game_file, 'w') as f:
-                json.dump(backup_data, f, indent=2)
-            print(f"✓ Game '{game_name}' backed up to file for {username}")
-            success_count += 1
-        except Exception as e:
-            print(f"❌ File game backup failed: {e}")
-        
-        return success_count > 0
+        return True
     
     def backup_roster_data(self, username, roster_name, roster_data):
-        """Backup roster data to multiple locations"""
-        success_count = 0
+        """Backup roster data to the backup store, and to the database when it changed"""
+        try:
+            version, changed = self.store.save('rosters', backup_key(username, roster_name), roster_data,
+                                               meta={'username': username, 'roster_name': roster_name})
+        except Exception as e:
+            print(f"❌ Roster backup failed: {e}")
+            return False
+        if not changed:
+            return True
+        print(f"✓ Roster '{roster_name}' backed up for {username} (version {version})")
         
-        # 1. Database backup
         try:
             if db_manager.save_roster(username, roster_name, roster_data):
                 print(f"✓ Roster '{roster_name}' backed up to database for {username}")
-                success_count += 1
         except Exception as e:
             print(f"❌ Database roster backup failed: {e}")
-        
-        # 2. File backup
+        return True
+    
+    def session_versions(self, session_id):
+        """Backed-up versions of a session, oldest first"""
+        return self.store.versions('sessions', session_id)
+    
+    def recover_session_data(self, session_id, version=None):
+        """Attempt to recover session data from backups (a given version: backup store only)"""
+        # Try the backup store first
         try:
-            user_hash = hashlib.md5(username.encode()).hexdigest()[:8]
-            roster_dir = os.path.join(self.base_dir, "rosters", user_hash)
-            os.makedirs(roster_dir, exist_ok=True)
-            
-            safe_name = "".join(c for c in roster_name if c.isalnum() or c in (' ', '-', '_')).replace(' ', '_')
-            roster_file = os.path.join(roster_dir, f"{safe_name}.json")
-            
-            backup_data = {
-                'roster_name': roster_name,
-                'username': username,
-                'timestamp': datetime.now().isoformat(),
-                'roster_data': roster_data
-            }
-            
-            with open(roster_file, 'w') as f:
-                json.dump(backup_data, f, indent=2)
-            print(f"✓ Roster '{roster_name}' backed up to file for {username}")
-            success_count += 1
+            data = self.store.restore('sessions', session_id, version)
+            if data:
+                print(f"✓ Session {session_id} recovered from backup store")
+                return data
         except Exception as e:
-            print(f"❌ File roster backup failed: {e}")
+            print(f"❌ Backup store session recovery failed: {e}")
+        if version is not None:
+            return None
         
-        return success_count > 0
-    
-    def recover_session_data(self, session_id):
-        """Attempt to recover session data from backups"""
-        # Try database first
+        # Try database
         try:
             data = db_manager.load_session_data(session_id)
             if data:
@@ -155,7 +97,7 @@ class DataBackupSystem:
         except Exception as e:
             print(f"❌ Database session recovery failed: {e}")
         
-        # Try file backup
+        # Try file backup (written before the backup store)
         try:
             session_file = os.path.join(self.base_dir, "sessions", f"{session_id}.json")
             if os.path.exists(session_file):
@@ -166,7 +108,7 @@ class DataBackupSystem:
         except Exception as e:
             print(f"❌ File session recovery failed: {e}")
         
-        # Try emergency backup
+        # Try emergency backup (written before the backup store)
         try:
             emergency_file = os.path.join(self.base_dir, "emergency", f"session_{session_id}.pkl")
             if os.path.exists(emergency_file):
@@ -195,32 +137,17 @@ class DataBackupSystem:
         except:
             pass
         
-        # Count file backups
+        # Count backed-up sessions, games and rosters
         try:
-            sessions_dir = os.path.join(self.base_dir, "sessions")
-            if os.path.exists(sessions_dir):
-                status['total_sessions'] = len([f for f in os.listdir(sessions_dir) if f.endswith('.json')])
-            
-            games_dir = os.path.join(self.base_dir, "games")
-            if os.path.exists(games_dir):
-                for user_dir in os.listdir(games_dir):
-                    user_path = os.path.join(games_dir, user_dir)
-                    if os.path.isdir(user_path):
-                        status['total_games'] += len([f for f in os.listdir(user_path) if f.endswith('.json')])
-            
-            rosters_dir = os.path.join(self.base_dir, "rosters")
-            if os.path.exists(rosters_dir):
-                for user_dir in os.listdir(rosters_dir):
-                    user_path = os.path.join(rosters_dir, user_dir)
-                    if os.path.isdir(user_path):
-                        status['total_rosters'] += len([f for f in os.listdir(user_path) if f.endswith('.json')])
+            status['total_sessions'] = len(self.store.keys('sessions'))
+            status['total_games'] = len(self.store.keys('games'))
+            status['total_rosters'] = len(self.store.keys('rosters'))
         except Exception as e:
             print(f"Error getting backup status: {e}")
         
         status['backup_locations'] = [
             f"Database: {'✓' if status['database_connected'] else '❌'}",
-            f"File System: ✓ ({self.base_dir})",
-            f"Emergency Backups: ✓"
+            f"Backup Store: ✓ ({self.store.base_dir})"
         ]
         
         return status
@@ -1,13 +1,16 @@
 """
 Database models and connection management for persistent user data storage.
 """
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, JSON, text
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, JSON, text, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
 import os
 import json
+import pickle
 from flask_sqlalchemy import SQLAlchemy
+from session_cas import ABSENT
 
 db = SQLAlchemy()
 
@@ -18,6 +21,7 @@ class UserSession(db.Model):
     id = db.Column(db.String(255), primary_key=True)  # session_id
     username = db.Column(db.String(100), nullable=False, index=True)
     session_data = db.Column(db.LargeBinary, nullable=False)  # pickled data
+    version = db.Column(db.BigInteger, nullable=True)  # session_data's version, for compare-and-swap saves
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -112,6 +116,14 @@ class DatabaseManager:
                     inspector = inspect(db.engine)
                     tables = inspector.get_table_names()
                     
+                    # create_all() does not add columns to existing tables
+                    if 'user_sessions' in tables:
+                        columns = [c['name'] for c in inspector.get_columns('user_sessions')]
+                        if 'version' not in columns:
+                            with db.engine.begin() as conn:
+                                conn.execute(text('ALTER TABLE user_sessions ADD COLUMN version BIGINT'))
+                            print("✓ Added user_sessions.version")
+                    
                     expected_tables = ['user_sessions', 'user_rosters', 'saved_games']
                     missing_tables = [t for t in expected_tables if t not in tables]
                     
@@ -177,6 +189,82 @@ class DatabaseManager:
             db.session.rollback()
             return False
     
+    def save_session_cas(self, session_id, username, data, version, expected_version):
+        """Save session data only if the stored version is still expected_version (None: always).
+        
+        ABSENT (a session that was never saved) only inserts the row, or takes
+        over one written before versioning.
+        
+        Returns True when written, False when another save got there first and
+        None when the database is unavailable.
+        """
+        if not self.verify_database_connection():
+            print("Database connection failed, cannot save session data")
+            return None
+            
+        try:
+            pickled_data = pickle.dumps(data)
+            table = UserSession.__table__
+            update = table.update().where(table.c.id == session_id)
+            if expected_version == ABSENT:
+                update = update.where(table.c.version.is_(None))
+            elif expected_version is not None:
+                # Rows saved before versioning have no version and are taken over once
+                update = update.where(or_(table.c.version == expected_version, table.c.version.is_(None)))
+            result = db.session.execute(update.values(session_data=pickled_data, version=version,
+                                                      updated_at=datetime.utcnow()))
+            
+            if result.rowcount == 0:
+                if db.session.query(UserSession.id).filter_by(id=session_id).first():
+                    db.session.rollback()
+                    print(f"Session {session_id} changed since version {expected_version}, not saved")
+                    return False
+                db.session.add(UserSession(id=session_id, username=username, session_data=pickled_data, version=version))
+            
+            db.session.commit()
+            return True
+            
+        except IntegrityError:
+            # Another worker created the row first
+            db.session.rollback()
+            return False
+        except Exception as e:
+            print(f"❌ Error saving session data: {e}")
+            db.session.rollback()
+            return None
+    
+    def save_session_if_newer(self, session_id, username, data, version):
+        """Save session data unless the stored row already has this version or a later one.
+        
+        For durable copies when the hot store decided the conflict. Returns
+        True when written or already newer, None when the database is unavailable.
+        """
+        if not self.verify_database_connection():
+            print("Database connection failed, cannot save session data")
+            return None
+            
+        try:
+            pickled_data = pickle.dumps(data)
+            table = UserSession.__table__
+            update = table.update().where(table.c.id == session_id)
+            if version is not None:
+                update = update.where(or_(table.c.version < version, table.c.version.is_(None)))
+            result = db.session.execute(update.values(session_data=pickled_data, version=version,
+                                                      updated_at=datetime.utcnow()))
+            if result.rowcount == 0 and not db.session.query(UserSession.id).filter_by(id=session_id).first():
+                db.session.add(UserSession(id=session_id, username=username, session_data=pickled_data, version=version))
+            db.session.commit()
+            return True
+            
+        except IntegrityError:
+            # Another worker created the row first, with a version at least as new
+            db.session.rollback()
+            return True
+        except Exception as e:
+            print(f"❌ Error saving session data: {e}")
+            db.session.rollback()
+            return None
+    
     def load_session_data(self, session_id):
         """Load session data from database with connection verification"""
         # Verify database connection before attempting load
@@ -198,6 +286,17 @@ class DatabaseManager:
             print(f"❌ Error loading session data: {e}")
             return {}
     
+    def load_session_owner(self, session_id):
+        """Username the session row was created under, without loading the blob (None if unknown)"""
+        if not self.verify_database_connection():
+            return None
+        try:
+            row = db.session.query(UserSession.username).filter_by(id=session_id).first()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"❌ Error loading session owner: {e}")
+            return None
+    
     def delete_session_data(self, session_id):
         """Delete session data from database"""
         try:
@@ -0,0 +1,187 @@
+"""
+Drive (possession) segmentation for the box stats play log.
+
+box_stats['drives'] holds a compact drive table:
+
+    drives:        [{number, phase, game_id, start_index, end_index,
+                     start_field_position, end_field_position, start_down,
+                     plays, yards, efficient, explosive, negative,
+                     result, start_time, end_time, start_quarter, start_clock,
+                     end_quarter, end_clock}, ...]
+    plays_indexed: number of plays segmented
+
+Offensive and defensive plays belong to drives; special teams plays close
+the open drive (punts, field goals, kicks) and are not counted in one. A
+drive ends on a touchdown, a turnover, a turnover on downs, a kick, a
+change of phase or a new game. Boundaries follow the same result keywords
+the situation model uses for possession changes.
+
+New plays extend the last drive or open the next one. Edits and deletes
+re-segment from the drive that contained the changed play onwards; the
+drives before it are kept as they are.
+
+The per-play outcome is supplied by the caller:
+
+    outcome: function(play) -> {'yards': int, 'efficient': bool, 'explosive': bool, 'negative': bool}
+"""
+
+DRIVES_KEY = 'drives'
+
+DRIVE_PHASES = ('offense', 'defense')
+
+# Result keywords, as in the situation model (situation.py)
+TOUCHDOWN_KEYWORDS = ('touchdown', 'td', 'score')
+TURNOVER_KEYWORDS = ('interception', 'int', 'fumble', 'turnover')
+
+
+def _int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def play_phase(play):
+    return str(play.get('phase', 'offense')).lower()
+
+
+def drive_result(play):
+    """How a play ends its drive ('touchdown', 'turnover', 'turnover_on_downs', 'field_goal', 'punt'), or None"""
+    result = str(play.get('result', '') or '').lower()
+    play_type = str(play.get('play_type', '') or '').lower()
+    if any(keyword in result for keyword in TOUCHDOWN_KEYWORDS):
+        return 'touchdown'
+    players_involved = [p for p in (play.get('players_involved', []) or []) if isinstance(p, dict)]
+    if (any(keyword in result for keyword in TURNOVER_KEYWORDS)
+            or any(p.get('fumble', False) or p.get('interception', False) for p in players_involved)):
+        return 'turnover'
+    if 'field goal' in result or 'field_goal' in play_type or play_type == 'fg':
+        return 'field_goal'
+    if 'punt' in result or 'punt' in play_type:
+        return 'punt'
+    down = _int(play.get('down'))
+    distance = _int(play.get('distance'))
+    yards = _int(play.get('yards_gained'), 0)
+    if down is not None and down >= 4 and distance is not None and yards < distance:
+        return 'turnover_on_downs'
+    return None
+
+
+def _new_drive(number, play, play_index):
+    return {
+        'number': number,
+        'phase': play_phase(play),
+        'game_id': play.get('game_id'),
+        'start_index': play_index,
+        'end_index': play_index,
+        'start_field_position': play.get('field_position'),
+        'end_field_position': play.get('field_position'),
+        'start_down': play.get('down'),
+        'plays': 0, 'yards': 0, 'efficient': 0, 'explosive': 0, 'negative': 0,
+        'result': None,
+        'start_time': play.get('timestamp'),
+        'end_time': play.get('timestamp'),
+        'start_quarter': play.get('quarter'),
+        'start_clock': play.get('clock') or play.get('time'),
+        'end_quarter': play.get('quarter'),
+        'end_clock': play.get('clock') or play.get('time')
+    }
+
+
+def _feed(table, outcome, play, play_index):
+    """Segment one more play onto the end of the table"""
+    drives = table['drives']
+    current = drives[-1] if drives and drives[-1]['result'] is None else None
+    phase = play_phase(play)
+
+    if phase not in DRIVE_PHASES:
+        # Special teams: the kick ends whatever drive was open
+        if current is not None:
+            current['result'] = drive_result(play) or 'kick'
+        return
+
+    if current is not None and (current['phase'] != phase or current['game_id'] != play.get('game_id')):
+        current['result'] = 'possession_change' if current['game_id'] == play.get('game_id') else 'end_of_game'
+        current = None
+    if current is None:
+        current = _new_drive(len(drives) + 1, play, play_index)
+        drives.append(current)
+
+    result = outcome(play)
+    current['end_index'] = play_index
+    current['end_field_position'] = play.get('field_position')
+    current['plays'] += 1
+    current['yards'] += int(result.get('yards', 0) or 0)
+    for field in ('efficient', 'explosive', 'negative'):
+        if result.get(field):
+            current[field] += 1
+    if play.get('timestamp'):
+        current['end_time'] = play.get('timestamp')
+    if play.get('quarter') is not None:
+        current['end_quarter'] = play.get('quarter')
+    if play.get('clock') or play.get('time'):
+        current['end_clock'] = play.get('clock') or play.get('time')
+    current['result'] = drive_result(play)
+
+
+def rebuild_drives(box_stats, outcome):
+    """Segment the whole play log and store the drive table with the session"""
+    plays = box_stats.get('plays') or []
+    table = {'drives': [], 'plays_indexed': 0}
+    for play_index, play in enumerate(plays):
+        _feed(table, outcome, play, play_index)
+    table['plays_indexed'] = len(plays)
+    box_stats[DRIVES_KEY] = table
+    return table
+
+
+def _current_table(box_stats, expected_plays):
+    table = box_stats.get(DRIVES_KEY)
+    if not isinstance(table, dict) or table.get('plays_indexed') != expected_plays:
+        return None
+    return table
+
+
+def get_drives(box_stats, outcome):
+    """Return the session's drive table, rebuilding it when missing or stale"""
+    table = _current_table(box_stats, len(box_stats.get('plays') or []))
+    return table if table is not None else rebuild_drives(box_stats, outcome)
+
+
+def drives_add_play(box_stats, outcome):
+    """Segment a newly appended play (the last one)"""
+    plays = box_stats.get('plays') or []
+    table = _current_table(box_stats, len(plays) - 1)
+    if table is None:
+        return rebuild_drives(box_stats, outcome)
+    _feed(table, outcome, plays[-1], len(plays) - 1)
+    table['plays_indexed'] = len(plays)
+    return table
+
+
+def resegment_from(box_stats, outcome, play_index, indexed_plays=None):
+    """Re-segment from the drive containing play_index after an edit, delete or undo.
+
+    indexed_plays is the play count the table described before the change
+    (defaults to the current count, i.e. an in-place edit).
+    """
+    plays = box_stats.get('plays') or []
+    table = _current_table(box_stats, len(plays) if indexed_plays is None else indexed_plays)
+    if table is None:
+        return rebuild_drives(box_stats, outcome)
+    drives = table['drives']
+    # Keep drives that ended before the changed play
+    keep = len(drives)
+    while keep > 0 and drives[keep - 1]['end_index'] >= play_index:
+        keep -= 1
+    del drives[keep:]
+    if drives:
+        # The kept drive may have been closed by a special teams play at or after play_index
+        drives[-1]['result'] = drive_result(plays[drives[-1]['end_index']])
+        start = drives[-1]['end_index'] + 1
+    else:
+        start = 0
+    for i in range(start, len(plays)):
+        _feed(table, outcome, plays[i], i)
+    table['plays_indexed'] = len(plays)
+    return table
@@ -0,0 +1,180 @@
+"""
+Fast JSON responses and HTTP compression for the Flask app.
+
+FastJSONProvider serializes with orjson when it is installed. NumPy and
+pandas scalars are handled natively and NaN/inf become null, so DataFrame
+records can be returned without cleaning them first. Without orjson the
+provider falls back to the standard library with the same conversions.
+
+init_compression() gzip/brotli-encodes large text responses for clients
+that accept it.
+"""
+import io
+import gzip
+import json
+import math
+import uuid
+import decimal
+import dataclasses
+from datetime import date
+
+from flask import request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Mimetypes worth compressing
+COMPRESSIBLE_MIMETYPES = {
+    'application/json', 'text/html', 'text/plain', 'text/css', 'text/csv',
+    'text/javascript', 'application/javascript', 'image/svg+xml'
+}
+
+
+def _is_missing(value):
+    """pandas NA/NaT markers, which serialize as null"""
+    return pd is not None and (value is pd.NA or value is pd.NaT)
+
+
+def _default(value):
+    """Convert values neither serializer handles on its own (mirrors Flask's default)"""
+    if _is_missing(value):
+        return None
+    if np is not None and isinstance(value, np.generic):
+        value = value.item()
+        if isinstance(value, float) and not math.isfinite(value):
+            return None
+        return value
+    if np is not None and isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _sanitize(value):
+    """Replace non-finite floats with None for the standard library fallback"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: _sanitize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_sanitize(v) for v in value]
+    if np is not None and isinstance(value, np.generic):
+        return _default(value)
+    if np is not None and isinstance(value, np.ndarray):
+        return _sanitize(value.tolist())
+    return value
+
+
+def dumps_bytes(obj, indent=False):
+    """Serialize to UTF-8 JSON bytes, NaN/inf as null"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=_default, option=option)
+        except (orjson.JSONEncodeError, TypeError) as e:
+            # e.g. integers wider than 64 bits; the standard library copes with those
+            print(f"orjson could not serialize response, using json: {e}")
+    return json.dumps(_sanitize(obj), default=_default, allow_nan=False,
+                      indent=2 if indent else None,
+                      separators=None if indent else (',', ':')).encode('utf-8')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj, indent=bool(kwargs.get('indent'))).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if orjson is not None:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        return self._app.response_class(dumps_bytes(obj, indent=indent) + b"\n", mimetype=self.mimetype)
+
+
+def compress_body(data, encoding, level=6, brotli_quality=5):
+    """Encode a response body with gzip or brotli"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=brotli_quality)
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=level, mtime=0) as f:
+        f.write(data)
+    return buffer.getvalue()
+
+
+def choose_encoding(accept_encodings):
+    """Pick brotli over gzip when the client accepts both"""
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def init_compression(app):
+    """Compress large text responses (COMPRESS_MIN_SIZE, COMPRESS_LEVEL, COMPRESS_BROTLI_QUALITY)"""
+    app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+    app.config.setdefault('COMPRESS_LEVEL', 6)
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', 5)
+
+    @app.after_request
+    def compress_response(response):
+        try:
+            if (response.direct_passthrough or response.is_streamed
+                    or not 200 <= response.status_code < 300
+                    or response.status_code == 204
+                    or 'Content-Encoding' in response.headers
+                    or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+                return response
+
+            response.vary.add('Accept-Encoding')
+            data = response.get_data()
+            if len(data) < app.config['COMPRESS_MIN_SIZE']:
+                return response
+
+            encoding = choose_encoding(request.accept_encodings)
+            if not encoding:
+                return response
+
+            response.set_data(compress_body(data, encoding, app.config['COMPRESS_LEVEL'],
+                                            app.config['COMPRESS_BROTLI_QUALITY']))
+            response.headers['Content-Encoding'] = encoding
+        except Exception as e:
+            print(f"Error compressing response: {e}")
+        return response
+
+    return compress_response
@@ -2,11 +2,23 @@ import os
 
 # Gunicorn configuration file for production deployment
 bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
-workers = 2
-worker_class = "sync"
+# Session saves are compare-and-swap (session_cas.py), so workers can share sessions
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+# Threads per worker, so a slow PDF export, Supabase call or live stream doesn't hold up the worker
+worker_class = "gthread"
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+# Thread budget: a live stream (/box_stats/stream) keeps its thread for up to LIVE_STREAM_SECONDS,
+# so each worker streams to at most LIVE_STREAM_LIMIT viewers (default threads // 2) and answers
+# the rest with a 503; the other threads stay free for play entry and exports.
+# Total live viewers = workers * LIVE_STREAM_LIMIT; raise GUNICORN_THREADS along with the limit.
+os.environ.setdefault('LIVE_STREAM_LIMIT', str(max(1, threads // 2)))
 worker_connections = 1000
 max_requests = 1000
 max_requests_jitter = 100
 timeout = 30
 keepalive = 2
 preload_app = True
+
+# Live updates have to cross workers; the in-process broker only reaches its own
+if workers > 1:
+    os.environ.setdefault('LIVE_UPDATES_BACKEND', 'spool')
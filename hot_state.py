@@ -0,0 +1,187 @@
+"""
+Shared hot tier for live game sessions, so any worker can serve any request.
+
+Each live session is one entry: the version it was saved at and the stored
+blob (packed records, pickled). ServerSideSession reads it before the
+durable tiers and uses it to decide save conflicts; the database and the
+session files are then written for durability only. Backends:
+
+- RedisHotStore: one Redis hash per session (REDIS_URL); the conditional
+  writes run as Lua scripts, so they are atomic across workers and hosts.
+- SQLiteHotStore: single-host stand-in, also used by the tests; one WAL-mode
+  SQLite file shared by every worker process, conditional writes in an
+  IMMEDIATE transaction.
+
+Operations:
+
+    get(key)                          (version, blob) or None
+    cas(key, blob, version, expected) True written, False conflict, None not held;
+                                      expected None writes unconditionally; ABSENT
+                                      (never saved) conflicts with any versioned entry
+    put_if_newer(key, blob, version)  write if absent or older (warming after a cold load)
+    delete(key)
+
+Entries idle for HOT_STATE_TTL seconds (default 6 hours) are dropped; the
+durable tiers still have them.
+"""
+import os
+import time
+import sqlite3
+import threading
+
+from session_cas import ABSENT
+
+DEFAULT_TTL = 6 * 60 * 60
+
+
+class RedisHotStore:
+    """Sessions as Redis hashes {version, blob} under a key prefix"""
+
+    # KEYS[1] key; ARGV blob, version, expected ('' = unconditional), ttl
+    CAS_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'version')
+if ARGV[3] ~= '' then
+    if not current then return -1 end
+    if current ~= '' and current ~= ARGV[3] then return 0 end
+end
+redis.call('HSET', KEYS[1], 'version', ARGV[2], 'blob', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return 1
+"""
+
+    # KEYS[1] key; ARGV blob, version, ttl
+    PUT_IF_NEWER_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'version')
+if current and (tonumber(current) or 0) >= (tonumber(ARGV[2]) or 0) then return 0 end
+redis.call('HSET', KEYS[1], 'version', ARGV[2], 'blob', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+    def __init__(self, url=None, ttl=DEFAULT_TTL, prefix='hoy:session:'):
+        import redis
+        self.client = redis.Redis.from_url(url or os.environ.get('REDIS_URL', 'redis://localhost:6379/0'))
+        self.ttl = ttl
+        self.prefix = prefix
+        self._cas = self.client.register_script(self.CAS_SCRIPT)
+        self._put_if_newer = self.client.register_script(self.PUT_IF_NEWER_SCRIPT)
+
+    def _key(self, key):
+        return f"{self.prefix}{key}"
+
+    def get(self, key):
+        version, blob = self.client.hmget(self._key(key), 'version', 'blob')
+        if blob is None:
+            return None
+        self.client.expire(self._key(key), self.ttl)
+        return _parse_version(version), blob
+
+    def cas(self, key, blob, version, expected_version):
+        result = self._cas(keys=[self._key(key)],
+                           args=[blob, _format_version(version), _format_version(expected_version), self.ttl])
+        return None if result == -1 else bool(result)
+
+    def put_if_newer(self, key, blob, version):
+        return bool(self._put_if_newer(keys=[self._key(key)], args=[blob, _format_version(version), self.ttl]))
+
+    def delete(self, key):
+        self.client.delete(self._key(key))
+
+
+class SQLiteHotStore:
+    """Sessions as rows in one SQLite file that every worker on the host opens"""
+
+    def __init__(self, path=os.path.join('server_sessions', 'hot_state.sqlite3'), ttl=DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connect().execute('CREATE TABLE IF NOT EXISTS hot_sessions '
+                                '(key TEXT PRIMARY KEY, version INTEGER, blob BLOB NOT NULL, touched REAL NOT NULL)')
+
+    def _connect(self):
+        """One connection per thread and process (workers fork after the app is loaded)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _write(self, key, decide):
+        """Run decide(current version or the string 'absent') in a write transaction; write when it says so"""
+        conn = self._connect()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            conn.execute('DELETE FROM hot_sessions WHERE touched < ?', (now - self.ttl,))
+            row = conn.execute('SELECT version FROM hot_sessions WHERE key = ?', (key,)).fetchone()
+            result, write = decide('absent' if row is None else row[0])
+            if write is not None:
+                conn.execute('INSERT OR REPLACE INTO hot_sessions (key, version, blob, touched) VALUES (?, ?, ?, ?)',
+                             (key, write[1], sqlite3.Binary(write[0]), now))
+            conn.execute('COMMIT')
+            return result
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def get(self, key):
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute('SELECT version, blob, touched FROM hot_sessions WHERE key = ? AND touched >= ?',
+                           (key, now - self.ttl)).fetchone()
+        if row is None:
+            return None
+        if now - row[2] > 60:
+            # Reads keep a session alive, but only write that down once a minute
+            conn.execute('UPDATE hot_sessions SET touched = ? WHERE key = ?', (now, key))
+        return row[0], bytes(row[1])
+
+    def cas(self, key, blob, version, expected_version):
+        def decide(current):
+            if expected_version is None:
+                return True, (blob, version)
+            if current == 'absent':
+                return None, None
+            if current is not None and (expected_version == ABSENT or current != expected_version):
+                return False, None
+            return True, (blob, version)
+        return self._write(key, decide)
+
+    def put_if_newer(self, key, blob, version):
+        def decide(current):
+            if current != 'absent' and (current or 0) >= (version or 0):
+                return False, None
+            return True, (blob, version)
+        return self._write(key, decide)
+
+    def delete(self, key):
+        self._connect().execute('DELETE FROM hot_sessions WHERE key = ?', (key,))
+
+
+def _format_version(version):
+    if version == ABSENT:
+        return ABSENT
+    return '' if version is None else str(int(version))
+
+
+def _parse_version(version):
+    if version in (None, b'', ''):
+        return None
+    return int(version)
+
+
+def create_hot_store(backend=None, base_dir='server_sessions'):
+    """Create the store named by HOT_STATE_BACKEND ('redis', 'sqlite'), or None for durable tiers only"""
+    backend = (backend or os.environ.get('HOT_STATE_BACKEND', '')).lower()
+    ttl = int(os.environ.get('HOT_STATE_TTL', DEFAULT_TTL))
+    if backend == 'redis':
+        return RedisHotStore(ttl=ttl)
+    if backend == 'sqlite':
+        return SQLiteHotStore(os.environ.get('HOT_STATE_PATH', os.path.join(base_dir, 'hot_state.sqlite3')),
+                              ttl=ttl)
+    return None
@@ -0,0 +1,270 @@
+"""
+Bounded undo/redo journal for box stats play entry.
+
+Each mutation of a game session records an entry holding the inverse delta
+of what it changed:
+
+- the play change itself (appended, replaced or removed at an index), and
+- for add_play, the rows the play touched, before and after: its phase's
+  and the overall team stats row, the rows of the players involved, and
+  its play call's row in play_call_stats (keyed 'phase:call'), plus the
+  small next_situation and game_info sections. Progression counters are
+  not copied; the entry keeps their lengths before the play and the values
+  the play appended, so undo truncates and redo re-appends them.
+
+Only those rows are copied when the play is added (play_rows names them),
+and undoing the last added play touches only them, never the earlier plays. Edits and deletes are undone by applying the inverse play
+change and recomputing, the same way the original edit/delete was applied.
+
+The journal is stored with the session as data['journal'] = {'undo': [...],
+'redo': [...]}, newest entry last, capped at JOURNAL_LIMIT entries.
+"""
+import copy
+
+JOURNAL_KEY = 'journal'
+JOURNAL_LIMIT = 25
+
+# Sections of box_stats diffed row by row (team stats per phase, players per key,
+# play call stats per 'phase:call')
+ROW_SECTIONS = ('team_stats', 'players', 'play_call_stats')
+
+# Small sections stored whole when they change
+WHOLE_SECTIONS = ('next_situation', 'game_info')
+
+COUNTERS_KEY = 'progression_counters'
+
+
+class JournalConflict(Exception):
+    """The session no longer matches the state a journal entry expects"""
+
+
+def strip_row(row):
+    """Deep copy of a stats row without its progression counters"""
+    if not isinstance(row, dict):
+        return copy.deepcopy(row)
+    return {k: copy.deepcopy(v) for k, v in row.items() if k != COUNTERS_KEY}
+
+
+def _counter_lengths(row):
+    counters = row.get(COUNTERS_KEY) if isinstance(row, dict) else None
+    if not isinstance(counters, dict):
+        return None
+    return {name: len(values) for name, values in counters.items() if isinstance(values, list)}
+
+
+def _get_row(box_stats, section, key):
+    rows = box_stats.get(section) or {}
+    if section == 'play_call_stats':
+        phase, call = key.split(':', 1)
+        rows = rows.get(phase) or {}
+        key = call
+    return rows.get(key)
+
+
+def _set_row(box_stats, section, key, row):
+    rows = box_stats.setdefault(section, {})
+    if section == 'play_call_stats':
+        phase, key = key.split(':', 1)
+        rows = rows.setdefault(phase, {})
+    rows[key] = row
+
+
+def _pop_row(box_stats, section, key):
+    rows = box_stats.get(section) or {}
+    if section == 'play_call_stats':
+        phase, key = key.split(':', 1)
+        rows = rows.get(phase) or {}
+    rows.pop(key, None)
+
+
+def player_row_key(player):
+    """Key of a players_involved entry's row in box_stats['players'] (number, else 'name:<name>'), or None"""
+    if not isinstance(player, dict):
+        return None
+    number = player.get('number')
+    if number is not None and number != "":
+        return str(number)
+    name = str(player.get('name', '')).strip()
+    return f"name:{name}" if name else None
+
+
+def play_rows(play):
+    """Keys of the rows recording a play may change, by section"""
+    phase = play.get('phase') or 'offense'
+    players = {player_row_key(player) for player in play.get('players_involved') or []}
+    play_call = play.get('play_call')
+    return {
+        'team_stats': {phase, 'overall'},
+        'players': players - {None},
+        'play_call_stats': {f"{phase}:{play_call}"} if isinstance(play_call, str) and play_call.strip() else set()
+    }
+
+
+def snapshot(box_stats, keys):
+    """Capture the named rows and the small sections a mutation may change (progression counters by length only).
+
+    keys is {section: row keys}, as play_rows returns it; rows missing now are captured as None.
+    """
+    rows = {}
+    for section in ROW_SECTIONS:
+        rows[section] = {}
+        for key in keys.get(section, ()):
+            row = _get_row(box_stats, section, key)
+            rows[section][key] = (None, None) if row is None else (strip_row(row), _counter_lengths(row))
+    return {
+        'keys': keys,
+        'rows': rows,
+        'whole': {section: copy.deepcopy(box_stats.get(section)) for section in WHOLE_SECTIONS}
+    }
+
+
+def diff(before, box_stats):
+    """Row-level delta between a snapshot and the same rows of the current box stats"""
+    after = snapshot(box_stats, before['keys'])
+    rows = {}
+    for section in ROW_SECTIONS:
+        changes = {}
+        old_rows = before['rows'].get(section, {})
+        new_rows = after['rows'].get(section, {})
+        for key in set(old_rows) | set(new_rows):
+            old_row, old_lengths = old_rows.get(key, (None, None))
+            new_row, new_lengths = new_rows.get(key, (None, None))
+            if old_row == new_row and old_lengths == new_lengths:
+                continue
+            change = {'before': old_row, 'after': new_row, 'lengths': old_lengths or {}, 'tail': {}}
+            if new_lengths:
+                counters = _get_row(box_stats, section, key)[COUNTERS_KEY]
+                change['tail'] = {name: copy.deepcopy(counters[name][(old_lengths or {}).get(name, 0):])
+                                  for name in new_lengths}
+            changes[key] = change
+        if changes:
+            rows[section] = changes
+    whole = {
+        section: {'before': before['whole'][section], 'after': after['whole'][section]}
+        for section in WHOLE_SECTIONS
+        if before['whole'][section] != after['whole'][section]
+    }
+    return {'rows': rows, 'whole': whole}
+
+
+def _check_delta(box_stats, delta, side):
+    """Raise JournalConflict unless every row in the delta is currently in state `side`"""
+    for section, changes in delta.get('rows', {}).items():
+        for key, change in changes.items():
+            expected = change[side]
+            current = _get_row(box_stats, section, key)
+            if expected is None:
+                if current is not None:
+                    raise JournalConflict(f"{section} row {key} was added since")
+            elif strip_row(current) != expected:
+                raise JournalConflict(f"{section} row {key} changed since")
+
+
+def _apply_delta(box_stats, delta, side):
+    """Put every row/section in the delta into state `side` ('before' = undo, 'after' = redo)"""
+    for section, changes in delta.get('rows', {}).items():
+        for key, change in changes.items():
+            state = change[side]
+            existing = _get_row(box_stats, section, key)
+            existing = existing if isinstance(existing, dict) else {}
+            if state is None:
+                _pop_row(box_stats, section, key)
+                continue
+            row = copy.deepcopy(state)
+            if change['lengths'] or change['tail']:
+                old_counters = existing.get(COUNTERS_KEY) or {}
+                counters = {}
+                for name in set(change['lengths']) | set(change['tail']):
+                    values = list(old_counters.get(name, []))[:change['lengths'].get(name, 0)]
+                    if side == 'after':
+                        values.extend(copy.deepcopy(change['tail'].get(name, [])))
+                    counters[name] = values
+                row[COUNTERS_KEY] = counters
+            _set_row(box_stats, section, key, row)
+    for section, change in delta.get('whole', {}).items():
+        if change[side] is None:
+            box_stats.pop(section, None)
+        else:
+            box_stats[section] = copy.deepcopy(change[side])
+
+
+def get_journal(data):
+    journal = data.get(JOURNAL_KEY)
+    if not isinstance(journal, dict):
+        journal = {'undo': [], 'redo': []}
+        data[JOURNAL_KEY] = journal
+    return journal
+
+
+def record(data, entry):
+    """Push a new entry; a fresh mutation discards anything that could be redone"""
+    journal = get_journal(data)
+    journal['undo'].append(entry)
+    del journal['undo'][:-JOURNAL_LIMIT]
+    journal['redo'] = []
+    return entry
+
+
+def clear(data):
+    data[JOURNAL_KEY] = {'undo': [], 'redo': []}
+
+
+def add_play_entry(play_index, play, delta):
+    return {'op': 'add_play', 'index': play_index, 'play': copy.deepcopy(play), 'delta': delta}
+
+
+def edit_play_entry(play_index, before_play, after_play):
+    return {'op': 'edit_play', 'index': play_index,
+            'before_play': copy.deepcopy(before_play), 'after_play': copy.deepcopy(after_play)}
+
+
+def delete_play_entry(play_index, play):
+    return {'op': 'delete_play', 'index': play_index, 'play': copy.deepcopy(play)}
+
+
+def player_stats_entry(players_before, players_after):
+    """Manual player stat edits (update_player_stats); rows keyed by player"""
+    return {'op': 'update_player_stats', 'delta': {'rows': {'players': {
+        key: {'before': players_before.get(key), 'after': players_after.get(key), 'lengths': {}, 'tail': {}}
+        for key in set(players_before) | set(players_after)
+    }}, 'whole': {}}}
+
+
+def apply_play_change(box_stats, entry, undo):
+    """Apply (or invert) the play-log part of an entry; raises JournalConflict when it no longer fits"""
+    plays = box_stats.setdefault('plays', [])
+    index = entry.get('index')
+    op = entry['op']
+    if op == 'add_play':
+        if undo:
+            if len(plays) != index + 1 or plays[-1] != entry['play']:
+                raise JournalConflict('the play log changed after this play was added')
+            _check_delta(box_stats, entry['delta'], 'after')
+            plays.pop()
+            _apply_delta(box_stats, entry['delta'], 'before')
+        else:
+            if len(plays) != index:
+                raise JournalConflict('the play log changed after this play was undone')
+            _check_delta(box_stats, entry['delta'], 'before')
+            plays.append(copy.deepcopy(entry['play']))
+            _apply_delta(box_stats, entry['delta'], 'after')
+    elif op == 'edit_play':
+        expected, replacement = (entry['after_play'], entry['before_play']) if undo else (entry['before_play'], entry['after_play'])
+        if index >= len(plays) or plays[index] != expected:
+            raise JournalConflict('the play was changed again after this edit')
+        plays[index] = copy.deepcopy(replacement)
+    elif op == 'delete_play':
+        if undo:
+            if index > len(plays):
+                raise JournalConflict('the play log changed after this delete')
+            plays.insert(index, copy.deepcopy(entry['play']))
+        else:
+            if index >= len(plays) or plays[index] != entry['play']:
+                raise JournalConflict('the play log changed after this delete was undone')
+            plays.pop(index)
+    elif op == 'update_player_stats':
+        side, other = ('before', 'after') if undo else ('after', 'before')
+        _check_delta(box_stats, entry['delta'], other)
+        _apply_delta(box_stats, entry['delta'], side)
+    else:
+        raise JournalConflict(f"unknown journal operation {op}")
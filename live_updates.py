@@ -0,0 +1,207 @@
+"""
+Live update fan-out for box stats sessions (Server-Sent Events).
+
+Every change to a game session is published on a channel named after the
+session id. Two brokers are available:
+
+- LocalBroker: in-process fan-out; enough for a single worker.
+- SpoolBroker: single-host stand-in for several workers; events are appended
+  as JSON lines to a per-channel spool file that every worker tails.
+
+Events carry the session version as their id, so a reconnecting client that
+sends Last-Event-ID gets whatever it missed from the recent history.
+"""
+import os
+import json
+import time
+import queue
+import threading
+from collections import deque
+
+from session_cas import file_lock
+
+
+def _event_id(event):
+    try:
+        return int(event.get('version', 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+class Subscription:
+    """A subscriber's view of one channel"""
+
+    def __init__(self, broker, channel, maxsize=100):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, event):
+        """Queue an event, dropping the oldest one if the subscriber fell behind"""
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.queue.put_nowait(event)
+
+    def get(self, timeout=None):
+        """Wait for the next event, or None on timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """In-process pub/sub with a short per-channel history for resume"""
+
+    def __init__(self, history=50):
+        self.history = history
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._recent = {}
+
+    def publish(self, channel, event):
+        """Deliver an event to every subscriber of the channel"""
+        with self._lock:
+            self._recent.setdefault(channel, deque(maxlen=self.history)).append(event)
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+        return len(subscribers)
+
+    def subscribe(self, channel, last_event_id=None):
+        """Subscribe to a channel, replaying recent events newer than last_event_id"""
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+            missed = [e for e in self._recent.get(channel, ()) if last_event_id is not None and _event_id(e) > last_event_id]
+        for event in missed:
+            subscription.put(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+
+class SpoolSubscription:
+    """Tails a channel's spool file, returning events newer than the last one seen"""
+
+    def __init__(self, broker, channel, last_event_id=None, poll_interval=0.5):
+        self.broker = broker
+        self.channel = channel
+        self.poll_interval = poll_interval
+        self.path = broker.get_channel_path(channel)
+        self.pending = deque()
+        self.offset = 0
+        self.last_id = last_event_id or 0
+        if last_event_id is None:
+            # New viewers only get events published from now on
+            self._read_new()
+            if self.pending:
+                self.last_id = max(_event_id(e) for e in self.pending)
+            self.pending.clear()
+
+    def _read_new(self):
+        if not os.path.exists(self.path):
+            return
+        size = os.path.getsize(self.path)
+        if size < self.offset:
+            # The spool was compacted; rescan and rely on last_id to skip seen events
+            self.offset = 0
+        if size == self.offset:
+            return
+        with open(self.path, 'r') as f:
+            f.seek(self.offset)
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # partially written line; pick it up on the next poll
+                self.offset += len(line.encode('utf-8'))
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if _event_id(event) > self.last_id:
+                    self.pending.append(event)
+
+    def get(self, timeout=None):
+        deadline = time.monotonic() + (timeout or 0)
+        while True:
+            if not self.pending:
+                self._read_new()
+            if self.pending:
+                event = self.pending.popleft()
+                self.last_id = max(self.last_id, _event_id(event))
+                return event
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_interval)
+
+    def close(self):
+        pass
+
+
+class SpoolBroker:
+    """Cross-worker stand-in: one append-only JSON lines file per channel.
+    
+    Appends and compaction hold an advisory lock on <spool>.lock, so one
+    worker compacting can not drop events another worker is appending.
+    """
+
+    def __init__(self, base_dir=os.path.join('server_sessions', 'events'), history=50, max_bytes=256 * 1024):
+        self.base_dir = base_dir
+        self.history = history
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(base_dir, exist_ok=True)
+
+    def get_channel_path(self, channel):
+        safe_channel = "".join(c for c in str(channel) if c.isalnum() or c == '-')
+        return os.path.join(self.base_dir, f"{safe_channel}.jsonl")
+
+    def publish(self, channel, event):
+        path = self.get_channel_path(channel)
+        line = json.dumps(event, default=str) + '\n'
+        with self._lock, file_lock(path):
+            with open(path, 'a') as f:
+                f.write(line)
+            if os.path.getsize(path) > self.max_bytes:
+                self._compact(path)
+        return 1
+
+    def _compact(self, path):
+        """Keep only the most recent events so the spool never grows unbounded (caller holds the file lock)"""
+        try:
+            with open(path, 'r') as f:
+                lines = f.readlines()[-self.history:]
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                f.writelines(lines)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error compacting event spool {path}: {e}")
+
+    def subscribe(self, channel, last_event_id=None):
+        return SpoolSubscription(self, channel, last_event_id)
+
+    def unsubscribe(self, subscription):
+        pass
+
+
+def create_broker(backend=None, spool_dir=None):
+    """Create the broker named by LIVE_UPDATES_BACKEND ('local' or 'spool'); spool files go under spool_dir"""
+    backend = (backend or os.environ.get('LIVE_UPDATES_BACKEND', 'local')).lower()
+    if backend == 'spool':
+        return SpoolBroker(spool_dir) if spool_dir else SpoolBroker()
+    return LocalBroker()
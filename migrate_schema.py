@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Upgrade every stored session and saved game to the current box stats schema.
+
+Sessions and games are also upgraded lazily the first time they are loaded;
+this script does it in bulk so nothing is left on an old schema:
+
+    server_sessions/**/*.pkl       session files (archive segments and backups are left as written)
+    saved_games/**/*.json          saved game files (backups are left as written)
+    --database                     user_sessions and saved_games rows (DATABASE_URL or local SQLite)
+
+Usage: python migrate_schema.py [--sessions server_sessions] [--games saved_games] [--database] [--dry-run]
+"""
+import os
+import sys
+import json
+import pickle
+import argparse
+
+from session_schema import migrate_session, migrate_game, SCHEMA_VERSION
+
+SKIP_DIRS = ('archive', 'backups')
+
+
+def _walk(base_dir, extension):
+    for root, dirs, files in os.walk(base_dir):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in sorted(files):
+            if name.endswith(extension):
+                yield os.path.join(root, name)
+
+
+def _replace(path, write, mode):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, mode) as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def migrate_session_blob(blob):
+    """(blob to store, changed) for a pickled session, wrapped or not"""
+    wrapped = isinstance(blob, dict) and 'session_data' in blob
+    data = blob['session_data'] if wrapped else blob
+    if not migrate_session(data):
+        return blob, False
+    if wrapped:
+        return {**blob, 'session_data': data}, True
+    return data, True
+
+
+def migrate_session_files(session_dir, dry_run=False):
+    migrated = checked = 0
+    for path in _walk(session_dir, '.pkl'):
+        try:
+            with open(path, 'rb') as f:
+                blob = pickle.load(f)
+            checked += 1
+            blob, changed = migrate_session_blob(blob)
+            if changed:
+                migrated += 1
+                if not dry_run:
+                    _replace(path, lambda f: pickle.dump(blob, f), 'wb')
+                print(f"  session {path}")
+        except Exception as e:
+            print(f"❌ {path}: {e}")
+    return migrated, checked
+
+
+def migrate_game_files(games_dir, dry_run=False):
+    migrated = checked = 0
+    for path in _walk(games_dir, '.json'):
+        try:
+            with open(path, 'r') as f:
+                game = json.load(f)
+            checked += 1
+            if migrate_game(game):
+                migrated += 1
+                if not dry_run:
+                    _replace(path, lambda f: json.dump(game, f, indent=2), 'w')
+                print(f"  game {path}")
+        except Exception as e:
+            print(f"❌ {path}: {e}")
+    return migrated, checked
+
+
+def migrate_database(dry_run=False):
+    """Upgrade user_sessions and saved_games rows; returns (migrated, checked)"""
+    from migrate_data import create_migration_app
+    from database import db, UserSession, SavedGame
+
+    app, _ = create_migration_app()
+    migrated = checked = 0
+    with app.app_context():
+        for row in UserSession.query.all():
+            checked += 1
+            try:
+                blob, changed = migrate_session_blob(pickle.loads(row.session_data))
+                if changed:
+                    migrated += 1
+                    row.session_data = pickle.dumps(blob)
+                    print(f"  session row {row.id}")
+            except Exception as e:
+                print(f"❌ session row {row.id}: {e}")
+        for row in SavedGame.query.all():
+            checked += 1
+            try:
+                game = pickle.loads(row.game_data)
+                if migrate_game(game):
+                    migrated += 1
+                    row.game_data = pickle.dumps(game)
+                    print(f"  game row {row.username}/{row.game_name}")
+            except Exception as e:
+                print(f"❌ game row {row.username}/{row.game_name}: {e}")
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    return migrated, checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sessions', default='server_sessions')
+    parser.add_argument('--games', default='saved_games')
+    parser.add_argument('--database', action='store_true', help='also upgrade database rows')
+    parser.add_argument('--dry-run', action='store_true', help='report what would change without writing')
+    args = parser.parse_args()
+
+    print(f"Migrating to schema v{SCHEMA_VERSION}{' (dry run)' if args.dry_run else ''}")
+    results = [('session files', migrate_session_files(args.sessions, args.dry_run)),
+               ('game files', migrate_game_files(args.games, args.dry_run))]
+    if args.database:
+        results.append(('database rows', migrate_database(args.dry_run)))
+    for label, (migrated, checked) in results:
+        print(f"✓ {label}: {migrated} of {checked} upgraded")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+Per-session indexes over the box stats play log.
+
+The player index is stored with the session as box_stats['player_index']:
+
+    numbers: jersey number -> player key
+    names:   normalized player name -> player key
+    plays:   player key -> indices of the plays the player was involved in
+
+It is updated incrementally as plays are added and rebuilt whenever it is
+found out of step with the plays/players it describes (older sessions,
+archive rollovers, full stat recalculations).
+
+Posting lists (play indices per play call, phase, down, ...) are kept in
+box_stats['play_postings'] and shifted in place when plays are edited or
+deleted, so filtered play queries intersect short lists instead of scanning
+the whole log. Staleness is judged by play count alone; a play changed in
+place must be re-filed with update_play_postings (the app's save does this
+for every play whose fingerprint changed).
+"""
+import heapq
+from bisect import bisect_left, insort
+
+PLAYER_INDEX_KEY = 'player_index'
+
+
+def normalize_name(name):
+    """Lower-cased, whitespace-collapsed player name"""
+    return ' '.join(str(name or '').split()).lower()
+
+
+def involved_player_key(player):
+    """The players-dict key add_play uses for an involved player (number, else name:<name>)"""
+    number = player.get('number')
+    if number is not None and number != "":
+        return str(number)
+    name = str(player.get('name', '')).strip()
+    return f"name:{name}" if name else None
+
+
+def _empty_index():
+    return {'numbers': {}, 'names': {}, 'plays': {}, 'plays_indexed': 0, 'players_indexed': 0}
+
+
+def _index_player(index, key, player):
+    """Add a player's jersey number and name aliases to the index"""
+    if not isinstance(player, dict):
+        return
+    number = player.get('number')
+    if number is not None and str(number).strip() != '':
+        index['numbers'].setdefault(str(number).strip(), key)
+    if str(key).startswith('name:'):
+        index['names'].setdefault(normalize_name(str(key).split(':', 1)[1]), key)
+    name = normalize_name(player.get('name'))
+    if name:
+        index['names'].setdefault(name, key)
+
+
+def _lookup(index, players, value):
+    """Resolve a key, jersey number or name to a players-dict key using the index"""
+    lookup = str(value).strip()
+    if lookup in players:
+        return lookup
+    try:
+        key = index['numbers'].get(str(int(lookup)))
+    except (TypeError, ValueError):
+        key = None
+    if key is None:
+        key = index['names'].get(normalize_name(lookup))
+    return key if key in players else None
+
+
+def _play_player_keys(index, players, play):
+    """Players-dict keys of everyone involved in a play"""
+    keys = []
+    for involved in play.get('players_involved', []) or []:
+        if not isinstance(involved, dict):
+            continue
+        key = involved_player_key(involved)
+        if key not in players:
+            # recalculate_all_stats keys players by name_number; fall back to number/name
+            key = None
+            if involved.get('number') not in (None, ''):
+                key = _lookup(index, players, involved.get('number'))
+            if key is None and involved.get('name'):
+                key = _lookup(index, players, involved.get('name'))
+        if key is not None and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def rebuild_player_index(box_stats):
+    """Build the player index from scratch and store it with the session"""
+    players = box_stats.get('players') or {}
+    plays = box_stats.get('plays') or []
+    index = _empty_index()
+    for key, player in players.items():
+        _index_player(index, key, player)
+    for play_index, play in enumerate(plays):
+        for key in _play_player_keys(index, players, play):
+            index['plays'].setdefault(key, []).append(play_index)
+    index['plays_indexed'] = len(plays)
+    index['players_indexed'] = len(players)
+    box_stats[PLAYER_INDEX_KEY] = index
+    return index
+
+
+def get_player_index(box_stats):
+    """Return the session's player index, rebuilding it if it is missing or stale"""
+    index = box_stats.get(PLAYER_INDEX_KEY)
+    if (not isinstance(index, dict)
+            or index.get('plays_indexed') != len(box_stats.get('plays') or [])
+            or index.get('players_indexed') != len(box_stats.get('players') or {})):
+        index = rebuild_player_index(box_stats)
+    return index
+
+
+def index_new_play(box_stats, play_index=None):
+    """Add the play at play_index (default: the last play) to the index.
+
+    Call after the play has been appended and its players created.
+    """
+    plays = box_stats.get('plays') or []
+    players = box_stats.get('players') or {}
+    if play_index is None:
+        play_index = len(plays) - 1
+    index = box_stats.get(PLAYER_INDEX_KEY)
+    if not isinstance(index, dict) or index.get('plays_indexed') != play_index:
+        # Index was behind before this play; a rebuild picks the play up too
+        return rebuild_player_index(box_stats)
+    # Only players involved in this play can be new
+    for involved in plays[play_index].get('players_involved', []) or []:
+        key = involved_player_key(involved) if isinstance(involved, dict) else None
+        if key in players:
+            _index_player(index, key, players[key])
+    for key in _play_player_keys(index, players, plays[play_index]):
+        index['plays'].setdefault(key, []).append(play_index)
+    index['plays_indexed'] = len(plays)
+    index['players_indexed'] = len(players)
+    return index
+
+
+def unindex_last_play(box_stats, removed_index):
+    """Drop a play that was just popped off the end of the log from the player index"""
+    plays = box_stats.get('plays') or []
+    index = box_stats.get(PLAYER_INDEX_KEY)
+    if not isinstance(index, dict) or index.get('plays_indexed') != removed_index + 1 or removed_index != len(plays):
+        return rebuild_player_index(box_stats)
+    _drop_index(index['plays'], removed_index, shift=False)
+    index['plays_indexed'] = len(plays)
+    index['players_indexed'] = len(box_stats.get('players') or {})
+    return index
+
+
+def resolve_player(box_stats, player_number_or_key):
+    """Resolve (key, player) by key, jersey number or name through the index"""
+    players = box_stats.get('players') or {}
+    index = get_player_index(box_stats)
+    key = _lookup(index, players, player_number_or_key)
+    if key is None:
+        return None, None
+    return key, players[key]
+
+
+def player_plays(box_stats, player_key):
+    """The plays a player was involved in, oldest first, as (index, play) pairs"""
+    plays = box_stats.get('plays') or []
+    index = get_player_index(box_stats)
+    return [(i, plays[i]) for i in index['plays'].get(player_key, []) if i < len(plays)]
+
+
+def involved_entry(box_stats, play, player_key):
+    """The players_involved entry for player_key in a play, or None"""
+    players = box_stats.get('players') or {}
+    index = get_player_index(box_stats)
+    for involved in play.get('players_involved', []) or []:
+        if isinstance(involved, dict) and _play_player_keys(index, players, {'players_involved': [involved]}) == [player_key]:
+            return involved
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Play posting lists
+#
+# box_stats['play_postings'] maps dimension -> value -> sorted play indices.
+# The dimensions (play call, phase, down, ...) are supplied by the caller as
+# {name: function(play) -> value or list of values}.
+# ---------------------------------------------------------------------------
+
+PLAY_POSTINGS_KEY = 'play_postings'
+
+
+def posting_value(value):
+    """Normalized posting key for a dimension value"""
+    return ' '.join(str(value).split()).lower()
+
+
+def _dimension_values(dimensions, play):
+    """{dimension: [posting keys]} for one play"""
+    values = {}
+    for name, extract in dimensions.items():
+        try:
+            raw = extract(play)
+        except Exception:
+            raw = None
+        if raw is None or raw == '':
+            continue
+        raw = raw if isinstance(raw, (list, tuple, set)) else [raw]
+        keys = []
+        for value in raw:
+            key = posting_value(value)
+            if key and key not in keys:
+                keys.append(key)
+        if keys:
+            values[name] = keys
+    return values
+
+
+def _add_postings(postings, dimensions, play, play_index):
+    for name, keys in _dimension_values(dimensions, play).items():
+        for key in keys:
+            insort(postings['dims'].setdefault(name, {}).setdefault(key, []), play_index)
+
+
+def rebuild_play_postings(box_stats, dimensions):
+    """Build every posting list from the play log and store them with the session"""
+    plays = box_stats.get('plays') or []
+    postings = {'dims': {}, 'plays_indexed': 0, 'dimensions': sorted(dimensions)}
+    for play_index, play in enumerate(plays):
+        for name, keys in _dimension_values(dimensions, play).items():
+            for key in keys:
+                postings['dims'].setdefault(name, {}).setdefault(key, []).append(play_index)
+    postings['plays_indexed'] = len(plays)
+    box_stats[PLAY_POSTINGS_KEY] = postings
+    return postings
+
+
+def _current_postings(box_stats, dimensions, expected_plays):
+    postings = box_stats.get(PLAY_POSTINGS_KEY)
+    if (not isinstance(postings, dict)
+            or postings.get('plays_indexed') != expected_plays
+            or postings.get('dimensions') != sorted(dimensions)):
+        return None
+    return postings
+
+
+def get_play_postings(box_stats, dimensions):
+    """Return the session's posting lists, rebuilding them if missing or stale"""
+    postings = _current_postings(box_stats, dimensions, len(box_stats.get('plays') or []))
+    return postings if postings is not None else rebuild_play_postings(box_stats, dimensions)
+
+
+def index_play_postings(box_stats, dimensions, play_index=None):
+    """Add a newly appended play (default: the last one) to the posting lists"""
+    plays = box_stats.get('plays') or []
+    if play_index is None:
+        play_index = len(plays) - 1
+    postings = _current_postings(box_stats, dimensions, play_index)
+    if postings is None:
+        return rebuild_play_postings(box_stats, dimensions)
+    _add_postings(postings, dimensions, plays[play_index], play_index)
+    postings['plays_indexed'] = len(plays)
+    return postings
+
+
+def _drop_index(lists, play_index, shift):
+    """Remove play_index from every list; with shift, renumber the plays after it"""
+    for key in list(lists):
+        indices = lists[key]
+        pos = bisect_left(indices, play_index)
+        if pos < len(indices) and indices[pos] == play_index:
+            del indices[pos]
+        if shift:
+            for i in range(pos, len(indices)):
+                indices[i] -= 1
+        if not indices:
+            del lists[key]
+
+
+def remove_play_postings(box_stats, dimensions, play_index):
+    """Update the posting lists after the play at play_index was deleted from the log"""
+    plays = box_stats.get('plays') or []
+    postings = _current_postings(box_stats, dimensions, len(plays) + 1)
+    if postings is None:
+        return rebuild_play_postings(box_stats, dimensions)
+    for lists in postings['dims'].values():
+        _drop_index(lists, play_index, shift=True)
+    postings['plays_indexed'] = len(plays)
+    return postings
+
+
+def update_play_postings(box_stats, dimensions, play_index):
+    """Re-file the play at play_index after it was edited in place"""
+    plays = box_stats.get('plays') or []
+    postings = _current_postings(box_stats, dimensions, len(plays))
+    if postings is None:
+        return rebuild_play_postings(box_stats, dimensions)
+    for lists in postings['dims'].values():
+        _drop_index(lists, play_index, shift=False)
+    _add_postings(postings, dimensions, plays[play_index], play_index)
+    return postings
+
+
+def union_postings(lists):
+    """Sorted, de-duplicated union of sorted index lists"""
+    merged = []
+    for play_index in heapq.merge(*lists):
+        if not merged or merged[-1] != play_index:
+            merged.append(play_index)
+    return merged
+
+
+def intersect_postings(lists):
+    """Sorted intersection of sorted index lists, smallest list first"""
+    if not lists:
+        return []
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for other in lists[1:]:
+        if not result:
+            break
+        other_set = set(other)
+        result = [i for i in result if i in other_set]
+    return list(result)
+
+
+def query_play_indices(box_stats, dimensions, filters, extra_lists=None):
+    """Indices of plays matching every filter.
+
+    filters maps a dimension to the values it may take (any of them matches);
+    extra_lists are further posting lists to intersect (e.g. a player's plays).
+    With no filters at all every play matches.
+    """
+    postings = get_play_postings(box_stats, dimensions)
+    candidate_lists = []
+    for name, values in filters.items():
+        lists = postings['dims'].get(name, {})
+        candidate_lists.append(union_postings([lists.get(posting_value(v), []) for v in values]))
+    candidate_lists.extend(extra_lists or [])
+    if not candidate_lists:
+        return list(range(len(box_stats.get('plays') or [])))
+    return intersect_postings(candidate_lists)
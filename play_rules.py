@@ -0,0 +1,189 @@
+"""
+Configurable efficient/explosive/negative rules and a vectorized re-scorer.
+
+RuleConfig holds the thresholds behind calculate_play_efficiency,
+calculate_play_explosiveness and calculate_play_negativeness. The defaults
+are the current definitions:
+
+- efficient: 1st down >= 4 yards, 2nd down >= half the distance,
+  3rd/4th down >= the distance (defense: the opposite); an offensive
+  turnover is never efficient, a forced turnover always is, and a special
+  teams turnover is scored on yardage like any other special teams play
+- explosive: >= 10 yards on a run (or unknown role), >= 15 on a pass;
+  never on a turnover
+- negative: a turnover or a loss of yards
+
+play_columns() turns a play log into compact per-play columns (down,
+distance, yards, phase and the flags the rules need). evaluate() scores
+those columns under a rule set with NumPy, so a whole season can be
+re-scored under alternate thresholds without replaying games.
+"""
+import numpy as np
+
+PASS_ROLES = ('receiver', 'passer')
+
+# Phase codes in the 'phase' column; any other phase is scored like offense
+PHASES = ('offense', 'defense', 'special_teams')
+
+# Column names of a play_columns() table (all integer lists)
+COLUMNS = ('down', 'distance', 'yards', 'phase', 'turnover', 'rush_role', 'pass_role', 'valid')
+
+
+class RuleConfig:
+    """Thresholds for efficient, explosive and negative plays"""
+
+    FIELDS = {
+        'first_down_yards': 4,          # 1st down: efficient at this many yards
+        'second_down_fraction': 0.5,    # 2nd down: efficient at this share of the distance
+        'late_down_fraction': 1.0,      # 3rd/4th down: efficient at this share of the distance
+        'explosive_rush_yards': 10,     # explosive run (and plays without a passing role)
+        'explosive_pass_yards': 15,     # explosive pass
+        'negative_yards_below': 0,      # negative when yards gained are below this
+        'turnover_negative': True       # turnovers count as negative plays
+    }
+
+    def __init__(self, **values):
+        unknown = set(values) - set(self.FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown rule settings: {', '.join(sorted(unknown))}")
+        for name, default in self.FIELDS.items():
+            value = values.get(name, default)
+            try:
+                value = bool(value) if isinstance(default, bool) else type(default)(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid value for {name}: {value!r}")
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**(data or {}))
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, RuleConfig) and self.to_dict() == other.to_dict()
+
+
+def _int(value, default=None):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def play_row(play):
+    """One play as a column row (see COLUMNS)"""
+    players_involved = [p for p in (play.get('players_involved', []) or []) if isinstance(p, dict)]
+    roles = [str(p.get('role', '')) for p in players_involved]
+    play_type = str(play.get('play_type', '')).lower()
+    inferred_rush = 'rush' in play_type or 'run' in play_type
+    inferred_pass = 'pass' in play_type and not inferred_rush
+    phase = str(play.get('phase', 'offense')).lower()
+    down = _int(play.get('down', 1))
+    distance = _int(play.get('distance', 10))
+    return [
+        down if down is not None else 0,
+        distance if distance is not None else 0,
+        _int(play.get('yards_gained', 0), 0),
+        PHASES.index(phase) if phase in PHASES else 0,
+        1 if any(p.get('fumble', False) or p.get('interception', False) for p in players_involved) else 0,
+        # Unknown roles use the rushing threshold; with no player matching, the play type decides
+        1 if any(r not in PASS_ROLES for r in roles) or inferred_rush else 0,
+        1 if any(r in PASS_ROLES for r in roles) or inferred_pass else 0,
+        # Unparseable down/distance never counts as efficient
+        1 if down is not None and distance is not None else 0
+    ]
+
+
+def play_columns(plays):
+    """Column table {name: [int, ...]} for a play log; JSON-friendly so it can be cached"""
+    rows = [play_row(play) for play in plays]
+    return {name: [row[i] for row in rows] for i, name in enumerate(COLUMNS)}
+
+
+def concat_columns(tables):
+    """Stack several column tables (e.g. one per game) into one"""
+    return {name: [value for table in tables for value in table.get(name, [])] for name in COLUMNS}
+
+
+def evaluate(columns, rules):
+    """Efficient/explosive/negative boolean arrays for every play under a rule set"""
+    down = np.asarray(columns['down'], dtype=np.int64)
+    distance = np.asarray(columns['distance'], dtype=np.float64)
+    yards = np.asarray(columns['yards'], dtype=np.int64)
+    phase = np.asarray(columns['phase'], dtype=np.int64)
+    defense = phase == PHASES.index('defense')
+    special_teams = phase == PHASES.index('special_teams')
+    turnover = np.asarray(columns['turnover'], dtype=bool)
+    rush_role = np.asarray(columns['rush_role'], dtype=bool)
+    pass_role = np.asarray(columns['pass_role'], dtype=bool)
+    valid = np.asarray(columns['valid'], dtype=bool)
+
+    # Yards needed on each down; other downs never qualify
+    needed = np.select(
+        [down == 1, down == 2, (down == 3) | (down == 4)],
+        [np.full(down.shape, float(rules.first_down_yards)),
+         distance * rules.second_down_fraction,
+         distance * rules.late_down_fraction],
+        default=np.nan)
+    known_down = valid & ~np.isnan(needed)
+    reached = yards >= np.nan_to_num(needed)
+    efficient = known_down & np.where(defense, ~reached, reached)
+    # Turnovers decide offense (never) and defense (always); special teams keep the yardage rules
+    efficient = np.where(turnover & ~special_teams, defense, efficient)
+
+    explosive = ~turnover & (
+        (rush_role & (yards >= rules.explosive_rush_yards)) |
+        (pass_role & (yards >= rules.explosive_pass_yards)))
+
+    negative = yards < rules.negative_yards_below
+    if rules.turnover_negative:
+        negative = negative | turnover
+
+    return {'efficient': efficient, 'explosive': explosive, 'negative': negative, 'yards': yards, 'phase': phase}
+
+
+def score_summary(scored, mask=None):
+    """plays/yards/efficient/explosive/negative counters over the plays selected by mask"""
+    if mask is None:
+        mask = np.ones(scored['yards'].shape, dtype=bool)
+    return {
+        'plays': int(mask.sum()),
+        'yards': int(scored['yards'][mask].sum()),
+        'efficient': int(scored['efficient'][mask].sum()),
+        'explosive': int(scored['explosive'][mask].sum()),
+        'negative': int(scored['negative'][mask].sum())
+    }
+
+
+def compare_rules(columns, rules, baseline=None, groups=None):
+    """Score the same plays under the current rules and an alternate set, side by side.
+
+    groups optionally maps a group label (e.g. a play call) to each play, in
+    play order; the comparison is then also reported per group.
+    Returns {'phases': {phase: {'current', 'what_if'}}, 'changed': {...}, 'groups': {...}}.
+    """
+    baseline = baseline or RuleConfig()
+    current = evaluate(columns, baseline)
+    what_if = evaluate(columns, rules)
+    phase_masks = [(phase, current['phase'] == code) for code, phase in enumerate(PHASES)]
+
+    phases = {}
+    for phase, mask in phase_masks:
+        if mask.any():
+            phases[phase] = {'current': score_summary(current, mask), 'what_if': score_summary(what_if, mask)}
+
+    changed = {flag: int((current[flag] != what_if[flag]).sum()) for flag in ('efficient', 'explosive', 'negative')}
+
+    grouped = {}
+    if groups is not None:
+        labels = np.asarray(groups, dtype=object)
+        for label in dict.fromkeys(groups):
+            for phase, phase_mask in phase_masks:
+                mask = phase_mask & (labels == label)
+                if mask.any():
+                    grouped.setdefault(phase, {})[label] = {
+                        'current': score_summary(current, mask), 'what_if': score_summary(what_if, mask)}
+
+    return {'phases': phases, 'changed': changed, 'groups': grouped}
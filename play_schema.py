@@ -0,0 +1,320 @@
+"""
+Validation and coercion for add_play payloads.
+
+The schema is declared once below as tables of fields. At import each table
+is compiled into one validator per record type (play, penalty, player): a
+closure over a step per field with its key and coercer already bound, so
+validating a play is one pass over the payload with no per-request branching
+on field names. validate_play() returns the canonical play dict the stats
+engine stores (edit_play runs merged edits through it as well):
+
+    - players_involved is always a list of player dicts (a single object or
+      the legacy 'players' key are accepted)
+    - down, distance, yards_gained, penalty_yards and player numbers are ints
+    - phase is one of PHASES, play_type is canonical ('run' -> 'rush',
+      'pass_defense' -> 'pass', ...; missing or blank stays '' as before)
+      and player roles are canonical
+      ('ball_carrier' -> 'rusher', 'qb' -> 'passer', ...)
+    - per-player flags (touchdown, fumble, completion, ...) are bools
+    - client_id, when the client sent one, is kept for idempotent retries
+
+Anything that can not be coerced is collected and raised together as a
+PlayValidationError whose `errors` list names each field path, e.g.
+{'field': 'players_involved[1].number', 'message': 'must be a whole number'}.
+"""
+
+PHASES = ('offense', 'defense', 'special_teams')
+
+PLAY_TYPES = frozenset((
+    'rush', 'pass', 'kneel', 'spike',
+    'defensive_play', 'interception_return', 'fumble_return', 'safety',
+    'punt', 'field_goal', 'extra_point', 'kickoff', 'punt_return', 'kickoff_return', 'blocked_kick',
+    'onside_kick', 'fake_punt', 'fake_field_goal',
+    'penalty', 'timeout'
+))
+
+PLAY_TYPE_SYNONYMS = {
+    'run': 'rush',
+    'run_defense': 'rush',
+    'rush_defense': 'rush',
+    'pass_defense': 'pass'
+}
+
+# Role names the entry forms and older clients send, mapped to the roles the stats engine counts
+ROLE_SYNONYMS = {
+    # offense
+    'ball_carrier': 'rusher', 'runner': 'rusher', 'rush': 'rusher',
+    'wr': 'receiver', 'rec': 'receiver', 'catch': 'receiver',
+    'qb': 'passer', 'quarterback': 'passer', 'thrower': 'passer',
+    # defense
+    'tackle': 'tackler', 'tk': 'tackler', 'tacklesolo': 'tackler',
+    'assist_tackle': 'assist',
+    'sack': 'sacker',
+    'int': 'interceptor', 'interception': 'interceptor',
+    'pbu': 'pass_breakup'
+}
+
+PENALTY_SIDES = ('offense', 'defense')
+
+# Per-player checkboxes from the entry form
+PLAYER_FLAGS = (
+    'touchdown', 'fumble', 'completion', 'interception', 'first_down',
+    'tackle', 'sack', 'interception_def', 'pass_breakup', 'fumble_recovery', 'forced_fumble', 'tackle_for_loss',
+    'defensive_td', 'field_goal_made', 'extra_point_made', 'punt_return', 'kickoff_return', 'coverage_tackle',
+    'blocked_kick', 'special_teams_td'
+)
+
+_TRUE_STRINGS = ('true', 'on', 'yes', '1')
+_FALSE_STRINGS = ('false', 'off', 'no', '0', '')
+
+
+class PlayValidationError(ValueError):
+    """A play payload that can not be coerced; `errors` is a list of {field, message}"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__('; '.join(f"{e['field']}: {e['message']}" for e in errors))
+
+
+class _Invalid(Exception):
+    pass
+
+
+_MISSING = object()
+
+
+# ---------------------------------------------------------------------------
+# Coercers: value -> canonical value, or raise _Invalid(message)
+# ---------------------------------------------------------------------------
+
+def _whole_number(value):
+    if isinstance(value, bool):
+        raise _Invalid('must be a whole number')
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        if value != value or value != int(value):
+            raise _Invalid('must be a whole number')
+        return int(value)
+    if isinstance(value, str) and value.strip().lstrip('+-').isdigit():
+        return int(value)
+    raise _Invalid('must be a whole number')
+
+
+def int_field(low, high, default=_MISSING, nullable=False):
+    """Whole number in [low, high]; None/'' allowed when nullable, missing gives default"""
+    def coerce(value):
+        if value is _MISSING:
+            return default
+        if nullable and (value is None or value == ''):
+            return None
+        number = _whole_number(value)
+        if not low <= number <= high:
+            raise _Invalid(f"must be between {low} and {high}")
+        return number
+    return coerce
+
+
+def str_field(default=_MISSING, blank_to_none=False):
+    """Stripped string; None stays None"""
+    def coerce(value):
+        if value is _MISSING:
+            return default
+        if value is None:
+            return None
+        if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+            raise _Invalid('must be text')
+        text = str(value).strip()
+        return None if blank_to_none and not text else text
+    return coerce
+
+
+def choice_field(choices, synonyms=None, default=_MISSING):
+    """Lower-cased string mapped through synonyms, which must then be one of choices"""
+    synonyms = synonyms or {}
+
+    def coerce(value):
+        if value is _MISSING or value is None or (isinstance(value, str) and not value.strip()):
+            if default is _MISSING:
+                raise _Invalid('is required')
+            return default
+        if not isinstance(value, str):
+            raise _Invalid('must be text')
+        key = value.strip().lower()
+        key = synonyms.get(key, key)
+        if key not in choices:
+            raise _Invalid(f"must be one of {', '.join(sorted(choices))}")
+        return key
+    return coerce
+
+
+def bool_field(value):
+    """Checkbox value; missing stays missing, None is False"""
+    if value is _MISSING:
+        return _MISSING
+    if value is None or isinstance(value, bool):
+        return bool(value)
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str) and value.strip().lower() in _TRUE_STRINGS + _FALSE_STRINGS:
+        return value.strip().lower() in _TRUE_STRINGS
+    raise _Invalid('must be true or false')
+
+
+def role_field(value):
+    """Canonical role; an empty role is kept empty so the engine can infer it from the play"""
+    if value is _MISSING or value is None:
+        return ''
+    if not isinstance(value, str):
+        raise _Invalid('must be text')
+    role = value.strip().lower()
+    return ROLE_SYNONYMS.get(role, role)
+
+
+def client_id_field(value):
+    """Id the client gave the play (a UUID); absent when not sent"""
+    if value is _MISSING or value is None or value == '':
+        return _MISSING
+    if not isinstance(value, str) or not 8 <= len(value) <= 64 or \
+            not all(c.isascii() and (c.isalnum() or c in '-_') for c in value):
+        raise _Invalid('must be 8-64 letters, digits, dashes or underscores')
+    return value
+
+
+def field_position_field(value):
+    """Signed yard line (negative is own side) or an 'OWN 25' / 'OPP 30' string; yards past midfield clamp to 50"""
+    if value is _MISSING or value is None or value == '':
+        return None
+    if isinstance(value, str) and not value.strip().lstrip('+-').isdigit():
+        parts = value.strip().upper().split()
+        if len(parts) == 2 and parts[0] in ('OWN', 'OPP') and parts[1].isdigit():
+            return f"{parts[0]} {min(50, int(parts[1]))}"
+        raise _Invalid("must be a signed yard line or 'OWN xx' / 'OPP xx'")
+    number = _whole_number(value)
+    if not -99 <= number <= 99:
+        raise _Invalid('must be between -99 and 99')
+    return max(-50, min(50, number))
+
+
+# ---------------------------------------------------------------------------
+# Schema
+# ---------------------------------------------------------------------------
+
+PLAY_FIELDS = (
+    ('play_number', int_field(0, 9999, default=None, nullable=True)),
+    ('down', int_field(1, 4, default=None, nullable=True)),
+    ('distance', int_field(0, 99, default=None, nullable=True)),
+    ('field_position', field_position_field),
+    ('play_type', choice_field(PLAY_TYPES, PLAY_TYPE_SYNONYMS, default='')),
+    ('play_call', str_field(default=None, blank_to_none=True)),
+    ('result', str_field(default=None)),
+    ('yards_gained', int_field(-99, 109, default=0)),
+    ('timestamp', str_field(default=None)),
+    ('phase', choice_field(PHASES, default='offense')),
+    ('client_id', client_id_field)
+)
+
+PENALTY_FIELDS = (
+    ('penalty_type', str_field(default=None)),
+    ('penalty_yards', int_field(0, 99, default=0, nullable=True))
+)
+
+PLAYER_FIELDS = (
+    ('number', int_field(0, 999, default=None, nullable=True)),
+    ('name', str_field()),
+    ('position', str_field()),
+    ('role', role_field),
+    ('return_yards', int_field(-99, 109, nullable=True)),
+) + tuple((flag, bool_field) for flag in PLAYER_FLAGS)
+
+
+def _compile_step(key, coerce):
+    """One field as a step(get, target, errors, prefix) with its key and coercer bound"""
+    def step(get, target, errors, prefix):
+        try:
+            value = coerce(get(key, _MISSING))
+        except _Invalid as e:
+            errors.append({'field': prefix + key, 'message': str(e)})
+            return
+        if value is not _MISSING:
+            target[key] = value
+    return step
+
+
+def compile_fields(fields):
+    """Compile a field table into validate(source, target, errors, prefix='') for that record type"""
+    steps = tuple(_compile_step(key, coerce) for key, coerce in fields)
+
+    def validate(source, target, errors, prefix=''):
+        get = source.get
+        for step in steps:
+            step(get, target, errors, prefix)
+    return validate
+
+
+_validate_play_fields = compile_fields(PLAY_FIELDS)
+_validate_penalty_fields = compile_fields(PENALTY_FIELDS)
+_validate_player_fields = compile_fields(PLAYER_FIELDS)
+_PENALTY_SIDE = choice_field(PENALTY_SIDES, default='offense')
+
+
+def _players(payload, errors):
+    """players_involved as a list of canonical player dicts (legacy 'players' as fallback)"""
+    players = payload.get('players_involved')
+    field = 'players_involved'
+    if isinstance(players, dict):
+        players = [players]
+    if not players:
+        players = payload.get('players')
+        field = 'players'
+        if isinstance(players, dict):
+            players = [players]
+        if not players:
+            return []
+    if not isinstance(players, list):
+        errors.append({'field': field, 'message': 'must be a list of players'})
+        return []
+
+    canonical = []
+    for i, player in enumerate(players):
+        prefix = f"{field}[{i}]."
+        if not isinstance(player, dict):
+            errors.append({'field': f"{field}[{i}]", 'message': 'must be an object'})
+            continue
+        # Unknown keys (roster id, extra stat boxes) are carried through as sent
+        row = dict(player)
+        before = len(errors)
+        _validate_player_fields(player, row, errors, prefix)
+        if len(errors) == before and row.get('number') is None and not row.get('name'):
+            errors.append({'field': f"{field}[{i}]", 'message': 'needs a number or a name'})
+        canonical.append(row)
+    return canonical
+
+
+def validate_play(payload):
+    """Canonical play dict for add_play; raises PlayValidationError listing every bad field"""
+    if not isinstance(payload, dict):
+        raise PlayValidationError([{'field': 'body', 'message': 'must be a JSON object'}])
+
+    errors = []
+    play = {}
+    _validate_play_fields(payload, play, errors)
+    play['players_involved'] = _players(payload, errors)
+    # Keep the stored key order the engine has always written
+    play['timestamp'] = play.pop('timestamp', None)
+    play['phase'] = play.pop('phase', 'offense')
+    if 'client_id' in play:
+        play['client_id'] = play.pop('client_id')
+
+    if play.get('play_type') == 'penalty':
+        _validate_penalty_fields(payload, play, errors)
+        if play.get('penalty_yards') is None:
+            play['penalty_yards'] = 0
+        try:
+            play['penalty_on'] = _PENALTY_SIDE(payload.get('penalty_on') or payload.get('penalty_side'))
+        except _Invalid as e:
+            errors.append({'field': 'penalty_side', 'message': str(e)})
+
+    if errors:
+        raise PlayValidationError(errors)
+    return play
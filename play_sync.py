@@ -0,0 +1,108 @@
+"""
+Idempotent play submission for clients that queue plays while offline.
+
+The entry page tags every play with a client_id (a UUID made on the device)
+and keeps unsent plays in a local queue. The session remembers a receipt for
+each client_id it has applied, in data['play_receipts'] (the most recent
+RECEIPT_LIMIT, oldest dropped first), so a play that is submitted again after
+a dropped response is answered from its receipt instead of being counted
+twice. Undoing or deleting a play keeps its receipt: the play was received,
+and a late retry must not bring it back.
+
+A queued batch carries ordering metadata per play:
+
+    client_seq   position in the device's queue (monotonic per device)
+    queued_at    ISO time the play was entered, used only to break ties
+
+order_batch() puts the batch in that order before it is applied, and
+apply_batch() applies it: one play that fails is rejected on its own and
+the rest still apply, so a bad play can not block the queue behind it.
+"""
+import copy
+
+RECEIPTS_KEY = 'play_receipts'
+RECEIPT_LIMIT = 1000
+BATCH_LIMIT = 200
+
+
+def get_receipt(data, client_id):
+    """Stored receipt for a client_id, or None"""
+    if not client_id:
+        return None
+    receipts = data.get(RECEIPTS_KEY)
+    return receipts.get(client_id) if isinstance(receipts, dict) else None
+
+
+def store_receipt(data, client_id, receipt):
+    """Remember that client_id was applied; the oldest receipts go past RECEIPT_LIMIT"""
+    if not client_id:
+        return
+    receipts = data.get(RECEIPTS_KEY)
+    if not isinstance(receipts, dict):
+        receipts = data[RECEIPTS_KEY] = {}
+    receipts[client_id] = receipt
+    for stale in list(receipts)[:max(0, len(receipts) - RECEIPT_LIMIT)]:
+        del receipts[stale]
+
+
+def make_receipt(result):
+    """What a retry of the same play is told: where the play landed and the situation after it"""
+    return {
+        'play_index': result['play_index'],
+        'play_number': result.get('play_number'),
+        'next_situation': result.get('next_situation', {})
+    }
+
+
+def _sort_key(position, item):
+    seq = item.get('client_seq') if isinstance(item, dict) else None
+    seq = seq if isinstance(seq, (int, float)) and not isinstance(seq, bool) else float('inf')
+    queued_at = item.get('queued_at') if isinstance(item, dict) else None
+    return (seq, str(queued_at or ''), position)
+
+
+def order_batch(items):
+    """Batch items in queue order: client_seq, then queued_at, then the order sent"""
+    return [item for _, item in sorted(enumerate(items), key=lambda pair: _sort_key(*pair))]
+
+
+def apply_batch(data, plays, record):
+    """Apply (client_id, play, errors) items in order with record(data, play) -> result.
+
+    Each item gets a result: added, duplicate (answered from its receipt) or
+    rejected (invalid, or record raised). A play that raises may have left the
+    session half-updated, so the session is put back as it was before the batch
+    and the plays that did apply are applied again without it.
+    Returns (results, index of the last added play or None).
+    """
+    checkpoint = None
+    failed = {}
+    while True:
+        results = []
+        last_index = None
+        retry = False
+        for position, (client_id, play, errors) in enumerate(plays):
+            if errors or position in failed:
+                results.append({'client_id': client_id, 'status': 'rejected', 'errors': errors or failed[position]})
+                continue
+            receipt = get_receipt(data, client_id)
+            if receipt:
+                results.append({'client_id': client_id, 'status': 'duplicate', **receipt})
+                continue
+            if checkpoint is None:
+                checkpoint = copy.deepcopy(data)
+            try:
+                result = record(data, copy.deepcopy(play))
+            except Exception as e:
+                print(f"❌ Queued play {client_id} could not be applied: {e}")
+                failed[position] = [{'field': None, 'message': f'could not be applied: {e}'}]
+                retry = True
+                break
+            receipt = make_receipt(result)
+            store_receipt(data, client_id, receipt)
+            results.append({'client_id': client_id, 'status': 'added', **receipt})
+            last_index = result['play_index']
+        if not retry:
+            return results, last_index
+        data.clear()
+        data.update(copy.deepcopy(checkpoint))
@@ -0,0 +1,281 @@
+"""
+Season rollups across a user's saved games.
+
+Each saved game is reduced to a compact summary (team counters per phase,
+player counters, play call counters) built from its stored aggregates, so
+no play log is re-scanned. Summaries are cached per user on disk and keyed
+by a source stamp (file mtime/size, or the Supabase row's updated_at); a
+game is summarized again only when it has been re-saved.
+
+Summaries also carry the per-play columns play_rules needs, so a season can
+be re-scored under alternate thresholds from the cache alone.
+
+Rollups (season, per-opponent, per-game trend, players, play calls) are
+computed with pandas over the summaries.
+"""
+import os
+import json
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from play_rules import play_columns
+
+SUMMARY_VERSION = 2
+
+PHASES = ('offense', 'defense', 'special_teams', 'overall')
+
+COUNTER_COLUMNS = ['plays', 'yards', 'efficient', 'explosive', 'negative']
+
+
+def _counters(stats, yards=None):
+    """plays/yards/efficient/explosive/negative from a stored team, player or play call row"""
+    stats = stats if isinstance(stats, dict) else {}
+
+    def number(field):
+        try:
+            return int(stats.get(field, 0) or 0)
+        except (TypeError, ValueError):
+            return 0
+    return {
+        'plays': number('total_plays'),
+        'yards': number('total_yards') if yards is None else yards,
+        'efficient': number('efficient_plays'),
+        'explosive': number('explosive_plays'),
+        'negative': number('negative_plays')
+    }
+
+
+def _player_id(key, player):
+    """Identity of a player across games: jersey number, else normalized name"""
+    number = player.get('number')
+    if number not in (None, '', 0, '0'):
+        return str(number)
+    name = ' '.join(str(player.get('name', '')).split()).lower()
+    return f"name:{name}" if name else f"key:{key}"
+
+
+def summarize_game(game_data, meta):
+    """Compact per-game summary from a saved game's stored aggregates"""
+    game_data = game_data.get('game_data', game_data) if isinstance(game_data, dict) else {}
+    game_info = game_data.get('game_info') or {}
+
+    team_stats = game_data.get('team_stats') or {}
+    if 'offense' not in team_stats and 'total_plays' in team_stats:
+        # Pre-phase saves kept one flat team row
+        team_stats = {'offense': team_stats, 'overall': team_stats}
+    team = {phase: _counters(team_stats.get(phase)) for phase in PHASES if isinstance(team_stats.get(phase), dict)}
+
+    players = {}
+    for key, player in (game_data.get('players') or {}).items():
+        if not isinstance(player, dict):
+            continue
+        yards = sum(int(player.get(f, 0) or 0) for f in ('rushing_yards', 'receiving_yards', 'passing_yards'))
+        counters = _counters(player, yards)
+        if counters['plays'] == 0:
+            continue
+        players[_player_id(key, player)] = {
+            'name': player.get('name', ''),
+            'number': player.get('number'),
+            'position': player.get('position', ''),
+            **counters
+        }
+
+    play_calls = []
+    play_call_stats = game_data.get('play_call_stats') or {}
+    if play_call_stats and all(isinstance(v, dict) and 'total_plays' in v for v in play_call_stats.values()):
+        # Older saves tracked offensive play calls without a phase level
+        play_call_stats = {'offense': play_call_stats}
+    for phase, calls in play_call_stats.items():
+        if not isinstance(calls, dict):
+            continue
+        for play_call, stats in calls.items():
+            if isinstance(stats, dict):
+                play_calls.append({'phase': str(phase), 'play_call': str(play_call), **_counters(stats)})
+
+    # Per-play columns let the season be re-scored under other rule sets (play_rules)
+    plays = [play for play in (game_data.get('plays') or []) if isinstance(play, dict)]
+
+    return {
+        'summary_version': SUMMARY_VERSION,
+        'game_key': meta['game_key'],
+        'game_name': meta.get('game_name') or game_info.get('name') or meta['game_key'],
+        'opponent': game_info.get('opponent') or meta.get('opponent') or '',
+        'date': str(game_info.get('date') or meta.get('date') or ''),
+        'saved_at': meta.get('saved_at') or game_data.get('saved_at') or '',
+        'source': meta.get('source', 'local'),
+        'team': team,
+        'players': players,
+        'play_calls': play_calls,
+        'play_columns': play_columns(plays),
+        'play_call_labels': [str(play.get('play_call') or '') for play in plays]
+    }
+
+
+class SeasonSummaryCache:
+    """Per-user cache of game summaries, refreshed only for re-saved games"""
+
+    def __init__(self, base_dir=os.path.join('server_sessions', 'season_cache')):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        os.makedirs(base_dir, exist_ok=True)
+
+    def get_cache_path(self, username):
+        return os.path.join(self.base_dir, f"{hashlib.md5(username.encode()).hexdigest()}.json")
+
+    def _read(self, username):
+        path = self.get_cache_path(username)
+        try:
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error reading season cache for {username}: {e}")
+        return {'games': {}}
+
+    def _write(self, username, cache):
+        path = self.get_cache_path(username)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, path)
+
+    def get_summaries(self, username, sources):
+        """Summaries for every source, summarizing only new or re-saved games.
+
+        sources: [{'game_key', 'stamp', 'load': callable -> game data, ...meta}]
+        Returns (summaries, refreshed_count).
+        """
+        with self._lock:
+            cache = self._read(username)
+            cached = cache.get('games', {})
+            games = {}
+            refreshed = 0
+            for source in sources:
+                entry = cached.get(source['game_key'])
+                if (entry and entry.get('stamp') == source['stamp']
+                        and entry.get('summary', {}).get('summary_version') == SUMMARY_VERSION):
+                    games[source['game_key']] = entry
+                    continue
+                try:
+                    game_data = source['load']()
+                except Exception as e:
+                    print(f"Error loading game {source['game_key']} for season rollup: {e}")
+                    game_data = None
+                if not game_data:
+                    continue
+                games[source['game_key']] = {'stamp': source['stamp'], 'summary': summarize_game(game_data, source)}
+                refreshed += 1
+            # Games no longer listed (deleted) drop out of the cache
+            if refreshed or set(games) != set(cached):
+                try:
+                    self._write(username, {'games': games})
+                except Exception as e:
+                    print(f"Error writing season cache for {username}: {e}")
+            return [entry['summary'] for entry in games.values()], refreshed
+
+    def invalidate(self, username, game_key=None):
+        """Forget one game's summary (or all of a user's) so it is rebuilt on next use"""
+        with self._lock:
+            if game_key is None:
+                cache = {'games': {}}
+            else:
+                cache = self._read(username)
+                cache.get('games', {}).pop(game_key, None)
+            try:
+                self._write(username, cache)
+            except Exception as e:
+                print(f"Error invalidating season cache for {username}: {e}")
+
+
+def dedupe_summaries(summaries):
+    """Games saved to both Supabase and file appear twice; keep the newest save per game name"""
+    latest = {}
+    for summary in summaries:
+        name = ' '.join(str(summary.get('game_name', '')).split()).lower() or summary['game_key']
+        if name not in latest or str(summary.get('saved_at', '')) > str(latest[name].get('saved_at', '')):
+            latest[name] = summary
+    return list(latest.values())
+
+
+def _with_rates(df):
+    """Add efficiency/explosive/negative rates, yards per play and phase-aware NEE columns"""
+    plays = df['plays'].where(df['plays'] > 0)
+    df['avg_yards_per_play'] = (df['yards'] / plays).round(1).fillna(0.0)
+    df['efficiency_rate'] = (df['efficient'] / plays * 100).round(1).fillna(0.0)
+    df['explosive_rate'] = (df['explosive'] / plays * 100).round(1).fillna(0.0)
+    df['negative_rate'] = (df['negative'] / plays * 100).round(1).fillna(0.0)
+    defense = (df['phase'] == 'defense') if 'phase' in df else False
+    df['nee_score'] = np.where(
+        defense,
+        df['efficiency_rate'] + df['negative_rate'] - df['explosive_rate'],
+        df['efficiency_rate'] + df['explosive_rate'] - df['negative_rate']
+    ).round(1)
+    return df
+
+
+def _records(df):
+    return df.to_dict('records') if not df.empty else []
+
+
+def season_rollup(summaries, phase=None):
+    """Season, per-opponent, per-game, player and play call rollups over game summaries"""
+    summaries = sorted(dedupe_summaries(summaries), key=lambda s: (s.get('date') or s.get('saved_at') or '', s.get('saved_at') or ''))
+    games = [{'game_key': s['game_key'], 'game_name': s['game_name'], 'opponent': s['opponent'] or 'Unknown',
+              'date': s['date'], 'week': week} for week, s in enumerate(summaries, start=1)]
+    game_meta = pd.DataFrame(games, columns=['game_key', 'game_name', 'opponent', 'date', 'week'])
+
+    team = pd.DataFrame(
+        [{'game_key': s['game_key'], 'phase': p, **c} for s in summaries for p, c in s['team'].items()],
+        columns=['game_key', 'phase'] + COUNTER_COLUMNS)
+    players = pd.DataFrame(
+        [{'game_key': s['game_key'], 'player_id': pid, 'name': p['name'], 'number': p['number'],
+          'position': p['position'], **{c: p[c] for c in COUNTER_COLUMNS}}
+         for s in summaries for pid, p in s['players'].items()],
+        columns=['game_key', 'player_id', 'name', 'number', 'position'] + COUNTER_COLUMNS)
+    calls = pd.DataFrame(
+        [{'game_key': s['game_key'], **c} for s in summaries for c in s['play_calls']],
+        columns=['game_key', 'phase', 'play_call'] + COUNTER_COLUMNS)
+
+    if phase:
+        team = team[team['phase'] == phase]
+        calls = calls[calls['phase'] == phase]
+
+    team = team.merge(game_meta, on='game_key', how='left')
+    calls = calls.merge(game_meta, on='game_key', how='left')
+    players = players.merge(game_meta, on='game_key', how='left')
+
+    # Per-game trend (NEE by week) and season/opponent totals
+    by_game = _with_rates(team.copy()).sort_values(['week', 'phase'])
+    season = _with_rates(team.groupby('phase', as_index=False)[COUNTER_COLUMNS].sum())
+    by_opponent = _with_rates(team.groupby(['opponent', 'phase'], as_index=False)[COUNTER_COLUMNS].sum())
+
+    # Players: season totals plus the per-game efficiency series
+    player_totals = players.groupby('player_id', as_index=False).agg(
+        name=('name', 'last'), number=('number', 'last'), position=('position', 'last'),
+        games=('game_key', 'nunique'), **{c: (c, 'sum') for c in COUNTER_COLUMNS})
+    player_totals = _with_rates(player_totals).sort_values('plays', ascending=False)
+    player_games = _with_rates(players.copy()).sort_values('week')
+    player_series = {
+        pid: group[['week', 'game_name', 'opponent', 'plays', 'efficiency_rate', 'nee_score']].to_dict('records')
+        for pid, group in player_games.groupby('player_id')
+    }
+
+    # Play calls: season success and success by opponent
+    call_totals = _with_rates(calls.groupby(['phase', 'play_call'], as_index=False)[COUNTER_COLUMNS].sum())
+    call_totals = call_totals.sort_values('plays', ascending=False)
+    call_by_opponent = _with_rates(calls.groupby(['phase', 'play_call', 'opponent'], as_index=False)[COUNTER_COLUMNS].sum())
+
+    return {
+        'games': games,
+        'season': _records(season),
+        'by_game': _records(by_game[['week', 'game_key', 'game_name', 'opponent', 'date', 'phase'] + COUNTER_COLUMNS +
+                                    ['avg_yards_per_play', 'efficiency_rate', 'explosive_rate', 'negative_rate', 'nee_score']]),
+        'by_opponent': _records(by_opponent),
+        'players': _records(player_totals),
+        'player_series': player_series,
+        'play_calls': _records(call_totals),
+        'play_calls_by_opponent': _records(call_by_opponent)
+    }
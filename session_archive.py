@@ -0,0 +1,235 @@
+"""
+Tiered storage for long-running box stats sessions.
+
+Completed games are moved out of the hot session blob into gzip-compressed
+cold segments on disk. The hot session keeps the current game plus a small
+summary per archived segment; full segments are loaded back on demand for
+historical queries.
+"""
+import os
+import gzip
+import pickle
+import shutil
+import threading
+import uuid
+from datetime import datetime
+
+from session_schema import PLAY_CALL_PHASES
+
+# Fields that identify a game; changing any of them starts a new game
+GAME_IDENTITY_FIELDS = ('name', 'opponent', 'date')
+
+# Player fields that survive a game rollover (everything else is per-game)
+PLAYER_IDENTITY_FIELDS = ('number', 'name', 'position')
+
+# Player counters copied into the hot segment summary
+PLAYER_SUMMARY_FIELDS = ('total_plays', 'efficient_plays', 'explosive_plays', 'negative_plays',
+                         'rushing_yards', 'receiving_yards', 'passing_yards', 'touchdowns')
+
+
+def ensure_game_id(box_stats):
+    """Return the current game id, assigning one if the session has none yet.
+
+    The game info is remembered under its id, so a game whose plays are
+    archived after the session moved on still keeps its name, opponent and date.
+    """
+    game_info = box_stats.get('game_info')
+    if not isinstance(game_info, dict):
+        game_info = {}
+        box_stats['game_info'] = game_info
+    if not game_info.get('game_id'):
+        game_info['game_id'] = str(uuid.uuid4())
+    known = box_stats.setdefault('archive', {}).setdefault('game_infos', {})
+    if known.get(game_info['game_id']) != game_info:
+        known[game_info['game_id']] = dict(game_info)
+    return game_info['game_id']
+
+
+def is_same_game(old_info, new_info):
+    """Check whether new game info describes the game already in progress.
+
+    A blank identity (no name, opponent or date yet) is treated as the same
+    game so that filling in details mid-game never triggers a rollover.
+    """
+    old_identity = tuple(str((old_info or {}).get(f, '')).strip() for f in GAME_IDENTITY_FIELDS)
+    new_identity = tuple(str((new_info or {}).get(f, '')).strip() for f in GAME_IDENTITY_FIELDS)
+    if not any(old_identity):
+        return True
+    return old_identity == new_identity
+
+
+def _zeroed(value):
+    """Return an empty value of the same shape (counters to zero, series emptied)"""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return 0
+    if isinstance(value, float):
+        return 0.0
+    if isinstance(value, list):
+        return []
+    if isinstance(value, dict):
+        return {k: _zeroed(v) for k, v in value.items()}
+    return value
+
+
+def _strip_series(stats):
+    """Copy a stats dict without its per-play progression series"""
+    if not isinstance(stats, dict):
+        return stats
+    return {k: _strip_series(v) for k, v in stats.items()
+            if not isinstance(v, list) and k != 'progression_counters'}
+
+
+class SessionArchive:
+    """Cold storage for completed games of a box stats session"""
+
+    def __init__(self, base_dir=os.path.join('server_sessions', 'archive')):
+        self.base_dir = base_dir
+        os.makedirs(base_dir, exist_ok=True)
+
+    def get_segment_dir(self, session_id):
+        """Get the directory holding a session's archived segments"""
+        return os.path.join(self.base_dir, session_id[:2], session_id)
+
+    def get_segment_path(self, session_id, segment_id):
+        """Get the file path for an archived segment"""
+        safe_id = "".join(c for c in str(segment_id) if c.isalnum() or c == '-')
+        return os.path.join(self.get_segment_dir(session_id), f"{safe_id}.pkl.gz")
+
+    def write_segment(self, session_id, segment):
+        """Write a segment to disk as compressed pickle"""
+        segment_dir = self.get_segment_dir(session_id)
+        os.makedirs(segment_dir, exist_ok=True)
+        path = self.get_segment_path(session_id, segment['segment_id'])
+        # Two workers may write the same segment; each writes its own temp file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+            pickle.dump(segment, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    def read_segment(self, session_id, segment_id):
+        """Load an archived segment, or None if it is missing"""
+        path = self.get_segment_path(session_id, segment_id)
+        try:
+            if os.path.exists(path):
+                with gzip.open(path, 'rb') as f:
+                    return pickle.load(f)
+        except Exception as e:
+            print(f"❌ Error reading archive segment {segment_id} for {session_id}: {e}")
+        return None
+
+    def delete_segments(self, session_id):
+        """Remove all archived segments for a session"""
+        try:
+            segment_dir = self.get_segment_dir(session_id)
+            if os.path.exists(segment_dir):
+                shutil.rmtree(segment_dir)
+            return True
+        except Exception as e:
+            print(f"Error deleting archive for session {session_id}: {e}")
+            return False
+
+    def list_segments(self, box_stats):
+        """Return the hot summaries of every archived segment, oldest first"""
+        return list(box_stats.get('archive', {}).get('segments', []))
+
+    def archive_game(self, session_id, box_stats, reason='game_complete'):
+        """Move the current game into a cold segment and reset the hot game state.
+
+        Plays, per-game team/player stats and play call stats go to disk;
+        the hot session keeps a summary of the segment and the player roster.
+        The segment id is derived from the game id and how many segments that
+        game already has, so an update that is retried against the same stored
+        session rewrites the same segment instead of archiving the game twice.
+        Returns the segment summary, or None when there is nothing to archive.
+        """
+        plays = box_stats.get('plays', [])
+        if not plays:
+            return None
+
+        game_info = dict(box_stats.get('game_info') or {})
+        game_id = game_info.get('game_id') or str(uuid.uuid4())
+        segments = box_stats.setdefault('archive', {}).setdefault('segments', [])
+        part = sum(1 for seg in segments if seg.get('game_id') == game_id)
+        segment_id = f"{game_id}-{part}"
+        archived_at = datetime.now().isoformat()
+
+        segment = {
+            'segment_id': segment_id,
+            'session_id': session_id,
+            'game_id': game_id,
+            'game_info': game_info,
+            'reason': reason,
+            'archived_at': archived_at,
+            'plays': plays,
+            'players': box_stats.get('players', {}),
+            'team_stats': box_stats.get('team_stats', {}),
+            'play_call_stats': box_stats.get('play_call_stats', {})
+        }
+        self.write_segment(session_id, segment)
+
+        summary = {
+            'segment_id': segment_id,
+            'game_id': game_id,
+            'game_info': game_info,
+            'reason': reason,
+            'archived_at': archived_at,
+            'play_count': len(plays),
+            'team_stats': _strip_series(box_stats.get('team_stats', {})),
+            'players': {
+                key: {f: p.get(f) for f in PLAYER_IDENTITY_FIELDS + PLAYER_SUMMARY_FIELDS if f in p}
+                for key, p in box_stats.get('players', {}).items()
+                if isinstance(p, dict) and p.get('total_plays', 0) > 0
+            }
+        }
+        segments.append(summary)
+        # The summary carries the game info from here on
+        box_stats['archive'].get('game_infos', {}).pop(game_id, None)
+
+        # Reset the hot game: keep roster identity, zero every per-game counter
+        box_stats['plays'] = []
+        box_stats['team_stats'] = _zeroed(box_stats.get('team_stats', {}))
+        box_stats['play_call_stats'] = {phase: {} for phase in PLAY_CALL_PHASES}
+        box_stats['players'] = {
+            key: {k: (v if k in PLAYER_IDENTITY_FIELDS else _zeroed(v)) for k, v in p.items()}
+            for key, p in box_stats.get('players', {}).items()
+            if isinstance(p, dict)
+        }
+        box_stats.pop('next_situation', None)
+
+        print(f"✓ Archived {len(plays)} plays for session {session_id} into segment {segment_id} ({reason})")
+        return summary
+
+    def archive_completed_games(self, session_id, box_stats):
+        """Archive the hot game if its plays belong to a game other than the current one.
+
+        Plays are stamped with the game id they were recorded under, so a
+        session whose game info moved on without an explicit rollover is
+        split here, before the first play of the new game is recorded.
+        """
+        current_game_id = ensure_game_id(box_stats)
+        plays = box_stats.get('plays', [])
+        stale_ids = [p.get('game_id') for p in plays if p.get('game_id') and p.get('game_id') != current_game_id]
+        if not stale_ids or any(p.get('game_id') == current_game_id for p in plays):
+            return None
+
+        # Archive under the info the stale game was last played with, not just its id
+        current_info = box_stats['game_info']
+        known = box_stats.get('archive', {}).get('game_infos', {})
+        box_stats['game_info'] = dict(known.get(stale_ids[-1]) or {}, game_id=stale_ids[-1])
+        summary = self.archive_game(session_id, box_stats, reason='game_rollover')
+        box_stats['game_info'] = current_info
+        return summary
+
+    def load_plays(self, session_id, box_stats, include_archived=True):
+        """Return the session's plays, archived segments first when requested"""
+        plays = []
+        if include_archived:
+            for summary in self.list_segments(box_stats):
+                segment = self.read_segment(session_id, summary['segment_id'])
+                if segment:
+                    plays.extend(segment.get('plays', []))
+        plays.extend(box_stats.get('plays', []))
+        return plays
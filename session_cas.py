@@ -0,0 +1,115 @@
+"""
+Compare-and-swap writes for session blobs, so several workers can share them.
+
+A save names the version it was based on (the 'version' the blob had when it
+was loaded). The store only takes the write if that is still the stored
+version; otherwise another request saved in between and SessionConflict is
+raised instead of silently overwriting its work:
+
+    user_sessions   UPDATE ... WHERE version = expected (DatabaseManager.save_session_cas)
+    session files   check and replace under an exclusive lock on <file>.lock
+
+A blob that was loaded before anything was stored carries no version; its
+save expects ABSENT and only goes through if the session is still not stored
+(or was written before versioning), so two first saves can not both win.
+Wholesale replacements (reset, loading a game, restores) pass no expected
+version and are accepted unconditionally.
+
+With a shared hot store (hot_state.py) the conflict is decided there, and
+the database and file copies are only replaced by newer versions
+(save_session_if_newer, write_file_if_newer).
+
+Callers whose change is a pure append (add_play, sync) go through
+ServerSideSession.update_session_data, which reloads and re-applies the
+change on a conflict; the rest surface the conflict as a 409.
+"""
+import os
+import pickle
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-worker development only
+    fcntl = None
+
+# Load/apply/save rounds before an append gives up
+SAVE_ATTEMPTS = 5
+
+# Expected version of a session that was never saved: insert only if absent
+ABSENT = 'absent'
+
+
+class SessionConflict(Exception):
+    """The stored session moved past the version a save was based on"""
+
+    def __init__(self, session_id, expected_version, stored_version=None):
+        self.session_id = session_id
+        self.expected_version = expected_version
+        self.stored_version = stored_version
+        super().__init__(f"Session {session_id} was changed by another request "
+                         f"(based on version {expected_version}, stored {stored_version}); reload and try again")
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive advisory lock on path + '.lock', held for the with block"""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'a') as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def stored_version(blob):
+    """Version of a stored session blob (wrapped or not), or None"""
+    if isinstance(blob, dict) and 'session_data' in blob:
+        blob = blob['session_data']
+    return blob.get('version') if isinstance(blob, dict) else None
+
+
+def read_file_version(path):
+    try:
+        with open(path, 'rb') as f:
+            return stored_version(pickle.load(f))
+    except FileNotFoundError:
+        return None
+
+
+def _replace_locked(path, stored, accept):
+    """Atomically replace path with stored under the file lock, if accept(current version) allows it"""
+    with file_lock(path):
+        current = read_file_version(path)
+        if not accept(current):
+            return current
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(stored, f)
+        os.replace(tmp_path, path)
+        return None
+
+
+def write_file_cas(session_id, path, stored, expected_version):
+    """Atomically replace path with stored, if the file is still at expected_version (None: always).
+    
+    ABSENT only accepts a missing file or one written before versioning.
+    """
+    def accept(current):
+        return expected_version is None or current is None or current == expected_version
+    current = _replace_locked(path, stored, accept)
+    if current is not None:
+        raise SessionConflict(session_id, expected_version, current)
+
+
+def write_file_if_newer(path, stored, version):
+    """Atomically replace path with stored unless the file already holds this version or a later one.
+    
+    For durable copies when another tier decided the conflict: writes from
+    different workers may land in any order, and the newest must win.
+    """
+    def accept(current):
+        return version is None or current is None or current < version
+    return _replace_locked(path, stored, accept) is None
@@ -0,0 +1,172 @@
+"""
+Schema version for stored box stats, and the migrations that upgrade old blobs.
+
+Every box_stats dict (in a session blob, a saved game file or a database row)
+carries SCHEMA_KEY. Blobs written before versioning have none and count as
+version 0. migrate_box_stats() runs the steps in MIGRATIONS that the blob has
+not seen yet, in order, then stamps the current version; a current blob costs
+one dict lookup. Request handlers can then assume the current shape:
+
+    version 1   team_stats has offense/defense/special_teams/overall rows
+                with every TEAM_STAT_FIELDS counter, player keys are strings
+                and every player row has the PLAYER_ANALYTICS_FIELDS,
+                play_call_stats is keyed by phase (calls recorded before
+                phases were tracked count as offense) with string
+                down_breakdown keys, and plays, players, game_info and
+                play_call_stats always exist
+
+To change the shape: add a step function, append (new version, step) to
+MIGRATIONS and bump SCHEMA_VERSION. Steps must accept any blob of the
+previous version and be safe to run on a partly upgraded one.
+
+Sessions upgrade lazily on load (ServerSideSession) and saved games when
+they are loaded; migrate_schema.py upgrades everything on disk and in the
+database in bulk.
+"""
+
+SCHEMA_KEY = 'schema_version'
+SCHEMA_VERSION = 1
+
+TEAM_PHASES = ('offense', 'defense', 'special_teams', 'overall')
+PLAY_CALL_PHASES = ('offense', 'defense', 'special_teams')
+
+# One team_stats row, as add_play has always initialised it
+TEAM_STAT_FIELDS = {
+    'total_plays': 0,
+    'efficient_plays': 0,
+    'explosive_plays': 0,
+    'negative_plays': 0,
+    'total_yards': 0,
+    'passing_yards': 0,
+    'rushing_yards': 0,
+    'passing_plays': 0,
+    'rushing_plays': 0,
+    'passing_efficient_plays': 0,
+    'rushing_efficient_plays': 0,
+    'passing_explosive_plays': 0,
+    'rushing_explosive_plays': 0,
+    'passing_negative_plays': 0,
+    'rushing_negative_plays': 0,
+    'touchdowns': 0,
+    'turnovers': 0,
+    'interceptions': 0,
+    'efficiency_rate': 0.0,
+    'explosive_rate': 0.0,
+    'negative_rate': 0.0,
+    'nee_score': 0.0,
+    'avg_yards_per_play': 0.0,
+    'success_rate': 0.0
+}
+
+# Analytics fields added to player rows after the first release
+PLAYER_ANALYTICS_FIELDS = {
+    'negative_plays': 0,
+    'efficiency_rate': 0.0,
+    'explosive_rate': 0.0,
+    'negative_rate': 0.0,
+    'nee_score': 0.0
+}
+
+
+def team_stats_row():
+    return dict(TEAM_STAT_FIELDS)
+
+
+def new_box_stats():
+    """Empty box_stats in the current schema"""
+    return {
+        'plays': [],
+        'players': {},
+        'game_info': {},
+        'team_stats': {phase: team_stats_row() for phase in TEAM_PHASES},
+        'play_call_stats': {phase: {} for phase in PLAY_CALL_PHASES},
+        SCHEMA_KEY: SCHEMA_VERSION
+    }
+
+
+def _to_v1(box_stats):
+    """Phase-split team stats with every counter, string player keys, backfilled analytics fields"""
+    for key, kind in (('plays', list), ('players', dict), ('game_info', dict), ('play_call_stats', dict)):
+        if not isinstance(box_stats.get(key), kind):
+            box_stats[key] = kind()
+
+    team_stats = box_stats.get('team_stats')
+    if not isinstance(team_stats, dict):
+        team_stats = {}
+    elif 'total_plays' in team_stats and 'offense' not in team_stats:
+        # Pre-phase format: one flat row, which was all offense
+        flat = {k: v for k, v in team_stats.items() if not isinstance(v, dict)}
+        team_stats = {'offense': dict(flat), 'overall': dict(flat)}
+    for phase in TEAM_PHASES:
+        row = team_stats.get(phase)
+        if not isinstance(row, dict):
+            row = team_stats[phase] = {}
+        for field, default in TEAM_STAT_FIELDS.items():
+            row.setdefault(field, default)
+    box_stats['team_stats'] = team_stats
+
+    players = {}
+    for key, row in box_stats['players'].items():
+        if isinstance(row, dict):
+            for field, default in PLAYER_ANALYTICS_FIELDS.items():
+                row.setdefault(field, default)
+        players['unknown' if key is None else str(key)] = row
+    box_stats['players'] = players
+
+    old_calls = box_stats['play_call_stats']
+    play_call_stats = {phase: old_calls[phase] if isinstance(old_calls.get(phase), dict) else {}
+                       for phase in PLAY_CALL_PHASES}
+    for play_call, stats in old_calls.items():
+        # Pre-phase format: calls at the top level, all offense
+        if play_call not in PLAY_CALL_PHASES and isinstance(stats, dict):
+            play_call_stats['offense'].setdefault(play_call, stats)
+    for calls in play_call_stats.values():
+        for stats in calls.values():
+            breakdown = stats.get('down_breakdown') if isinstance(stats, dict) else None
+            if isinstance(breakdown, dict):
+                stats['down_breakdown'] = {str(k): v for k, v in breakdown.items()}
+    box_stats['play_call_stats'] = play_call_stats
+
+
+# (version, step) in order; each step upgrades a blob of the previous version
+MIGRATIONS = (
+    (1, _to_v1),
+)
+
+
+def schema_version(box_stats):
+    return box_stats.get(SCHEMA_KEY, 0) if isinstance(box_stats, dict) else 0
+
+
+def migrate_box_stats(box_stats):
+    """Upgrade box_stats in place to SCHEMA_VERSION; True if anything ran"""
+    if not isinstance(box_stats, dict):
+        return False
+    version = schema_version(box_stats)
+    if version >= SCHEMA_VERSION:
+        return False
+    for target, step in MIGRATIONS:
+        if version < target:
+            step(box_stats)
+            version = target
+    box_stats[SCHEMA_KEY] = version
+    return True
+
+
+def migrate_session(data):
+    """Upgrade a session blob's box_stats in place; True if it changed"""
+    if not isinstance(data, dict) or not isinstance(data.get('box_stats'), dict):
+        return False
+    return migrate_box_stats(data['box_stats'])
+
+
+def game_box_stats(game):
+    """The box_stats inside a saved game ({'game_data': ...} or the older flat file)"""
+    if not isinstance(game, dict):
+        return None
+    return game['game_data'] if isinstance(game.get('game_data'), dict) else game
+
+
+def migrate_game(game):
+    """Upgrade a saved game's box_stats in place; True if it changed"""
+    return migrate_box_stats(game_box_stats(game))
@@ -0,0 +1,335 @@
+"""
+Compact down/distance/field position model for play entry.
+
+A situation is four small ints:
+
+    down        1-4
+    distance    yards to go, >= 1
+    yard_line   absolute, 1-99, measured from the offense's own goal line
+                (OWN 25 -> 25, OPP 30 -> 70, midfield -> 50)
+    possession  POSSESSION_OFFENSE (0) or POSSESSION_DEFENSE (1)
+
+transition() is the pure state machine: (situation, event, yards) ->
+(next situation, reason code). Touchdowns, turnovers and turnovers on downs
+flip possession and mirror the yard line (100 - yard_line) so the new
+offense's own goal line is again 0.
+
+Field position strings ("OWN 25", "OPP 30", or the signed ints the entry
+form sends) and reason messages only exist at the boundary:
+encode_field_position/decode_field_position and next_situation_for_play.
+"""
+from collections import namedtuple
+
+Situation = namedtuple('Situation', ['down', 'distance', 'yard_line', 'possession'])
+
+POSSESSION_OFFENSE = 0
+POSSESSION_DEFENSE = 1
+
+FIRST_DOWN_DISTANCE = 10
+KICKOFF_YARD_LINE = 25       # where a new drive starts after a score
+MIDFIELD = 50
+GOAL_LINE = 100
+
+# Events
+EVENT_PLAY = 0
+EVENT_TOUCHDOWN = 1          # result says the play scored
+EVENT_TURNOVER = 2           # result says the ball changed hands
+EVENT_PENALTY_OFFENSE = 3    # yards are the penalty yards
+EVENT_PENALTY_DEFENSE = 4
+
+# Reasons
+REASON_FIRST_DOWN = 0
+REASON_NEXT_DOWN = 1
+REASON_TURNOVER_ON_DOWNS = 2
+REASON_TOUCHDOWN = 3         # reached the goal line on yardage
+REASON_TOUCHDOWN_SCORED = 4  # result recorded a score
+REASON_TURNOVER = 5
+REASON_PENALTY_OFFENSE = 6
+REASON_PENALTY_DEFENSE = 7
+REASON_PENALTY_TOUCHDOWN = 8
+
+# Result keywords (substring match, as entered on the form)
+TOUCHDOWN_KEYWORDS = ('touchdown', 'td', 'score')
+TURNOVER_KEYWORDS = ('interception', 'int', 'fumble', 'turnover')
+
+DEFAULT_FIELD_POSITION = 'OWN 25'
+
+
+def _clamp_yard_line(yard_line):
+    return max(1, min(GOAL_LINE - 1, yard_line))
+
+
+def _new_drive(situation):
+    """Other team's ball at its own 25 after a score"""
+    return Situation(1, FIRST_DOWN_DISTANCE, KICKOFF_YARD_LINE, 1 - situation.possession)
+
+
+def _change_possession(yard_line, possession):
+    """Other team's ball, 1st & 10, at the same spot seen from its own goal line"""
+    return Situation(1, FIRST_DOWN_DISTANCE, GOAL_LINE - yard_line, 1 - possession)
+
+
+def transition(situation, event, yards):
+    """Next situation and reason code after a play or penalty (pure)"""
+    down, distance, yard_line, possession = situation
+
+    if event in (EVENT_PENALTY_OFFENSE, EVENT_PENALTY_DEFENSE):
+        moved = yard_line + (yards if event == EVENT_PENALTY_DEFENSE else -yards)
+        if moved >= GOAL_LINE:
+            return _new_drive(situation), REASON_PENALTY_TOUCHDOWN
+        moved = _clamp_yard_line(moved)
+        if event == EVENT_PENALTY_DEFENSE:
+            return Situation(1, FIRST_DOWN_DISTANCE, moved, possession), REASON_PENALTY_DEFENSE
+        return Situation(down, distance + yards, moved, possession), REASON_PENALTY_OFFENSE
+
+    moved = yard_line + yards
+    if moved >= GOAL_LINE:
+        return _new_drive(situation), REASON_TOUCHDOWN
+    moved = _clamp_yard_line(moved)
+
+    if event == EVENT_TOUCHDOWN:
+        return _new_drive(situation), REASON_TOUCHDOWN_SCORED
+    if event == EVENT_TURNOVER:
+        return _change_possession(moved, possession), REASON_TURNOVER
+
+    remaining = distance - yards
+    if remaining <= 0:
+        return Situation(1, FIRST_DOWN_DISTANCE, moved, possession), REASON_FIRST_DOWN
+    if down >= 4:
+        return _change_possession(moved, possession), REASON_TURNOVER_ON_DOWNS
+    return Situation(down + 1, max(1, remaining), moved, possession), REASON_NEXT_DOWN
+
+
+# ---------------------------------------------------------------------------
+# Boundary: field position strings, plays and API dicts
+# ---------------------------------------------------------------------------
+
+def parse_field_position(fp):
+    """Parse field position accepting signed ints or legacy 'OWN/OPP xx' strings.
+    Returns tuple: (side: 'OWN'|'OPP', yard: int 1..50)
+    """
+    try:
+        # Signed integer or numeric string
+        if isinstance(fp, (int, float)) or (isinstance(fp, str) and fp.strip().lstrip('+-').isdigit()):
+            val = int(fp)
+            side = 'OWN' if val < 0 else 'OPP'
+            yard = max(1, min(MIDFIELD, abs(val) if val != 0 else KICKOFF_YARD_LINE))
+            return side, yard
+        # Legacy string format
+        parts = str(fp).strip().upper().split()
+        if len(parts) >= 2:
+            side = 'OWN' if parts[0] == 'OWN' else 'OPP'
+            try:
+                yard = int(parts[1])
+            except Exception:
+                yard = KICKOFF_YARD_LINE
+            return side, max(1, min(MIDFIELD, yard))
+        return 'OWN', KICKOFF_YARD_LINE
+    except Exception:
+        return 'OWN', KICKOFF_YARD_LINE
+
+
+def encode_field_position(fp):
+    """'OWN 25' / 'OPP 30' / signed int -> absolute yard line (25 / 70)"""
+    side, yard = parse_field_position(fp)
+    return yard if side == 'OWN' else GOAL_LINE - yard
+
+
+def decode_field_position(yard_line):
+    """Absolute yard line -> 'OWN xx' short of midfield, else 'OPP xx'"""
+    yard_line = _clamp_yard_line(int(yard_line))
+    if yard_line < MIDFIELD:
+        return f"OWN {yard_line}"
+    return f"OPP {GOAL_LINE - yard_line}"
+
+
+def possession_for_phase(phase):
+    return POSSESSION_DEFENSE if str(phase or 'offense').lower() == 'defense' else POSSESSION_OFFENSE
+
+
+def situation_from_play(play):
+    """Encode the situation a play was run from; raises ValueError/TypeError on a bad down or distance"""
+    return Situation(
+        int(play.get('down', 1)),
+        int(play.get('distance', FIRST_DOWN_DISTANCE)),
+        encode_field_position(play.get('field_position', DEFAULT_FIELD_POSITION)),
+        possession_for_phase(play.get('phase'))
+    )
+
+
+def penalty_side(play):
+    """Which side a penalty was on ('offense' or 'defense'); the form sends penalty_side"""
+    side = play.get('penalty_side') or play.get('penalty_on') or 'offense'
+    return 'defense' if str(side).lower() == 'defense' else 'offense'
+
+
+def event_from_play(play):
+    """(event, yards) for a play: penalties by side, otherwise the result keywords"""
+    if play.get('play_type') == 'penalty':
+        event = EVENT_PENALTY_DEFENSE if penalty_side(play) == 'defense' else EVENT_PENALTY_OFFENSE
+        return event, int(play.get('penalty_yards', 0) or 0)
+    yards = int(play.get('yards_gained', 0))
+    result = str(play.get('result', '')).lower()
+    if any(keyword in result for keyword in TOUCHDOWN_KEYWORDS):
+        return EVENT_TOUCHDOWN, yards
+    if any(keyword in result for keyword in TURNOVER_KEYWORDS):
+        return EVENT_TURNOVER, yards
+    return EVENT_PLAY, yards
+
+
+def describe(reason, before, after, yards):
+    """Reason message shown on the entry form"""
+    if reason == REASON_FIRST_DOWN:
+        return 'First down achieved'
+    if reason == REASON_NEXT_DOWN:
+        return f"Next down: {after.down} & {after.distance}"
+    if reason == REASON_TURNOVER_ON_DOWNS:
+        return 'Turnover on downs'
+    if reason == REASON_TOUCHDOWN:
+        return 'Touchdown - Reset for next drive'
+    if reason == REASON_TOUCHDOWN_SCORED:
+        return 'Touchdown scored - Reset for next drive'
+    if reason == REASON_TURNOVER:
+        return 'Turnover - Opponent takes possession'
+    if reason == REASON_PENALTY_TOUCHDOWN:
+        return 'Penalty resulted in touchdown - Reset for next drive'
+    if reason == REASON_PENALTY_DEFENSE:
+        return f"Defensive penalty: Automatic first down at {decode_field_position(after.yard_line)}"
+    if reason == REASON_PENALTY_OFFENSE:
+        return f"Offensive penalty: Repeat {before.down} down with {yards} yard penalty"
+    return ''
+
+
+def situation_dict(situation, reason_text, possession_changed=False, auto_calculated=True):
+    """API form of a situation (field position as a string)"""
+    return {
+        'down': situation.down,
+        'distance': situation.distance,
+        'field_position': decode_field_position(situation.yard_line),
+        'auto_calculated': auto_calculated,
+        'reason': reason_text,
+        'possession_changed': possession_changed
+    }
+
+
+def next_situation_for_play(play):
+    """Next down, distance and field position after a play, as the API returns it"""
+    try:
+        before = situation_from_play(play)
+        event, yards = event_from_play(play)
+        after, reason = transition(before, event, yards)
+        return situation_dict(after, describe(reason, before, after, yards), after.possession != before.possession)
+    except Exception as e:
+        label = 'penalty situation' if play.get('play_type') == 'penalty' else ''
+        return {
+            'down': 1,
+            'distance': FIRST_DOWN_DISTANCE,
+            'field_position': DEFAULT_FIELD_POSITION,
+            'auto_calculated': False,
+            'reason': f"Error calculating{' ' + label if label else ''}: {str(e)}"
+        }
+
+
+# ---------------------------------------------------------------------------
+# Situation chain: replay recorded plays forward after an edit
+# ---------------------------------------------------------------------------
+
+# Reasons after which the next snap is a new possession (kickoff/return spots are not predictable)
+POSSESSION_REASONS = (REASON_TOUCHDOWN, REASON_TOUCHDOWN_SCORED, REASON_TURNOVER, REASON_TURNOVER_ON_DOWNS,
+                      REASON_PENALTY_TOUCHDOWN)
+
+
+def _situation_fields(situation):
+    return {'down': situation.down, 'distance': situation.distance,
+            'field_position': decode_field_position(situation.yard_line)}
+
+
+def _same_series(play, next_play):
+    """Whether next_play continues play's possession (same game and phase, not special teams)"""
+    phase = str(play.get('phase', 'offense')).lower()
+    return (phase != 'special_teams'
+            and str(next_play.get('phase', 'offense')).lower() == phase
+            and next_play.get('game_id') == play.get('game_id'))
+
+
+def replay_situations(plays, start_index):
+    """Replay the situation chain from plays[start_index] forward in one pass.
+
+    Each play's recorded yards/result are applied to the situation expected
+    before it; the next play's recorded down/distance/field position is
+    compared with that expectation. The replay stops as soon as a play
+    agrees (nothing later can have changed), at a change of possession or
+    phase, or at the end of the log.
+
+    Returns {'start', 'checked_through', 'mismatches': [{index, play_number,
+    recorded, expected}], 'next_situation'} where next_situation is set only
+    when the replay reached the end of the log.
+    """
+    chain = {'start': start_index, 'checked_through': start_index, 'mismatches': [], 'next_situation': None}
+    if start_index < 0 or start_index >= len(plays):
+        return chain
+    try:
+        state = situation_from_play(plays[start_index])
+    except (TypeError, ValueError):
+        return chain
+
+    index = start_index
+    while True:
+        play = plays[index]
+        try:
+            event, yards = event_from_play(play)
+        except (TypeError, ValueError):
+            return chain
+        after, reason = transition(state, event, yards)
+        chain['checked_through'] = index
+        if index + 1 == len(plays):
+            chain['next_situation'] = situation_dict(after, describe(reason, state, after, yards),
+                                                     after.possession != state.possession)
+            return chain
+
+        next_play = plays[index + 1]
+        if reason in POSSESSION_REASONS or not _same_series(play, next_play):
+            return chain
+        chain['checked_through'] = index + 1
+        try:
+            recorded = situation_from_play(next_play)
+        except (TypeError, ValueError):
+            recorded = None
+        if recorded is not None and recorded[:3] == after[:3]:
+            return chain
+        chain['mismatches'].append({
+            'index': index + 1,
+            'play_number': next_play.get('play_number'),
+            'recorded': _situation_fields(recorded) if recorded is not None else None,
+            'expected': _situation_fields(after)
+        })
+        state = after
+        index += 1
+
+
+def recheck_situations(box_stats, play_index):
+    """Re-check an edited play against its predecessor, then replay the chain from it.
+
+    box_stats['situation_flags'] maps play index -> {play_number, recorded, expected};
+    the edited play's own flag and the flags in the replayed range are replaced, so
+    fixing a flagged play clears its flag. next_situation follows when the replay
+    reaches the last play.
+    """
+    plays = box_stats.get('plays') or []
+    flags = box_stats.setdefault('situation_flags', {})
+    own_flag = None
+    if play_index > 0:
+        head = replay_situations(plays, play_index - 1)
+        own_flag = next((m for m in head['mismatches'] if m['index'] == play_index), None)
+    flags.pop(str(play_index), None)
+
+    chain = replay_situations(plays, play_index)
+    for index in range(chain['start'] + 1, chain['checked_through'] + 1):
+        flags.pop(str(index), None)
+    if own_flag:
+        chain['mismatches'].insert(0, own_flag)
+    for mismatch in chain['mismatches']:
+        flags[str(mismatch['index'])] = {k: v for k, v in mismatch.items() if k != 'index'}
+    if chain['next_situation'] is not None:
+        box_stats['next_situation'] = chain['next_situation']
+    return chain
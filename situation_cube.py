@@ -0,0 +1,148 @@
+"""
+Pre-aggregated situational cube for play call analytics.
+
+box_stats['situation_cube'] holds one counter cell per observed combination
+of the cube dimensions (phase, play call, down, distance bucket, field zone,
+play type). Cells are updated as plays are added, edited or deleted, so any
+slice ("3rd & medium in the red zone") is answered by summing the matching
+cells; the cost depends on the number of distinct situations, not on the
+number of plays.
+
+Dimensions and the per-play outcome are supplied by the caller:
+
+    dimensions: {name: function(play) -> value}
+    outcome:    function(play) -> {'yards': int, 'efficient': bool, 'explosive': bool, 'negative': bool}
+"""
+
+SITUATION_CUBE_KEY = 'situation_cube'
+
+# Separates dimension values inside a cell key
+_KEY_SEPARATOR = '\x1f'
+
+COUNTER_FIELDS = ('plays', 'yards', 'efficient', 'explosive', 'negative')
+
+
+def _normalize(value):
+    return ' '.join(str(value).split()).lower() if value is not None else ''
+
+
+def _cell_values(dimensions, play):
+    values = []
+    for extract in dimensions.values():
+        try:
+            values.append(extract(play))
+        except Exception:
+            values.append(None)
+    return values
+
+
+def _apply(cube, dimensions, outcome, play, sign):
+    """Add (sign=1) or remove (sign=-1) one play's contribution"""
+    values = _cell_values(dimensions, play)
+    key = _KEY_SEPARATOR.join(_normalize(v) for v in values)
+    cell = cube['cells'].get(key)
+    if cell is None:
+        if sign < 0:
+            return
+        cell = {'values': ['' if v is None else str(v).strip() for v in values]}
+        cell.update({field: 0 for field in COUNTER_FIELDS})
+        cube['cells'][key] = cell
+    result = outcome(play)
+    cell['plays'] += sign
+    cell['yards'] += sign * int(result.get('yards', 0) or 0)
+    for field in ('efficient', 'explosive', 'negative'):
+        if result.get(field):
+            cell[field] += sign
+    if cell['plays'] <= 0:
+        del cube['cells'][key]
+
+
+def rebuild_cube(box_stats, dimensions, outcome):
+    """Aggregate every play into a fresh cube and store it with the session"""
+    plays = box_stats.get('plays') or []
+    cube = {'dimensions': list(dimensions), 'cells': {}, 'plays_indexed': 0}
+    for play in plays:
+        _apply(cube, dimensions, outcome, play, 1)
+    cube['plays_indexed'] = len(plays)
+    box_stats[SITUATION_CUBE_KEY] = cube
+    return cube
+
+
+def _current_cube(box_stats, dimensions, expected_plays):
+    cube = box_stats.get(SITUATION_CUBE_KEY)
+    if (not isinstance(cube, dict)
+            or cube.get('dimensions') != list(dimensions)
+            or cube.get('plays_indexed') != expected_plays):
+        return None
+    return cube
+
+
+def get_cube(box_stats, dimensions, outcome):
+    """Return the session's cube, rebuilding it when missing or stale"""
+    cube = _current_cube(box_stats, dimensions, len(box_stats.get('plays') or []))
+    return cube if cube is not None else rebuild_cube(box_stats, dimensions, outcome)
+
+
+def cube_add_play(box_stats, dimensions, outcome, play=None):
+    """Count a newly appended play (default: the last one)"""
+    plays = box_stats.get('plays') or []
+    cube = _current_cube(box_stats, dimensions, len(plays) - 1)
+    if cube is None:
+        return rebuild_cube(box_stats, dimensions, outcome)
+    _apply(cube, dimensions, outcome, play if play is not None else plays[-1], 1)
+    cube['plays_indexed'] = len(plays)
+    return cube
+
+
+def cube_remove_play(box_stats, dimensions, outcome, removed_play):
+    """Uncount a play that was just deleted from the log"""
+    plays = box_stats.get('plays') or []
+    cube = _current_cube(box_stats, dimensions, len(plays) + 1)
+    if cube is None:
+        return rebuild_cube(box_stats, dimensions, outcome)
+    _apply(cube, dimensions, outcome, removed_play, -1)
+    cube['plays_indexed'] = len(plays)
+    return cube
+
+
+def cube_replace_play(box_stats, dimensions, outcome, old_play, new_play):
+    """Move an edited play from its old cell to its new one"""
+    cube = _current_cube(box_stats, dimensions, len(box_stats.get('plays') or []))
+    if cube is None:
+        return rebuild_cube(box_stats, dimensions, outcome)
+    _apply(cube, dimensions, outcome, old_play, -1)
+    _apply(cube, dimensions, outcome, new_play, 1)
+    return cube
+
+
+def slice_cube(cube, filters, group_by=()):
+    """Sum the cells matching filters, optionally grouped by some dimensions.
+
+    filters maps a dimension to accepted values (any may match); dimensions
+    not filtered are rolled up. Returns (totals, groups) where groups maps a
+    tuple of normalized group_by values to their labels and counters.
+    """
+    dimensions = cube['dimensions']
+    positions = {name: i for i, name in enumerate(dimensions)}
+    wanted = {positions[name]: {_normalize(v) for v in values} for name, values in filters.items() if name in positions}
+    group_positions = [positions[name] for name in group_by if name in positions]
+
+    totals = {field: 0 for field in COUNTER_FIELDS}
+    groups = {}
+    for key, cell in cube['cells'].items():
+        parts = key.split(_KEY_SEPARATOR)
+        if any(parts[i] not in accepted for i, accepted in wanted.items()):
+            continue
+        for field in COUNTER_FIELDS:
+            totals[field] += cell[field]
+        if group_positions:
+            group_key = tuple(parts[i] for i in group_positions)
+            group = groups.get(group_key)
+            if group is None:
+                # Label the group with the values as first entered
+                group = {'values': [cell['values'][i] for i in group_positions]}
+                group.update({field: 0 for field in COUNTER_FIELDS})
+                groups[group_key] = group
+            for field in COUNTER_FIELDS:
+                group[field] += cell[field]
+    return totals, groups
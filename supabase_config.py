@@ -4,6 +4,7 @@ Supabase configuration and database operations for Hoy Sports Data App
 import os
 from typing import Dict, List, Optional, Any
 import json
+import threading
 from datetime import datetime
 import logging
 
@@ -28,37 +29,54 @@ class SupabaseManager:
         self.url = os.getenv('SUPABASE_URL')
         self.anon_key = os.getenv('SUPABASE_ANON_KEY')
         self.service_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+        # The clients keep auth state and an HTTP session that threads must not share:
+        # each thread (and each forked worker) gets its own pair, built on first use
+        self._local = threading.local()
+        self._enabled = False
         
         if not SUPABASE_AVAILABLE:
             logger.warning("Supabase library not available")
-            self.supabase = None
-            self.supabase_admin = None
         elif not self.url or not self.anon_key:
             logger.warning("Supabase credentials not found in environment variables")
-            self.supabase = None
-            self.supabase_admin = None
         else:
-            try:
-                # Regular client with anon key for standard operations
-                self.supabase: Client = create_client(self.url, self.anon_key)
+            self._enabled = True
+            # Build this thread's clients now so bad credentials show up at startup
+            if self.supabase is not None:
                 logger.info("Supabase client initialized successfully")
-                
-                # Admin client with service role key for bypassing RLS
-                if self.service_key:
-                    self.supabase_admin: Client = create_client(self.url, self.service_key)
+                if self.supabase_admin is not None:
                     logger.info("Supabase admin client initialized successfully")
                 else:
-                    self.supabase_admin = None
                     logger.warning("Service role key not found - admin operations may fail")
-                    
+    
+    def _client(self, name, key):
+        """This thread's client for key, or None when Supabase is off"""
+        if not self._enabled or not key:
+            return None
+        local = self._local
+        if getattr(local, 'pid', None) != os.getpid():
+            local.clients, local.pid = {}, os.getpid()
+        if name not in local.clients:
+            try:
+                local.clients[name] = create_client(self.url, key)
             except Exception as e:
                 logger.error(f"Failed to initialize Supabase client: {e}")
-                self.supabase = None
-                self.supabase_admin = None
+                self._enabled = False
+                return None
+        return local.clients[name]
+    
+    @property
+    def supabase(self):
+        """Regular client with anon key for standard operations"""
+        return self._client('supabase', self.anon_key)
+    
+    @property
+    def supabase_admin(self):
+        """Admin client with service role key for bypassing RLS"""
+        return self._client('supabase_admin', self.service_key)
     
     def is_connected(self) -> bool:
         """Check if Supabase connection is available"""
-        return self.supabase is not None
+        return self._enabled
     
     def test_connection(self) -> bool:
         """Test the database connection"""
@@ -211,7 +229,23 @@ class SupabaseManager:
         except Exception as e:
             logger.error(f"Error getting user game sessions from Supabase: {e}")
             return []
-    
+
+    def get_user_game_session_stamps(self, user_id: str) -> List[Dict]:
+        """List a user's game sessions without box_stats (id, name, opponent, date and timestamps)"""
+        try:
+            if not self.supabase:
+                logger.error("Supabase client not initialized")
+                return []
+
+            result = self.supabase.table('game_sessions').select(
+                'id,session_name,opponent,game_date,created_at,updated_at'
+            ).eq('user_id', user_id).execute()
+            return result.data or []
+
+        except Exception as e:
+            logger.error(f"Error getting game session stamps from Supabase: {e}")
+            return []
+
     def delete_roster(self, user_id: str, roster_name: str) -> bool:
         """Delete a roster for a specific user from Supabase"""
         try:
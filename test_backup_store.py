@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed backup store (backup_store.py).
+
+Runs without the server, in a temporary directory: unchanged saves add
+nothing, appending plays only writes the chunks that changed, any kept
+version restores exactly, and pruned versions' objects are collected, by
+hand or once enough versions were pruned, but never while they are new.
+
+Usage: python test_backup_store.py   (or python -m pytest test_backup_store.py)
+"""
+import os
+import sys
+import tempfile
+
+import backup_store
+from backup_store import BackupStore, CHUNK_ITEMS, backup_key
+
+
+def game(play_count):
+    plays = [{'play_number': n + 1, 'play_type': 'rush', 'yards_gained': n % 7} for n in range(play_count)]
+    return {'game_info': {'opponent': 'Central', 'date': '2025-09-12'},
+            'box_stats': {'plays': plays, 'team_stats': {'offense': {'total_plays': play_count}}}}
+
+
+def object_count(store):
+    return sum(len(files) for _, _, files in os.walk(store.objects_dir))
+
+
+def test_unchanged_save_is_a_noop():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BackupStore(tmp)
+        assert store.save('games', 'u1-Week_1', game(10)) == (1, True)
+        objects = object_count(store)
+        assert store.save('games', 'u1-Week_1', game(10)) == (1, False)
+        assert object_count(store) == objects
+        assert [v['version'] for v in store.versions('games', 'u1-Week_1')] == [1]
+
+
+def test_appending_plays_writes_only_new_chunks():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BackupStore(tmp)
+        store.save('games', 'g', game(CHUNK_ITEMS * 4))
+        before = object_count(store)
+        assert store.save('games', 'g', game(CHUNK_ITEMS * 4 + 1)) == (2, True)
+        # The four full runs of plays are shared; only the new run and the changed totals are written
+        assert object_count(store) - before == 2, object_count(store) - before
+
+
+def test_restore_any_version():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BackupStore(tmp)
+        for count in (5, 40, 80):
+            store.save('sessions', 's1', game(count), meta={'username': 'coach'})
+        assert store.restore('sessions', 's1') == game(80)
+        assert store.restore('sessions', 's1', 2) == game(40)
+        assert store.restore('sessions', 's1', 9) is None and store.restore('sessions', 'missing') is None
+        assert store.versions('sessions', 's1')[0]['meta'] == {'username': 'coach'}
+        assert store.keys('sessions') == ['s1']
+
+
+def test_prune_and_collect_garbage():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = BackupStore(tmp, keep_versions=2)
+        for count in (3, 50, 90, 91):
+            store.save('games', 'g', game(count))
+        assert [v['version'] for v in store.versions('games', 'g')] == [3, 4]
+        # Freshly written objects are left for a save that may still be writing its manifest
+        assert store.collect_garbage() == 0
+        assert store.collect_garbage(grace=0) > 0
+        assert store.collect_garbage(grace=0) == 0
+        assert store.restore('games', 'g', 3) == game(90) and store.restore('games', 'g') == game(91)
+
+
+def test_save_collects_after_pruning():
+    limits = backup_store.GC_AFTER_PRUNED, backup_store.GC_GRACE_SECONDS
+    backup_store.GC_AFTER_PRUNED, backup_store.GC_GRACE_SECONDS = 2, 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = BackupStore(tmp, keep_versions=1)
+            store.save('games', 'g', game(40))
+            store.save('games', 'g', {'replaced': True})
+            # One manifest pruned: below the threshold, its objects are still there
+            assert object_count(store) > 1
+            store.save('games', 'g', {'replaced': 2})
+            # Second pruned manifest: save collected everything the kept version does not name
+            assert object_count(store) == 1
+            assert store.restore('games', 'g') == {'replaced': 2}
+    finally:
+        backup_store.GC_AFTER_PRUNED, backup_store.GC_GRACE_SECONDS = limits
+
+
+def test_backup_key():
+    assert backup_key('coach', 'Week 1: Central!') == backup_key('coach', 'Week 1 Central')
+    assert backup_key('coach', 'Week 1') != backup_key('other', 'Week 1')
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for drive segmentation (drives.py).
+
+Runs without the server. Drives end on touchdowns, turnovers, turnovers on
+downs, kicks, phase changes and new games; segmenting play by play, or
+re-segmenting after an edit or delete, must give the same table as a
+rebuild from the play log.
+
+Usage: python test_drives.py   (or python -m pytest test_drives.py)
+"""
+import copy
+import sys
+
+from drives import rebuild_drives, get_drives, drives_add_play, resegment_from, drive_result, DRIVES_KEY
+
+
+def outcome(play):
+    yards = play.get('yards_gained', 0)
+    return {'yards': yards, 'efficient': yards >= 4, 'explosive': yards >= 12, 'negative': yards < 0}
+
+
+def play(phase='offense', result='tackled', yards=4, down=1, distance=10, game_id='g1', **extra):
+    return dict({'phase': phase, 'result': result, 'yards_gained': yards, 'down': down, 'distance': distance,
+                 'game_id': game_id}, **extra)
+
+
+def game_log():
+    return [
+        play(yards=5), play(yards=6, down=2), play(result='touchdown', yards=12),      # 0-2 touchdown
+        play(phase='special_teams', result='kickoff'),                                   # 3 in no drive
+        play(phase='defense', yards=2), play(phase='defense', result='interception'),   # 4-5 turnover
+        play(yards=1), play(yards=0, down=2), play(yards=1, down=3),
+        play(phase='special_teams', result='punt', play_type='punt'),                   # 6-8 closed by the punt
+        play(phase='defense', yards=3), play(phase='defense', down=4, distance=5, yards=2),  # 10-11 on downs
+        play(yards=8), play(phase='defense', yards=3),                                   # 12 possession change
+        play(phase='defense', yards=1, game_id='g2')                                     # 13 end of game, 14 open
+    ]
+
+
+def segmented(plays):
+    box_stats = {'plays': []}
+    rebuild_drives(box_stats, outcome)
+    for p in plays:
+        box_stats['plays'].append(copy.deepcopy(p))
+        drives_add_play(box_stats, outcome)
+    return box_stats
+
+
+def assert_matches_rebuild(box_stats):
+    assert box_stats[DRIVES_KEY] == rebuild_drives(copy.deepcopy(box_stats), outcome)
+
+
+def test_boundaries():
+    drives = segmented(game_log())[DRIVES_KEY]['drives']
+    assert [(d['start_index'], d['end_index'], d['result']) for d in drives] == [
+        (0, 2, 'touchdown'), (4, 5, 'turnover'), (6, 8, 'punt'), (10, 11, 'turnover_on_downs'),
+        (12, 12, 'possession_change'), (13, 13, 'end_of_game'), (14, 14, None)]
+    assert [d['number'] for d in drives] == list(range(1, 8))
+    first = drives[0]
+    assert (first['plays'], first['yards'], first['efficient'], first['explosive']) == (3, 23, 3, 1)
+    assert drive_result(play(phase='special_teams', result='made', play_type='field_goal')) == 'field_goal'
+
+
+def test_appends_match_a_rebuild():
+    box_stats = segmented(game_log())
+    assert_matches_rebuild(box_stats)
+
+
+def test_edits_and_deletes_resegment_from_the_changed_drive():
+    for play_index in range(len(game_log())):
+        # An edit that ends the drive early
+        box_stats = segmented(game_log())
+        box_stats['plays'][play_index] = dict(box_stats['plays'][play_index], result='fumble')
+        resegment_from(box_stats, outcome, play_index)
+        assert_matches_rebuild(box_stats)
+
+        # A delete (the table described one more play before it)
+        box_stats = segmented(game_log())
+        box_stats['plays'].pop(play_index)
+        resegment_from(box_stats, outcome, play_index, len(box_stats['plays']) + 1)
+        assert_matches_rebuild(box_stats)
+
+
+def test_undo_of_an_add_and_stale_tables():
+    box_stats = segmented(game_log())
+    expected = copy.deepcopy(box_stats[DRIVES_KEY])
+    box_stats['plays'].append(play(result='touchdown'))
+    drives_add_play(box_stats, outcome)
+    box_stats['plays'].pop()
+    resegment_from(box_stats, outcome, len(box_stats['plays']), len(box_stats['plays']) + 1)
+    assert box_stats[DRIVES_KEY] == expected
+
+    # Plays appended without segmenting them
+    box_stats['plays'].append(play(yards=3))
+    assert get_drives(box_stats, outcome)['plays_indexed'] == len(box_stats['plays'])
+    assert_matches_rebuild(box_stats)
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
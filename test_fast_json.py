@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for JSON serialization and response compression (fast_json.py).
+
+Runs against a small Flask app, not the box stats app. Serialization must
+give the same JSON with and without orjson (NaN/inf as null, dates as HTTP
+dates, wide integers); large responses are brotli-encoded when the client
+accepts br and brotli is installed, gzip otherwise, and small, non-text or
+non-2xx responses are left alone.
+
+Usage: python test_fast_json.py   (or python -m pytest test_fast_json.py)
+"""
+import gzip
+import json
+import sys
+from datetime import datetime
+
+from flask import Flask, jsonify, Response
+
+import fast_json
+from fast_json import FastJSONProvider, init_compression, dumps_bytes, choose_encoding
+
+
+def make_app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    init_compression(app)
+
+    @app.route('/large')
+    def large():
+        return jsonify({'plays': [{'play_number': n, 'play_call': 'Inside Zone'} for n in range(200)]})
+
+    @app.route('/small')
+    def small():
+        return jsonify({'ok': True})
+
+    @app.route('/missing')
+    def missing():
+        return jsonify({'error': 'x' * 4096}), 404
+
+    @app.route('/binary')
+    def binary():
+        return Response(b'\0' * 4096, mimetype='application/octet-stream')
+
+    return app
+
+
+class Headers(dict):
+    """request.accept_encodings stand-in: encoding -> accepted"""
+
+    def __getitem__(self, key):
+        return self.get(key, False)
+
+
+def test_serializes_like_the_standard_library():
+    value = {'yards': 4, 'rate': float('nan'), 'limit': float('inf'), 'when': datetime(2025, 9, 12, 19, 30),
+             'wide': 2 ** 70, 'nested': [1.5, {'x': None}]}
+    expected = {'yards': 4, 'rate': None, 'limit': None, 'when': 'Fri, 12 Sep 2025 19:30:00 GMT',
+                'wide': 2 ** 70, 'nested': [1.5, {'x': None}]}
+    assert json.loads(dumps_bytes(value)) == expected
+    # The standard library fallback gives the same document
+    saved, fast_json.orjson = fast_json.orjson, None
+    try:
+        assert json.loads(dumps_bytes(value)) == expected
+    finally:
+        fast_json.orjson = saved
+
+
+def test_encoding_negotiation():
+    assert choose_encoding(Headers(gzip=True)) == 'gzip'
+    assert choose_encoding(Headers()) is None
+    expected = 'br' if fast_json.brotli is not None else 'gzip'
+    assert choose_encoding(Headers(br=True, gzip=True)) == expected
+    saved, fast_json.brotli = fast_json.brotli, None
+    try:
+        assert choose_encoding(Headers(br=True, gzip=True)) == 'gzip'
+        assert choose_encoding(Headers(br=True)) is None
+    finally:
+        fast_json.brotli = saved
+
+
+def test_large_json_responses_are_compressed():
+    client = make_app().test_client()
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert len(json.loads(gzip.decompress(response.get_data()))['plays']) == 200
+
+    if fast_json.brotli is not None:
+        response = client.get('/large', headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert len(json.loads(fast_json.brotli.decompress(response.get_data()))['plays']) == 200
+
+    response = client.get('/large')
+    assert 'Content-Encoding' not in response.headers
+    assert len(response.get_json()['plays']) == 200
+
+
+def test_small_binary_and_error_responses_are_not_compressed():
+    client = make_app().test_client()
+    for url in ('/small', '/missing', '/binary'):
+        response = client.get(url, headers={'Accept-Encoding': 'gzip, br'})
+        assert 'Content-Encoding' not in response.headers, url
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared hot session store (hot_state.py), on the SQLite stand-in.
+
+Runs without the server or Redis, in a temporary directory. The concurrent
+test forks worker processes that append to one session through cas() with
+retries, the way ServerSideSession.update_session_data does; no append may
+be lost.
+
+Usage: python test_hot_state.py   (or python -m pytest test_hot_state.py)
+"""
+import os
+import sys
+import time
+import pickle
+import tempfile
+import multiprocessing
+
+from hot_state import SQLiteHotStore, create_hot_store
+from session_cas import ABSENT
+
+
+def test_cas_and_put_if_newer():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteHotStore(os.path.join(tmp, 'hot.sqlite3'))
+        assert store.get('s1') is None
+        # Not held: the caller falls back to the durable tiers
+        assert store.cas('s1', b'v1', 1, expected_version=0) is None
+        assert store.put_if_newer('s1', b'v5', 5)
+        assert not store.put_if_newer('s1', b'v4', 4) and store.get('s1') == (5, b'v5')
+        assert store.cas('s1', b'v6', 6, expected_version=5) is True
+        assert store.cas('s1', b'other', 6, expected_version=5) is False
+        assert store.get('s1') == (6, b'v6')
+        # A blob loaded before anything was stored loses to any saved version
+        assert store.cas('s1', b'first', 7, expected_version=ABSENT) is False
+        assert store.cas('s3', b'first', 7, expected_version=ABSENT) is None
+        # Wholesale replacement (reset): unconditional, even when not held
+        assert store.cas('s2', b'reset', 900, expected_version=None) is True
+        store.delete('s1')
+        assert store.get('s1') is None and store.get('s2') == (900, b'reset')
+
+
+def test_idle_entries_expire():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteHotStore(os.path.join(tmp, 'hot.sqlite3'), ttl=0.2)
+        store.put_if_newer('s1', b'blob', 1)
+        assert store.get('s1') == (1, b'blob')
+        time.sleep(0.3)
+        assert store.get('s1') is None
+        # A held-but-expired session is not held: the next save goes through the durable tiers
+        assert store.cas('s1', b'blob', 2, expected_version=1) is None
+
+
+def test_backend_selection():
+    assert create_hot_store('') is None
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['HOT_STATE_PATH'] = os.path.join(tmp, 'hot.sqlite3')
+        try:
+            assert isinstance(create_hot_store('sqlite'), SQLiteHotStore)
+        finally:
+            del os.environ['HOT_STATE_PATH']
+        # Without HOT_STATE_PATH the store sits in the session directory
+        create_hot_store('sqlite', base_dir=tmp)
+        assert os.path.exists(os.path.join(tmp, 'hot_state.sqlite3'))
+
+
+def _append_plays(path, name, count):
+    store = SQLiteHotStore(path)
+    for i in range(count):
+        while True:
+            version, blob = store.get('game')
+            data = pickle.loads(blob)
+            data['plays'].append(f'{name}-{i}')
+            if store.cas('game', pickle.dumps(data), version + 1, version):
+                break
+
+
+def test_workers_share_one_session():
+    workers, plays_each = 4, 25
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'hot.sqlite3')
+        store = SQLiteHotStore(path)
+        store.put_if_newer('game', pickle.dumps({'plays': []}), 1)
+
+        context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+        processes = [context.Process(target=_append_plays, args=(path, f'w{n}', plays_each)) for n in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert all(process.exitcode == 0 for process in processes)
+
+        version, blob = store.get('game')
+        plays = pickle.loads(blob)['plays']
+        assert len(plays) == workers * plays_each and version == 1 + workers * plays_each, (len(plays), version)
+        for n in range(workers):
+            assert [p for p in plays if p.startswith(f'w{n}-')] == [f'w{n}-{i}' for i in range(plays_each)]
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Consistency checks for the per-session indexes kept by the app.
+
+Imports the app. After adds, edits, deletes, undo and redo through the box
+stats endpoints, the stored player index, posting lists, situational cube
+and drive table must equal a rebuild from the stored plays. A play changed
+in place by a path that does not maintain the posting lists is re-filed
+when the session is saved.
+
+Runs against session files, backups and a SQLite database in a temporary
+directory, removed at exit.
+
+Usage: python test_index_consistency.py   (or python -m pytest test_index_consistency.py)
+"""
+import os
+import sys
+import copy
+import uuid
+import atexit
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep session files, backups and the database out of the working tree
+TEST_DIR = tempfile.mkdtemp(prefix='hoy-test-')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ['SESSION_DIR'] = os.path.join(TEST_DIR, 'server_sessions')
+os.environ['BACKUP_STORE_DIR'] = os.path.join(TEST_DIR, 'backup_store')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+from app import (app, server_session, play_outcome, PLAY_INDEX_DIMENSIONS, SITUATION_CUBE_DIMENSIONS,
+                 rebuild_player_index, rebuild_play_postings, rebuild_cube, rebuild_drives, query_play_indices)
+
+
+def client_for(username, session_id):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['authenticated'] = True
+        sess['username'] = username
+        sess['server_session_id'] = session_id
+    return client
+
+
+def post(client, url, payload=None):
+    response = client.post(url, json=payload or {})
+    assert response.status_code == 200 and response.get_json().get('success'), (url, response.get_json())
+    return response.get_json()
+
+
+def add_play(client, number, play_call, down=1, yards=4, phase='offense', result='tackled'):
+    post(client, '/box_stats/add_play', {
+        'play_number': number, 'down': down, 'distance': 10, 'field_position': -25, 'play_type': 'rush',
+        'result': result, 'phase': phase, 'yards_gained': yards, 'play_call': play_call,
+        'players_involved': [{'number': 20 + number % 3, 'name': f"Back {number % 3}", 'role': 'rusher'}]
+    })
+
+
+def assert_indexes_match_rebuild(session_id):
+    box_stats = server_session.load_session_data(session_id)['box_stats']
+    rebuilt = copy.deepcopy(box_stats)
+    assert box_stats['player_index'] == rebuild_player_index(rebuilt), 'player index'
+    assert box_stats['play_postings'] == rebuild_play_postings(rebuilt, PLAY_INDEX_DIMENSIONS), 'posting lists'
+    assert box_stats['situation_cube'] == rebuild_cube(rebuilt, SITUATION_CUBE_DIMENSIONS, play_outcome), 'cube'
+    assert box_stats['drives'] == rebuild_drives(rebuilt, play_outcome), 'drives'
+
+
+def test_indexes_follow_edit_delete_undo_and_redo():
+    session_id = f"indexes-{uuid.uuid4()}"
+    try:
+        coach = client_for('coach_a', session_id)
+        for number, (call, down) in enumerate([('Inside Zone', 1), ('Power', 2), ('Mesh', 3), ('Power', 1),
+                                                ('Four Verts', 2), ('Inside Zone', 3)], start=1):
+            add_play(coach, number, call, down)
+        assert_indexes_match_rebuild(session_id)
+
+        post(coach, '/box_stats/edit_play', {'play_index': 1, 'play_data': {'play_call': 'Mesh', 'down': 3}})
+        assert_indexes_match_rebuild(session_id)
+        post(coach, '/box_stats/delete_play', {'play_index': 2})
+        assert_indexes_match_rebuild(session_id)
+        add_play(coach, 7, 'Punt', phase='special_teams', result='punt')
+        assert_indexes_match_rebuild(session_id)
+
+        # Undo the add, the delete and the edit, then redo all three
+        for _ in range(3):
+            post(coach, '/box_stats/undo')
+            assert_indexes_match_rebuild(session_id)
+        for _ in range(3):
+            post(coach, '/box_stats/redo')
+            assert_indexes_match_rebuild(session_id)
+    finally:
+        server_session.delete_session(session_id)
+
+
+def test_save_refiles_plays_edited_in_place():
+    session_id = f"indexes-{uuid.uuid4()}"
+    try:
+        coach = client_for('coach_a', session_id)
+        for number in range(1, 5):
+            add_play(coach, number, 'Power')
+        data = server_session.load_session_data(session_id)
+        # Same play count: the lists alone can not tell the play changed
+        data['box_stats']['plays'][0]['play_call'] = 'Mesh'
+        server_session.save_session_data(session_id, data)
+        box_stats = server_session.load_session_data(session_id)['box_stats']
+        assert query_play_indices(box_stats, PLAY_INDEX_DIMENSIONS, {'play_call': ['Mesh']}) == [0]
+        assert query_play_indices(box_stats, PLAY_INDEX_DIMENSIONS, {'play_call': ['Power']}) == [1, 2, 3]
+    finally:
+        server_session.delete_session(session_id)
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
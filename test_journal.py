@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for the undo/redo journal (journal.py).
+
+Runs without the server. add_play is simulated the way record_play changes a
+session: the play's team rows, player rows (with progression counters) and
+play call row. Undo must put the session back exactly, redo must bring the
+play back exactly, and entries that no longer fit raise JournalConflict.
+
+Usage: python test_journal.py   (or python -m pytest test_journal.py)
+"""
+import copy
+import sys
+
+import journal
+from journal import JournalConflict, apply_play_change
+
+
+def new_session():
+    row = {'total_plays': 0, 'total_yards': 0, 'progression_counters': {'play': []}}
+    return {'plays': [],
+            'team_stats': {phase: copy.deepcopy(row) for phase in ('offense', 'defense', 'special_teams', 'overall')},
+            'players': {'7': {'name': 'Bench', 'total_plays': 0}},
+            'play_call_stats': {'offense': {}, 'defense': {}, 'special_teams': {}},
+            'next_situation': {'down': 1, 'distance': 10},
+            'game_info': {'game_id': 'g1'}}
+
+
+def add_play(data, play):
+    """Record a play like record_play does and journal it; returns the entry"""
+    box_stats = data['box_stats']
+    before = journal.snapshot(box_stats, journal.play_rows(play))
+    box_stats['plays'].append(copy.deepcopy(play))
+    for phase in (play['phase'], 'overall'):
+        row = box_stats['team_stats'][phase]
+        row['total_plays'] += 1
+        row['total_yards'] += play['yards_gained']
+        row['progression_counters']['play'].append(len(box_stats['plays']))
+    for player in play['players_involved']:
+        row = box_stats['players'].setdefault(journal.player_row_key(player),
+                                              {'name': player.get('name'), 'total_plays': 0,
+                                               'progression_counters': {'play': []}})
+        row['total_plays'] += 1
+        row['progression_counters']['play'].append(len(box_stats['plays']))
+    calls = box_stats['play_call_stats'][play['phase']]
+    calls.setdefault(play['play_call'], {'total_plays': 0})['total_plays'] += 1
+    box_stats['next_situation'] = {'down': 2, 'distance': 10 - play['yards_gained']}
+    entry = journal.add_play_entry(len(box_stats['plays']) - 1, box_stats['plays'][-1], journal.diff(before, box_stats))
+    return journal.record(data, entry)
+
+
+def play(number, call='Inside Zone', players=({'number': 22, 'name': 'Smith'},), yards=4):
+    return {'play_number': number, 'phase': 'offense', 'play_call': call, 'yards_gained': yards,
+            'players_involved': [dict(p) for p in players]}
+
+
+def test_undo_and_redo_add():
+    data = {'box_stats': new_session()}
+    add_play(data, play(1))
+    after_first = copy.deepcopy(data['box_stats'])
+    entry = add_play(data, play(2, call='Power', players=({'number': 22}, {'name': 'Jones'}), yards=6))
+    after_second = copy.deepcopy(data['box_stats'])
+
+    # Only the rows the play touched are in the entry
+    assert set(entry['delta']['rows']['team_stats']) == {'offense', 'overall'}
+    assert set(entry['delta']['rows']['players']) == {'22', 'name:Jones'}
+    assert set(entry['delta']['rows']['play_call_stats']) == {'offense:Power'}
+    assert set(entry['delta']['whole']) == {'next_situation'}
+
+    apply_play_change(data['box_stats'], entry, undo=True)
+    assert data['box_stats'] == after_first
+    apply_play_change(data['box_stats'], entry, undo=False)
+    assert data['box_stats'] == after_second
+
+
+def test_snapshot_copies_only_the_play_rows():
+    box_stats = new_session()
+    box_stats['players'].update({str(n): {'total_plays': n} for n in range(30, 130)})
+    before = journal.snapshot(box_stats, journal.play_rows(play(1)))
+    assert set(before['rows']['players']) == {'22'} and before['rows']['players']['22'] == (None, None)
+    assert set(before['rows']['team_stats']) == {'offense', 'overall'}
+
+
+def test_undo_and_redo_edit_and_delete():
+    data = {'box_stats': new_session()}
+    add_play(data, play(1))
+    add_play(data, play(2))
+    plays = data['box_stats']['plays']
+
+    edited = dict(plays[0], yards_gained=9)
+    entry = journal.record(data, journal.edit_play_entry(0, plays[0], edited))
+    plays[0] = copy.deepcopy(edited)
+    apply_play_change(data['box_stats'], entry, undo=True)
+    assert plays[0]['yards_gained'] == 4
+    apply_play_change(data['box_stats'], entry, undo=False)
+    assert plays[0]['yards_gained'] == 9
+
+    deleted = plays.pop(0)
+    entry = journal.record(data, journal.delete_play_entry(0, deleted))
+    apply_play_change(data['box_stats'], entry, undo=True)
+    assert [p['play_number'] for p in plays] == [1, 2] and plays[0] == deleted
+    apply_play_change(data['box_stats'], entry, undo=False)
+    assert [p['play_number'] for p in plays] == [2]
+
+
+def test_undo_and_redo_player_stats():
+    box_stats = new_session()
+    before = {'7': journal.strip_row(box_stats['players']['7'])}
+    box_stats['players']['7']['total_plays'] = 5
+    box_stats['players']['9'] = {'name': 'New', 'total_plays': 1}
+    after = {key: journal.strip_row(box_stats['players'][key]) for key in ('7', '9')}
+    entry = journal.player_stats_entry(before, after)
+
+    apply_play_change(box_stats, entry, undo=True)
+    assert box_stats['players'] == {'7': {'name': 'Bench', 'total_plays': 0}}
+    apply_play_change(box_stats, entry, undo=False)
+    assert box_stats['players']['7']['total_plays'] == 5 and box_stats['players']['9']['name'] == 'New'
+
+
+def expect_conflict(box_stats, entry, undo):
+    try:
+        apply_play_change(box_stats, entry, undo)
+    except JournalConflict:
+        return
+    raise AssertionError(f"{entry['op']} {'undo' if undo else 'redo'} applied to a session it no longer fits")
+
+
+def test_conflicts():
+    data = {'box_stats': new_session()}
+    entry = add_play(data, play(1))
+    box_stats = data['box_stats']
+
+    # Another play was added after this one
+    box_stats['plays'].append(play(2))
+    expect_conflict(box_stats, entry, undo=True)
+    box_stats['plays'].pop()
+    # A row the play touched changed since (a manual stat edit)
+    box_stats['players']['22']['total_plays'] = 40
+    expect_conflict(box_stats, entry, undo=True)
+    box_stats['players']['22']['total_plays'] = 1
+    apply_play_change(box_stats, entry, undo=True)
+    # Redo after the play log moved on, or after a row it creates appeared
+    box_stats['plays'].append(play(9))
+    expect_conflict(box_stats, entry, undo=False)
+    box_stats['plays'].pop()
+    box_stats['players']['22'] = {'total_plays': 3}
+    expect_conflict(box_stats, entry, undo=False)
+
+    box_stats = new_session()
+    box_stats['plays'] = [play(1)]
+    edit = journal.edit_play_entry(0, play(1), play(1, yards=8))
+    expect_conflict(box_stats, edit, undo=True)
+    delete = journal.delete_play_entry(0, play(5))
+    expect_conflict(box_stats, delete, undo=False)
+    expect_conflict(box_stats, journal.delete_play_entry(3, play(5)), undo=True)
+    expect_conflict(box_stats, {'op': 'rename_game'}, undo=True)
+
+
+def test_journal_is_bounded_and_new_changes_drop_redo():
+    data = {}
+    for n in range(journal.JOURNAL_LIMIT + 5):
+        journal.record(data, {'op': 'edit_play', 'index': n})
+    log = journal.get_journal(data)
+    assert len(log['undo']) == journal.JOURNAL_LIMIT and log['undo'][0]['index'] == 5
+    log['redo'].append(log['undo'].pop())
+    journal.record(data, {'op': 'edit_play', 'index': 99})
+    assert journal.get_journal(data)['redo'] == []
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
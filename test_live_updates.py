@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Tests for the live update brokers (live_updates.py).
+
+Runs without the server, in a temporary directory. The spool test forks
+worker processes that publish to one channel while the spool keeps being
+compacted; the spool must stay whole JSON lines and keep every worker's
+latest event.
+
+Usage: python test_live_updates.py   (or python -m pytest test_live_updates.py)
+"""
+import os
+import sys
+import json
+import tempfile
+import multiprocessing
+
+from live_updates import LocalBroker, SpoolBroker, create_broker
+
+
+def test_local_resume_from_last_event_id():
+    broker = LocalBroker()
+    for version in (1, 2, 3):
+        broker.publish('s1', {'version': version})
+    subscription = broker.subscribe('s1', last_event_id=1)
+    assert [subscription.get(0)['version'], subscription.get(0)['version']] == [2, 3]
+    assert subscription.get(0.01) is None
+    subscription.close()
+
+
+def _publish(base_dir, writer, count):
+    broker = SpoolBroker(base_dir, history=20, max_bytes=1024)
+    for i in range(count):
+        broker.publish('game', {'version': writer * 1000 + i, 'writer': writer, 'i': i})
+
+
+def test_spool_compaction_shared_by_workers():
+    workers, events_each = 8, 300
+    with tempfile.TemporaryDirectory() as tmp:
+        context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+        processes = [context.Process(target=_publish, args=(tmp, n + 1, events_each)) for n in range(workers)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        assert all(process.exitcode == 0 for process in processes)
+
+        path = SpoolBroker(tmp).get_channel_path('game')
+        with open(path, 'r') as f:
+            events = [json.loads(line) for line in f]
+        # The spool is the tail of the append order: a lost append shows up as a gap in a worker's run
+        assert len(events) <= 20 + 1024 // 10
+        for n in range(workers):
+            mine = [e['i'] for e in events if e['writer'] == n + 1]
+            assert mine == list(range(mine[0], mine[0] + len(mine))) if mine else True, (n + 1, mine)
+        finishers = [e['writer'] for e in events if e['i'] == events_each - 1]
+        assert finishers and events[-1]['i'] == events_each - 1
+        assert not [name for name in os.listdir(tmp) if name.endswith('.tmp')]
+
+
+def test_spool_lives_under_the_given_dir():
+    assert isinstance(create_broker('local'), LocalBroker)
+    with tempfile.TemporaryDirectory() as tmp:
+        broker = create_broker('spool', spool_dir=os.path.join(tmp, 'events'))
+        broker.publish('game', {'version': 1})
+        assert os.path.exists(os.path.join(tmp, 'events', 'game.jsonl'))
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
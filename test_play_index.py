@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for the player index and play posting lists (play_index.py).
+
+Runs without the server. After every incremental update (append, edit in
+place, delete, undo of an add) the stored indexes must equal a rebuild from
+the play log, and queries must return the same plays as a scan.
+
+Usage: python test_play_index.py   (or python -m pytest test_play_index.py)
+"""
+import copy
+import sys
+
+from play_index import (rebuild_player_index, get_player_index, index_new_play, unindex_last_play, resolve_player,
+                        player_plays, rebuild_play_postings, get_play_postings, index_play_postings,
+                        remove_play_postings, update_play_postings, query_play_indices, PLAY_POSTINGS_KEY,
+                        PLAYER_INDEX_KEY)
+
+DIMENSIONS = {
+    'play_call': lambda play: play.get('play_call'),
+    'phase': lambda play: play.get('phase', 'offense'),
+    'down': lambda play: play.get('down')
+}
+
+CALLS = ('Inside Zone', 'Power', 'Mesh', 'Four Verts')
+
+
+def make_play(n):
+    return {'play_number': n + 1, 'phase': 'defense' if n % 5 == 4 else 'offense', 'down': n % 4 + 1,
+            'play_call': CALLS[n % len(CALLS)], 'players_involved': [{'number': 10 + n % 3, 'name': f"P{n % 3}"}]}
+
+
+def new_session(count):
+    box_stats = {'plays': [], 'players': {}}
+    for n in range(count):
+        append(box_stats, make_play(n))
+    return box_stats
+
+
+def append(box_stats, play):
+    box_stats['plays'].append(play)
+    for involved in play['players_involved']:
+        box_stats['players'].setdefault(str(involved['number']), {'number': involved['number'], 'name': involved['name']})
+    index_new_play(box_stats)
+    index_play_postings(box_stats, DIMENSIONS)
+
+
+def assert_matches_rebuild(box_stats):
+    postings = copy.deepcopy(box_stats[PLAY_POSTINGS_KEY])
+    player_index = copy.deepcopy(box_stats[PLAYER_INDEX_KEY])
+    rebuilt = copy.deepcopy(box_stats)
+    assert postings == rebuild_play_postings(rebuilt, DIMENSIONS)
+    assert player_index == rebuild_player_index(rebuilt)
+
+
+def scan(box_stats, **filters):
+    return [i for i, play in enumerate(box_stats['plays'])
+            if all(str(play.get(name)).lower() in {str(v).lower() for v in values} for name, values in filters.items())]
+
+
+def test_appends_match_a_rebuild():
+    box_stats = new_session(12)
+    assert_matches_rebuild(box_stats)
+    assert query_play_indices(box_stats, DIMENSIONS, {'play_call': ['power'], 'down': [2]}) == \
+        scan(box_stats, play_call=['Power'], down=[2])
+    key, player = resolve_player(box_stats, 'p1')
+    assert key == '11' and [i for i, _ in player_plays(box_stats, key)] == [1, 4, 7, 10]
+
+
+def test_edit_in_place_refiles_the_play():
+    box_stats = new_session(12)
+    box_stats['plays'][3] = dict(box_stats['plays'][3], play_call='Power', down=1)
+    update_play_postings(box_stats, DIMENSIONS, 3)
+    assert_matches_rebuild(box_stats)
+    assert 3 in query_play_indices(box_stats, DIMENSIONS, {'play_call': ['Power'], 'down': [1]})
+    # Re-filing an unchanged play is a no-op, so it is safe to repeat
+    before = copy.deepcopy(box_stats[PLAY_POSTINGS_KEY])
+    update_play_postings(box_stats, DIMENSIONS, 3)
+    assert box_stats[PLAY_POSTINGS_KEY] == before
+
+
+def test_edit_that_keeps_the_count_goes_unnoticed_until_refiled():
+    box_stats = new_session(8)
+    box_stats['plays'][0]['play_call'] = 'Mesh'
+    # Same play count, so the lists are still taken as current
+    assert 0 not in query_play_indices(box_stats, DIMENSIONS, {'play_call': ['Mesh']})
+    update_play_postings(box_stats, DIMENSIONS, 0)
+    assert query_play_indices(box_stats, DIMENSIONS, {'play_call': ['Mesh']}) == scan(box_stats, play_call=['Mesh'])
+
+
+def test_delete_shifts_the_later_plays():
+    box_stats = new_session(12)
+    for play_index in (11, 5, 0):
+        box_stats['plays'].pop(play_index)
+        remove_play_postings(box_stats, DIMENSIONS, play_index)
+        rebuild_player_index(box_stats)
+        assert_matches_rebuild(box_stats)
+        for call in CALLS:
+            assert query_play_indices(box_stats, DIMENSIONS, {'play_call': [call]}) == scan(box_stats, play_call=[call])
+
+
+def test_undo_of_an_add_drops_the_last_play():
+    box_stats = new_session(6)
+    expected = copy.deepcopy(box_stats)
+    append(box_stats, make_play(6))
+    box_stats['plays'].pop()
+    unindex_last_play(box_stats, 6)
+    remove_play_postings(box_stats, DIMENSIONS, 6)
+    assert box_stats[PLAY_POSTINGS_KEY] == expected[PLAY_POSTINGS_KEY]
+    assert box_stats[PLAYER_INDEX_KEY] == expected[PLAYER_INDEX_KEY]
+
+
+def test_stale_indexes_are_rebuilt():
+    box_stats = new_session(6)
+    # A play appended without indexing (older code path, archive rollover)
+    box_stats['plays'].append(make_play(6))
+    assert get_play_postings(box_stats, DIMENSIONS)['plays_indexed'] == 7
+    assert get_player_index(box_stats)['plays_indexed'] == 7
+    # Dimensions that changed since the lists were built
+    assert 'phase' not in get_play_postings(box_stats, {'play_call': DIMENSIONS['play_call']})['dims']
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
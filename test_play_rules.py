@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the vectorized play rules (play_rules.py).
+
+Imports the app: the default RuleConfig must score every play exactly like
+the live calculate_play_efficiency does at team level, across offense,
+defense and special teams plays, with and without turnovers.
+
+Runs against session files, backups and a SQLite database in a temporary
+directory, removed at exit.
+
+Usage: python test_play_rules.py   (or python -m pytest test_play_rules.py)
+"""
+import os
+import sys
+import atexit
+import shutil
+import tempfile
+import itertools
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep session files, backups and the database out of the working tree
+TEST_DIR = tempfile.mkdtemp(prefix='hoy-test-')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ['SESSION_DIR'] = os.path.join(TEST_DIR, 'server_sessions')
+os.environ['BACKUP_STORE_DIR'] = os.path.join(TEST_DIR, 'backup_store')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+from app import calculate_play_efficiency
+from play_rules import RuleConfig, play_columns, evaluate
+
+
+def mixed_plays():
+    plays = []
+    turnovers = [[], [{'number': 7, 'role': 'passer', 'interception': True}],
+                 [{'number': 22, 'role': 'rusher', 'fumble': True}], [{'number': 80, 'role': 'receiver'}]]
+    for phase, down, distance, yards, players in itertools.product(
+            ('offense', 'defense', 'special_teams'), (1, 2, 3, 4, 5, 'x'), (1, 7, 10),
+            (-3, 0, 3, 4, 5, 10, 15), turnovers):
+        plays.append({'phase': phase, 'down': down, 'distance': distance, 'yards_gained': yards,
+                      'play_type': 'pass' if any(p.get('role') in ('passer', 'receiver') for p in players) else 'rush',
+                      'players_involved': players})
+    return plays
+
+
+def test_default_rules_match_live_efficiency():
+    plays = mixed_plays()
+    scored = evaluate(play_columns(plays), RuleConfig())
+    mismatches = [
+        (play['phase'], play['down'], play['distance'], play['yards_gained'], bool(efficient))
+        for play, efficient in zip(plays, scored['efficient'])
+        if bool(efficient) != calculate_play_efficiency(play, play['yards_gained'], None, play['phase'])
+    ]
+    assert not mismatches, f"{len(mismatches)} of {len(plays)} differ, e.g. {mismatches[:3]}"
+
+
+def test_special_teams_turnovers_use_yardage():
+    plays = [{'phase': 'special_teams', 'down': 1, 'distance': 10, 'yards_gained': 12, 'play_type': 'rush',
+              'players_involved': [{'number': 3, 'role': 'returner', 'fumble': True}]}]
+    assert list(evaluate(play_columns(plays), RuleConfig())['efficient']) == [True]
+    assert calculate_play_efficiency(plays[0], 12, None, 'special_teams') is True
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
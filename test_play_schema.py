@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Tests for add_play payload validation (play_schema.py).
+
+Runs without the server. Payloads are shaped like the ones the entry form,
+the edit form and the older test scripts send.
+
+Usage: python test_play_schema.py   (or python -m pytest test_play_schema.py)
+"""
+import sys
+
+from play_schema import validate_play, PlayValidationError
+
+
+def form_play(**overrides):
+    """A rush play as addPlay() in box_stats.html sends it"""
+    play = {
+        'play_number': 3, 'down': 2, 'distance': 7, 'field_position': -35, 'play_type': 'rush',
+        'play_call': ' Inside Zone ', 'result': 'tackled', 'phase': 'offense',
+        'timestamp': '2025-09-05T22:28:43.000Z', 'yards_gained': 6,
+        'players_involved': [{'id': 17, 'number': 22, 'name': 'Smith', 'position': 'RB', 'role': 'ball_carrier',
+                              'touchdown': False, 'fumble': False}]
+    }
+    play.update(overrides)
+    return play
+
+
+def errors_for(payload):
+    try:
+        validate_play(payload)
+    except PlayValidationError as e:
+        return {error['field']: error['message'] for error in e.errors}
+    raise AssertionError('payload was accepted')
+
+
+def test_form_play_is_canonical():
+    play = validate_play(form_play())
+    assert list(play) == ['play_number', 'down', 'distance', 'field_position', 'play_type', 'play_call', 'result',
+                          'yards_gained', 'players_involved', 'timestamp', 'phase']
+    assert play['play_call'] == 'Inside Zone' and play['field_position'] == -35
+    player = play['players_involved'][0]
+    assert player['role'] == 'rusher' and player['number'] == 22 and player['id'] == 17
+    assert player['touchdown'] is False and 'completion' not in player
+
+
+def test_synonyms_and_coercion():
+    play = validate_play(form_play(play_type='Pass_Defense', phase='Defense', down='3', distance=4.0,
+                                   yards_gained='-2', field_position='opp 30', play_call='   '))
+    assert (play['play_type'], play['phase'], play['down'], play['distance'], play['yards_gained']) == \
+        ('pass', 'defense', 3, 4, -2)
+    assert play['field_position'] == 'OPP 30' and play['play_call'] is None
+    # Typed past midfield: clamped the way the situation model reads it
+    assert validate_play(form_play(field_position=58))['field_position'] == 50
+    assert validate_play(form_play(field_position='own 99'))['field_position'] == 'OWN 50'
+    assert validate_play(form_play(play_type='run'))['play_type'] == 'rush'
+    # Missing or blank play types are stored as '' the way add_play always did
+    assert validate_play(form_play(play_type=None))['play_type'] == ''
+    assert validate_play({k: v for k, v in form_play().items() if k != 'play_type'})['play_type'] == ''
+
+    play = validate_play(form_play(players_involved=[{'number': '7', 'role': 'QB', 'completion': 'on'},
+                                                     {'number': None, 'name': 'Jones', 'role': 'wr'}]))
+    assert [p['role'] for p in play['players_involved']] == ['passer', 'receiver']
+    assert play['players_involved'][0]['number'] == 7 and play['players_involved'][0]['completion'] is True
+
+
+def test_legacy_players_and_single_object():
+    payload = form_play()
+    payload['players'] = {'number': 5, 'role': 'rusher'}
+    del payload['players_involved']
+    assert validate_play(payload)['players_involved'] == [{'number': 5, 'role': 'rusher'}]
+
+    payload = form_play(players_involved={'number': 9})
+    assert validate_play(payload)['players_involved'] == [{'number': 9, 'role': ''}]
+    assert validate_play(form_play(players_involved=[]))['players_involved'] == []
+
+
+def test_penalty_fields():
+    play = validate_play(form_play(play_type='penalty', players_involved=[], yards_gained=0, penalty_type='holding',
+                                   penalty_yards='10', penalty_side='defense'))
+    assert (play['penalty_type'], play['penalty_yards'], play['penalty_on']) == ('holding', 10, 'defense')
+    play = validate_play(form_play(play_type='penalty', players_involved=[], penalty_yards=None))
+    assert play['penalty_yards'] == 0 and play['penalty_on'] == 'offense'
+    assert 'penalty_on' not in validate_play(form_play())
+
+
+def test_rejects_with_field_paths():
+    errors = errors_for(form_play(down=5, yards_gained=2.5, phase='kickoff', play_type='hail_mary',
+                                  players_involved=[{'number': 'A1'}, 'Smith', {'role': 'rusher'},
+                                                    {'number': 3, 'fumble': 'maybe'}]))
+    assert errors['down'] == 'must be between 1 and 4'
+    assert errors['yards_gained'] == 'must be a whole number'
+    assert errors['phase'].startswith('must be one of') and errors['play_type'].startswith('must be one of')
+    assert errors['players_involved[0].number'] == 'must be a whole number'
+    assert errors['players_involved[1]'] == 'must be an object'
+    assert errors['players_involved[2]'] == 'needs a number or a name'
+    assert errors['players_involved[3].fumble'] == 'must be true or false'
+
+    assert errors_for(None) == {'body': 'must be a JSON object'}
+    assert errors_for(form_play(field_position='MID 40')) == \
+        {'field_position': "must be a signed yard line or 'OWN xx' / 'OPP xx'"}
+    assert errors_for(form_play(field_position=-120)) == {'field_position': 'must be between -99 and 99'}
+    assert errors_for(form_play(play_type='penalty', penalty_side='both')) == \
+        {'penalty_side': 'must be one of defense, offense'}
+    assert errors_for(form_play(client_id='short')) == \
+        {'client_id': 'must be 8-64 letters, digits, dashes or underscores'}
+
+
+def test_client_id():
+    client_id = '3f2b8c1e-9d4a-4e6b-8f0a-1c2d3e4f5a6b'
+    play = validate_play(form_play(client_id=client_id, client_seq=4, queued_at='2025-09-05T22:28:43Z'))
+    assert play['client_id'] == client_id and list(play)[-1] == 'client_id'
+    assert 'client_seq' not in play and 'queued_at' not in play
+    assert 'client_id' not in validate_play(form_play(client_id=None))
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
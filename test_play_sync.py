@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for idempotent play submission and offline batch ordering (play_sync.py).
+
+Runs without the server.
+
+Usage: python test_play_sync.py   (or python -m pytest test_play_sync.py)
+"""
+import sys
+
+import play_sync
+from play_sync import get_receipt, store_receipt, make_receipt, order_batch, apply_batch, RECEIPTS_KEY
+
+
+def test_receipts():
+    data = {}
+    assert get_receipt(data, 'abcdefgh') is None
+    receipt = make_receipt({'play_index': 4, 'play_number': 5, 'next_situation': {'down': 2}, 'play_count': 5})
+    assert receipt == {'play_index': 4, 'play_number': 5, 'next_situation': {'down': 2}}
+    store_receipt(data, 'abcdefgh', receipt)
+    assert get_receipt(data, 'abcdefgh') == receipt
+    # Plays without a client_id are never remembered or matched
+    store_receipt(data, None, receipt)
+    assert get_receipt(data, None) is None and list(data[RECEIPTS_KEY]) == ['abcdefgh']
+
+
+def test_oldest_receipts_are_dropped():
+    data = {}
+    limit, play_sync.RECEIPT_LIMIT = play_sync.RECEIPT_LIMIT, 3
+    try:
+        for i in range(5):
+            store_receipt(data, f'client-{i:03d}', {'play_index': i})
+    finally:
+        play_sync.RECEIPT_LIMIT = limit
+    assert list(data[RECEIPTS_KEY]) == ['client-002', 'client-003', 'client-004']
+
+
+def test_batch_order():
+    items = [{'client_id': 'c', 'client_seq': 3},
+             {'client_id': 'late', 'queued_at': '2025-09-05T22:00:00Z'},
+             {'client_id': 'a', 'client_seq': 1, 'queued_at': '2025-09-05T21:59:00Z'},
+             {'client_id': 'b2', 'client_seq': 2, 'queued_at': '2025-09-05T21:59:30Z'},
+             {'client_id': 'b1', 'client_seq': 2, 'queued_at': '2025-09-05T21:59:10Z'},
+             'not a play',
+             {'client_id': 'bool', 'client_seq': True}]
+    ordered = [item['client_id'] if isinstance(item, dict) else item for item in order_batch(items)]
+    # Sequenced plays first; the rest keep the order they were sent in, after queued_at
+    assert ordered == ['a', 'b1', 'b2', 'c', 'not a play', 'bool', 'late']
+
+
+def test_failing_play_is_rejected_alone():
+    def record(data, play):
+        # Half-applies the bad play before raising, like a crash mid-record_play
+        data['plays'].append(play['yards'])
+        if play['yards'] is None:
+            raise ValueError('no yards')
+        return {'play_index': len(data['plays']) - 1}
+
+    data = {'plays': [7]}
+    store_receipt(data, 'seen', {'play_index': 0})
+    plays = [('seen', {'yards': 7}, None),
+             ('a', {'yards': 3}, None),
+             ('bad', {'yards': None}, None),
+             ('invalid', {'yards': 1}, [{'field': 'down', 'message': 'required'}]),
+             ('b', {'yards': 5}, None)]
+    results, last_index = apply_batch(data, plays, record)
+    assert [r['status'] for r in results] == ['duplicate', 'added', 'rejected', 'rejected', 'added']
+    assert 'could not be applied' in results[2]['errors'][0]['message']
+    assert data['plays'] == [7, 3, 5] and last_index == 2
+    assert get_receipt(data, 'bad') is None and get_receipt(data, 'b') == {'play_index': 2, 'play_number': None, 'next_situation': {}}
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Checks for progression series: counters, rolling windows and LTTB downsampling.
+
+Imports the app. A series derived from the stored counters is one point per
+play; max_points downsamples it with Largest-Triangle-Three-Buckets, which
+keeps the first and last points and the peaks and dips in between, and
+/box_stats/progressions applies the same options to every series it returns.
+
+Runs against session files, backups and a SQLite database in a temporary
+directory, removed at exit.
+
+Usage: python test_progressions.py   (or python -m pytest test_progressions.py)
+"""
+import os
+import sys
+import uuid
+import atexit
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep session files, backups and the database out of the working tree
+TEST_DIR = tempfile.mkdtemp(prefix='hoy-test-')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ['SESSION_DIR'] = os.path.join(TEST_DIR, 'server_sessions')
+os.environ['BACKUP_STORE_DIR'] = os.path.join(TEST_DIR, 'backup_store')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+from app import app, server_session, downsample_lttb, smooth_series, derive_progression, record_progression
+
+
+def series_of(values):
+    return [{'play': i + 1, 'efficiency': value} for i, value in enumerate(values)]
+
+
+def test_lttb_keeps_the_ends_and_the_extremes():
+    values = [50.0] * 200
+    values[73], values[151] = 100.0, 0.0
+    series = series_of(values)
+    sampled = downsample_lttb(series, 'efficiency', 20)
+    assert len(sampled) == 20
+    assert sampled[0] is series[0] and sampled[-1] is series[-1]
+    plays = [point['play'] for point in sampled]
+    assert plays == sorted(plays) and len(set(plays)) == len(plays)
+    # The spike and the dip survive, as chart points taken from the series itself
+    assert {74, 152} <= set(plays)
+    assert all(point in series for point in sampled)
+
+
+def test_lttb_leaves_short_series_alone():
+    series = series_of([10.0, 20.0, 30.0])
+    assert downsample_lttb(series, 'efficiency', 10) is series
+    # Fewer than three points can not keep both ends and a bucket
+    assert len(downsample_lttb(series_of(range(50)), 'efficiency', 1)) == 3
+
+
+def test_window_and_max_points_on_derived_series():
+    stats = {'total_plays': 0, 'efficient_plays': 0}
+    for play_number in range(1, 101):
+        stats['total_plays'] += 1
+        stats['efficient_plays'] += play_number % 2
+        record_progression(stats, play_number, total_yards=4 * play_number)
+    full = derive_progression(stats, 'efficiency')
+    assert [p['play'] for p in full] == list(range(1, 101))
+    assert full[1]['efficiency'] == 50.0
+    assert derive_progression(stats, 'avg_yards')[-1]['avg_yards'] == 4.0
+
+    smoothed = derive_progression(stats, 'efficiency', window=4)
+    assert smoothed == smooth_series(full, 'efficiency', 4) and len(smoothed) == 100
+    assert len(derive_progression(stats, 'efficiency', max_points=25)) == 25
+
+
+def test_progressions_endpoint_downsamples_each_series():
+    session_id = f"progression-{uuid.uuid4()}"
+    try:
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess['authenticated'] = True
+            sess['username'] = 'coach_a'
+            sess['server_session_id'] = session_id
+        for number in range(1, 41):
+            response = client.post('/box_stats/add_play', json={
+                'play_number': number, 'down': 1, 'distance': 10, 'field_position': -25, 'play_type': 'rush',
+                'result': 'tackled', 'phase': 'offense', 'yards_gained': number % 7,
+                'players_involved': [{'number': 22, 'name': 'Back', 'role': 'rusher'}]
+            })
+            assert response.status_code == 200, response.get_json()
+
+        body = client.get('/box_stats/progressions?series=team:overall:efficiency,player:22:nee&max_points=10').get_json()
+        assert body['success'] and len(body['series']) == 2
+        for series in body['series']:
+            assert 'error' not in series, series
+            assert len(series['points']) == 10, series
+            assert series['points'][-1]['play'] == 40
+    finally:
+        server_session.delete_session(session_id)
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
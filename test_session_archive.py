@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for moving finished games into cold segments (session_archive.py).
+
+Runs without the server, in a temporary directory.
+
+Usage: python test_session_archive.py   (or python -m pytest test_session_archive.py)
+"""
+import copy
+import os
+import sys
+import tempfile
+
+from session_archive import SessionArchive, ensure_game_id
+
+
+def session_with_plays(game_id, count):
+    return {'game_info': {'game_id': game_id, 'opponent': 'Central'},
+            'plays': [{'play_number': n + 1, 'game_id': game_id} for n in range(count)],
+            'players': {}, 'team_stats': {'offense': {'total_plays': count}}}
+
+
+def test_retried_archive_writes_one_segment():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SessionArchive(tmp)
+        stored = session_with_plays('g1', 5)
+        # A save conflict makes the update run again on the same stored session
+        first = archive.archive_game('s1', copy.deepcopy(stored))
+        retried = copy.deepcopy(stored)
+        second = archive.archive_game('s1', retried)
+        assert first['segment_id'] == second['segment_id']
+        assert os.listdir(archive.get_segment_dir('s1')) == [f"{first['segment_id']}.pkl.gz"]
+        assert len(archive.load_plays('s1', retried)) == 5
+
+
+def test_same_game_archived_again_gets_a_new_segment():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SessionArchive(tmp)
+        box_stats = session_with_plays('g1', 3)
+        archive.archive_game('s1', box_stats)
+        box_stats['plays'] = [{'play_number': 4, 'game_id': 'g1'}]
+        archive.archive_game('s1', box_stats)
+        assert [seg['segment_id'] for seg in archive.list_segments(box_stats)] == ['g1-0', 'g1-1']
+        assert len(archive.load_plays('s1', box_stats)) == 4
+
+
+def test_rollover_keeps_the_stale_games_info():
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = SessionArchive(tmp)
+        box_stats = session_with_plays('g1', 0)
+        box_stats['game_info'].update(name='Week 3', date='2025-09-12')
+        for n in range(3):
+            box_stats['plays'].append({'play_number': n + 1, 'game_id': ensure_game_id(box_stats)})
+        # The session moved on to the next game without an explicit rollover
+        box_stats['game_info'] = {'game_id': 'g2', 'name': 'Week 4', 'opponent': 'North'}
+        summary = archive.archive_completed_games('s1', box_stats)
+        assert summary['game_info'] == {'game_id': 'g1', 'opponent': 'Central', 'name': 'Week 3', 'date': '2025-09-12'}
+        assert archive.read_segment('s1', summary['segment_id'])['game_info']['name'] == 'Week 3'
+        assert box_stats['game_info']['name'] == 'Week 4' and box_stats['plays'] == []
+        assert set(box_stats['archive']['game_infos']) == {'g2'}
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for compare-and-swap session file writes (session_cas.py).
+
+Runs without the server, in a temporary directory. The concurrent test has
+several threads append plays to one session file through the same
+load/apply/save-and-retry loop ServerSideSession.update_session_data uses;
+no append may be lost.
+
+Usage: python test_session_cas.py   (or python -m pytest test_session_cas.py)
+"""
+import os
+import sys
+import pickle
+import tempfile
+import threading
+
+from session_cas import SessionConflict, write_file_cas, write_file_if_newer, read_file_version, stored_version, ABSENT
+
+
+def load(path):
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def test_conflict_and_blind_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.pkl')
+        # Nothing stored yet: any expected version is accepted
+        write_file_cas('s1', path, {'version': 1, 'plays': []}, expected_version=7)
+        write_file_cas('s1', path, {'version': 2, 'plays': ['a']}, expected_version=1)
+        try:
+            write_file_cas('s1', path, {'version': 2, 'plays': ['b']}, expected_version=1)
+            raise AssertionError('stale write was accepted')
+        except SessionConflict as e:
+            assert (e.expected_version, e.stored_version) == (1, 2)
+        assert load(path)['plays'] == ['a']
+        # A wholesale replacement (no expected version) always goes through
+        write_file_cas('s1', path, {'version': 50, 'plays': []}, expected_version=None)
+        assert read_file_version(path) == 50
+        assert not [name for name in os.listdir(tmp) if name.endswith('.tmp')]
+
+
+def test_first_save_only_if_absent():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.pkl')
+        # Two requests both loaded an empty session; only the first save lands
+        write_file_cas('s1', path, {'version': 1, 'plays': ['a']}, expected_version=ABSENT)
+        try:
+            write_file_cas('s1', path, {'version': 1, 'plays': ['b']}, expected_version=ABSENT)
+            raise AssertionError('second first save was accepted')
+        except SessionConflict as e:
+            assert e.stored_version == 1
+        assert load(path)['plays'] == ['a']
+
+
+def test_durable_copies_only_move_forward():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.pkl')
+        assert write_file_if_newer(path, {'version': 7}, 7)
+        # A slower worker's older save lands late and is skipped
+        assert not write_file_if_newer(path, {'version': 6}, 6)
+        assert not write_file_if_newer(path, {'version': 7, 'late': True}, 7)
+        assert write_file_if_newer(path, {'version': 8}, 8) and load(path) == {'version': 8}
+
+
+def test_wrapped_and_legacy_blobs():
+    assert stored_version({'session_data': {'version': 4}}) == 4
+    assert stored_version({'box_stats': {}}) is None and stored_version(None) is None
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.pkl')
+        with open(path, 'wb') as f:
+            pickle.dump({'box_stats': {'plays': []}}, f)
+        # Written before versioning: taken over by the first versioned save
+        write_file_cas('s1', path, {'version': 1}, expected_version=9)
+        assert read_file_version(path) == 1
+
+
+def test_concurrent_appends_are_not_lost():
+    writers, plays_each = 4, 15
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.pkl')
+        write_file_cas('s1', path, {'version': 0, 'plays': []}, expected_version=None)
+        conflicts = []
+
+        def writer(name):
+            for i in range(plays_each):
+                while True:
+                    data = load(path)
+                    expected = data['version']
+                    data['plays'].append(f'{name}-{i}')
+                    data['version'] = expected + 1
+                    try:
+                        write_file_cas('s1', path, data, expected)
+                        break
+                    except SessionConflict:
+                        conflicts.append(name)
+
+        threads = [threading.Thread(target=writer, args=(f'w{n}',)) for n in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        data = load(path)
+        assert len(data['plays']) == writers * plays_each, len(data['plays'])
+        assert data['version'] == writers * plays_each
+        for n in range(writers):
+            # Each writer's plays land in the order it sent them
+            mine = [play for play in data['plays'] if play.startswith(f'w{n}-')]
+            assert mine == [f'w{n}-{i}' for i in range(plays_each)]
+        print(f"  {len(conflicts)} conflicts retried")
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Checks for restoring a session from the backup store (/admin/recover_session).
+
+Imports the app. Only admins may list or restore backups, restoring takes a
+POST, and a restored session is saved as a version newer than anything
+stored since the backup was taken.
+
+Runs against session files, backups and a SQLite database in a temporary
+directory, removed at exit.
+
+Usage: python test_session_recovery.py   (or python -m pytest test_session_recovery.py)
+"""
+import os
+import sys
+import uuid
+import atexit
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep session files, backups and the database out of the working tree
+TEST_DIR = tempfile.mkdtemp(prefix='hoy-test-')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ['SESSION_DIR'] = os.path.join(TEST_DIR, 'server_sessions')
+os.environ['BACKUP_STORE_DIR'] = os.path.join(TEST_DIR, 'backup_store')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+from app import app, server_session, BACKUP_EVERY_VERSIONS
+
+
+def client_for(username, session_id=None, is_admin=False):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['authenticated'] = True
+        sess['username'] = username
+        sess['is_admin'] = is_admin
+        if session_id:
+            sess['server_session_id'] = session_id
+    return client
+
+
+def add_play(client, number):
+    response = client.post('/box_stats/add_play', json={
+        'play_number': number, 'down': 1, 'distance': 10, 'field_position': -25, 'play_type': 'rush',
+        'result': 'tackled', 'phase': 'offense', 'yards_gained': 3, 'players_involved': []
+    })
+    assert response.status_code == 200, response.get_json()
+
+
+def test_only_admins_restore_and_restores_move_forward():
+    session_id = f"recover-{uuid.uuid4()}"
+    try:
+        coach = client_for('coach_a', session_id)
+        add_play(coach, 1)
+        add_play(coach, 2)
+        admin = client_for('admin', is_admin=True)
+        versions = admin.get(f'/admin/session_backups/{session_id}').get_json()['versions']
+        first_backup = versions[0]['version']
+        add_play(coach, 3)
+        stored_version = server_session.load_session_data(session_id)['version']
+
+        assert coach.get(f'/admin/session_backups/{session_id}').status_code == 403
+        assert coach.post(f'/admin/recover_session/{session_id}?version={first_backup}').status_code == 403
+        assert admin.get(f'/admin/recover_session/{session_id}?version={first_backup}').status_code == 405
+
+        response = admin.post(f'/admin/recover_session/{session_id}?version={first_backup}')
+        assert response.status_code == 200, response.get_json()
+        data = server_session.load_session_data(session_id)
+        assert len(data['box_stats']['plays']) == 1
+        # Stamped past the version saved after the backup, not back at the backup's own
+        assert data['version'] > stored_version
+    finally:
+        server_session.delete_session(session_id)
+
+
+def test_saves_are_backed_up_every_few_versions():
+    session_id = f"throttle-{uuid.uuid4()}"
+    try:
+        coach = client_for('coach_a', session_id)
+        for number in range(1, BACKUP_EVERY_VERSIONS + 2):
+            add_play(coach, number)
+        admin = client_for('admin', is_admin=True)
+        versions = admin.get(f'/admin/session_backups/{session_id}').get_json()['versions']
+        # The first save and the one BACKUP_EVERY_VERSIONS later, not one per play
+        assert 1 <= len(versions) <= 2, versions
+    finally:
+        server_session.delete_session(session_id)
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
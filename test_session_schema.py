@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the box stats schema migrations (session_schema.py).
+
+Runs without the server, on hand-built old blobs and on every session and
+saved game in the working tree (copies; nothing on disk is changed).
+
+Usage: python test_session_schema.py   (or python -m pytest test_session_schema.py)
+"""
+import sys
+import copy
+import glob
+import json
+import pickle
+
+from session_schema import (migrate_box_stats, migrate_session, migrate_game, new_box_stats, SCHEMA_KEY,
+                            SCHEMA_VERSION, TEAM_PHASES, PLAY_CALL_PHASES, TEAM_STAT_FIELDS, PLAYER_ANALYTICS_FIELDS)
+
+
+def check_current(box_stats):
+    assert box_stats[SCHEMA_KEY] == SCHEMA_VERSION
+    for key in ('plays', 'players', 'game_info', 'play_call_stats'):
+        assert key in box_stats, key
+    for phase in TEAM_PHASES:
+        assert set(TEAM_STAT_FIELDS) <= set(box_stats['team_stats'][phase]), phase
+    for key, row in box_stats['players'].items():
+        assert isinstance(key, str) and set(PLAYER_ANALYTICS_FIELDS) <= set(row), key
+    assert set(box_stats['play_call_stats']) == set(PLAY_CALL_PHASES)
+    for calls in box_stats['play_call_stats'].values():
+        for stats in calls.values():
+            assert all(isinstance(k, str) for k in stats.get('down_breakdown', {})), stats
+
+
+def test_flat_team_stats_are_split_by_phase():
+    box_stats = {'plays': [{'play_type': 'rush'}], 'players': {7: {'number': 7, 'rushing_yards': 12}},
+                 'team_stats': {'total_plays': 3, 'efficient_plays': 2, 'total_yards': 17},
+                 'play_call_stats': {'offense': {'Zone': {'total_plays': 2, 'down_breakdown': {1: 1, 2: 1}}}}}
+    assert migrate_box_stats(box_stats)
+    check_current(box_stats)
+    assert box_stats['team_stats']['offense']['total_yards'] == 17
+    assert box_stats['team_stats']['overall']['efficient_plays'] == 2
+    assert box_stats['team_stats']['defense'] == TEAM_STAT_FIELDS
+    # Offense and overall are separate rows from then on
+    assert box_stats['team_stats']['offense'] is not box_stats['team_stats']['overall']
+    assert box_stats['players']['7']['rushing_yards'] == 12 and box_stats['players']['7']['nee_score'] == 0.0
+    assert box_stats['play_call_stats']['offense']['Zone']['down_breakdown'] == {'1': 1, '2': 1}
+
+
+def test_flat_play_calls_move_to_offense():
+    box_stats = {'play_call_stats': {'Stretch': {'total_plays': 1}, 'defense': {'Cover 2': {'total_plays': 4}}}}
+    migrate_box_stats(box_stats)
+    check_current(box_stats)
+    assert box_stats['play_call_stats'] == {'offense': {'Stretch': {'total_plays': 1}},
+                                            'defense': {'Cover 2': {'total_plays': 4}}, 'special_teams': {}}
+
+
+def test_existing_values_are_kept():
+    box_stats = {'team_stats': {'offense': {'total_plays': 9, 'nee_score': 41.5}, 'defense': {}},
+                 'players': {'3': {'negative_plays': 2}}}
+    migrate_box_stats(box_stats)
+    check_current(box_stats)
+    assert box_stats['team_stats']['offense']['total_plays'] == 9
+    assert box_stats['team_stats']['offense']['nee_score'] == 41.5
+    assert box_stats['players']['3']['negative_plays'] == 2
+
+
+def test_runs_once():
+    box_stats = {'team_stats': {'total_plays': 1}}
+    assert migrate_box_stats(box_stats)
+    upgraded = copy.deepcopy(box_stats)
+    assert not migrate_box_stats(box_stats) and box_stats == upgraded
+    fresh = new_box_stats()
+    assert not migrate_box_stats(fresh)
+    check_current(fresh)
+    assert not migrate_session({}) and not migrate_game(None)
+
+
+def test_saved_game_formats():
+    wrapped = {'game_name': 'Test', 'version': '2.0', 'game_data': {'plays': [], 'team_stats': {'total_plays': 0}}}
+    assert migrate_game(wrapped)
+    check_current(wrapped['game_data'])
+    assert SCHEMA_KEY not in wrapped
+    flat = {'plays': [], 'players': {}, 'team_stats': {}}
+    assert migrate_game(flat)
+    check_current(flat)
+
+
+def test_stored_sessions_and_games():
+    checked = 0
+    for path in glob.glob('server_sessions/**/*.pkl', recursive=True):
+        with open(path, 'rb') as f:
+            blob = pickle.load(f)
+        data = blob['session_data'] if isinstance(blob, dict) and 'session_data' in blob else blob
+        if migrate_session(data):
+            check_current(data['box_stats'])
+            checked += 1
+    for path in glob.glob('saved_games/**/*.json', recursive=True):
+        with open(path, 'r') as f:
+            game = json.load(f)
+        if migrate_game(game):
+            check_current(game.get('game_data', game))
+            checked += 1
+    print(f"  {checked} stored blobs upgraded")
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
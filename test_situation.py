@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Exhaustive tests for the situation model (situation.py).
+
+Runs without the server: every down, a spread of distances, every yard line
+and every gain from a safety to a 99-yard play, for plain plays, scores,
+turnovers and penalties. Plain plays that stay between the 1 and the goal
+line are checked against the previous string-based calculation.
+
+Usage: python test_situation.py   (or python -m pytest test_situation.py)
+"""
+import sys
+
+from situation import (Situation, transition, encode_field_position, decode_field_position, next_situation_for_play,
+                       replay_situations, recheck_situations,
+                       EVENT_PLAY, EVENT_TOUCHDOWN, EVENT_TURNOVER, EVENT_PENALTY_OFFENSE, EVENT_PENALTY_DEFENSE,
+                       REASON_FIRST_DOWN, REASON_NEXT_DOWN, REASON_TURNOVER_ON_DOWNS, REASON_TOUCHDOWN,
+                       REASON_TOUCHDOWN_SCORED, REASON_TURNOVER, REASON_PENALTY_OFFENSE, REASON_PENALTY_DEFENSE,
+                       REASON_PENALTY_TOUCHDOWN, POSSESSION_OFFENSE, POSSESSION_DEFENSE)
+
+DOWNS = (1, 2, 3, 4)
+DISTANCES = (1, 2, 3, 5, 7, 10, 15, 25)
+YARD_LINES = range(1, 100)
+GAINS = range(-20, 100)
+PENALTY_YARDS = (0, 5, 10, 15, 30)
+
+
+def legacy_next_situation(down, distance, field_position, yards_gained):
+    """The string-based calculation for a plain play (no result keywords), kept as a reference"""
+    side, yard_line = field_position.split()
+    yard_line = int(yard_line)
+    if side == 'OWN':
+        new_yard_line = yard_line + yards_gained
+        if new_yard_line >= 50:
+            new_side = 'OPP'
+            new_yard_line = max(1, 100 - new_yard_line)
+        else:
+            new_side = 'OWN'
+    else:
+        new_yard_line = yard_line - yards_gained
+        if new_yard_line <= 0:
+            return 1, 10, 'OWN 25'
+        elif new_yard_line > 50:
+            new_side = 'OWN'
+            new_yard_line = 100 - new_yard_line
+        else:
+            new_side = 'OPP'
+            new_yard_line = max(1, new_yard_line)
+    new_field_position = f"{new_side} {max(1, abs(int(new_yard_line)))}"
+    remaining = distance - yards_gained
+    if remaining <= 0:
+        return 1, 10, new_field_position
+    if down >= 4:
+        return None  # turnover on downs mirrored the spot incorrectly; not comparable
+    return down + 1, max(1, remaining), new_field_position
+
+
+def check_invariants(state):
+    assert 1 <= state.down <= 4, state
+    assert state.distance >= 1, state
+    assert 1 <= state.yard_line <= 99, state
+    assert state.possession in (POSSESSION_OFFENSE, POSSESSION_DEFENSE), state
+
+
+def test_field_position_round_trip():
+    for yard in range(1, 50):
+        assert encode_field_position(f"OWN {yard}") == yard
+        assert encode_field_position(f"OPP {yard}") == 100 - yard
+        assert decode_field_position(yard) == f"OWN {yard}"
+        assert decode_field_position(100 - yard) == f"OPP {yard}"
+        # Signed ints from the entry form: negative is own side
+        assert encode_field_position(-yard) == yard
+        assert encode_field_position(yard) == 100 - yard
+        assert encode_field_position(str(-yard)) == yard
+    assert decode_field_position(50) == 'OPP 50'
+    assert encode_field_position('OWN 50') == encode_field_position('OPP 50') == 50
+    assert encode_field_position('own 99') == 50  # legacy strings clamp at midfield
+    assert encode_field_position(0) == 75 and encode_field_position('') == 25 and encode_field_position(None) == 25
+    for yard_line in YARD_LINES:
+        assert encode_field_position(decode_field_position(yard_line)) == yard_line
+
+
+def test_plain_plays_exhaustive():
+    compared = 0
+    for possession in (POSSESSION_OFFENSE, POSSESSION_DEFENSE):
+        for down in DOWNS:
+            for distance in DISTANCES:
+                for yard_line in YARD_LINES:
+                    state = Situation(down, distance, yard_line, possession)
+                    for gain in GAINS:
+                        after, reason = transition(state, EVENT_PLAY, gain)
+                        check_invariants(after)
+                        moved = yard_line + gain
+                        if moved >= 100:
+                            assert reason == REASON_TOUCHDOWN
+                            assert after == Situation(1, 10, 25, 1 - possession)
+                            continue
+                        spot = max(1, moved)
+                        if gain >= distance:
+                            assert reason == REASON_FIRST_DOWN and after == Situation(1, 10, spot, possession)
+                        elif down == 4:
+                            assert reason == REASON_TURNOVER_ON_DOWNS
+                            assert after == Situation(1, 10, 100 - spot, 1 - possession)
+                        else:
+                            assert reason == REASON_NEXT_DOWN
+                            assert after == Situation(down + 1, distance - gain, spot, possession)
+                        # Same answer as the string-based version wherever that one was well defined
+                        if moved >= 1 and possession == POSSESSION_OFFENSE:
+                            legacy = legacy_next_situation(down, distance, decode_field_position(yard_line), gain)
+                            if legacy is not None:
+                                assert (after.down, after.distance, decode_field_position(after.yard_line)) == legacy, \
+                                    (state, gain, after, legacy)
+                                compared += 1
+    assert compared > 100000
+
+
+def test_scores_and_turnovers_exhaustive():
+    for down in DOWNS:
+        for distance in DISTANCES:
+            for yard_line in YARD_LINES:
+                state = Situation(down, distance, yard_line, POSSESSION_OFFENSE)
+                for gain in GAINS:
+                    after, reason = transition(state, EVENT_TOUCHDOWN, gain)
+                    assert after == Situation(1, 10, 25, POSSESSION_DEFENSE)
+                    assert reason in (REASON_TOUCHDOWN, REASON_TOUCHDOWN_SCORED)
+
+                    after, reason = transition(state, EVENT_TURNOVER, gain)
+                    check_invariants(after)
+                    if yard_line + gain >= 100:
+                        assert reason == REASON_TOUCHDOWN
+                        continue
+                    assert reason == REASON_TURNOVER
+                    assert after.possession == POSSESSION_DEFENSE and (after.down, after.distance) == (1, 10)
+                    # The spot is the same piece of grass, seen from the other goal line
+                    assert after.yard_line == 100 - max(1, yard_line + gain)
+
+
+def test_penalties_exhaustive():
+    for down in DOWNS:
+        for distance in DISTANCES:
+            for yard_line in YARD_LINES:
+                state = Situation(down, distance, yard_line, POSSESSION_OFFENSE)
+                for penalty in PENALTY_YARDS:
+                    after, reason = transition(state, EVENT_PENALTY_DEFENSE, penalty)
+                    check_invariants(after)
+                    if yard_line + penalty >= 100:
+                        assert reason == REASON_PENALTY_TOUCHDOWN
+                    else:
+                        assert reason == REASON_PENALTY_DEFENSE
+                        assert after == Situation(1, 10, yard_line + penalty, POSSESSION_OFFENSE)
+
+                    after, reason = transition(state, EVENT_PENALTY_OFFENSE, penalty)
+                    check_invariants(after)
+                    assert reason == REASON_PENALTY_OFFENSE
+                    assert after == Situation(down, distance + penalty, max(1, yard_line - penalty), POSSESSION_OFFENSE)
+
+
+def test_transition_is_pure():
+    state = Situation(3, 7, 40, POSSESSION_OFFENSE)
+    first = transition(state, EVENT_PLAY, 4)
+    assert transition(state, EVENT_PLAY, 4) == first
+    assert state == Situation(3, 7, 40, POSSESSION_OFFENSE)
+
+
+def test_play_boundary():
+    """Plays and API dicts as add_play uses them"""
+    result = next_situation_for_play({'down': 1, 'distance': 10, 'field_position': 'OWN 25', 'yards_gained': 6})
+    assert result == {'down': 2, 'distance': 4, 'field_position': 'OWN 31', 'auto_calculated': True,
+                      'reason': 'Next down: 2 & 4', 'possession_changed': False}
+
+    result = next_situation_for_play({'down': 2, 'distance': 3, 'field_position': -45, 'yards_gained': 12})
+    assert (result['down'], result['distance'], result['field_position']) == (1, 10, 'OPP 43')
+    assert result['reason'] == 'First down achieved'
+
+    result = next_situation_for_play({'down': 4, 'distance': 2, 'field_position': 'OPP 30', 'yards_gained': 1})
+    assert result['field_position'] == 'OWN 29' and result['possession_changed']
+    assert result['reason'] == 'Turnover on downs'
+
+    result = next_situation_for_play({'down': 2, 'distance': 8, 'field_position': 'OWN 30', 'yards_gained': 5,
+                                      'result': 'Interception'})
+    assert result['field_position'] == 'OPP 35' and result['reason'] == 'Turnover - Opponent takes possession'
+
+    result = next_situation_for_play({'down': 1, 'distance': 10, 'field_position': 'OPP 5', 'yards_gained': 3,
+                                      'result': 'Touchdown'})
+    assert result['field_position'] == 'OWN 25' and result['reason'] == 'Touchdown scored - Reset for next drive'
+
+    result = next_situation_for_play({'down': 3, 'distance': 4, 'field_position': 'OPP 40', 'play_type': 'penalty',
+                                      'penalty_yards': 15, 'penalty_side': 'defense'})
+    assert result['field_position'] == 'OPP 25'
+    assert result['reason'] == 'Defensive penalty: Automatic first down at OPP 25'
+
+    result = next_situation_for_play({'down': 2, 'distance': 6, 'field_position': 'OWN 20', 'play_type': 'penalty',
+                                      'penalty_yards': 5, 'penalty_on': 'offense'})
+    assert (result['down'], result['distance'], result['field_position']) == (2, 11, 'OWN 15')
+    assert result['reason'] == 'Offensive penalty: Repeat 2 down with 5 yard penalty'
+
+    result = next_situation_for_play({'down': None, 'distance': 10, 'field_position': 'OWN 25'})
+    assert result['auto_calculated'] is False and result['field_position'] == 'OWN 25'
+
+
+def drive_plays():
+    """A consistent four-play series: 8, 1, 5 (first down), 3"""
+    return [
+        {'down': 1, 'distance': 10, 'field_position': 'OWN 25', 'yards_gained': 8, 'play_number': 1},
+        {'down': 2, 'distance': 2, 'field_position': 'OWN 33', 'yards_gained': 1, 'play_number': 2},
+        {'down': 3, 'distance': 1, 'field_position': 'OWN 34', 'yards_gained': 5, 'play_number': 3},
+        {'down': 1, 'distance': 10, 'field_position': 'OWN 39', 'yards_gained': 3, 'play_number': 4},
+    ]
+
+
+def test_chain_stops_when_plays_agree():
+    chain = replay_situations(drive_plays(), 0)
+    assert chain['mismatches'] == [] and chain['checked_through'] == 1 and chain['next_situation'] is None
+
+
+def test_chain_flags_every_downstream_play_after_an_edit():
+    plays = drive_plays()
+    plays[0]['yards_gained'] = 4
+    chain = replay_situations(plays, 0)
+    assert [m['index'] for m in chain['mismatches']] == [1, 2, 3]
+    assert chain['mismatches'][0]['expected'] == {'down': 2, 'distance': 6, 'field_position': 'OWN 29'}
+    assert chain['mismatches'][0]['recorded'] == {'down': 2, 'distance': 2, 'field_position': 'OWN 33'}
+    # Reached the end: the next situation follows the replayed chain
+    assert chain['next_situation']['field_position'] == 'OWN 38'
+
+
+def test_chain_stops_at_possession_change():
+    plays = drive_plays()
+    plays[1]['result'] = 'Fumble'
+    plays[2]['phase'] = 'defense'
+    plays[0]['yards_gained'] = 4
+    chain = replay_situations(plays, 0)
+    assert [m['index'] for m in chain['mismatches']] == [1]
+    assert chain['checked_through'] == 1 and chain['next_situation'] is None
+
+
+
+def test_fixing_a_flagged_play_clears_its_flag():
+    box_stats = {'plays': drive_plays()}
+    box_stats['plays'][0]['yards_gained'] = 4
+    recheck_situations(box_stats, 0)
+    assert sorted(box_stats['situation_flags']) == ['1', '2', '3']
+    # The coach corrects play 1 to the situation the chain expects
+    box_stats['plays'][1].update({'down': 2, 'distance': 6, 'field_position': 'OWN 29'})
+    recheck_situations(box_stats, 1)
+    assert '1' not in box_stats['situation_flags']
+    assert sorted(box_stats['situation_flags']) == ['2', '3']
+    # Editing play 1 away from the chain flags it again
+    box_stats['plays'][1]['distance'] = 9
+    recheck_situations(box_stats, 1)
+    assert box_stats['situation_flags']['1']['expected'] == {'down': 2, 'distance': 6, 'field_position': 'OWN 29'}
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the situational cube (situation_cube.py).
+
+Runs without the server. Adding, editing and deleting plays must leave the
+same cells as aggregating the play log from scratch, removing what was
+added must roll the cube back exactly, and slices must sum to the plays
+they describe.
+
+Usage: python test_situation_cube.py   (or python -m pytest test_situation_cube.py)
+"""
+import copy
+import sys
+
+from situation_cube import (rebuild_cube, get_cube, cube_add_play, cube_remove_play, cube_replace_play, slice_cube,
+                            SITUATION_CUBE_KEY)
+
+DIMENSIONS = {
+    'phase': lambda play: play.get('phase'),
+    'play_call': lambda play: play.get('play_call'),
+    'down': lambda play: play.get('down')
+}
+
+
+def outcome(play):
+    yards = play.get('yards_gained', 0)
+    return {'yards': yards, 'efficient': yards >= 4, 'explosive': yards >= 12, 'negative': yards < 0}
+
+
+def make_play(n):
+    return {'phase': 'offense', 'play_call': ('Inside Zone', 'Power', 'Mesh')[n % 3], 'down': n % 3 + 1,
+            'yards_gained': (n * 7) % 15 - 3}
+
+
+def new_session(count):
+    box_stats = {'plays': []}
+    rebuild_cube(box_stats, DIMENSIONS, outcome)
+    for n in range(count):
+        box_stats['plays'].append(make_play(n))
+        cube_add_play(box_stats, DIMENSIONS, outcome)
+    return box_stats
+
+
+def assert_matches_rebuild(box_stats):
+    assert box_stats[SITUATION_CUBE_KEY] == rebuild_cube(copy.deepcopy(box_stats), DIMENSIONS, outcome)
+
+
+def test_updates_match_a_rebuild():
+    box_stats = new_session(10)
+    assert_matches_rebuild(box_stats)
+
+    old = box_stats['plays'][4]
+    box_stats['plays'][4] = dict(old, play_call='Four Verts', yards_gained=20)
+    cube_replace_play(box_stats, DIMENSIONS, outcome, old, box_stats['plays'][4])
+    assert_matches_rebuild(box_stats)
+
+    removed = box_stats['plays'].pop(2)
+    cube_remove_play(box_stats, DIMENSIONS, outcome, removed)
+    assert_matches_rebuild(box_stats)
+
+
+def test_removing_what_was_added_rolls_back():
+    box_stats = new_session(6)
+    before = copy.deepcopy(box_stats[SITUATION_CUBE_KEY])
+    added = dict(make_play(0), play_call='Trick Play', down=4, yards_gained=30)
+    box_stats['plays'].append(added)
+    cube_add_play(box_stats, DIMENSIONS, outcome)
+    # A new situation gets its own cell, which goes away with its last play
+    assert len(box_stats[SITUATION_CUBE_KEY]['cells']) == len(before['cells']) + 1
+    cube_remove_play(box_stats, DIMENSIONS, outcome, box_stats['plays'].pop())
+    assert box_stats[SITUATION_CUBE_KEY] == before
+
+    # An edit undone by the opposite edit
+    old, new = box_stats['plays'][0], dict(box_stats['plays'][0], down=4)
+    cube_replace_play(box_stats, DIMENSIONS, outcome, old, new)
+    cube_replace_play(box_stats, DIMENSIONS, outcome, new, old)
+    assert box_stats[SITUATION_CUBE_KEY] == before
+
+
+def test_slices_sum_the_matching_plays():
+    box_stats = new_session(30)
+    cube = get_cube(box_stats, DIMENSIONS, outcome)
+    totals, groups = slice_cube(cube, {'play_call': ['power'], 'down': [2, 3]}, group_by=('down',))
+    matching = [p for p in box_stats['plays'] if p['play_call'] == 'Power' and p['down'] in (2, 3)]
+    assert totals['plays'] == len(matching)
+    assert totals['yards'] == sum(p['yards_gained'] for p in matching)
+    assert totals['efficient'] == sum(1 for p in matching if p['yards_gained'] >= 4)
+    assert sum(group['plays'] for group in groups.values()) == totals['plays']
+
+
+def test_stale_cube_is_rebuilt():
+    box_stats = new_session(5)
+    # Plays appended without counting them
+    box_stats['plays'].extend(make_play(n) for n in range(5, 8))
+    assert get_cube(box_stats, DIMENSIONS, outcome)['plays_indexed'] == 8
+    assert_matches_rebuild(box_stats)
+    # Different dimensions than the stored cube was built with
+    assert get_cube(box_stats, {'phase': DIMENSIONS['phase']}, outcome)['dimensions'] == ['phase']
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
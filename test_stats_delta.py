@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Checks for conditional and delta /box_stats/get_stats and the row versions behind them.
+
+Imports the app. The ETag follows the session version (304 while it is
+unchanged), ?since_version= returns only the plays and players changed
+after that version, and a save records a new version only for the rows
+whose fingerprint changed.
+
+Runs against session files, backups and a SQLite database in a temporary
+directory, removed at exit.
+
+Usage: python test_stats_delta.py   (or python -m pytest test_stats_delta.py)
+"""
+import os
+import sys
+import copy
+import uuid
+import atexit
+import shutil
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep session files, backups and the database out of the working tree
+TEST_DIR = tempfile.mkdtemp(prefix='hoy-test-')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ['SESSION_DIR'] = os.path.join(TEST_DIR, 'server_sessions')
+os.environ['BACKUP_STORE_DIR'] = os.path.join(TEST_DIR, 'backup_store')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+from app import app, server_session
+
+
+def client_for(username, session_id):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['authenticated'] = True
+        sess['username'] = username
+        sess['server_session_id'] = session_id
+    return client
+
+
+def add_play(client, number, yards=3, number_of_player=22):
+    response = client.post('/box_stats/add_play', json={
+        'play_number': number, 'down': 1, 'distance': 10, 'field_position': -25, 'play_type': 'rush',
+        'result': 'tackled', 'phase': 'offense', 'yards_gained': yards,
+        'players_involved': [{'number': number_of_player, 'name': 'Back', 'role': 'rusher'}]
+    })
+    assert response.status_code == 200, response.get_json()
+
+
+def test_etag_and_not_modified():
+    session_id = f"delta-{uuid.uuid4()}"
+    try:
+        coach = client_for('coach_a', session_id)
+        add_play(coach, 1)
+        first = coach.get('/box_stats/get_stats')
+        etag = first.headers['ETag']
+        assert first.status_code == 200 and first.headers['Cache-Control'] == 'no-cache'
+
+        cached = coach.get('/box_stats/get_stats', headers={'If-None-Match': etag})
+        assert cached.status_code == 304 and cached.headers['ETag'] == etag and not cached.get_data()
+        assert coach.get('/box_stats/get_stats', headers={'If-None-Match': f'W/"other", {etag}'}).status_code == 304
+
+        add_play(coach, 2)
+        changed = coach.get('/box_stats/get_stats', headers={'If-None-Match': etag})
+        assert changed.status_code == 200 and changed.headers['ETag'] != etag
+    finally:
+        server_session.delete_session(session_id)
+
+
+def test_delta_has_only_rows_changed_since_the_version():
+    session_id = f"delta-{uuid.uuid4()}"
+    try:
+        coach = client_for('coach_a', session_id)
+        for number in range(1, 4):
+            add_play(coach, number)
+        since = coach.get('/box_stats/get_stats').get_json()['version']
+
+        add_play(coach, 4, number_of_player=30)
+        delta = coach.get(f'/box_stats/get_stats?since_version={since}').get_json()
+        assert delta['delta'] and delta['play_count'] == 4
+        assert [p['index'] for p in delta['plays']] == [3]
+        assert '30' in delta['players'] and 'team_stats' in delta
+        since = delta['version']
+
+        # Nothing changed: an empty delta at the same version
+        delta = coach.get(f'/box_stats/get_stats?since_version={since}').get_json()
+        assert delta['version'] == since and delta['plays'] == [] and delta['players'] == {}
+
+        coach.post('/box_stats/delete_play', json={'play_index': 3})
+        delta = coach.get(f'/box_stats/get_stats?since_version={since}').get_json()
+        # Clients truncate to play_count; the deleted play needs no tombstone
+        assert delta['play_count'] == 3 and all(p['index'] < 3 for p in delta['plays'])
+
+        # A version older than the blob's base gets the full payload
+        full = coach.get('/box_stats/get_stats?since_version=1').get_json()
+        assert 'delta' not in full and len(full['box_stats']['plays']) == 3
+    finally:
+        server_session.delete_session(session_id)
+
+
+def stamped(plays, players):
+    data = {'box_stats': {'plays': plays, 'players': players, 'team_stats': {}}}
+    server_session._stamp_version(data)
+    return data
+
+
+def test_row_versions_follow_fingerprints():
+    data = stamped([{'play_number': n} for n in range(1, 4)], {'22': {'total_plays': 3}, '30': {'total_plays': 1}})
+    base = data['version']
+    assert [v[1] for v in data['row_versions']['plays']] == [base] * 3
+
+    # Saving the blob unchanged keeps its version, so its ETag still matches
+    server_session._stamp_version(data)
+    assert data['version'] == base
+
+    # Only the edited play and player move to the new version; a removed player is recorded
+    data['box_stats']['plays'][1]['yards_gained'] = 9
+    data['box_stats']['players']['22']['total_plays'] = 4
+    del data['box_stats']['players']['30']
+    server_session._stamp_version(data)
+    assert data['version'] == base + 1
+    assert [v[1] for v in data['row_versions']['plays']] == [base, base + 1, base]
+    assert data['row_versions']['players']['22'][1] == base + 1
+    assert data['row_versions']['removed_players'] == {'30': base + 1}
+
+    # A touched hint fingerprints only the rows it names (plus appended plays)
+    hinted = copy.deepcopy(data)
+    hinted['box_stats']['plays'][0]['yards_gained'] = 1
+    hinted['box_stats']['plays'][2]['yards_gained'] = 2
+    hinted['box_stats']['plays'].append({'play_number': 4})
+    server_session._stamp_version(hinted, touched={'plays': [2]})
+    assert [v[1] for v in hinted['row_versions']['plays']] == [base, base + 1, base + 2, base + 2]
+
+    # A blob replaced wholesale restarts its versions from the clock
+    replaced = stamped([{'play_number': 1}], {})
+    assert replaced['row_versions']['base'] == replaced['version'] >= base
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
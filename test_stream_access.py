@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Access checks for the live box stats stream (/box_stats/stream).
+
+Imports the app. A session may be watched from the device recording it, or
+by the same user from another device; any other signed-in user gets a 403.
+Each worker serves at most LIVE_STREAM_LIMIT streams at once.
+
+Runs against session files, backups and a SQLite database in a temporary
+directory, removed at exit.
+
+Usage: python test_stream_access.py   (or python -m pytest test_stream_access.py)
+"""
+import os
+import sys
+import copy
+import uuid
+import atexit
+import shutil
+import tempfile
+import threading
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep session files, backups and the database out of the working tree
+TEST_DIR = tempfile.mkdtemp(prefix='hoy-test-')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ['SESSION_DIR'] = os.path.join(TEST_DIR, 'server_sessions')
+os.environ['BACKUP_STORE_DIR'] = os.path.join(TEST_DIR, 'backup_store')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+import app as app_module
+from app import app, server_session
+
+
+def client_for(username, session_id=None):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['authenticated'] = True
+        sess['username'] = username
+        if session_id:
+            sess['server_session_id'] = session_id
+    return client
+
+
+def stream_status(client, session_id):
+    response = client.get(f'/box_stats/stream?session_id={session_id}')
+    try:
+        return response.status_code
+    finally:
+        response.close()
+
+
+def test_only_the_owner_can_watch():
+    session_id = f"stream-{uuid.uuid4()}"
+    try:
+        owner = client_for('coach_a', session_id)
+        response = owner.post('/box_stats/add_play', json={
+            'play_number': 1, 'down': 1, 'distance': 10, 'field_position': -25, 'play_type': 'rush',
+            'result': 'tackled', 'phase': 'offense', 'yards_gained': 3, 'players_involved': []
+        })
+        assert response.status_code == 200, response.get_json()
+        assert server_session.load_session_data(session_id)['username'] == 'coach_a'
+
+        assert stream_status(owner, session_id) == 200
+        # Same coach on a second device
+        assert stream_status(client_for('coach_a'), session_id) == 200
+        # Another signed-in user guessing or copying the id
+        assert stream_status(client_for('coach_b'), session_id) == 403
+        # A session id nobody saved
+        assert stream_status(client_for('coach_a'), f"stream-{uuid.uuid4()}") == 403
+    finally:
+        server_session.delete_session(session_id)
+
+
+def test_replacing_a_session_keeps_its_owner():
+    session_id = f"stream-{uuid.uuid4()}"
+    try:
+        owner = client_for('coach_a', session_id)
+        owner.post('/box_stats/add_play', json={
+            'play_number': 1, 'down': 1, 'distance': 10, 'field_position': -25, 'play_type': 'rush',
+            'result': 'tackled', 'phase': 'offense', 'yards_gained': 3, 'players_involved': []
+        })
+        # Another user's request replacing the blob (a restore or game load) does not take it over
+        replacement = copy.deepcopy(server_session.load_session_data(session_id))
+        replacement.pop('username')
+        with app.test_request_context():
+            app_module.session['username'] = 'coach_b'
+            server_session.save_session_data(session_id, replacement, overwrite=True)
+        assert server_session.session_owner(session_id) == 'coach_a'
+        assert server_session.load_session_data(session_id)['username'] == 'coach_a'
+        assert stream_status(client_for('coach_b'), session_id) == 403
+    finally:
+        server_session.delete_session(session_id)
+
+
+def test_streams_per_worker_are_capped():
+    session_id = f"stream-{uuid.uuid4()}"
+    slots, app_module.live_stream_slots = app_module.live_stream_slots, threading.BoundedSemaphore(1)
+    try:
+        owner = client_for('coach_a', session_id)
+        owner.post('/box_stats/add_play', json={
+            'play_number': 1, 'down': 1, 'distance': 10, 'field_position': -25, 'play_type': 'rush',
+            'result': 'tackled', 'phase': 'offense', 'yards_gained': 3, 'players_involved': []
+        })
+        first = owner.get(f'/box_stats/stream?session_id={session_id}')
+        assert first.status_code == 200
+        second = owner.get(f'/box_stats/stream?session_id={session_id}')
+        assert second.status_code == 503 and second.headers['Retry-After']
+        # Closing a stream frees its slot
+        first.close()
+        assert stream_status(owner, session_id) == 200
+    finally:
+        app_module.live_stream_slots = slots
+        server_session.delete_session(session_id)
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for the threaded (gthread) request path.
+
+Imports the app and drives it from many threads at once, the way one
+gthread worker serves requests:
+
+- add_play from many clients into one game session: no play may be lost or
+  counted twice (per-session locks, compare-and-swap saves, client_id receipts)
+- chart rendering for PDFs in parallel: every thread gets exactly the image a
+  serial render produces (no shared pyplot state)
+
+Runs against session files, backups and a SQLite database in a temporary
+directory, removed at exit.
+
+Usage: python test_thread_safety.py   (or python -m pytest test_thread_safety.py)
+"""
+import os
+import sys
+import uuid
+import atexit
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Keep session files, backups and the database out of the working tree
+TEST_DIR = tempfile.mkdtemp(prefix='hoy-test-')
+atexit.register(shutil.rmtree, TEST_DIR, ignore_errors=True)
+os.environ['SESSION_DIR'] = os.path.join(TEST_DIR, 'server_sessions')
+os.environ['BACKUP_STORE_DIR'] = os.path.join(TEST_DIR, 'backup_store')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(TEST_DIR, 'test.db')}"
+
+from app import app, server_session, pdf_exporter
+
+THREADS = 8
+PLAYS_PER_THREAD = 10
+
+
+def stress_play(thread, i):
+    return {
+        'play_number': thread * PLAYS_PER_THREAD + i + 1, 'down': 1, 'distance': 10, 'field_position': -25,
+        'play_type': 'rush', 'play_call': 'Inside Zone', 'result': 'tackled', 'phase': 'offense',
+        'yards_gained': 4, 'players_involved': [{'number': 22, 'name': 'Smith', 'role': 'rusher'}],
+        'client_id': f'stress-{thread:02d}-{i:04d}'
+    }
+
+
+def client_for(session_id):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['authenticated'] = True
+        sess['username'] = 'stress'
+        sess['server_session_id'] = session_id
+    return client
+
+
+def test_concurrent_add_play_one_session():
+    session_id = f"stress-{uuid.uuid4()}"
+    barrier = threading.Barrier(THREADS)
+
+    def submit(thread):
+        client = client_for(session_id)
+        barrier.wait()
+        statuses = []
+        for i in range(PLAYS_PER_THREAD):
+            response = client.post('/box_stats/add_play', json=stress_play(thread, i))
+            statuses.append((response.status_code, response.get_json().get('duplicate', False)))
+        # A retry after a lost response must not count the play again
+        response = client.post('/box_stats/add_play', json=stress_play(thread, 0))
+        statuses.append((response.status_code, response.get_json().get('duplicate', False)))
+        return statuses
+
+    try:
+        with ThreadPoolExecutor(THREADS) as pool:
+            results = list(pool.map(submit, range(THREADS)))
+
+        for statuses in results:
+            assert all(code == 200 for code, _ in statuses), statuses
+            assert [duplicate for _, duplicate in statuses] == [False] * PLAYS_PER_THREAD + [True]
+
+        data = server_session.load_session_data(session_id)
+        plays = data['box_stats']['plays']
+        total = THREADS * PLAYS_PER_THREAD
+        assert len(plays) == total, len(plays)
+        assert sorted(play['client_id'] for play in plays) == \
+            sorted(stress_play(t, i)['client_id'] for t in range(THREADS) for i in range(PLAYS_PER_THREAD))
+        assert data['box_stats']['team_stats']['offense']['total_plays'] == total
+        assert data['box_stats']['team_stats']['offense']['total_yards'] == 4 * total
+        print(f"  {total} plays from {THREADS} threads, version {data['version']}")
+    finally:
+        server_session.delete_session(session_id)
+
+
+def test_parallel_chart_rendering():
+    charts = [({'Q1': 7, 'Q2': 3, 'Q3': 10, 'Q4': 0}, 'bar', 'Points by quarter'),
+              ({'1': 4.5, '2': 3.0, '3': 6.5}, 'line', 'Yards per play by down'),
+              ({'Rush': 60, 'Pass': 40}, 'pie', 'Play mix')]
+    expected = [pdf_exporter.create_chart_image(*chart).getvalue() for chart in charts]
+
+    def render(n):
+        index = n % len(charts)
+        return index, pdf_exporter.create_chart_image(*charts[index]).getvalue()
+
+    with ThreadPoolExecutor(THREADS) as pool:
+        rendered = list(pool.map(render, range(THREADS * 3)))
+    for index, image in rendered:
+        assert image.startswith(b'\x89PNG')
+        assert image == expected[index], f"chart {index} differs when rendered in parallel"
+
+
+if __name__ == '__main__':
+    tests = [value for name, value in sorted(globals().items()) if name.startswith('test_') and callable(value)]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ {test.__name__}: {e}")
+    print(f"\n{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)